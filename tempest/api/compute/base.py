@@ -15,12 +15,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import time
-
 from tempest.api import compute
 from tempest import clients
+from tempest.common import backoff
+from tempest.common import cleanup
 from tempest.common.utils import data_utils
-from tempest import exceptions
+from tempest.common import waiters
 from tempest.openstack.common import log as logging
 import tempest.test
 
@@ -45,6 +45,7 @@ class BaseComputeTest(tempest.test.BaseTestCase):
 
         cls.os = os
         cls.build_interval = cls.config.compute.build_interval
+        cls.poll_policy = backoff.PollPolicy.from_config(cls.config.compute)
         cls.build_timeout = cls.config.compute.build_timeout
         cls.ssh_user = cls.config.compute.ssh_user
         cls.image_ref = cls.config.compute.image_ref
@@ -57,36 +58,48 @@ class BaseComputeTest(tempest.test.BaseTestCase):
         cls.images = []
 
     @classmethod
-    def clear_servers(cls):
-        for server in cls.servers:
-            try:
-                cls.servers_client.delete_server(server['id'])
-            except Exception:
-                pass
+    def _get_cleaner(cls):
+        return cleanup.ResourceCleaner(cls.config.compute.teardown_workers,
+                                       name=cls.__name__)
 
+    @classmethod
+    def _add_servers(cls, cleaner):
+        client = cls.servers_client
+
+        def _list_servers():
+            resp, body = client.list_servers_with_detail()
+            return body['servers']
+
+        cleaner.register('server', client.delete_server,
+                         wait=cleanup.deletion_waiter(client, _list_servers))
         for server in cls.servers:
-            try:
-                cls.servers_client.wait_for_server_termination(server['id'])
-            except Exception:
-                pass
+            cleaner.add('server', server['id'])
 
     @classmethod
-    def clear_images(cls):
+    def _add_images(cls, cleaner):
+        cleaner.register('image', cls.images_client.delete_image)
         for image_id in cls.images:
-            try:
-                cls.images_client.delete_image(image_id)
-            except exceptions.NotFound:
-                # The image may have already been deleted which is OK.
-                pass
-            except Exception as exc:
-                LOG.info('Exception raised deleting image %s', image_id)
-                LOG.exception(exc)
-                pass
+            cleaner.add('image', image_id)
+
+    @classmethod
+    def clear_servers(cls):
+        cleaner = cls._get_cleaner()
+        cls._add_servers(cleaner)
+        cleaner.run(ignore_errors=True)
+
+    @classmethod
+    def clear_images(cls):
+        cleaner = cls._get_cleaner()
+        cls._add_images(cleaner)
+        cleaner.run(ignore_errors=True)
 
     @classmethod
     def tearDownClass(cls):
-        cls.clear_images()
-        cls.clear_servers()
+        # The images and the servers are deleted concurrently.
+        cleaner = cls._get_cleaner()
+        cls._add_images(cleaner)
+        cls._add_servers(cleaner)
+        cleaner.run(ignore_errors=True)
         cls.clear_isolated_creds()
         super(BaseComputeTest, cls).tearDownClass()
 
@@ -112,15 +125,21 @@ class BaseComputeTest(tempest.test.BaseTestCase):
         cls.servers.extend(servers)
 
         if 'wait_until' in kwargs:
-            for server in servers:
-                cls.servers_client.wait_for_server_status(
-                    server['id'], kwargs['wait_until'])
+            status = kwargs['wait_until']
+            if len(servers) > 1 and status != 'BUILD':
+                # One servers listing per interval for all of them.
+                waiters.wait_for_servers_status(
+                    cls.servers_client, [s['id'] for s in servers], status)
+            else:
+                for server in servers:
+                    cls.servers_client.wait_for_server_status(
+                        server['id'], status)
 
         return resp, body
 
     def wait_for(self, condition):
         """Repeatedly calls condition() until a timeout."""
-        start_time = int(time.time())
+        poller = self.poll_policy.poller(self.build_timeout)
         while True:
             try:
                 condition()
@@ -128,10 +147,9 @@ class BaseComputeTest(tempest.test.BaseTestCase):
                 pass
             else:
                 return
-            if int(time.time()) - start_time >= self.build_timeout:
+            if not poller.sleep():
                 condition()
                 return
-            time.sleep(self.build_interval)
 
 
 class BaseV2ComputeTest(BaseComputeTest):
@@ -16,7 +16,6 @@
 #    under the License.
 
 import base64
-import time
 
 import testtools
 
@@ -187,16 +186,14 @@ class ServerActionsTestJSON(base.BaseV2ComputeTest):
 
         # Need to poll for the id change until lp#924371 is fixed
         resp, server = self.client.get_server(self.server_id)
-        start = int(time.time())
+        poller = self.poll_policy.poller(self.build_timeout)
 
         while server['flavor']['id'] != previous_flavor_ref:
-            time.sleep(self.build_interval)
-            resp, server = self.client.get_server(self.server_id)
-
-            if int(time.time()) - start >= self.build_timeout:
+            if not poller.sleep():
                 message = 'Server %s failed to revert resize within the \
                 required time (%s s).' % (self.server_id, self.build_timeout)
                 raise exceptions.TimeoutException(message)
+            resp, server = self.client.get_server(self.server_id)
 
     @attr(type='gate')
     def test_create_backup(self):
@@ -17,7 +17,7 @@
 import cStringIO as StringIO
 
 from tempest import clients
-from tempest.common import isolated_creds
+from tempest.common import credential_pool
 from tempest.common.utils import data_utils
 from tempest import exceptions
 from tempest.openstack.common import log as logging
@@ -34,7 +34,7 @@ class BaseImageTest(tempest.test.BaseTestCase):
         super(BaseImageTest, cls).setUpClass()
         cls.created_images = []
         cls._interface = 'json'
-        cls.isolated_creds = isolated_creds.IsolatedCreds(cls.__name__)
+        cls.isolated_creds = credential_pool.get_isolated_creds(cls.__name__)
         if not cls.config.service_available.glance:
             skip_msg = ("%s skipped as glance is not available" % cls.__name__)
             raise cls.skipException(skip_msg)
@@ -18,6 +18,7 @@
 import netaddr
 
 from tempest import clients
+from tempest.common import cleanup
 from tempest.common.utils import data_utils
 from tempest import exceptions
 from tempest.openstack.common import log as logging
@@ -68,39 +69,49 @@ class BaseNetworkTest(tempest.test.BaseTestCase):
 
     @classmethod
     def tearDownClass(cls):
-        # Clean up vpn services
-        for vpnservice in cls.vpnservices:
-            cls.client.delete_vpn_service(vpnservice['id'])
-        # Clean up routers
-        for router in cls.routers:
-            resp, body = cls.client.list_router_interfaces(router['id'])
-            interfaces = body['ports']
-            for i in interfaces:
-                cls.client.remove_router_interface_with_subnet_id(
-                    router['id'], i['fixed_ips'][0]['subnet_id'])
-            cls.client.delete_router(router['id'])
-        # Clean up health monitors
-        for health_monitor in cls.health_monitors:
-            cls.client.delete_health_monitor(health_monitor['id'])
-        # Clean up members
-        for member in cls.members:
-            cls.client.delete_member(member['id'])
-        # Clean up vips
-        for vip in cls.vips:
-            cls.client.delete_vip(vip['id'])
-        # Clean up pools
-        for pool in cls.pools:
-            cls.client.delete_pool(pool['id'])
-        # Clean up ports
-        for port in cls.ports:
-            cls.client.delete_port(port['id'])
-        # Clean up subnets
-        for subnet in cls.subnets:
-            cls.client.delete_subnet(subnet['id'])
-        # Clean up networks
-        for network in cls.networks:
-            cls.client.delete_network(network['id'])
-        super(BaseNetworkTest, cls).tearDownClass()
+        # Every level of dependent resources is deleted concurrently, e.g.
+        # the subnets once the routers, ports, pools and vpn services using
+        # them are gone.
+        client = cls.client
+        cleaner = cleanup.ResourceCleaner(cls.config.compute.teardown_workers,
+                                          name=cls.__name__)
+        cleaner.register('vpnservice', client.delete_vpn_service)
+        cleaner.register('health_monitor', client.delete_health_monitor)
+        cleaner.register('member', client.delete_member)
+        cleaner.register('vip', client.delete_vip)
+        cleaner.register('port', client.delete_port)
+        cleaner.register('router', cls._delete_router, after=('vpnservice',))
+        cleaner.register('pool', client.delete_pool,
+                         after=('health_monitor', 'member', 'vip'))
+        cleaner.register('subnet', client.delete_subnet,
+                         after=('vpnservice', 'vip', 'port', 'router',
+                                'pool'))
+        cleaner.register('network', client.delete_network,
+                         after=('subnet',))
+        for kind, resources in (('vpnservice', cls.vpnservices),
+                                ('health_monitor', cls.health_monitors),
+                                ('member', cls.members),
+                                ('vip', cls.vips),
+                                ('port', cls.ports),
+                                ('router', cls.routers),
+                                ('pool', cls.pools),
+                                ('subnet', cls.subnets),
+                                ('network', cls.networks)):
+            for resource in resources:
+                cleaner.add(kind, resource['id'])
+        try:
+            cleaner.run()
+        finally:
+            super(BaseNetworkTest, cls).tearDownClass()
+
+    @classmethod
+    def _delete_router(cls, router_id):
+        resp, body = cls.client.list_router_interfaces(router_id)
+        interfaces = body['ports']
+        for i in interfaces:
+            cls.client.remove_router_interface_with_subnet_id(
+                router_id, i['fixed_ips'][0]['subnet_id'])
+        cls.client.delete_router(router_id)
 
     @classmethod
     def create_network(cls, network_name=None):
@@ -15,9 +15,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import itertools
+import urllib
 
 from tempest.api.identity.base import DataGenerator
 from tempest import clients
+from tempest.common import concurrency
 from tempest.common import custom_matchers
 from tempest.common import isolated_creds
 from tempest import exceptions
@@ -34,6 +37,9 @@ class BaseObjectTest(tempest.test.BaseTestCase):
             raise cls.skipException(skip_msg)
         cls.isolated_creds = isolated_creds.IsolatedCreds(cls.__name__)
         if cls.config.compute.allow_tenant_isolation:
+            # Create the three sets of isolated creds concurrently
+            cls.isolated_creds.create_isolated_creds('primary', 'admin',
+                                                     'alt')
             # Get isolated creds for normal user
             creds = cls.isolated_creds.get_primary_creds()
             username, tenant_name, password = creds
@@ -114,14 +120,54 @@ class BaseObjectTest(tempest.test.BaseTestCase):
             object_client = cls.object_client
         for cont in containers:
             try:
-                objlist = container_client.list_all_container_objects(cont)
-                # delete every object in the container
-                for obj in objlist:
-                    object_client.delete_object(cont, obj['name'])
+                cls.delete_container_objects(cont, container_client,
+                                             object_client)
                 container_client.delete_container(cont)
             except exceptions.NotFound:
                 pass
 
+    @classmethod
+    def delete_container_objects(cls, container, container_client,
+                                 object_client):
+        """Remove all objects in the given container.
+
+        The listing is streamed page by page. The objects of every page are
+        deleted in a single request if the bulk middleware is enabled,
+        otherwise (or if it turns out not to be) with concurrent DELETE
+        requests, at most [compute] teardown_workers at a time.
+        """
+        workers = cls.config.compute.teardown_workers
+        use_bulk = cls.config.object_storage_feature_enabled.bulk_delete
+
+        def _delete_object(name):
+            try:
+                object_client.delete_object(container, name)
+            except exceptions.NotFound:
+                pass
+
+        names = (obj['name'] for obj in
+                 container_client.iter_container_objects(container))
+        if not use_bulk:
+            concurrency.run_for_each(_delete_object, names, workers)
+            return
+        while True:
+            page = list(itertools.islice(names, 9999))
+            if not page:
+                return
+            resp, result = container_client.bulk_delete_objects(
+                container, page)
+            if result is None:
+                # No bulk middleware, delete the rest one by one.
+                concurrency.run_for_each(_delete_object,
+                                         itertools.chain(page, names),
+                                         workers)
+                return
+            # Retry the failed ones on their own to get a proper error.
+            prefix = '/%s/' % urllib.quote(str(container))
+            failed = [urllib.unquote(path[len(prefix):]).decode('utf-8')
+                      for path, status in result['Errors']]
+            concurrency.run_for_each(_delete_object, failed, workers)
+
     def assertHeaders(self, resp, target, method):
         """
         Common method to check the existence and the format of common response
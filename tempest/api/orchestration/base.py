@@ -12,9 +12,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import time
-
 from tempest import clients
+from tempest.common import backoff
 from tempest.common.utils import data_utils
 from tempest.openstack.common import log as logging
 import tempest.test
@@ -36,6 +35,8 @@ class BaseOrchestrationTest(tempest.test.BaseTestCase):
             raise cls.skipException("Heat support is required")
         cls.build_timeout = cls.orchestration_cfg.build_timeout
         cls.build_interval = cls.orchestration_cfg.build_interval
+        cls.poll_policy = backoff.PollPolicy.from_config(
+            cls.orchestration_cfg)
 
         cls.os = os
         cls.orchestration_client = os.orchestration_client
@@ -120,7 +121,7 @@ class BaseOrchestrationTest(tempest.test.BaseTestCase):
 
     def wait_for(self, condition):
         """Repeatedly calls condition() until a timeout."""
-        start_time = int(time.time())
+        poller = self.poll_policy.poller(self.build_timeout)
         while True:
             try:
                 condition()
@@ -128,10 +129,9 @@ class BaseOrchestrationTest(tempest.test.BaseTestCase):
                 pass
             else:
                 return
-            if int(time.time()) - start_time >= self.build_timeout:
+            if not poller.sleep():
                 condition()
                 return
-            time.sleep(self.build_interval)
 
     @staticmethod
     def stack_output(stack, output_key):
@@ -15,9 +15,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import time
-
 from tempest import clients
+from tempest.common import backoff
+from tempest.common import cleanup
 from tempest.openstack.common import log as logging
 import tempest.test
 
@@ -46,6 +46,7 @@ class BaseVolumeTest(tempest.test.BaseTestCase):
         cls.image_ref = cls.config.compute.image_ref
         cls.flavor_ref = cls.config.compute.flavor_ref
         cls.build_interval = cls.config.volume.build_interval
+        cls.poll_policy = backoff.PollPolicy.from_config(cls.config.volume)
         cls.build_timeout = cls.config.volume.build_timeout
         cls.snapshots = []
         cls.volumes = []
@@ -58,8 +59,10 @@ class BaseVolumeTest(tempest.test.BaseTestCase):
 
     @classmethod
     def tearDownClass(cls):
-        cls.clear_snapshots()
-        cls.clear_volumes()
+        cleaner = cls._get_cleaner()
+        cls._add_snapshots(cleaner)
+        cls._add_volumes(cleaner, after=('snapshot',))
+        cleaner.run(ignore_errors=True)
         cls.clear_isolated_creds()
         super(BaseVolumeTest, cls).tearDownClass()
 
@@ -87,36 +90,56 @@ class BaseVolumeTest(tempest.test.BaseTestCase):
         return volume
 
     @classmethod
-    def clear_volumes(cls):
-        for volume in cls.volumes:
-            try:
-                cls.volumes_client.delete_volume(volume['id'])
-            except Exception:
-                pass
+    def _get_cleaner(cls):
+        return cleanup.ResourceCleaner(cls.config.compute.teardown_workers,
+                                       name=cls.__name__)
 
+    @classmethod
+    def _add_volumes(cls, cleaner, after=()):
+        client = cls.volumes_client
+
+        def _list_volumes():
+            resp, volumes = client.list_volumes()
+            return volumes
+
+        cleaner.register('volume', client.delete_volume,
+                         wait=cleanup.deletion_waiter(
+                             client, _list_volumes,
+                             error_status='error_deleting'),
+                         after=after)
         for volume in cls.volumes:
-            try:
-                cls.volumes_client.wait_for_resource_deletion(volume['id'])
-            except Exception:
-                pass
+            cleaner.add('volume', volume['id'])
 
     @classmethod
-    def clear_snapshots(cls):
-        for snapshot in cls.snapshots:
-            try:
-                cls.snapshots_client.delete_snapshot(snapshot['id'])
-            except Exception:
-                pass
+    def _add_snapshots(cls, cleaner):
+        client = cls.snapshots_client
+
+        def _list_snapshots():
+            resp, snapshots = client.list_snapshots()
+            return snapshots
 
+        cleaner.register('snapshot', client.delete_snapshot,
+                         wait=cleanup.deletion_waiter(
+                             client, _list_snapshots,
+                             error_status='error_deleting'))
         for snapshot in cls.snapshots:
-            try:
-                cls.snapshots_client.wait_for_resource_deletion(snapshot['id'])
-            except Exception:
-                pass
+            cleaner.add('snapshot', snapshot['id'])
+
+    @classmethod
+    def clear_volumes(cls):
+        cleaner = cls._get_cleaner()
+        cls._add_volumes(cleaner)
+        cleaner.run(ignore_errors=True)
+
+    @classmethod
+    def clear_snapshots(cls):
+        cleaner = cls._get_cleaner()
+        cls._add_snapshots(cleaner)
+        cleaner.run(ignore_errors=True)
 
     def wait_for(self, condition):
         """Repeatedly calls condition() until a timeout."""
-        start_time = int(time.time())
+        poller = self.poll_policy.poller(self.build_timeout)
         while True:
             try:
                 condition()
@@ -124,10 +147,9 @@ class BaseVolumeTest(tempest.test.BaseTestCase):
                 pass
             else:
                 return
-            if int(time.time()) - start_time >= self.build_timeout:
+            if not poller.sleep():
                 condition()
                 return
-            time.sleep(self.build_interval)
 
 
 class BaseVolumeAdminTest(BaseVolumeTest):
@@ -15,6 +15,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+
 from tempest import config
 from tempest import exceptions
 from tempest.openstack.common import log as logging
@@ -158,6 +160,9 @@ class Manager(object):
 
     """
     Top level manager for OpenStack Compute clients
+
+    The clients are only built the first time the matching attribute
+    is accessed, so a test class only pays for the clients it uses.
     """
 
     def __init__(self, username=None, password=None, tenant_name=None,
@@ -201,124 +206,193 @@ class Manager(object):
             client_args_v3_auth = None
 
         self.servers_client_v3_auth = None
+        self._client_factories = {}
 
         if interface == 'xml':
-            self.certificates_client = CertificatesClientXML(*client_args)
-            self.servers_client = ServersClientXML(*client_args)
-            self.servers_v3_client = ServersV3ClientXML(*client_args)
-            self.limits_client = LimitsClientXML(*client_args)
-            self.images_client = ImagesClientXML(*client_args)
-            self.keypairs_client = KeyPairsClientXML(*client_args)
-            self.quotas_client = QuotasClientXML(*client_args)
-            self.flavors_client = FlavorsClientXML(*client_args)
-            self.extensions_v3_client = ExtensionsV3ClientXML(*client_args)
-            self.extensions_client = ExtensionsClientXML(*client_args)
-            self.volumes_extensions_client = VolumesExtensionsClientXML(
-                *client_args)
-            self.floating_ips_client = FloatingIPsClientXML(*client_args)
-            self.snapshots_client = SnapshotsClientXML(*client_args)
-            self.volumes_client = VolumesClientXML(*client_args)
-            self.backups_client = BackupsClientXML(*client_args)
-            self.volume_types_client = VolumeTypesClientXML(*client_args)
-            self.identity_client = IdentityClientXML(*client_args)
-            self.identity_v3_client = IdentityV3ClientXML(*client_args)
-            self.token_client = TokenClientXML(self.config)
-            self.security_groups_client = SecurityGroupsClientXML(
-                *client_args)
-            self.interfaces_v3_client = InterfacesV3ClientXML(*client_args)
-            self.interfaces_client = InterfacesClientXML(*client_args)
-            self.endpoints_client = EndPointClientXML(*client_args)
-            self.fixed_ips_client = FixedIPsClientXML(*client_args)
-            self.availability_zone_v3_client = AvailabilityZoneV3ClientXML(
-                *client_args)
-            self.availability_zone_client = AvailabilityZoneClientXML(
-                *client_args)
-            self.services_v3_client = ServicesV3ClientXML(*client_args)
-            self.service_client = ServiceClientXML(*client_args)
-            self.aggregates_client = AggregatesClientXML(*client_args)
-            self.services_client = ServicesClientXML(*client_args)
-            self.tenant_usages_client = TenantUsagesClientXML(*client_args)
-            self.policy_client = PolicyClientXML(*client_args)
-            self.hypervisor_v3_client = HypervisorV3ClientXML(*client_args)
-            self.hypervisor_client = HypervisorClientXML(*client_args)
-            self.token_v3_client = V3TokenClientXML(*client_args)
-            self.network_client = NetworkClientXML(*client_args)
-            self.credentials_client = CredentialsClientXML(*client_args)
-            self.instance_usages_audit_log_client = \
-                InstanceUsagesAuditLogClientXML(*client_args)
-            self.volume_hosts_client = VolumeHostsClientXML(*client_args)
+            self._set_client('certificates_client', CertificatesClientXML,
+                             *client_args)
+            self._set_client('servers_client', ServersClientXML, *client_args)
+            self._set_client('servers_v3_client', ServersV3ClientXML,
+                             *client_args)
+            self._set_client('limits_client', LimitsClientXML, *client_args)
+            self._set_client('images_client', ImagesClientXML, *client_args)
+            self._set_client('keypairs_client', KeyPairsClientXML,
+                             *client_args)
+            self._set_client('quotas_client', QuotasClientXML, *client_args)
+            self._set_client('flavors_client', FlavorsClientXML, *client_args)
+            self._set_client('extensions_v3_client', ExtensionsV3ClientXML,
+                             *client_args)
+            self._set_client('extensions_client', ExtensionsClientXML,
+                             *client_args)
+            self._set_client('volumes_extensions_client',
+                             VolumesExtensionsClientXML, *client_args)
+            self._set_client('floating_ips_client', FloatingIPsClientXML,
+                             *client_args)
+            self._set_client('snapshots_client', SnapshotsClientXML,
+                             *client_args)
+            self._set_client('volumes_client', VolumesClientXML, *client_args)
+            self._set_client('backups_client', BackupsClientXML, *client_args)
+            self._set_client('volume_types_client', VolumeTypesClientXML,
+                             *client_args)
+            self._set_client('identity_client', IdentityClientXML,
+                             *client_args)
+            self._set_client('identity_v3_client', IdentityV3ClientXML,
+                             *client_args)
+            self._set_client('token_client', TokenClientXML, self.config)
+            self._set_client('security_groups_client', SecurityGroupsClientXML,
+                             *client_args)
+            self._set_client('interfaces_v3_client', InterfacesV3ClientXML,
+                             *client_args)
+            self._set_client('interfaces_client', InterfacesClientXML,
+                             *client_args)
+            self._set_client('endpoints_client', EndPointClientXML,
+                             *client_args)
+            self._set_client('fixed_ips_client', FixedIPsClientXML,
+                             *client_args)
+            self._set_client('availability_zone_v3_client',
+                             AvailabilityZoneV3ClientXML, *client_args)
+            self._set_client('availability_zone_client',
+                             AvailabilityZoneClientXML, *client_args)
+            self._set_client('services_v3_client', ServicesV3ClientXML,
+                             *client_args)
+            self._set_client('service_client', ServiceClientXML, *client_args)
+            self._set_client('aggregates_client', AggregatesClientXML,
+                             *client_args)
+            self._set_client('services_client', ServicesClientXML,
+                             *client_args)
+            self._set_client('tenant_usages_client', TenantUsagesClientXML,
+                             *client_args)
+            self._set_client('policy_client', PolicyClientXML, *client_args)
+            self._set_client('hypervisor_v3_client', HypervisorV3ClientXML,
+                             *client_args)
+            self._set_client('hypervisor_client', HypervisorClientXML,
+                             *client_args)
+            self._set_client('token_v3_client', V3TokenClientXML, *client_args)
+            self._set_client('network_client', NetworkClientXML, *client_args)
+            self._set_client('credentials_client', CredentialsClientXML,
+                             *client_args)
+            self._set_client('instance_usages_audit_log_client',
+                             InstanceUsagesAuditLogClientXML, *client_args)
+            self._set_client('volume_hosts_client', VolumeHostsClientXML,
+                             *client_args)
 
             if client_args_v3_auth:
-                self.servers_client_v3_auth = ServersClientXML(
-                    *client_args_v3_auth)
+                self._set_client('servers_client_v3_auth', ServersClientXML,
+                                 *client_args_v3_auth)
 
         elif interface == 'json':
-            self.certificates_client = CertificatesClientJSON(*client_args)
-            self.servers_client = ServersClientJSON(*client_args)
-            self.servers_v3_client = ServersV3ClientJSON(*client_args)
-            self.limits_client = LimitsClientJSON(*client_args)
-            self.images_client = ImagesClientJSON(*client_args)
-            self.keypairs_client = KeyPairsClientJSON(*client_args)
-            self.quotas_client = QuotasClientJSON(*client_args)
-            self.flavors_client = FlavorsClientJSON(*client_args)
-            self.extensions_v3_client = ExtensionsV3ClientJSON(*client_args)
-            self.extensions_client = ExtensionsClientJSON(*client_args)
-            self.volumes_extensions_client = VolumesExtensionsClientJSON(
-                *client_args)
-            self.floating_ips_client = FloatingIPsClientJSON(*client_args)
-            self.snapshots_client = SnapshotsClientJSON(*client_args)
-            self.volumes_client = VolumesClientJSON(*client_args)
-            self.backups_client = BackupsClientJSON(*client_args)
-            self.volume_types_client = VolumeTypesClientJSON(*client_args)
-            self.identity_client = IdentityClientJSON(*client_args)
-            self.identity_v3_client = IdentityV3ClientJSON(*client_args)
-            self.token_client = TokenClientJSON(self.config)
-            self.security_groups_client = SecurityGroupsClientJSON(
-                *client_args)
-            self.interfaces_v3_client = InterfacesV3ClientJSON(*client_args)
-            self.interfaces_client = InterfacesClientJSON(*client_args)
-            self.endpoints_client = EndPointClientJSON(*client_args)
-            self.fixed_ips_client = FixedIPsClientJSON(*client_args)
-            self.availability_zone_v3_client = AvailabilityZoneV3ClientJSON(
-                *client_args)
-            self.availability_zone_client = AvailabilityZoneClientJSON(
-                *client_args)
-            self.services_v3_client = ServicesV3ClientJSON(*client_args)
-            self.service_client = ServiceClientJSON(*client_args)
-            self.aggregates_client = AggregatesClientJSON(*client_args)
-            self.services_client = ServicesClientJSON(*client_args)
-            self.tenant_usages_client = TenantUsagesClientJSON(*client_args)
-            self.policy_client = PolicyClientJSON(*client_args)
-            self.hypervisor_v3_client = HypervisorV3ClientJSON(*client_args)
-            self.hypervisor_client = HypervisorClientJSON(*client_args)
-            self.token_v3_client = V3TokenClientJSON(*client_args)
-            self.network_client = NetworkClientJSON(*client_args)
-            self.credentials_client = CredentialsClientJSON(*client_args)
-            self.instance_usages_audit_log_client = \
-                InstanceUsagesAuditLogClientJSON(*client_args)
-            self.volume_hosts_client = VolumeHostsClientJSON(*client_args)
+            self._set_client('certificates_client', CertificatesClientJSON,
+                             *client_args)
+            self._set_client('servers_client', ServersClientJSON, *client_args)
+            self._set_client('servers_v3_client', ServersV3ClientJSON,
+                             *client_args)
+            self._set_client('limits_client', LimitsClientJSON, *client_args)
+            self._set_client('images_client', ImagesClientJSON, *client_args)
+            self._set_client('keypairs_client', KeyPairsClientJSON,
+                             *client_args)
+            self._set_client('quotas_client', QuotasClientJSON, *client_args)
+            self._set_client('flavors_client', FlavorsClientJSON, *client_args)
+            self._set_client('extensions_v3_client', ExtensionsV3ClientJSON,
+                             *client_args)
+            self._set_client('extensions_client', ExtensionsClientJSON,
+                             *client_args)
+            self._set_client('volumes_extensions_client',
+                             VolumesExtensionsClientJSON, *client_args)
+            self._set_client('floating_ips_client', FloatingIPsClientJSON,
+                             *client_args)
+            self._set_client('snapshots_client', SnapshotsClientJSON,
+                             *client_args)
+            self._set_client('volumes_client', VolumesClientJSON, *client_args)
+            self._set_client('backups_client', BackupsClientJSON, *client_args)
+            self._set_client('volume_types_client', VolumeTypesClientJSON,
+                             *client_args)
+            self._set_client('identity_client', IdentityClientJSON,
+                             *client_args)
+            self._set_client('identity_v3_client', IdentityV3ClientJSON,
+                             *client_args)
+            self._set_client('token_client', TokenClientJSON, self.config)
+            self._set_client('security_groups_client',
+                             SecurityGroupsClientJSON, *client_args)
+            self._set_client('interfaces_v3_client', InterfacesV3ClientJSON,
+                             *client_args)
+            self._set_client('interfaces_client', InterfacesClientJSON,
+                             *client_args)
+            self._set_client('endpoints_client', EndPointClientJSON,
+                             *client_args)
+            self._set_client('fixed_ips_client', FixedIPsClientJSON,
+                             *client_args)
+            self._set_client('availability_zone_v3_client',
+                             AvailabilityZoneV3ClientJSON, *client_args)
+            self._set_client('availability_zone_client',
+                             AvailabilityZoneClientJSON, *client_args)
+            self._set_client('services_v3_client', ServicesV3ClientJSON,
+                             *client_args)
+            self._set_client('service_client', ServiceClientJSON, *client_args)
+            self._set_client('aggregates_client', AggregatesClientJSON,
+                             *client_args)
+            self._set_client('services_client', ServicesClientJSON,
+                             *client_args)
+            self._set_client('tenant_usages_client', TenantUsagesClientJSON,
+                             *client_args)
+            self._set_client('policy_client', PolicyClientJSON, *client_args)
+            self._set_client('hypervisor_v3_client', HypervisorV3ClientJSON,
+                             *client_args)
+            self._set_client('hypervisor_client', HypervisorClientJSON,
+                             *client_args)
+            self._set_client('token_v3_client', V3TokenClientJSON,
+                             *client_args)
+            self._set_client('network_client', NetworkClientJSON, *client_args)
+            self._set_client('credentials_client', CredentialsClientJSON,
+                             *client_args)
+            self._set_client('instance_usages_audit_log_client',
+                             InstanceUsagesAuditLogClientJSON, *client_args)
+            self._set_client('volume_hosts_client', VolumeHostsClientJSON,
+                             *client_args)
 
             if client_args_v3_auth:
-                self.servers_client_v3_auth = ServersClientJSON(
-                    *client_args_v3_auth)
+                self._set_client('servers_client_v3_auth', ServersClientJSON,
+                                 *client_args_v3_auth)
         else:
             msg = "Unsupported interface type `%s'" % interface
             raise exceptions.InvalidConfiguration(msg)
 
         # common clients
-        self.hosts_client = HostsClientJSON(*client_args)
-        self.account_client = AccountClient(*client_args)
+        self._set_client('hosts_client', HostsClientJSON, *client_args)
+        self._set_client('account_client', AccountClient, *client_args)
         if self.config.service_available.glance:
-            self.image_client = ImageClientJSON(*client_args)
-            self.image_client_v2 = ImageClientV2JSON(*client_args)
-        self.container_client = ContainerClient(*client_args)
-        self.object_client = ObjectClient(*client_args)
-        self.orchestration_client = OrchestrationClient(*client_args)
-        self.ec2api_client = botoclients.APIClientEC2(*client_args)
-        self.s3_client = botoclients.ObjectClientS3(*client_args)
-        self.custom_object_client = ObjectClientCustomizedHeader(*client_args)
-        self.custom_account_client = \
-            AccountClientCustomizedHeader(*client_args)
+            self._set_client('image_client', ImageClientJSON, *client_args)
+            self._set_client('image_client_v2', ImageClientV2JSON,
+                             *client_args)
+        self._set_client('container_client', ContainerClient, *client_args)
+        self._set_client('object_client', ObjectClient, *client_args)
+        self._set_client('orchestration_client', OrchestrationClient,
+                         *client_args)
+        self._set_client('ec2api_client', botoclients.APIClientEC2,
+                         *client_args)
+        self._set_client('s3_client', botoclients.ObjectClientS3, *client_args)
+        self._set_client('custom_object_client', ObjectClientCustomizedHeader,
+                         *client_args)
+        self._set_client('custom_account_client',
+                         AccountClientCustomizedHeader, *client_args)
+
+    def _set_client(self, name, client_class, *args):
+        """
+        Registers a client which is only built, with the given arguments,
+        the first time the name attribute of the manager is accessed.
+        """
+        self.__dict__.pop(name, None)
+        self._client_factories[name] = functools.partial(client_class, *args)
+
+    def __getattr__(self, name):
+        # NOTE: only called for attributes not set on the instance yet, so
+        # a built client is never looked up here again.
+        factories = self.__dict__.get('_client_factories', {})
+        if name not in factories:
+            raise AttributeError("'%s' object has no attribute '%s'" %
+                                 (self.__class__.__name__, name))
+        client = factories[name]()
+        setattr(self, name, client)
+        return client
 
 
 class AltManager(Manager):
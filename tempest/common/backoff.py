@@ -0,0 +1,101 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import random
+import time
+
+
+class PollPolicy(object):
+    """Computes the sleep times between the checks of a wait loop.
+
+    The first checks happen after initial_interval seconds, so operations
+    finishing quickly are noticed early, then the interval grows by factor
+    after every check up to interval. Every sleep time is randomly picked
+    between initial_interval and the current interval (full jitter), which
+    keeps parallel waiters from polling the APIs in lockstep.
+    """
+
+    def __init__(self, interval, initial_interval=None, factor=2.0,
+                 jitter=True):
+        self.interval = interval
+        if initial_interval is None:
+            initial_interval = interval
+        self.initial_interval = min(initial_interval, interval)
+        self.factor = max(factor, 1.0)
+        self.jitter = jitter
+
+    @classmethod
+    def from_config(cls, conf_group):
+        """Builds the policy of a service group of the tempest config.
+
+        The group must have the build_interval, poll_initial_interval and
+        poll_backoff_factor options.
+        """
+        return cls(conf_group.build_interval,
+                   conf_group.poll_initial_interval,
+                   conf_group.poll_backoff_factor)
+
+    def intervals(self):
+        """Yields the successive sleep times of a wait loop."""
+        current = self.initial_interval
+        while True:
+            if self.jitter:
+                yield random.uniform(self.initial_interval, current)
+            else:
+                yield current
+            current = min(current * self.factor, self.interval)
+
+    def poller(self, timeout):
+        return Poller(self, timeout)
+
+
+class Poller(object):
+    """Deadline aware sleeper of a single wait loop.
+
+    Usage::
+
+        poller = policy.poller(timeout)
+        while not check():
+            if not poller.sleep():
+                raise exceptions.TimeoutException()
+    """
+
+    def __init__(self, policy, timeout):
+        self.start_time = time.time()
+        self.deadline = self.start_time + timeout
+        self._intervals = policy.intervals()
+
+    def elapsed(self):
+        return time.time() - self.start_time
+
+    def remaining(self):
+        return self.deadline - time.time()
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def sleep(self):
+        """Sleeps until the next check.
+
+        Never sleeps past the deadline, returns False without sleeping if
+        the deadline has already passed.
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            return False
+        time.sleep(min(next(self._intervals), remaining))
+        return True
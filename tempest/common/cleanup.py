@@ -0,0 +1,167 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import time
+
+import six
+
+from tempest.common import concurrency
+from tempest.common import waiters
+from tempest import exceptions
+from tempest.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+_Kind = collections.namedtuple('_Kind', ['name', 'delete', 'wait', 'after'])
+
+
+def deletion_waiter(client, list_resources, error_status=None,
+                    get_status=lambda r: r.get('status')):
+    """Returns a wait function confirming deletions with batched polling.
+
+    list_resources is called without arguments once per poll and returns
+    the list of the existing resources, a resource is deleted once it is
+    missing from it. The poll intervals and the timeout are the ones of
+    client.
+    """
+
+    def wait(resource_ids):
+        waiters.wait_for_resources_status(
+            list_resources, resource_ids, None, client.poll_policy,
+            client.build_timeout, get_status=get_status,
+            error_status=error_status, allow_notfound=True)
+    return wait
+
+
+class ResourceCleaner(object):
+    """Deletes the resources of a test class, one dependency level at a time.
+
+    Every kind of resource is registered with its delete function, an
+    optional wait function confirming the deletion of a list of resource
+    ids at once, and the kinds which must be deleted before it. The kinds
+    are sorted in levels: the resources of a level are deleted concurrently
+    (at most max_workers calls at a time), then their deletions are
+    confirmed, before the next level starts. The time spent in every phase
+    is logged and kept in self.timings.
+
+    Usage::
+
+        cleaner = cleanup.ResourceCleaner(max_workers=4)
+        cleaner.register('snapshot', client.delete_snapshot,
+                         wait=wait_for_snapshots)
+        cleaner.register('volume', client.delete_volume,
+                         wait=wait_for_volumes, after=('snapshot',))
+        cleaner.add('volume', volume['id'])
+        cleaner.run()
+    """
+
+    def __init__(self, max_workers=4, name=None):
+        self.max_workers = max_workers
+        self.name = name
+        self.timings = []
+        self._kinds = collections.OrderedDict()
+        self._resources = collections.defaultdict(list)
+
+    def register(self, kind, delete, wait=None, after=()):
+        if kind in self._kinds:
+            raise ValueError("Resource kind %s is already registered" % kind)
+        for dep in after:
+            if dep not in self._kinds:
+                raise ValueError("Resource kind %s is deleted after the "
+                                 "unknown kind %s" % (kind, dep))
+        self._kinds[kind] = _Kind(kind, delete, wait, tuple(after))
+
+    def add(self, kind, resource_id):
+        if kind not in self._kinds:
+            raise ValueError("Unknown resource kind %s" % kind)
+        if resource_id not in self._resources[kind]:
+            self._resources[kind].append(resource_id)
+
+    def levels(self):
+        """Returns the lists of the kinds which can be deleted together."""
+        depth = {}
+        for kind in self._kinds.values():
+            depth[kind.name] = max([depth[dep] + 1 for dep in kind.after] or
+                                   [0])
+        levels = [[] for _ in range(max(depth.values() or [-1]) + 1)]
+        for name, level in depth.items():
+            levels[level].append(name)
+        return levels
+
+    def _delete(self, kind, resource_id):
+        try:
+            self._kinds[kind].delete(resource_id)
+        except exceptions.NotFound:
+            pass
+
+    def _run_phase(self, description, graph):
+        start = time.time()
+        try:
+            graph.run(fail_fast=False)
+        except Exception:
+            # Reported with the other errors at the end of the run.
+            pass
+        elapsed = time.time() - start
+        self.timings.append((description, elapsed))
+        LOG.info("%s: %s took %.2f s", self.name or 'Cleanup', description,
+                 elapsed)
+        return graph.errors
+
+    def run(self, ignore_errors=False):
+        """Deletes all the added resources.
+
+        A failure does not stop the cleanup, the resources depending on the
+        failed one are still tried. Once all the levels are done, the
+        errors are logged and the first one is re-raised unless
+        ignore_errors is set. The added resources are forgotten, so a
+        cleaner can be run again.
+        """
+        errors = []
+        for number, kinds in enumerate(self.levels()):
+            kinds = [kind for kind in kinds if self._resources.get(kind)]
+            if not kinds:
+                continue
+            names = ', '.join(kinds)
+            graph = concurrency.TaskGraph(self.max_workers)
+            for kind in kinds:
+                for resource_id in self._resources[kind]:
+                    graph.add('delete %s %s' % (kind, resource_id),
+                              self._delete, (kind, resource_id))
+            failed = self._run_phase('level %d delete (%s)' % (number, names),
+                                     graph)
+            errors.extend(failed.items())
+
+            graph = concurrency.TaskGraph(self.max_workers)
+            for kind in kinds:
+                wait = self._kinds[kind].wait
+                deleted = [resource_id for resource_id in self._resources[kind]
+                           if 'delete %s %s' % (kind, resource_id)
+                           not in failed]
+                if wait is not None and deleted:
+                    graph.add('wait for %s deletion' % kind, wait, (deleted,))
+            if len(graph):
+                failed = self._run_phase('level %d wait (%s)' %
+                                         (number, names), graph)
+                errors.extend(failed.items())
+        self._resources.clear()
+
+        for task, exc_info in errors:
+            LOG.error("%s: %s failed: %s", self.name or 'Cleanup', task,
+                      exc_info[1])
+        if errors and not ignore_errors:
+            six.reraise(*errors[0][1])
@@ -0,0 +1,197 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import sys
+import threading
+
+import six
+from six.moves import queue
+
+from tempest.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+_Task = collections.namedtuple('_Task', ['name', 'func', 'args', 'deps'])
+_STOP = object()
+
+
+class TaskGraph(object):
+    """Runs API calls concurrently while honouring their dependencies.
+
+    Every task is a callable with the names of the tasks it depends on; a
+    task is started as soon as all of its dependencies succeeded, with at
+    most max_workers tasks running at the same time. Dependencies must be
+    added before the tasks using them, so the graph can not have cycles.
+
+    Usage::
+
+        graph = concurrency.TaskGraph(max_workers=4)
+        graph.add('tenant', create_tenant, (name,))
+        graph.add('user', lambda: create_user(graph.results['tenant']),
+                  deps=('tenant',))
+        graph.run()
+        user = graph.results['user']
+    """
+
+    def __init__(self, max_workers=1):
+        self.max_workers = max(max_workers, 1)
+        self.results = {}
+        self.errors = {}
+        self._tasks = collections.OrderedDict()
+
+    def add(self, name, func, args=(), deps=()):
+        if name in self._tasks:
+            raise ValueError("Task %s is already defined" % name)
+        for dep in deps:
+            if dep not in self._tasks:
+                raise ValueError("Task %s depends on the unknown task %s" %
+                                 (name, dep))
+        self._tasks[name] = _Task(name, func, tuple(args), tuple(deps))
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def _call(self, task):
+        try:
+            return task.func(*task.args), None
+        except Exception:
+            return None, sys.exc_info()
+
+    def run(self, fail_fast=True):
+        """Runs all the tasks and returns the results dict.
+
+        Once a task failed, no new task is started if fail_fast is set,
+        otherwise only the tasks depending (even indirectly) on a failed
+        one are skipped. In both cases the running tasks are waited for,
+        then the first error is re-raised; the results of the tasks which
+        succeeded are still available in self.results for a rollback.
+        """
+        if self.max_workers == 1 or len(self._tasks) <= 1:
+            self._run_serially(fail_fast)
+        else:
+            self._run_concurrently(fail_fast)
+        if self.errors:
+            first = next(name for name in self._tasks if name in self.errors)
+            for name, exc_info in self.errors.items():
+                if name != first:
+                    LOG.error("Task %s failed as well: %s" %
+                              (name, exc_info[1]))
+            six.reraise(*self.errors[first])
+        return self.results
+
+    def _runnable(self, task):
+        return all(dep in self.results for dep in task.deps)
+
+    def _run_serially(self, fail_fast):
+        for task in self._tasks.values():
+            if self.errors and fail_fast:
+                break
+            if not self._runnable(task):
+                continue
+            result, exc_info = self._call(task)
+            if exc_info:
+                self.errors[task.name] = exc_info
+            else:
+                self.results[task.name] = result
+
+    def _run_concurrently(self, fail_fast):
+        pending = list(self._tasks.values())
+        running = set()
+        finished = threading.Condition()
+
+        def worker(task):
+            result, exc_info = self._call(task)
+            with finished:
+                if exc_info:
+                    self.errors[task.name] = exc_info
+                else:
+                    self.results[task.name] = result
+                running.discard(task.name)
+                finished.notify()
+
+        with finished:
+            while True:
+                if not (self.errors and fail_fast):
+                    for task in list(pending):
+                        if len(running) >= self.max_workers:
+                            break
+                        if not self._runnable(task):
+                            continue
+                        pending.remove(task)
+                        running.add(task.name)
+                        thread = threading.Thread(target=worker, args=(task,),
+                                                  name=task.name)
+                        thread.daemon = True
+                        thread.start()
+                if not running:
+                    # Whatever is still pending depends on a failed task.
+                    break
+                finished.wait()
+
+
+def run_for_each(func, items, max_workers=1):
+    """Calls func on every item, with at most max_workers calls at a time.
+
+    items is consumed lazily, only a few items ahead of the workers, so it
+    can be a generator over a listing too large to be held in memory. All
+    the items are processed even if some calls fail, then the first error
+    is re-raised and the others are logged. Returns the number of items.
+    """
+    errors = []
+    count = 0
+    if max_workers <= 1:
+        for item in items:
+            count += 1
+            try:
+                func(item)
+            except Exception:
+                errors.append(sys.exc_info())
+    else:
+        pending = queue.Queue(maxsize=max_workers * 2)
+        lock = threading.Lock()
+
+        def worker():
+            while True:
+                item = pending.get()
+                if item is _STOP:
+                    return
+                try:
+                    func(item)
+                except Exception:
+                    with lock:
+                        errors.append(sys.exc_info())
+
+        threads = [threading.Thread(target=worker)
+                   for _ in range(max_workers)]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        try:
+            for item in items:
+                count += 1
+                pending.put(item)
+        finally:
+            for thread in threads:
+                pending.put(_STOP)
+            for thread in threads:
+                thread.join()
+    for exc_info in errors[1:]:
+        LOG.error("Call failed as well: %s" % exc_info[1])
+    if errors:
+        six.reraise(*errors[0])
+    return count
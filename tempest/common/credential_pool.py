@@ -0,0 +1,402 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Pool of pre-provisioned isolated credentials shared by the test workers.
+
+tools/credential_pool.py creates [credential-pool] size sets of isolated
+credentials (tenant, user and network resources) before the run and
+describes them in a JSON file in the pool directory. Every test worker
+process leases a set by taking an exclusive flock on the lock file of the
+set, so a lease is released even if the worker dies. When a lease is
+returned the resources the test class left behind in the tenant are
+deleted; a set which can not be scrubbed is replaced by a new one.
+tools/credential_pool.py deletes all the sets at the end of the run.
+"""
+
+import contextlib
+import errno
+import fcntl
+import json
+import os
+import tempfile
+
+from tempest import clients
+from tempest.common import isolated_creds
+from tempest.common import waiters
+from tempest import config
+from tempest import exceptions
+from tempest.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+POOL_NAME = 'tempest-credential-pool'
+
+
+@contextlib.contextmanager
+def _flock(path, shared=False):
+    with open(path, 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class Lease(object):
+    """A credential set leased from the pool, until release() is called."""
+
+    def __init__(self, pool, index, cred_set, lock_file):
+        self.pool = pool
+        self.index = index
+        self.cred_set = cred_set
+        self._lock_file = lock_file
+
+    @property
+    def user(self):
+        return self.cred_set['user']
+
+    @property
+    def tenant(self):
+        return self.cred_set['tenant']
+
+    @property
+    def net_resources(self):
+        """The (network, subnet, router) of the set, or None."""
+        if not self.cred_set.get('network'):
+            return None
+        return (self.cred_set['network'], self.cred_set['subnet'],
+                self.cred_set['router'])
+
+    def release(self):
+        if self._lock_file is None:
+            return
+        try:
+            self.pool.scrub(self)
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+
+
+class CredentialPool(object):
+
+    def __init__(self):
+        self.config = config.TempestConfig()
+        self.path = (self.config.credential_pool.lock_path or
+                     os.path.join(tempfile.gettempdir(), POOL_NAME))
+        self.pool_file = os.path.join(self.path, 'credentials.json')
+        self.lock_file = os.path.join(self.path, 'pool.lock')
+
+    def _lease_lock_file(self, index):
+        return os.path.join(self.path, 'lease-%d.lock' % index)
+
+    def _new_isolated_creds(self):
+        return isolated_creds.IsolatedCreds(POOL_NAME)
+
+    def _load(self):
+        try:
+            with open(self.pool_file) as pool_file:
+                return json.load(pool_file)
+        except IOError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            return None
+
+    def _save(self, cred_sets):
+        # Written aside then renamed so readers never see a partial file.
+        # The file holds the passwords, only the owner may read it.
+        tmp_file = self.pool_file + '.tmp'
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as pool_file:
+            json.dump(cred_sets, pool_file)
+        os.rename(tmp_file, self.pool_file)
+
+    def _provision(self, creds, cred_types):
+        """Returns the description of newly created credential sets."""
+        creds.create_isolated_creds(*cred_types)
+        cred_sets = []
+        for cred_type in cred_types:
+            user, tenant = creds.isolated_creds[cred_type]
+            cred_set = {'user': user, 'tenant': tenant,
+                        'password': creds.password}
+            net_resources = creds.isolated_net_resources.get(cred_type)
+            if net_resources:
+                cred_set.update(zip(('network', 'subnet', 'router'),
+                                    net_resources))
+            cred_sets.append(cred_set)
+        return cred_sets
+
+    def _delete_sets(self, cred_sets):
+        creds = self._new_isolated_creds()
+        for index, cred_set in enumerate(cred_sets):
+            cred_type = 'pool-%d' % index
+            creds.isolated_creds[cred_type] = (cred_set['user'],
+                                               cred_set['tenant'])
+            if cred_set.get('network'):
+                creds.isolated_net_resources[cred_type] = (
+                    cred_set['network'], cred_set['subnet'],
+                    cred_set['router'])
+        creds.clear_isolated_creds()
+
+    def create(self):
+        """Creates the pool, unless it already exists."""
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path, 0o700)
+        with _flock(self.lock_file):
+            if self._load() is not None:
+                LOG.info("Credential pool %s already exists" % self.path)
+                return
+            size = self.config.credential_pool.size
+            cred_sets = self._provision(
+                self._new_isolated_creds(),
+                ['pool-%d' % index for index in range(size)])
+            self._save(cred_sets)
+            LOG.info("Created %d credential sets in pool %s" %
+                     (size, self.path))
+
+    def delete(self):
+        """Deletes all the credential sets of the pool and the pool."""
+        if not os.path.isdir(self.path):
+            return
+        with _flock(self.lock_file):
+            cred_sets = self._load()
+            if cred_sets is None:
+                return
+            self._delete_sets(cred_sets)
+            for index in range(len(cred_sets)):
+                try:
+                    os.remove(self._lease_lock_file(index))
+                except OSError:
+                    pass
+            os.remove(self.pool_file)
+            LOG.info("Deleted %d credential sets of pool %s" %
+                     (len(cred_sets), self.path))
+
+    def lease(self):
+        """Leases a free credential set.
+
+        Returns None if the pool has not been created or if all of its
+        sets are leased.
+        """
+        cred_sets = self._load()
+        if not cred_sets:
+            return None
+        size = len(cred_sets)
+        # Start the search at a different set in every worker process.
+        for offset in range(size):
+            index = (os.getpid() + offset) % size
+            lock_file = open(self._lease_lock_file(index), 'a')
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except IOError as e:
+                lock_file.close()
+                if e.errno in (errno.EAGAIN, errno.EACCES):
+                    continue
+                raise
+            # Re-read it, the set may have been replaced meanwhile.
+            with _flock(self.lock_file, shared=True):
+                cred_set = self._load()[index]
+            LOG.info("Leased credential set %d of pool %s" %
+                     (index, self.path))
+            return Lease(self, index, cred_set, lock_file)
+        LOG.warning("All the %d credential sets of pool %s are leased" %
+                    (size, self.path))
+        return None
+
+    def scrub(self, lease):
+        """Deletes what was left in the tenant of a returned lease.
+
+        The set is replaced by a new one if it can not be scrubbed.
+        """
+        try:
+            Scrubber(self.config, lease.cred_set).scrub()
+        except Exception:
+            LOG.exception("Unable to scrub credential set %d of pool %s, "
+                          "replacing it" % (lease.index, self.path))
+            self._replace(lease.index)
+
+    def _replace(self, index):
+        with _flock(self.lock_file):
+            cred_sets = self._load()
+            self._delete_sets([cred_sets[index]])
+            cred_sets[index] = self._provision(self._new_isolated_creds(),
+                                               ['pool-%d' % index])[0]
+            self._save(cred_sets)
+
+
+class Scrubber(object):
+    """Deletes the compute and volume resources of a tenant.
+
+    Uses the credentials of the tenant itself, so only its own resources
+    are listed. The networks created by the tests are not scrubbed, the
+    tests delete them in their class tear down.
+    """
+
+    def __init__(self, config, cred_set):
+        self.config = config
+        self.os = clients.Manager(username=cred_set['user']['name'],
+                                  password=cred_set['password'],
+                                  tenant_name=cred_set['tenant']['name'])
+
+    @staticmethod
+    def _delete(delete_func, resource_id):
+        try:
+            delete_func(resource_id)
+        except exceptions.NotFound:
+            pass
+
+    def _wait_for_deletion(self, client, list_func, resource_ids,
+                           error_status):
+        if not resource_ids:
+            return
+
+        def _list_resources():
+            resp, body = list_func()
+            return body
+
+        waiters.wait_for_resources_status(
+            _list_resources, resource_ids, None, client.poll_policy,
+            client.build_timeout, error_status=error_status,
+            allow_notfound=True)
+
+    def scrub_servers(self):
+        client = self.os.servers_client
+        resp, body = client.list_servers()
+        server_ids = [server['id'] for server in body['servers']]
+        for server_id in server_ids:
+            self._delete(client.delete_server, server_id)
+
+        def _list_servers():
+            resp, body = client.list_servers_with_detail()
+            return resp, body['servers']
+
+        self._wait_for_deletion(client, _list_servers, server_ids, 'ERROR')
+        return len(server_ids)
+
+    def scrub_floating_ips(self):
+        client = self.os.floating_ips_client
+        resp, floating_ips = client.list_floating_ips()
+        for floating_ip in floating_ips:
+            self._delete(client.delete_floating_ip, floating_ip['id'])
+        return len(floating_ips)
+
+    def scrub_keypairs(self):
+        client = self.os.keypairs_client
+        resp, keypairs = client.list_keypairs()
+        for keypair in keypairs:
+            self._delete(client.delete_keypair, keypair['keypair']['name'])
+        return len(keypairs)
+
+    def scrub_security_groups(self):
+        client = self.os.security_groups_client
+        resp, security_groups = client.list_security_groups()
+        security_groups = [sg for sg in security_groups
+                           if sg['name'] != 'default']
+        for security_group in security_groups:
+            self._delete(client.delete_security_group, security_group['id'])
+        return len(security_groups)
+
+    def scrub_volumes(self):
+        # Snapshots first, a volume with snapshots can not be deleted.
+        client = self.os.snapshots_client
+        resp, snapshots = client.list_snapshots()
+        snapshot_ids = [snapshot['id'] for snapshot in snapshots]
+        for snapshot_id in snapshot_ids:
+            self._delete(client.delete_snapshot, snapshot_id)
+        self._wait_for_deletion(client, client.list_snapshots, snapshot_ids,
+                                'error_deleting')
+        client = self.os.volumes_client
+        resp, volumes = client.list_volumes()
+        volume_ids = [volume['id'] for volume in volumes]
+        for volume_id in volume_ids:
+            self._delete(client.delete_volume, volume_id)
+        self._wait_for_deletion(client, client.list_volumes, volume_ids,
+                                'error_deleting')
+        return len(snapshot_ids) + len(volume_ids)
+
+    def scrub(self):
+        scrubbed = 0
+        if self.config.service_available.nova:
+            # The servers go first, they hold the other resources.
+            scrubbed += self.scrub_servers()
+            scrubbed += self.scrub_floating_ips()
+            scrubbed += self.scrub_keypairs()
+            scrubbed += self.scrub_security_groups()
+        if self.config.service_available.cinder:
+            scrubbed += self.scrub_volumes()
+        if scrubbed:
+            LOG.info("Scrubbed %d resources left in tenant %s" %
+                     (scrubbed, self.os.tenant_name))
+
+
+class PooledIsolatedCreds(isolated_creds.IsolatedCreds):
+    """IsolatedCreds leasing the primary and alt credentials from the pool.
+
+    The admin credentials, which need the admin role, and the credentials
+    asked for while the pool is exhausted are created as usual.
+    """
+
+    POOLED_CRED_TYPES = ('primary', 'alt')
+
+    def __init__(self, name, pool=None, **kwargs):
+        super(PooledIsolatedCreds, self).__init__(name, **kwargs)
+        self.pool = pool or CredentialPool()
+        self.leases = {}
+
+    def create_isolated_creds(self, *cred_types):
+        remaining = []
+        for cred_type in cred_types:
+            if (cred_type not in self.POOLED_CRED_TYPES or
+                    self.isolated_creds.get(cred_type)):
+                remaining.append(cred_type)
+                continue
+            lease = self.pool.lease()
+            if lease is None:
+                remaining.append(cred_type)
+                continue
+            self.leases[cred_type] = lease
+            self.isolated_creds[cred_type] = (lease.user, lease.tenant)
+            if lease.net_resources:
+                self.isolated_net_resources[cred_type] = lease.net_resources
+        super(PooledIsolatedCreds, self).create_isolated_creds(*remaining)
+
+    def clear_isolated_creds(self):
+        try:
+            for cred_type, lease in self.leases.items():
+                self.isolated_creds.pop(cred_type, None)
+                self.isolated_net_resources.pop(cred_type, None)
+                lease.release()
+            self.leases.clear()
+        finally:
+            super(PooledIsolatedCreds, self).clear_isolated_creds()
+
+
+def get_isolated_creds(name, pooled=True, **kwargs):
+    """Returns the IsolatedCreds test classes should use.
+
+    Leases from the credential pool when [credential-pool] enabled is set
+    and the tempest clients are used, the pool describes the resources
+    the way they return them. Test classes which change the tenant itself,
+    such as its quotas, pass pooled=False to get their own tenant: the
+    changes would not be undone when the lease is returned.
+    """
+    conf = config.TempestConfig()
+    if (pooled and conf.credential_pool.enabled and
+            kwargs.get('tempest_client', True)):
+        return PooledIsolatedCreds(name, **kwargs)
+    return isolated_creds.IsolatedCreds(name, **kwargs)
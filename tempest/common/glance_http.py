@@ -15,10 +15,13 @@
 
 # Originally copied from python-glanceclient
 
+import contextlib
 import copy
 import hashlib
 import httplib
 import json
+import mmap
+import os
 import posixpath
 import re
 import socket
@@ -114,11 +117,12 @@ class HTTPClient(object):
                 for header, value in kwargs['headers'].items():
                     conn.putheader(header, value)
                 conn.endheaders()
-                chunk = kwargs['body'].read(CHUNKSIZE)
-                # Chunk it, baby...
-                while chunk:
-                    conn.send('%x\r\n%s\r\n' % (len(chunk), chunk))
-                    chunk = kwargs['body'].read(CHUNKSIZE)
+                # Chunk it, baby... The data is sent as it is read, without
+                # copying it into the chunk framing.
+                for chunk in iter_body_chunks(kwargs['body']):
+                    conn.send('%x\r\n' % len(chunk))
+                    conn.send(chunk)
+                    conn.send('\r\n')
                 conn.send('0\r\n\r\n')
             else:
                 conn.request(method, conn_url, **kwargs)
@@ -140,7 +144,9 @@ class HTTPClient(object):
             body_iter = StringIO.StringIO(body_str)
             self._log_response(resp, None)
         else:
-            self._log_response(resp, body_iter)
+            # The image data is streamed to the caller, it can not be logged
+            # without being consumed.
+            self._log_response(resp, None)
 
         return resp, body_iter
 
@@ -193,7 +199,7 @@ class HTTPClient(object):
         kwargs['headers'].setdefault('Content-Type',
                                      'application/octet-stream')
         if 'body' in kwargs:
-            if (hasattr(kwargs['body'], 'read')
+            if (_is_streamed(kwargs['body'])
                     and method.lower() in ('post', 'put')):
                 # We use 'Transfer-Encoding: chunked' because
                 # body size may not always be known in advance.
@@ -201,6 +207,66 @@ class HTTPClient(object):
         return self._http_request(url, method, **kwargs)
 
 
+def _is_streamed(body):
+    # NOTE: strings have no __iter__, they are sent in one go.
+    return hasattr(body, 'read') or hasattr(body, '__iter__')
+
+
+def iter_body_chunks(body, chunk_size=CHUNKSIZE):
+    """Yields the data of a request body in chunks of chunk_size bytes.
+
+    body is either a file-like object (a file, a mmap.mmap...), read
+    chunk_size bytes at a time, or an iterable of strings.
+    """
+    if hasattr(body, 'read'):
+        chunk = body.read(chunk_size)
+        while chunk:
+            yield chunk
+            chunk = body.read(chunk_size)
+    else:
+        for chunk in body:
+            if chunk:
+                yield chunk
+
+
+@contextlib.contextmanager
+def mapped_file(path):
+    """Opens the file at path as a read-only memory-mapped file.
+
+    The mapping can be used as the body of an upload: it is read in
+    chunks like a file, while the pages of the file are mapped in and
+    dropped by the kernel instead of going through Python buffers.
+    """
+    with open(path, 'rb') as data_file:
+        if os.fstat(data_file.fileno()).st_size == 0:
+            # Empty files can not be mapped.
+            yield data_file
+            return
+        mapping = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapping
+        finally:
+            mapping.close()
+
+
+def save_body(body_iter, sink=None):
+    """Writes a streamed response body to sink, one chunk at a time.
+
+    sink is a file-like object, or None to just consume the body. The md5
+    checksum of the data is updated with every chunk, so the data never
+    has to be held in memory to be verified. Returns the size of the data
+    and its md5 hex digest.
+    """
+    md5 = hashlib.md5()
+    size = 0
+    for chunk in body_iter:
+        md5.update(chunk)
+        size += len(chunk)
+        if sink is not None:
+            sink.write(chunk)
+    return size, md5.hexdigest()
+
+
 class OpenSSLConnectionDelegator(object):
     """
     An OpenSSL.SSL.Connection delegator.
@@ -0,0 +1,75 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Latency histograms, shared by the stress statistics and the timings of the
+REST calls.
+
+A histogram is a list of HISTOGRAM_SIZE counts: one per bucket of
+BUCKET_BOUNDS, and a last one for the longer latencies.
+"""
+
+import bisect
+
+# Upper bounds (in seconds) of the buckets of the latency histograms: from
+# 1ms, each about 19% wider than the previous one, up to more than an
+# hour. A last bucket counts the longer latencies.
+BUCKET_BOUNDS = [0.001 * 2 ** (i / 4.0) for i in xrange(89)]
+HISTOGRAM_SIZE = len(BUCKET_BOUNDS) + 1
+PERCENTILES = (50, 95, 99)
+
+
+def bucket(seconds):
+    """Returns the index of the bucket counting the given latency."""
+    return bisect.bisect_left(BUCKET_BOUNDS, seconds)
+
+
+def merge(histograms):
+    """Returns the sum of the given histograms."""
+    return [sum(counts) for counts in zip(*histograms)]
+
+
+def percentiles(histogram, points=PERCENTILES):
+    """Returns the latencies under which the given percents of runs fall.
+
+    A latency is the upper bound of the bucket where the percentile falls
+    (infinity for the last bucket), or None if the histogram is empty.
+    """
+    total = sum(histogram)
+    result = []
+    for point in points:
+        if not total:
+            result.append(None)
+            continue
+        rank = total * point / 100.0
+        seen = 0
+        for index, count in enumerate(histogram):
+            seen += count
+            if seen >= rank:
+                break
+        if index < len(BUCKET_BOUNDS):
+            result.append(BUCKET_BOUNDS[index])
+        else:
+            result.append(float('inf'))
+    return result
+
+
+def format_percentiles(histogram):
+    return ', '.join('p%d %s' % (point, '-' if latency is None
+                                 else '%.3fs' % latency)
+                     for point, latency in zip(PERCENTILES,
+                                               percentiles(histogram)))
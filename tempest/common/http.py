@@ -16,12 +16,176 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import select
+import threading
+import time
+import urlparse
+
 import httplib2
 
 
 class ClosingHttp(httplib2.Http):
+    # NOTE: the connection cache of httplib2.Http is kept per thread, so
+    # a client can be shared by concurrent workers. Since every connection
+    # gets closed after its request, nothing is lost by not sharing them.
+    @property
+    def connections(self):
+        local = self.__dict__.setdefault('_local', threading.local())
+        if not hasattr(local, 'connections'):
+            local.connections = {}
+        return local.connections
+
+    @connections.setter
+    def connections(self, value):
+        local = self.__dict__.setdefault('_local', threading.local())
+        local.connections = value
+
     def request(self, *args, **kwargs):
         original_headers = kwargs.get('headers', {})
         new_headers = dict(original_headers, connection='close')
         new_kwargs = dict(kwargs, headers=new_headers)
         return super(ClosingHttp, self).request(*args, **new_kwargs)
+
+
+def _is_connection_dropped(conn):
+    """Returns True if the peer already closed a kept-alive connection.
+
+    An idle keep-alive socket must not be readable; if it is, the server
+    either closed it (EOF) or sent garbage, so it is not safe to reuse.
+    """
+    sock = getattr(conn, 'sock', None)
+    if sock is None:
+        # Not connected yet (or already closed), httplib2 will reconnect.
+        return False
+    try:
+        readable, _, _ = select.select([sock], [], [], 0.0)
+    except (select.error, ValueError, TypeError):
+        return True
+    return bool(readable)
+
+
+class PooledHttp(object):
+    """Keep-alive HTTP transport with a connection pool per endpoint.
+
+    Exposes the same ``request`` interface as ``httplib2.Http``. Every
+    (scheme, host:port) endpoint gets its own pool of ``httplib2.Http``
+    objects, each one holding a persistent connection. At most ``maxsize``
+    idle connections are kept per endpoint, connections idle for longer than
+    ``idle_timeout`` seconds are evicted and connections closed by the peer
+    are dropped before being handed out again.
+    """
+
+    def __init__(self, maxsize=10, idle_timeout=30, **http_kwargs):
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.http_kwargs = http_kwargs
+        self._pools = collections.defaultdict(collections.deque)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _pool_key(uri):
+        parts = urlparse.urlsplit(uri)
+        return (parts.scheme.lower(), parts.netloc.lower())
+
+    @staticmethod
+    def _close(http_obj):
+        for conn in http_obj.connections.values():
+            conn.close()
+        http_obj.connections.clear()
+
+    def _get(self, key):
+        now = time.time()
+        with self._lock:
+            pool = self._pools[key]
+            while pool:
+                last_used, http_obj = pool.pop()
+                if now - last_used > self.idle_timeout:
+                    self._close(http_obj)
+                    continue
+                if any(_is_connection_dropped(conn)
+                       for conn in http_obj.connections.values()):
+                    self._close(http_obj)
+                    continue
+                return http_obj
+        return httplib2.Http(**self.http_kwargs)
+
+    def _put(self, key, http_obj):
+        with self._lock:
+            pool = self._pools[key]
+            if len(pool) < self.maxsize:
+                pool.append((time.time(), http_obj))
+                return
+        self._close(http_obj)
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        key = self._pool_key(uri)
+        http_obj = self._get(key)
+        try:
+            resp, content = http_obj.request(uri, method, body=body,
+                                             headers=headers, **kwargs)
+        except Exception:
+            # The connection state is unknown, never put it back.
+            self._close(http_obj)
+            raise
+        if resp.get('connection', '').lower() == 'close':
+            self._close(http_obj)
+            return resp, content
+        self._put(key, http_obj)
+        return resp, content
+
+    def clear(self):
+        """Closes every pooled connection."""
+        with self._lock:
+            pools = self._pools.values()
+            self._pools = collections.defaultdict(collections.deque)
+        for pool in pools:
+            for _, http_obj in pool:
+                self._close(http_obj)
+
+
+_shared_pools = {}
+_shared_pools_lock = threading.Lock()
+
+
+def _http_kwargs(config):
+    return {'disable_ssl_certificate_validation':
+            config.identity.disable_ssl_certificate_validation,
+            'timeout': config.http.timeout or None}
+
+
+def get_http_obj(config):
+    """Returns the HTTP transport RestClient instances should use.
+
+    With ``[http] keep_alive`` enabled every caller gets the same process
+    wide PooledHttp, so all the clients a Manager builds reuse connections.
+    Otherwise a new ClosingHttp is returned, as before.
+    """
+    http_kwargs = _http_kwargs(config)
+    if not config.http.keep_alive:
+        return ClosingHttp(**http_kwargs)
+    key = (tuple(sorted(http_kwargs.items())), config.http.pool_maxsize,
+           config.http.pool_idle_timeout)
+    with _shared_pools_lock:
+        if key not in _shared_pools:
+            _shared_pools[key] = PooledHttp(
+                maxsize=config.http.pool_maxsize,
+                idle_timeout=config.http.pool_idle_timeout,
+                **http_kwargs)
+        return _shared_pools[key]
+
+
+def get_connection(config, url):
+    """Returns a new httplib connection to the endpoint of url.
+
+    For the callers reading a response body as a stream, which httplib2
+    does not allow. The connection validates the certificates and times
+    out like the transports get_http_obj returns.
+    """
+    http_kwargs = _http_kwargs(config)
+    parts = urlparse.urlsplit(url)
+    if parts.scheme == 'https':
+        return httplib2.HTTPSConnectionWithTimeout(parts.netloc,
+                                                   **http_kwargs)
+    return httplib2.HTTPConnectionWithTimeout(
+        parts.netloc, timeout=http_kwargs['timeout'])
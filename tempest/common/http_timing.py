@@ -0,0 +1,281 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Timings of the REST calls, aggregated per endpoint.
+
+With [http] record_timings set, RestClient sends its requests through
+request(), which measures the DNS resolution and the connection (when a
+new connection is opened), the time to the first byte of the response
+and the total latency of every call. The calls are aggregated in memory
+per (service, method, URL template), the IDs and generated names of the
+URL being replaced by placeholders; only counters and a histogram are
+kept per endpoint. The report of the process is logged at exit, and the
+report of the calls made during a test is attached to it.
+"""
+
+import atexit
+import json
+import os
+import re
+import socket
+import threading
+import time
+import urlparse
+
+import httplib2
+
+from tempest.common import histograms
+from tempest.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+# The endpoints listed by a report, slowest first
+REPORT_LIMIT = 20
+
+_ID_SEGMENT = re.compile(r'^([0-9a-f]{8}-([0-9a-f]{4}-){3}[0-9a-f]{12}|'
+                         r'[0-9a-f]{32}|\d+(\.\d+){0,3})$', re.IGNORECASE)
+# The names generated by rand_name() end with a random number
+_NAME_SEGMENT = re.compile(r'-\d+$')
+
+_local = threading.local()
+
+
+def url_template(url):
+    """Returns the path of url, its IDs and generated names replaced."""
+    segments = []
+    for segment in url.split('?', 1)[0].split('/'):
+        if _ID_SEGMENT.match(segment):
+            segment = '{id}'
+        elif _NAME_SEGMENT.search(segment):
+            segment = '{name}'
+        segments.append(segment)
+    return '/'.join(segments)
+
+
+class CallTiming(object):
+    """The phases of a call, filled in by the timed connections."""
+
+    __slots__ = ('dns', 'connect', 'ttfb', '_sent')
+
+    def __init__(self):
+        self.dns = 0.0
+        self.connect = 0.0
+        self.ttfb = 0.0
+        self._sent = None
+
+
+class _TimedConnectionMixin:
+    # NOTE: httplib connections are old-style classes, which super() does
+    # not support; _base is the connection class the mixin is used with.
+    _base = None
+
+    def connect(self):
+        timing = getattr(_local, 'timing', None)
+        if timing is None:
+            return self._base.connect(self)
+        start = time.time()
+        host = self.host
+        if not (self.proxy_info or
+                isinstance(self, httplib2.HTTPSConnectionWithTimeout)):
+            # Resolved here to time the lookup apart from the connection.
+            # The host name is needed by the TLS handshake of HTTPS.
+            address = socket.getaddrinfo(host, self.port, 0,
+                                         socket.SOCK_STREAM)[0][4][0]
+            resolved = time.time()
+            timing.dns += resolved - start
+            start = resolved
+            self.host = address
+        try:
+            self._base.connect(self)
+        finally:
+            self.host = host
+            timing.connect += time.time() - start
+
+    def request(self, *args, **kwargs):
+        timing = getattr(_local, 'timing', None)
+        if timing is not None:
+            timing._sent = time.time()
+        return self._base.request(self, *args, **kwargs)
+
+    def getresponse(self, *args, **kwargs):
+        response = self._base.getresponse(self, *args, **kwargs)
+        timing = getattr(_local, 'timing', None)
+        if timing is not None and timing._sent is not None:
+            # The status line and the headers are read
+            timing.ttfb += time.time() - timing._sent
+        return response
+
+
+class TimedHTTPConnection(_TimedConnectionMixin,
+                          httplib2.HTTPConnectionWithTimeout):
+    _base = httplib2.HTTPConnectionWithTimeout
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin,
+                           httplib2.HTTPSConnectionWithTimeout):
+    _base = httplib2.HTTPSConnectionWithTimeout
+
+
+_CONNECTION_TYPES = {'http': TimedHTTPConnection,
+                     'https': TimedHTTPSConnection}
+
+
+class EndpointStatistic(object):
+    """The aggregated calls of an endpoint."""
+
+    __slots__ = ('calls', 'errors', 'total', 'dns', 'connect', 'ttfb',
+                 'sent', 'received', 'histogram')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.dns = 0.0
+        self.connect = 0.0
+        self.ttfb = 0.0
+        self.sent = 0
+        self.received = 0
+        self.histogram = [0] * histograms.HISTOGRAM_SIZE
+
+    def add(self, timing, latency, sent, received, failed):
+        self.calls += 1
+        self.errors += failed
+        self.total += latency
+        self.dns += timing.dns
+        self.connect += timing.connect
+        self.ttfb += timing.ttfb
+        self.sent += sent
+        self.received += received
+        self.histogram[histograms.bucket(latency)] += 1
+
+    def as_dict(self):
+        record = dict((name, getattr(self, name))
+                      for name in self.__slots__ if name != 'histogram')
+        for point, latency in zip(histograms.PERCENTILES,
+                                  histograms.percentiles(self.histogram)):
+            record['p%d' % point] = latency
+        return record
+
+
+class Recorder(object):
+    """Aggregates the calls of the process, and of the open scopes.
+
+    A scope is a dict of the statistics of the endpoints called since it
+    was started, such as the calls of a test.
+    """
+
+    def __init__(self):
+        self.endpoints = {}
+        self._scopes = []
+        self._lock = threading.Lock()
+
+    def record(self, key, timing, latency, sent, received, failed):
+        with self._lock:
+            for endpoints in [self.endpoints] + self._scopes:
+                statistic = endpoints.get(key)
+                if statistic is None:
+                    statistic = endpoints[key] = EndpointStatistic()
+                statistic.add(timing, latency, sent, received, failed)
+
+    def start_scope(self):
+        scope = {}
+        with self._lock:
+            self._scopes.append(scope)
+        return scope
+
+    def stop_scope(self, scope):
+        with self._lock:
+            self._scopes.remove(scope)
+        return scope
+
+
+recorder = Recorder()
+_enabled = False
+_enabled_lock = threading.Lock()
+_report_path = None
+
+
+def report(endpoints, limit=REPORT_LIMIT):
+    """Returns the report of the endpoints taking the longest, as text."""
+    lines = ["%-14s %-6s %-44s %6s %5s %8s %8s %8s %8s %9s" %
+             ('service', 'method', 'url', 'calls', 'fails', 'total', 'p50',
+              'p95', 'ttfb', 'dns+conn')]
+    for key, statistic in sorted(endpoints.iteritems(),
+                                 key=lambda item: -item[1].total)[:limit]:
+        record = statistic.as_dict()
+        lines.append("%-14s %-6s %-44s %6d %5d %7.2fs %7.3fs %7.3fs %7.2fs "
+                     "%8.2fs" % (key + (record['calls'], record['errors'],
+                                        record['total'], record['p50'],
+                                        record['p95'], record['ttfb'],
+                                        record['connect'] + record['dns'])))
+    return '\n'.join(lines)
+
+
+def _report_at_exit():
+    if not recorder.endpoints:
+        return
+    LOG.info("REST calls taking the longest:\n%s", report(recorder.endpoints))
+    if not _report_path:
+        return
+    lines = []
+    for (service, method, url), statistic in recorder.endpoints.iteritems():
+        record = statistic.as_dict()
+        record.update(service=service, method=method, url=url,
+                      pid=os.getpid())
+        lines.append(json.dumps(record))
+    # One write, for the reports of concurrent processes not to interleave
+    with open(_report_path, 'a') as report_file:
+        report_file.write('\n'.join(lines) + '\n')
+
+
+def enable(report_path=None):
+    """Reports the calls of the process at exit, once.
+
+    If report_path is given, the statistics of every endpoint are also
+    appended to it, one line of JSON per endpoint.
+    """
+    global _enabled, _report_path
+    with _enabled_lock:
+        if not _enabled:
+            _enabled = True
+            _report_path = report_path
+            atexit.register(_report_at_exit)
+
+
+def request(http_obj, service, url, req_url, method, headers=None,
+            body=None):
+    """Sends a request with http_obj and records its timings.
+
+    url is the URL relative to the endpoint of service, from which the
+    template of the endpoint is built.
+    """
+    timing = _local.timing = CallTiming()
+    scheme = urlparse.urlsplit(req_url).scheme
+    start = time.time()
+    failed = True
+    resp_body = None
+    try:
+        resp, resp_body = http_obj.request(
+            req_url, method, headers=headers, body=body,
+            connection_type=_CONNECTION_TYPES.get(scheme))
+        failed = resp.status >= 400
+        return resp, resp_body
+    finally:
+        latency = time.time() - start
+        _local.timing = None
+        recorder.record((service or '-', method, url_template(url)), timing,
+                        latency, len(body or ''), len(resp_body or ''), failed)
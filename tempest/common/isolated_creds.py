@@ -20,6 +20,7 @@ import keystoneclient.v2_0.client as keystoneclient
 import neutronclient.v2_0.client as neutronclient
 
 from tempest import clients
+from tempest.common import concurrency
 from tempest.common.utils import data_utils
 from tempest import config
 from tempest import exceptions
@@ -76,6 +77,16 @@ class IsolatedCreds(object):
             admin_clients = self._get_official_admin_clients()
         return admin_clients
 
+    def _workers(self):
+        """Returns the number of concurrent API calls to use.
+
+        The official neutronclient is an httplib2.Http, which must not be
+        used by several threads at once, so its calls are sequential.
+        """
+        if not self.tempest_client:
+            return 1
+        return self.config.identity.isolated_creds_workers
+
     def _create_tenant(self, name, description):
         if self.tempest_client:
             resp, tenant = self.identity_admin_client.create_tenant(
@@ -146,37 +157,42 @@ class IsolatedCreds(object):
         else:
             self.identity_admin_client.tenants.delete(tenant)
 
-    def _create_creds(self, suffix=None, admin=False):
-        data_utils.rand_name_root = data_utils.rand_name(self.name)
-        if suffix:
-            data_utils.rand_name_root += suffix
-        tenant_name = data_utils.rand_name_root + "-tenant"
-        tenant_desc = tenant_name + "-desc"
-        tenant = self._create_tenant(name=tenant_name,
-                                     description=tenant_desc)
-        if suffix:
-            data_utils.rand_name_root += suffix
-        username = data_utils.rand_name_root + "-user"
-        email = data_utils.rand_name_root + "@example.com"
-        user = self._create_user(username, self.password,
-                                 tenant, email)
-        if admin:
-            role = None
-            try:
-                roles = self._list_roles()
-                admin_role = self.config.identity.admin_role
-                if self.tempest_client:
-                    role = next(r for r in roles if r['name'] == admin_role)
-                else:
-                    role = next(r for r in roles if r.name == admin_role)
-            except StopIteration:
-                msg = "No admin role found"
-                raise exceptions.NotFound(msg)
+    def _get_admin_role(self):
+        roles = self._list_roles()
+        admin_role = self.config.identity.admin_role
+        try:
             if self.tempest_client:
-                self._assign_user_role(tenant['id'], user['id'], role['id'])
+                return next(r for r in roles if r['name'] == admin_role)
             else:
-                self._assign_user_role(tenant.id, user.id, role.id)
-        return user, tenant
+                return next(r for r in roles if r.name == admin_role)
+        except StopIteration:
+            msg = "No admin role found"
+            raise exceptions.NotFound(msg)
+
+    def _add_creds_tasks(self, graph, cred_type):
+        """Adds the tasks creating the tenant and user of cred_type."""
+        results = graph.results
+        name_root = data_utils.rand_name(self.name)
+        tenant_name = name_root + "-tenant"
+        tenant_desc = tenant_name + "-desc"
+        username = name_root + "-user"
+        email = name_root + "@example.com"
+        tenant_task = cred_type + '-tenant'
+        user_task = cred_type + '-user'
+        graph.add(tenant_task, self._create_tenant, (tenant_name, tenant_desc))
+        graph.add(user_task,
+                  lambda: self._create_user(username, self.password,
+                                            results[tenant_task], email),
+                  deps=(tenant_task,))
+        if cred_type == 'admin':
+            # The role lookup does not need the tenant, run it meanwhile.
+            graph.add('admin-role', self._get_admin_role)
+            graph.add('admin-role-assignment',
+                      lambda: self._assign_user_role(
+                          self._get_id(results[tenant_task]),
+                          self._get_id(results[user_task]),
+                          self._get_id(results['admin-role'])),
+                      deps=(user_task, 'admin-role'))
 
     def _get_cred_names(self, user, tenant):
         if self.tempest_client:
@@ -187,34 +203,113 @@ class IsolatedCreds(object):
             tenant_name = tenant.name
         return username, tenant_name
 
-    def _get_tenant_id(self, tenant):
+    def _get_id(self, resource):
         if self.tempest_client:
-            return tenant.get('id')
+            return resource.get('id')
+        else:
+            return resource.id
+
+    def _add_network_tasks(self, graph, cred_type):
+        """Adds the tasks creating the network resources of cred_type.
+
+        The network and its subnet are created while the router is, the
+        router interface is added once both of them exist.
+        """
+        results = graph.results
+        name_root = data_utils.rand_name(self.name)
+        tenant_task = cred_type + '-tenant'
+        network_task = cred_type + '-network'
+        subnet_task = cred_type + '-subnet'
+        router_task = cred_type + '-router'
+        graph.add(network_task,
+                  lambda: self._create_network(
+                      name_root + "-network",
+                      self._get_id(results[tenant_task])),
+                  deps=(tenant_task,))
+        graph.add(subnet_task,
+                  lambda: self._create_subnet(
+                      name_root + "-subnet",
+                      self._get_id(results[tenant_task]),
+                      results[network_task]['id']),
+                  deps=(network_task,))
+        graph.add(router_task,
+                  lambda: self._create_router(
+                      name_root + "-router",
+                      self._get_id(results[tenant_task])),
+                  deps=(tenant_task,))
+        graph.add(cred_type + '-router-interface',
+                  lambda: self._add_router_interface(
+                      results[router_task]['id'],
+                      results[subnet_task]['id']),
+                  deps=(subnet_task, router_task))
+
+    def _store_isolated_creds(self, graph, cred_type):
+        """Keeps what was fully created for cred_type, rolls back the rest.
+
+        Must be called once the graph has run, even if it failed.
+        """
+        results = graph.results
+        tenant = results.get(cred_type + '-tenant')
+        user = results.get(cred_type + '-user')
+        complete = (user is not None and
+                    (cred_type != 'admin' or
+                     'admin-role-assignment' in results))
+        if complete:
+            username, tenant_name = self._get_cred_names(user, tenant)
+            self.isolated_creds[cred_type] = (user, tenant)
+            LOG.info("Acquired %s isolated creds:\n user: %s, tenant: %s"
+                     % (cred_type, username, tenant_name))
+        else:
+            if user is not None:
+                self._clear_isolated_user(user)
+            if tenant is not None:
+                self._clear_isolated_tenant(tenant)
+        network = results.get(cred_type + '-network')
+        subnet = results.get(cred_type + '-subnet')
+        router = results.get(cred_type + '-router')
+        if complete and cred_type + '-router-interface' in results:
+            self.isolated_net_resources[cred_type] = (network, subnet, router,)
+            LOG.info("Created isolated network resources for : \n"
+                     + " user: %s, tenant: %s" % (username, tenant_name))
         else:
-            return tenant.id
-
-    def _create_network_resources(self, tenant_id):
-        network = None
-        subnet = None
-        router = None
-        data_utils.rand_name_root = data_utils.rand_name(self.name)
-        network_name = data_utils.rand_name_root + "-network"
-        network = self._create_network(network_name, tenant_id)
-        try:
-            subnet_name = data_utils.rand_name_root + "-subnet"
-            subnet = self._create_subnet(subnet_name, tenant_id, network['id'])
-            router_name = data_utils.rand_name_root + "-router"
-            router = self._create_router(router_name, tenant_id)
-            self._add_router_interface(router['id'], subnet['id'])
-        except Exception:
             if router:
+                if subnet and cred_type + '-router-interface' in results:
+                    self._remove_router_interface(router, subnet)
                 self._clear_isolated_router(router['id'], router['name'])
             if subnet:
                 self._clear_isolated_subnet(subnet['id'], subnet['name'])
             if network:
                 self._clear_isolated_network(network['id'], network['name'])
-            raise
-        return network, subnet, router
+
+    def create_isolated_creds(self, *cred_types):
+        """Creates the isolated credentials of all the given types at once.
+
+        cred_types are any of 'primary', 'alt' and 'admin'. All the tenants,
+        users and network resources are created concurrently, up to
+        [identity] isolated_creds_workers API calls at a time with the
+        tempest clients.
+        """
+        cred_types = [cred_type for cred_type in cred_types
+                      if not self.isolated_creds.get(cred_type)]
+        if not cred_types:
+            return
+        graph = concurrency.TaskGraph(self._workers())
+        for cred_type in cred_types:
+            self._add_creds_tasks(graph, cred_type)
+            if self.config.service_available.neutron:
+                self._add_network_tasks(graph, cred_type)
+        try:
+            graph.run()
+        finally:
+            for cred_type in cred_types:
+                try:
+                    self._store_isolated_creds(graph, cred_type)
+                except Exception:
+                    if not graph.errors:
+                        raise
+                    # Do not hide the error which made the creation fail.
+                    LOG.exception("Unable to roll back the %s isolated "
+                                  "creds" % cred_type)
 
     def _create_network(self, name, tenant_id):
         if self.tempest_client:
@@ -318,62 +413,20 @@ class IsolatedCreds(object):
     def get_alt_router(self):
         return self.isolated_net_resources.get('alt')[2]
 
-    def get_primary_creds(self):
-        if self.isolated_creds.get('primary'):
-            user, tenant = self.isolated_creds['primary']
-            username, tenant_name = self._get_cred_names(user, tenant)
-        else:
-            user, tenant = self._create_creds()
-            username, tenant_name = self._get_cred_names(user, tenant)
-            self.isolated_creds['primary'] = (user, tenant)
-            LOG.info("Acquired isolated creds:\n user: %s, tenant: %s"
-                     % (username, tenant_name))
-            if self.config.service_available.neutron:
-                network, subnet, router = self._create_network_resources(
-                    self._get_tenant_id(tenant))
-                self.isolated_net_resources['primary'] = (
-                    network, subnet, router,)
-                LOG.info("Created isolated network resources for : \n"
-                         + " user: %s, tenant: %s" % (username, tenant_name))
+    def _get_creds(self, cred_type):
+        self.create_isolated_creds(cred_type)
+        user, tenant = self.isolated_creds[cred_type]
+        username, tenant_name = self._get_cred_names(user, tenant)
         return username, tenant_name, self.password
 
+    def get_primary_creds(self):
+        return self._get_creds('primary')
+
     def get_admin_creds(self):
-        if self.isolated_creds.get('admin'):
-            user, tenant = self.isolated_creds['admin']
-            username, tenant_name = self._get_cred_names(user, tenant)
-        else:
-            user, tenant = self._create_creds(admin=True)
-            username, tenant_name = self._get_cred_names(user, tenant)
-            self.isolated_creds['admin'] = (user, tenant)
-            LOG.info("Acquired admin isolated creds:\n user: %s, tenant: %s"
-                     % (username, tenant_name))
-            if self.config.service_available.neutron:
-                network, subnet, router = self._create_network_resources(
-                    self._get_tenant_id(tenant))
-                self.isolated_net_resources['admin'] = (
-                    network, subnet, router,)
-                LOG.info("Created isolated network resources for : \n"
-                         + " user: %s, tenant: %s" % (username, tenant_name))
-        return username, tenant_name, self.password
+        return self._get_creds('admin')
 
     def get_alt_creds(self):
-        if self.isolated_creds.get('alt'):
-            user, tenant = self.isolated_creds['alt']
-            username, tenant_name = self._get_cred_names(user, tenant)
-        else:
-            user, tenant = self._create_creds()
-            username, tenant_name = self._get_cred_names(user, tenant)
-            self.isolated_creds['alt'] = (user, tenant)
-            LOG.info("Acquired alt isolated creds:\n user: %s, tenant: %s"
-                     % (username, tenant_name))
-            if self.config.service_available.neutron:
-                network, subnet, router = self._create_network_resources(
-                    self._get_tenant_id(tenant))
-                self.isolated_net_resources['alt'] = (
-                    network, subnet, router,)
-                LOG.info("Created isolated network resources for : \n"
-                         + " user: %s, tenant: %s" % (username, tenant_name))
-        return username, tenant_name, self.password
+        return self._get_creds('alt')
 
     def _clear_isolated_router(self, router_id, router_name):
         net_client = self.network_admin_client
@@ -402,18 +455,54 @@ class IsolatedCreds(object):
                      network_name)
             pass
 
-    def _cleanup_ports(self, network_id):
-        # TODO(mlavalle) This method will be removed once patch
-        # https://review.openstack.org/#/c/46563/ merges in Neutron
+    def _clear_isolated_user(self, user):
+        try:
+            self._delete_user(self._get_id(user))
+        except exceptions.NotFound:
+            if self.tempest_client:
+                name = user['name']
+            else:
+                name = user.name
+            LOG.warn("user with name: %s not found for delete" % name)
+
+    def _clear_isolated_tenant(self, tenant):
+        try:
+            self._delete_tenant(self._get_id(tenant))
+        except exceptions.NotFound:
+            if self.tempest_client:
+                name = tenant['name']
+            else:
+                name = tenant.name
+            LOG.warn("tenant with name: %s not found for delete" % name)
+
+    def _remove_router_interface(self, router, subnet):
+        net_client = self.network_admin_client
+        try:
+            if self.tempest_client:
+                net_client.remove_router_interface_with_subnet_id(
+                    router['id'], subnet['id'])
+            else:
+                body = {'subnet_id': subnet['id']}
+                net_client.remove_interface_router(router['id'], body)
+        except exceptions.NotFound:
+            LOG.warn('router with name: %s not found for delete' %
+                     router['name'])
+
+    def _list_ports(self):
         if not self.ports:
             if self.tempest_client:
                 resp, resp_body = self.network_admin_client.list_ports()
             else:
                 resp_body = self.network_admin_client.list_ports()
             self.ports = resp_body['ports']
+        return self.ports
+
+    def _cleanup_ports(self, network_id):
+        # TODO(mlavalle) This method will be removed once patch
+        # https://review.openstack.org/#/c/46563/ merges in Neutron
         ports_to_delete = [
             port
-            for port in self.ports
+            for port in self._list_ports()
             if (port['network_id'] == network_id and
                 port['device_owner'] != 'network:router_interface')
         ]
@@ -426,58 +515,49 @@ class IsolatedCreds(object):
                 LOG.warn('Port id: %s, name %s not found for clean-up' %
                          (port['id'], port['name']))
 
-    def _clear_isolated_net_resources(self):
-        net_client = self.network_admin_client
-        for cred in self.isolated_net_resources:
-            network, subnet, router = self.isolated_net_resources.get(cred)
-            try:
-                if self.tempest_client:
-                    net_client.remove_router_interface_with_subnet_id(
-                        router['id'], subnet['id'])
-                else:
-                    body = {'subnet_id': subnet['id']}
-                    net_client.remove_interface_router(router['id'], body)
-            except exceptions.NotFound:
-                LOG.warn('router with name: %s not found for delete' %
-                         router['name'])
-                pass
-            self._clear_isolated_router(router['id'], router['name'])
-            # TODO(mlavalle) This method call will be removed once patch
-            # https://review.openstack.org/#/c/46563/ merges in Neutron
-            self._cleanup_ports(network['id'])
-            self._clear_isolated_subnet(subnet['id'], subnet['name'])
-            self._clear_isolated_network(network['id'], network['name'])
-            LOG.info("Cleared isolated network resources: \n"
-                     + " network: %s, subnet: %s, router: %s"
-                     % (network['name'], subnet['name'], router['name']))
+    def _add_net_cleanup_tasks(self, graph, cred_type):
+        """Adds the tasks deleting the network resources of cred_type.
+
+        The router is deleted while the ports of the network are, the
+        subnet and network once both are gone.
+        """
+        network, subnet, router = self.isolated_net_resources[cred_type]
+        interface_task = cred_type + '-remove-router-interface'
+        ports_task = cred_type + '-delete-ports'
+        subnet_task = cred_type + '-delete-subnet'
+        graph.add(interface_task, self._remove_router_interface,
+                  (router, subnet))
+        graph.add(cred_type + '-delete-router', self._clear_isolated_router,
+                  (router['id'], router['name']), deps=(interface_task,))
+        # TODO(mlavalle) This task will be removed once patch
+        # https://review.openstack.org/#/c/46563/ merges in Neutron
+        graph.add(ports_task, self._cleanup_ports, (network['id'],))
+        graph.add(subnet_task, self._clear_isolated_subnet,
+                  (subnet['id'], subnet['name']),
+                  deps=(interface_task, ports_task))
+        graph.add(cred_type + '-delete-network', self._clear_isolated_network,
+                  (network['id'], network['name']), deps=(subnet_task,))
 
     def clear_isolated_creds(self):
         if not self.isolated_creds:
             return
-        self._clear_isolated_net_resources()
-        for cred in self.isolated_creds:
-            user, tenant = self.isolated_creds.get(cred)
-            try:
-                if self.tempest_client:
-                    self._delete_user(user['id'])
-                else:
-                    self._delete_user(user.id)
-            except exceptions.NotFound:
-                if self.tempest_client:
-                    name = user['name']
-                else:
-                    name = user.name
-                LOG.warn("user with name: %s not found for delete" % name)
-                pass
-            try:
-                if self.tempest_client:
-                    self._delete_tenant(tenant['id'])
-                else:
-                    self._delete_tenant(tenant.id)
-            except exceptions.NotFound:
-                if self.tempest_client:
-                    name = tenant['name']
-                else:
-                    name = tenant.name
-                LOG.warn("tenant with name: %s not found for delete" % name)
-                pass
+        if self.isolated_net_resources:
+            # List the ports once, before the cleanup tasks need them.
+            self._list_ports()
+        graph = concurrency.TaskGraph(self._workers())
+        for cred_type in self.isolated_net_resources:
+            self._add_net_cleanup_tasks(graph, cred_type)
+        for cred_type in self.isolated_creds:
+            user, tenant = self.isolated_creds.get(cred_type)
+            user_task = cred_type + '-delete-user'
+            graph.add(user_task, self._clear_isolated_user, (user,))
+            deps = [user_task]
+            if cred_type in self.isolated_net_resources:
+                deps.append(cred_type + '-delete-network')
+            graph.add(cred_type + '-delete-tenant',
+                      self._clear_isolated_tenant, (tenant,), deps=deps)
+        graph.run(fail_fast=False)
+        for network, subnet, router in self.isolated_net_resources.values():
+            LOG.info("Cleared isolated network resources: \n"
+                     + " network: %s, subnet: %s, router: %s"
+                     % (network['name'], subnet['name'], router['name']))
@@ -0,0 +1,229 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import hashlib
+import itertools
+import re
+import urllib2
+import zlib
+
+from tempest.common import concurrency
+
+ERROR_REGEXP = re.compile(r"^.*(ERROR|CRITICAL).*\[.*\-.*\]")
+ERROR_KEYWORDS = ('ERROR', 'CRITICAL')
+NOVA_TIMESTAMP = r"\d\d\d\d-\d\d-\d\d \d\d:\d\d:\d\d\.\d\d\d"
+TRACE_REGEXP = re.compile(r"(?P<timestamp>%s) (?P<pid>\d+ )?"
+                          r"(?P<level>(ERROR|TRACE)) "
+                          r"(?P<module>[\w\.]+) (?P<msg>.*)" % NOVA_TIMESTAMP)
+TRACE_KEYWORDS = (' ERROR ', ' TRACE ')
+CHUNK_SIZE = 64 * 1024
+
+_GZIP_MAGIC = '\x1f\x8b'
+# The parts of a message which change from an occurrence of an error to
+# the next: request contexts, UUIDs, addresses and other numbers.
+_VOLATILE_REGEXP = re.compile(r"\[req-[^\]]*\]|"
+                              r"[0-9a-f]{8}(-[0-9a-f]{4}){3}-[0-9a-f]{12}|"
+                              r"0x[0-9a-f]+|\d+", re.IGNORECASE)
+
+
+def read_chunks(stream, chunk_size=CHUNK_SIZE):
+    return iter(lambda: stream.read(chunk_size), '')
+
+
+def gunzip_chunks(chunks):
+    """Decompresses the chunks of a gzip stream as they come.
+
+    Streams which do not start with the gzip magic number are passed
+    through, such as the logs a server already decoded.
+    """
+    chunks = iter(chunks)
+    first = next(chunks, '')
+    if not first.startswith(_GZIP_MAGIC):
+        yield first
+        for chunk in chunks:
+            yield chunk
+        return
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for chunk in itertools.chain([first], chunks):
+        data = decompressor.decompress(chunk)
+        if data:
+            yield data
+    data = decompressor.flush()
+    if data:
+        yield data
+
+
+def iter_lines(chunks):
+    """Splits the chunks of a stream into lines, without their ends."""
+    pending = ''
+    for chunk in chunks:
+        lines = (pending + chunk).split('\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+def open_url(url, chunk_size=CHUNK_SIZE):
+    """Yields the lines of a log, gzipped or not, while downloading it."""
+    request = urllib2.Request(url)
+    request.add_header('Accept-Encoding', 'gzip')
+    page = urllib2.urlopen(request)
+    try:
+        for line in iter_lines(gunzip_chunks(read_chunks(page,
+                                                         chunk_size))):
+            yield line
+    finally:
+        page.close()
+
+
+def open_file(path, chunk_size=CHUNK_SIZE):
+    """Yields the lines of a log file, gzipped or not."""
+    with open(path, 'rb') as log:
+        for line in iter_lines(gunzip_chunks(read_chunks(log, chunk_size))):
+            yield line
+
+
+def compile_whitelist(entries):
+    """Compiles whitelist entries into a single regexp.
+
+    An entry is a dict with a 'module' and a 'message' regexp, and matches
+    the lines where the module is followed by the message. Returns None
+    if there are no entries.
+    """
+    if not entries:
+        return None
+    return re.compile('|'.join(
+        '(?:%s.*%s)' % (entry['module'].replace('.', '\\.'),
+                        entry['message'])
+        for entry in entries))
+
+
+class LogScanner(object):
+    """Finds the error lines of logs, and whether they are whitelisted.
+
+    whitelists maps the names of the logs to their whitelist entries, as
+    in etc/whitelist.yaml; each log's entries are compiled once into a
+    single regexp. The lines containing none of the keywords are skipped
+    without being matched against regexp.
+    """
+
+    def __init__(self, whitelists=None, regexp=ERROR_REGEXP,
+                 keywords=ERROR_KEYWORDS):
+        self.regexp = regexp
+        self.keywords = keywords
+        self.whitelists = dict((name, compile_whitelist(entries))
+                               for name, entries
+                               in (whitelists or {}).iteritems())
+
+    def _is_error(self, line):
+        if self.keywords and not any(keyword in line
+                                     for keyword in self.keywords):
+            return False
+        return (not line.startswith("Stderr:") and
+                self.regexp.match(line) is not None)
+
+    def scan(self, name, lines):
+        """Returns the (line, whitelisted) pairs of the error lines."""
+        whitelist = self.whitelists.get(name)
+        return [(line, bool(whitelist and whitelist.search(line)))
+                for line in lines if self._is_error(line)]
+
+    def scan_all(self, logs, max_workers=8):
+        """Scans many logs concurrently.
+
+        logs is a list of (name, lines) pairs, where lines iterates over
+        the lines of the log, such as open_url() or open_file(). Returns
+        the (name, errors) pairs of the logs, in the same order, errors
+        being the result of scan(). Raises the first error met reading a
+        log, once the logs being read are done.
+        """
+        graph = concurrency.TaskGraph(max_workers)
+        for index, (name, lines) in enumerate(logs):
+            graph.add(str(index), self.scan, (name, lines))
+        graph.run()
+        return [(name, graph.results[str(index)])
+                for index, (name, _) in enumerate(logs)]
+
+
+class StackTrace(object):
+    """An ERROR or TRACE message of a log, with its following lines."""
+
+    def __init__(self, timestamp=None, pid=None, level="", module="",
+                 msg=""):
+        self.timestamp = timestamp
+        self.pid = pid
+        self.level = level
+        self.module = module
+        self._lines = [msg]
+
+    @property
+    def msg(self):
+        return '\n'.join(self._lines)
+
+    def append(self, msg):
+        self._lines.append(msg)
+
+    def is_same(self, data):
+        return (data['timestamp'] == self.timestamp and
+                data['level'] == self.level)
+
+    def fingerprint(self):
+        """Returns a short digest identifying the occurrences of an error.
+
+        The request contexts, UUIDs and numbers of the message are left
+        out, so that the same error met by different requests has the
+        same fingerprint.
+        """
+        digest = hashlib.md5()
+        for part in [self.level, self.module] + self._lines:
+            digest.update(_VOLATILE_REGEXP.sub('#', part) + '\n')
+        return digest.hexdigest()[:12]
+
+    def __str__(self):
+        header = "<%s %s %s>" % (self.timestamp, self.level, self.module)
+        return '\n'.join([header] + self._lines) + '\n'
+
+
+def extract_traces(lines):
+    """Yields the StackTraces of the lines of a log, as they are read.
+
+    The consecutive lines of a trace have the timestamp and the level of
+    its first line.
+    """
+    trace = None
+    for line in lines:
+        match = None
+        if any(keyword in line for keyword in TRACE_KEYWORDS):
+            match = TRACE_REGEXP.match(line)
+        if match is None:
+            if trace is not None:
+                yield trace
+                trace = None
+            continue
+        data = match.groupdict()
+        if trace is not None and trace.is_same(data):
+            trace.append(data['msg'])
+            continue
+        if trace is not None:
+            yield trace
+        trace = StackTrace(timestamp=data['timestamp'], pid=data['pid'],
+                           level=data['level'], module=data['module'],
+                           msg=data['msg'])
+    if trace is not None:
+        yield trace
@@ -0,0 +1,271 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import errno
+import os
+import select
+import socket
+import struct
+import subprocess
+import time
+
+from tempest.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+
+
+def _checksum(data):
+    if len(data) % 2:
+        data += '\0'
+    total = sum(struct.unpack('!%dH' % (len(data) // 2), data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+
+def _echo_request(ident, seq):
+    payload = 'tempest-prober'
+    header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    checksum = _checksum(header + payload)
+    return struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, checksum, ident,
+                       seq) + payload
+
+
+class _TcpChecker(object):
+    # Non-blocking connect()s to the port, all polled together.
+
+    def __init__(self, port):
+        self.port = port
+        self._poll = select.poll()
+        self._sockets = {}
+        self._by_address = {}
+        self._ready = []
+
+    def start(self, address):
+        self._discard(self._by_address.get(address))
+        family = socket.AF_INET6 if ':' in address else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setblocking(0)
+        err = sock.connect_ex((address, self.port))
+        if err == 0:
+            sock.close()
+            self._ready.append(address)
+        elif err in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+            self._sockets[sock.fileno()] = (address, sock)
+            self._by_address[address] = sock.fileno()
+            self._poll.register(sock, select.POLLOUT)
+        else:
+            sock.close()
+
+    def _discard(self, fd):
+        if fd is None or fd not in self._sockets:
+            return
+        address, sock = self._sockets.pop(fd)
+        self._by_address.pop(address, None)
+        self._poll.unregister(fd)
+        sock.close()
+
+    def wait(self, timeout):
+        reachable, self._ready = self._ready, []
+        if reachable:
+            return reachable
+        for fd, event in self._poll.poll(timeout * 1000):
+            address, sock = self._sockets[fd]
+            if not sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR):
+                reachable.append(address)
+            self._discard(fd)
+        return reachable
+
+    def close(self):
+        for fd in list(self._sockets):
+            self._discard(fd)
+
+
+class _IcmpChecker(object):
+    # Echo requests on a single ICMP socket: a raw one, or the datagram
+    # one Linux lets unprivileged users open (net.ipv4.ping_group_range).
+
+    def __init__(self, sock, raw):
+        self._sock = sock
+        self._raw = raw
+        self._ident = os.getpid() & 0xffff
+        self._seq = 0
+        self._poll = select.poll()
+        self._poll.register(sock, select.POLLIN)
+
+    @classmethod
+    def open(cls):
+        for kind in (socket.SOCK_RAW, socket.SOCK_DGRAM):
+            try:
+                sock = socket.socket(socket.AF_INET, kind,
+                                     socket.IPPROTO_ICMP)
+            except socket.error:
+                continue
+            sock.setblocking(0)
+            return cls(sock, kind == socket.SOCK_RAW)
+        return None
+
+    def start(self, address):
+        self._seq = (self._seq + 1) & 0xffff
+        try:
+            self._sock.sendto(_echo_request(self._ident, self._seq),
+                              (address, 0))
+        except socket.error as exc:
+            LOG.debug("Echo request to %s failed: %s", address, exc)
+
+    def wait(self, timeout):
+        reachable = []
+        if not self._poll.poll(timeout * 1000):
+            return reachable
+        while True:
+            try:
+                data, (address, _) = self._sock.recvfrom(2048)
+            except socket.error:
+                return reachable
+            if self._raw:
+                # Skip the IP header, and the replies to the other pings
+                # of the host (a raw socket gets them all).
+                data = data[(ord(data[0]) & 0x0f) * 4:]
+                if struct.unpack('!H', data[4:6])[0] != self._ident:
+                    continue
+            if data and ord(data[0]) == ICMP_ECHO_REPLY:
+                reachable.append(address)
+
+    def close(self):
+        self._sock.close()
+
+
+class _PingChecker(object):
+    # Concurrent ping processes, when no ICMP socket can be opened.
+
+    def __init__(self):
+        self._procs = {}
+
+    def start(self, address):
+        if address in self._procs:
+            return
+        cmd = ['ping6' if ':' in address else 'ping', '-c1', '-w1', address]
+        self._procs[address] = subprocess.Popen(cmd,
+                                                stdout=subprocess.PIPE,
+                                                stderr=subprocess.PIPE)
+
+    def wait(self, timeout):
+        deadline = time.time() + timeout
+        reachable = []
+        while True:
+            for address, proc in self._procs.items():
+                if proc.poll() is not None:
+                    del self._procs[address]
+                    proc.communicate()
+                    if proc.returncode == 0:
+                        reachable.append(address)
+            if reachable or time.time() >= deadline:
+                return reachable
+            time.sleep(min(0.05, max(deadline - time.time(), 0)))
+
+    def close(self):
+        for proc in self._procs.values():
+            if proc.poll() is None:
+                proc.kill()
+            proc.communicate()
+        self._procs = {}
+
+
+class ProbeResult(object):
+    """Outcome of a probe: the seconds each address took to answer.
+
+    latencies maps every probed address to the time between the start of
+    the probe and its first answer, or None if it never answered.
+    """
+
+    def __init__(self, addresses):
+        self.latencies = dict.fromkeys(addresses)
+
+    @property
+    def unreachable(self):
+        return sorted(address for address, latency in self.latencies.items()
+                      if latency is None)
+
+    def histogram(self, bucket=1.0):
+        """Returns the sorted (bucket start, number of addresses) pairs."""
+        counts = collections.Counter(int(latency // bucket)
+                                     for latency in self.latencies.values()
+                                     if latency is not None)
+        return [(index * bucket, counts[index]) for index in sorted(counts)]
+
+
+class Prober(object):
+    """Waits for many addresses to become reachable at once.
+
+    All the addresses are probed from a single poll loop, every interval
+    seconds until they answer or timeout expires: with non-blocking TCP
+    connects when a port is given, otherwise with ICMP echo requests sent
+    on one socket (falling back to concurrent ping processes when ICMP
+    sockets are not permitted, and for IPv6).
+
+    Usage::
+
+        result = prober.Prober(timeout=60).probe(ips, port=22)
+        if result.unreachable:
+            ...
+    """
+
+    def __init__(self, timeout, interval=1.0):
+        self.timeout = timeout
+        self.interval = interval
+
+    def _checker(self, addresses, port):
+        if port is not None:
+            return _TcpChecker(port)
+        checker = None
+        if not any(':' in address for address in addresses):
+            checker = _IcmpChecker.open()
+        return checker or _PingChecker()
+
+    def probe(self, addresses, port=None):
+        result = ProbeResult(addresses)
+        pending = set(addresses)
+        start = time.time()
+        deadline = start + self.timeout
+        next_attempt = dict.fromkeys(pending, start)
+        checker = self._checker(pending, port)
+        try:
+            while pending:
+                now = time.time()
+                if now >= deadline:
+                    break
+                for address in pending:
+                    if next_attempt[address] <= now:
+                        checker.start(address)
+                        next_attempt[address] = now + self.interval
+                wait = min(min(next_attempt[address] for address in pending),
+                           deadline) - time.time()
+                for address in checker.wait(max(wait, 0.01)):
+                    if address in pending:
+                        pending.remove(address)
+                        result.latencies[address] = time.time() - start
+        finally:
+            checker.close()
+        LOG.debug("Probed %d addresses (%s): first answers %s, "
+                  "unreachable %s", len(result.latencies),
+                  'ICMP' if port is None else 'TCP port %d' % port,
+                  result.histogram(), result.unreachable)
+        return result
@@ -19,14 +19,16 @@
 import collections
 import hashlib
 import json
-from lxml import etree
 import re
 import time
 
+from tempest.common import backoff
 from tempest.common import http
+from tempest.common import http_timing
+from tempest.common import token_cache
 from tempest import exceptions
 from tempest.openstack.common import log as logging
-from tempest.services.compute.xml.common import xml_to_json
+from tempest.services.compute.xml.common import xml_string_to_json
 
 # redrive rate limited calls at most twice
 MAX_RECURSION_DEPTH = 2
@@ -52,22 +54,14 @@ class RestClient(object):
         self.service = None
         self.token = None
         self.base_url = None
-        self.region = {}
-        for cfgname in dir(self.config):
-            # Find all config.FOO.catalog_type and assume FOO is a service.
-            cfg = getattr(self.config, cfgname)
-            catalog_type = getattr(cfg, 'catalog_type', None)
-            if not catalog_type:
-                continue
-            service_region = getattr(cfg, 'region', None)
-            if not service_region:
-                service_region = self.config.identity.region
-            self.region[catalog_type] = service_region
+        self._auth_key = None
+        self.region = self.config.service_regions
         self.endpoint_url = 'publicURL'
         self.headers = {'Content-Type': 'application/%s' % self.TYPE,
                         'Accept': 'application/%s' % self.TYPE}
         self.build_interval = config.compute.build_interval
         self.build_timeout = config.compute.build_timeout
+        self.poll_policy = backoff.PollPolicy.from_config(config.compute)
         self.general_header_lc = set(('cache-control', 'connection',
                                       'date', 'pragma', 'trailer',
                                       'transfer-encoding', 'via',
@@ -76,9 +70,10 @@ class RestClient(object):
                                        'location', 'proxy-authenticate',
                                        'retry-after', 'server',
                                        'vary', 'www-authenticate'))
-        dscv = self.config.identity.disable_ssl_certificate_validation
-        self.http_obj = http.ClosingHttp(
-            disable_ssl_certificate_validation=dscv)
+        self.http_obj = http.get_http_obj(self.config)
+        self.record_timings = config.http.record_timings
+        if self.record_timings:
+            http_timing.enable(config.http.timing_report_file)
 
     def __str__(self):
         STRING_LIMIT = 80
@@ -115,6 +110,9 @@ class RestClient(object):
         will fetch a new token and base_url.
         """
 
+        if self._auth_key is not None:
+            # The token may have been revoked, don't hand it out anymore.
+            token_cache.TokenCache().invalidate(self._auth_key)
         self.token = None
         self.base_url = None
 
@@ -143,6 +141,28 @@ class RestClient(object):
         except Exception:
             raise
 
+    def _get_auth_data(self, key, fetch_func):
+        """
+        Returns the AuthData for key, from the shared token cache if enabled.
+        """
+
+        if not self.config.identity.token_cache:
+            return fetch_func()
+        self._auth_key = key
+        return token_cache.TokenCache().get(
+            key, fetch_func, self.config.identity.token_refresh_margin)
+
+    def _is_token_fresh(self):
+        """
+        Checks the current token was not invalidated or replaced meanwhile.
+        """
+
+        if not self.config.identity.token_cache or self._auth_key is None:
+            return True
+        return token_cache.TokenCache().is_fresh(
+            self._auth_key, self.token,
+            self.config.identity.token_refresh_margin)
+
     def keystone_auth(self, user, password, auth_url, service, tenant_name):
         """
         Provides authentication via Keystone using v2 identity API.
@@ -152,6 +172,28 @@ class RestClient(object):
         if 'tokens' not in auth_url:
             auth_url = auth_url.rstrip('/') + '/tokens'
 
+        auth_data = self._get_auth_data(
+            (auth_url, user, password, tenant_name, 'v2'),
+            lambda: self._keystone_auth_request(user, password, auth_url,
+                                                tenant_name))
+
+        mgmt_url = None
+        for ep in auth_data.catalog:
+            if ep["type"] == service:
+                for _ep in ep['endpoints']:
+                    if service in self.region and \
+                            _ep['region'] == self.region[service]:
+                        mgmt_url = _ep[self.endpoint_url]
+                if not mgmt_url:
+                    mgmt_url = ep['endpoints'][0][self.endpoint_url]
+                break
+
+        if mgmt_url is None:
+            raise exceptions.EndpointNotFound(service)
+
+        return auth_data.token, mgmt_url
+
+    def _keystone_auth_request(self, user, password, auth_url, tenant_name):
         creds = {
             'auth': {
                 'passwordCredentials': {
@@ -177,21 +219,10 @@ class RestClient(object):
                 print("Failed to obtain token for user: %s" % e)
                 raise
 
-            mgmt_url = None
-            for ep in auth_data['serviceCatalog']:
-                if ep["type"] == service:
-                    for _ep in ep['endpoints']:
-                        if service in self.region and \
-                                _ep['region'] == self.region[service]:
-                            mgmt_url = _ep[self.endpoint_url]
-                    if not mgmt_url:
-                        mgmt_url = ep['endpoints'][0][self.endpoint_url]
-                    break
-
-            if mgmt_url is None:
-                raise exceptions.EndpointNotFound(service)
-
-            return token, mgmt_url
+            expires_at = token_cache.parse_expiry(
+                auth_data['token'].get('expires'))
+            return token_cache.AuthData(token, expires_at,
+                                        auth_data.get('serviceCatalog', []))
 
         elif resp.status == 401:
             raise exceptions.AuthenticationFailure(user=user,
@@ -206,6 +237,45 @@ class RestClient(object):
 
         req_url = auth_url.rstrip('/') + '/auth/tokens'
 
+        auth_data = self._get_auth_data(
+            (req_url, user, password, project_name, domain_id, 'v3'),
+            lambda: self._identity_auth_v3_request(user, password, req_url,
+                                                   project_name, domain_id))
+
+        mgmt_url = None
+        for service_info in auth_data.catalog:
+            if service_info['type'] != service:
+                continue  # this isn't the entry for us.
+
+            endpoints = service_info['endpoints']
+
+            # Look for an endpoint in the region if configured.
+            if service in self.region:
+                region = self.region[service]
+
+                for ep in endpoints:
+                    if ep['region'] != region:
+                        continue
+
+                    mgmt_url = ep['url']
+                    # FIXME(blk-u): this isn't handling endpoint type
+                    # (public, internal, admin).
+                    break
+
+            if not mgmt_url:
+                # Didn't find endpoint for region, use the first.
+
+                ep = endpoints[0]
+                mgmt_url = ep['url']
+                # FIXME(blk-u): this isn't handling endpoint type
+                # (public, internal, admin).
+
+            break
+
+        return auth_data.token, mgmt_url
+
+    def _identity_auth_v3_request(self, user, password, req_url,
+                                  project_name, domain_id):
         creds = {
             "auth": {
                 "identity": {
@@ -240,39 +310,11 @@ class RestClient(object):
                                    req_url)
                 raise
 
-            catalog = json.loads(body)['token']['catalog']
-
-            mgmt_url = None
-            for service_info in catalog:
-                if service_info['type'] != service:
-                    continue  # this isn't the entry for us.
-
-                endpoints = service_info['endpoints']
-
-                # Look for an endpoint in the region if configured.
-                if service in self.region:
-                    region = self.region[service]
-
-                    for ep in endpoints:
-                        if ep['region'] != region:
-                            continue
-
-                        mgmt_url = ep['url']
-                        # FIXME(blk-u): this isn't handling endpoint type
-                        # (public, internal, admin).
-                        break
-
-                if not mgmt_url:
-                    # Didn't find endpoint for region, use the first.
-
-                    ep = endpoints[0]
-                    mgmt_url = ep['url']
-                    # FIXME(blk-u): this isn't handling endpoint type
-                    # (public, internal, admin).
-
-                break
-
-            return token, mgmt_url
+            token_data = json.loads(body)['token']
+            expires_at = token_cache.parse_expiry(
+                token_data.get('expires_at'))
+            return token_cache.AuthData(token, expires_at,
+                                        token_data.get('catalog', []))
 
         elif resp.status == 401:
             raise exceptions.AuthenticationFailure(user=user,
@@ -337,7 +379,8 @@ class RestClient(object):
                     print_headers['X-Auth-Token'] = "<Token omitted>"
             self.LOG.debug('Request Headers: ' + str(print_headers))
         if body:
-            str_body = str(body)
+            # A buffer body, e.g. an object segment, is not copied.
+            str_body = body if isinstance(body, buffer) else str(body)
             length = len(str_body)
             self.LOG.debug('Request Body: ' + str_body[:2048])
             if length >= 2048:
@@ -402,17 +445,30 @@ class RestClient(object):
 
         req_url = "%s/%s" % (self.base_url, url)
         self._log_request(method, req_url, headers, body)
-        resp, resp_body = self.http_obj.request(req_url, method,
-                                                headers=headers, body=body)
+        resp, resp_body = self._http_request(method, url, req_url,
+                                             headers=headers, body=body)
         self._log_response(resp, resp_body)
         self.response_checker(method, url, headers, body, resp, resp_body)
 
         return resp, resp_body
 
+    def _http_request(self, method, url, req_url, headers=None, body=None):
+        """Sends a request, recording its timings if record_timings is set.
+
+        url is the part of req_url relative to the endpoint of the service.
+        """
+        if self.record_timings:
+            return http_timing.request(self.http_obj, self.service, url,
+                                       req_url, method, headers=headers,
+                                       body=body)
+        return self.http_obj.request(req_url, method, headers=headers,
+                                     body=body)
+
     def request(self, method, url,
                 headers=None, body=None):
         retry = 0
-        if (self.token is None) or (self.base_url is None):
+        if ((self.token is None) or (self.base_url is None) or
+                not self._is_token_fresh()):
             self._set_auth()
 
         if headers is None:
@@ -537,13 +593,12 @@ class RestClient(object):
 
     def wait_for_resource_deletion(self, id):
         """Waits for a resource to be deleted."""
-        start_time = int(time.time())
+        poller = self.poll_policy.poller(self.build_timeout)
         while True:
             if self.is_resource_deleted(id):
                 return
-            if int(time.time()) - start_time >= self.build_timeout:
+            if not poller.sleep():
                 raise exceptions.TimeoutException
-            time.sleep(self.build_interval)
 
     def is_resource_deleted(self, id):
         """
@@ -558,7 +613,7 @@ class RestClientXML(RestClient):
     TYPE = "xml"
 
     def _parse_resp(self, body):
-        return xml_to_json(etree.fromstring(body))
+        return xml_string_to_json(body)
 
     def is_absolute_limit(self, resp, resp_body):
         if (not isinstance(resp_body, collections.Mapping) or
@@ -0,0 +1,301 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Timing-aware partitioning of the test classes across testr workers.
+
+The tests of a class run on the same worker (see group_regex in
+.testr.conf), so a worker is busy for the whole duration of its classes,
+setUpClass and tearDownClass included. The durations of the classes are
+measured from the subunit streams of the runs and kept in a TimingDB;
+the classes are then assigned to the workers longest first, each to the
+least loaded worker (longest processing time first).
+"""
+
+import collections
+import ConfigParser
+import json
+import os
+import re
+
+GROUP_REGEX = r'([^\.]*\.)*'
+# Weight of the last run in the recorded duration of a class
+SMOOTHING = 0.5
+# Estimated duration of a test when nothing is known about its class
+DEFAULT_TEST_TIME = 1.0
+
+# The class fixtures failures are reported as "setUpClass (module.Class)"
+_FIXTURE_REGEXP = re.compile(r'^\w+ \((?P<class>[\w\.]+)\)$')
+
+
+# The variables testr substitutes in the test command
+_TESTR_VARIABLES = re.compile(r'\$(IDOPTION|IDFILE|IDLIST|LISTOPT)')
+
+
+def _testr_conf(path):
+    parser = ConfigParser.RawConfigParser()
+    parser.read(path)
+    return parser
+
+
+def group_regex(path='.testr.conf'):
+    """Returns the compiled group_regex of a testr configuration."""
+    parser = _testr_conf(path)
+    if parser.has_option('DEFAULT', 'group_regex'):
+        return re.compile(parser.get('DEFAULT', 'group_regex'))
+    return re.compile(GROUP_REGEX)
+
+
+def worker_command(id_file, path='.testr.conf'):
+    """Returns the command running the tests listed in id_file.
+
+    This is the test_command of the testr configuration, with the
+    variables substituted the way testr does to run a partition.
+    """
+    parser = _testr_conf(path)
+    variables = {'IDFILE': id_file, 'LISTOPT': ''}
+
+    def subst(match):
+        return variables.get(match.group(1), '')
+
+    variables['IDOPTION'] = _TESTR_VARIABLES.sub(
+        subst, parser.get('DEFAULT', 'test_id_option'))
+    return _TESTR_VARIABLES.sub(subst, parser.get('DEFAULT', 'test_command'))
+
+
+def split_testr_args(testr_args):
+    """Splits the arguments of a 'testr run' into concurrency and filters.
+
+    testr_args is the string given to testr, split on whitespace as pbr
+    does. Returns the --concurrency, None if not given, and the filters.
+    Raises ValueError for the other options, which change what testr
+    runs.
+    """
+    concurrency = None
+    filters = []
+    args = iter(testr_args.split())
+    for arg in args:
+        if arg == '--concurrency':
+            concurrency = next(args, '')
+        elif arg.startswith('--concurrency='):
+            concurrency = arg.split('=', 1)[1]
+        elif arg in ('--parallel', '--subunit'):
+            continue
+        elif arg.startswith('-'):
+            raise ValueError("Unsupported testr option %s" % arg)
+        else:
+            filters.append(arg)
+    if concurrency is not None:
+        try:
+            concurrency = int(concurrency)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid concurrency %s" % concurrency)
+    return concurrency, filters
+
+
+def class_of(test_id, regexp):
+    """Returns the name of the class (testr group) of a test id."""
+    match = _FIXTURE_REGEXP.match(test_id)
+    if match:
+        return match.group('class')
+    match = regexp.match(test_id)
+    if match is None or not match.group(0):
+        return test_id
+    return match.group(0).rstrip('.')
+
+
+def is_fixture(test_id):
+    return _FIXTURE_REGEXP.match(test_id) is not None
+
+
+def group_tests(test_ids, regexp):
+    """Returns an ordered dict of the test ids of every class."""
+    classes = collections.OrderedDict()
+    for test_id in test_ids:
+        classes.setdefault(class_of(test_id, regexp), []).append(test_id)
+    return classes
+
+
+def _seconds(delta):
+    return delta.days * 86400 + delta.seconds + delta.microseconds / 1e6
+
+
+def _worker(test):
+    for tag in test.get('tags', ()):
+        if tag.startswith('worker-'):
+            return tag
+    return None
+
+
+def class_durations(tests, regexp):
+    """Measures the durations of the classes of a run.
+
+    tests are the dicts of testtools.StreamToDict. A test accounts for the
+    time since the end of the previous test of its worker, so the first
+    test of a class accounts for its setUpClass (and for the tearDownClass
+    of the class before it). Returns the durations and the numbers of
+    tests of the classes, as dicts, and the makespan of the run: the time
+    its busiest worker spent running tests.
+    """
+    workers = collections.defaultdict(list)
+    for test in tests:
+        start, stop = test['timestamps']
+        if start is None or stop is None:
+            continue
+        workers[_worker(test)].append((start, stop, test['id']))
+    durations = collections.defaultdict(float)
+    counts = collections.defaultdict(int)
+    makespan = 0.0
+    for runs in workers.values():
+        runs.sort()
+        previous = runs[0][0]
+        for start, stop, test_id in runs:
+            name = class_of(test_id, regexp)
+            durations[name] += max(_seconds(stop - previous), 0.0)
+            if not is_fixture(test_id):
+                counts[name] += 1
+            previous = max(previous, stop)
+        makespan = max(makespan, _seconds(previous - runs[0][0]))
+    return dict(durations), dict(counts), makespan
+
+
+class TimingDB(object):
+    """The recorded durations of the test classes, in a JSON file.
+
+    A class has its duration and its number of tests, so the duration of
+    a part of it can be estimated. The durations are smoothed over the
+    runs, and the makespans of the last runs are kept too.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.classes = {}
+        self.makespans = []
+        self._per_test = None
+        if os.path.exists(path):
+            with open(path) as db:
+                data = json.load(db)
+            self.classes = data.get('classes', {})
+            self.makespans = data.get('makespans', [])
+
+    def record(self, durations, counts, makespan):
+        for name, duration in durations.iteritems():
+            tests = counts.get(name, 0)
+            if not tests:
+                # Only a class fixture ran, the class failed to set up.
+                continue
+            known = self.classes.get(name)
+            if known:
+                # Smooth the duration of the tests both runs had.
+                duration = (SMOOTHING * duration +
+                            (1 - SMOOTHING) * known['duration'] * tests /
+                            known['tests'])
+            self.classes[name] = {'duration': duration, 'tests': tests}
+        self.makespans = (self.makespans + [makespan])[-10:]
+        self._per_test = None
+
+    def save(self):
+        temp = self.path + '.tmp'
+        with open(temp, 'w') as db:
+            json.dump({'classes': self.classes, 'makespans': self.makespans},
+                      db, indent=1, sort_keys=True)
+        os.rename(temp, self.path)
+
+    def _per_test_times(self):
+        """Maps every module and package prefix to the test durations."""
+        if self._per_test is None:
+            self._per_test = collections.defaultdict(list)
+            for name, known in self.classes.iteritems():
+                per_test = known['duration'] / known['tests']
+                parts = name.split('.')
+                for index in xrange(len(parts)):
+                    self._per_test['.'.join(parts[:index])].append(per_test)
+        return self._per_test
+
+    def estimate(self, name, tests):
+        """Returns the estimated duration of tests tests of a class.
+
+        The duration of an unknown class is its number of tests times the
+        median duration of a test in the known classes of its closest
+        module or package.
+        """
+        known = self.classes.get(name)
+        if known:
+            return known['duration'] * tests / known['tests']
+        per_test = self._per_test_times()
+        parts = name.split('.')
+        for index in xrange(len(parts) - 1, -1, -1):
+            times = sorted(per_test.get('.'.join(parts[:index]), ()))
+            if times:
+                return times[len(times) // 2] * tests
+        return DEFAULT_TEST_TIME * tests
+
+
+def partition(durations, workers):
+    """Assigns the classes to workers, longest processing time first.
+
+    durations maps the classes to their durations. The classes are taken
+    longest first, each for the least loaded worker (the one with the
+    fewest classes on a tie), as testr does with the durations of the
+    groups. Returns the (load, classes) pairs of the workers.
+    """
+    loads = [[0.0, []] for _ in xrange(max(workers, 1))]
+    for name, duration in sorted(durations.iteritems(),
+                                 key=lambda item: (-item[1], item[0])):
+        loads[0][0] += duration
+        loads[0][1].append(name)
+        loads.sort(key=lambda load: (load[0], len(load[1])))
+    return [tuple(load) for load in loads]
+
+
+def testr_partition(classes, test_times, workers):
+    """Returns the workers testr assigns the classes to on its own.
+
+    classes maps the classes to their test ids and test_times the test ids
+    to their last recorded durations. testr packs the classes whose tests
+    are all timed by the sum of these durations, which leaves out the
+    class fixtures, then the partially timed ones, then deals the other
+    classes round robin. Returns the list of the classes of every worker.
+    """
+    timed = {}
+    partial = {}
+    unknown = []
+    for name, test_ids in classes.iteritems():
+        times = [test_times[test_id] for test_id in test_ids
+                 if test_id in test_times]
+        if len(times) == len(test_ids):
+            timed[name] = sum(times)
+        elif sum(times):
+            partial[name] = sum(times)
+        else:
+            unknown.append(name)
+    loads = [[0.0, []] for _ in xrange(max(workers, 1))]
+    assigned = [load[1] for load in loads]
+    for durations in (timed, partial):
+        for name, duration in sorted(durations.iteritems(),
+                                     key=lambda item: -item[1]):
+            loads[0][0] += duration
+            loads[0][1].append(name)
+            loads.sort(key=lambda load: (load[0], len(load[1])))
+    for index, name in enumerate(unknown):
+        assigned[index % len(assigned)].append(name)
+    return assigned
+
+
+def makespan(assignment, durations):
+    """Returns the duration of the busiest worker of an assignment."""
+    return max([sum(durations[name] for name in names)
+                for names in assignment] or [0.0])
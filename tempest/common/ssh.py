@@ -16,12 +16,15 @@
 #    under the License.
 
 
+import collections
 import cStringIO
 import select
 import socket
+import threading
 import time
 import warnings
 
+from tempest.common import concurrency
 from tempest import exceptions
 
 
@@ -30,10 +33,60 @@ with warnings.catch_warnings():
     import paramiko
 
 
+class ConnectionCache(object):
+    """Keeps ssh connections open to reuse them across commands.
+
+    Clients given the same cache share one connection per host, username
+    and credentials, instead of connecting (key exchange, authentication)
+    for every command. A connection whose transport died is replaced on
+    its next use. The connections stay open until close() is called.
+    """
+
+    def __init__(self):
+        self._connections = {}
+        self._lock = threading.Lock()
+        self._key_locks = collections.defaultdict(threading.Lock)
+
+    def get(self, client):
+        """Returns an open connection for client, connecting if needed."""
+        key = client.connection_key()
+        with self._lock:
+            key_lock = self._key_locks[key]
+        # Only one thread connects to a host at a time, the others wait for
+        # its connection. The other hosts do not have to wait.
+        with key_lock:
+            with self._lock:
+                ssh = self._connections.get(key)
+            if ssh is not None:
+                transport = ssh.get_transport()
+                if transport is not None and transport.is_active():
+                    return ssh
+                ssh.close()
+            ssh = client._get_ssh_connection()
+            with self._lock:
+                self._connections[key] = ssh
+            return ssh
+
+    def drop(self, client):
+        """Closes the connection of client, if any."""
+        with self._lock:
+            ssh = self._connections.pop(client.connection_key(), None)
+        if ssh is not None:
+            ssh.close()
+
+    def close(self):
+        with self._lock:
+            connections = self._connections.values()
+            self._connections = {}
+        for ssh in connections:
+            ssh.close()
+
+
 class Client(object):
 
     def __init__(self, host, username, password=None, timeout=300, pkey=None,
-                 channel_timeout=10, look_for_keys=False, key_filename=None):
+                 channel_timeout=10, look_for_keys=False, key_filename=None,
+                 connection_cache=None):
         self.host = host
         self.username = username
         self.password = password
@@ -45,7 +98,22 @@ class Client(object):
         self.key_filename = key_filename
         self.timeout = int(timeout)
         self.channel_timeout = float(channel_timeout)
-        self.buf_size = 1024
+        self.buf_size = 1024 * 1024
+        self.connection_cache = connection_cache
+
+    def connection_key(self):
+        pkey = self.pkey.get_fingerprint() if self.pkey else None
+        return (self.host, self.username, self.password, pkey,
+                self.key_filename)
+
+    def _connect(self):
+        if self.connection_cache is None:
+            return self._get_ssh_connection()
+        return self.connection_cache.get(self)
+
+    def _release(self, ssh):
+        if self.connection_cache is None:
+            ssh.close()
 
     def _get_ssh_connection(self, sleep=1.5, backoff=1.01):
         """Returns an ssh connection to the specified host."""
@@ -94,49 +162,72 @@ class Client(object):
         except (EOFError, paramiko.AuthenticationException, socket.error):
             return
 
-    def exec_command(self, cmd):
+    def _open_session(self):
+        ssh = self._connect()
+        try:
+            return ssh, ssh.get_transport().open_session()
+        except (EOFError, socket.error, paramiko.SSHException):
+            if self.connection_cache is None:
+                raise
+            # The cached connection was lost (e.g. the server rebooted)
+            # although its transport still looked alive, connect again.
+            self.connection_cache.drop(self)
+            ssh = self._connect()
+            return ssh, ssh.get_transport().open_session()
+
+    def exec_command(self, cmd, stdout_callback=None, stderr_callback=None):
         """
         Execute the specified command on the server.
 
-        Note that this method is reading whole command outputs to memory, thus
-        shouldn't be used for large outputs.
+        The output is read in chunks of up to buf_size bytes. Without
+        callbacks the whole outputs are read to memory, thus this shouldn't
+        be used for large outputs; otherwise every chunk of standard output
+        (error) is passed to stdout_callback (stderr_callback) as soon as
+        it is received, and not kept.
 
-        :returns: data read from standard output of the command.
+        :returns: data read from standard output of the command, or an
+                  empty string with stdout_callback.
         :raises: SSHExecCommandFailed if command returns nonzero
                  status. The exception contains command status stderr content.
         """
-        ssh = self._get_ssh_connection()
-        transport = ssh.get_transport()
-        channel = transport.open_session()
-        channel.fileno()  # Register event pipe
-        channel.exec_command(cmd)
-        channel.shutdown_write()
         out_data = []
         err_data = []
-        poll = select.poll()
-        poll.register(channel, select.POLLIN)
-        start_time = time.time()
-
-        while True:
-            ready = poll.poll(self.channel_timeout)
-            if not any(ready):
-                if not self._is_timed_out(start_time):
+        if stdout_callback is None:
+            stdout_callback = out_data.append
+        if stderr_callback is None:
+            stderr_callback = err_data.append
+        ssh, channel = self._open_session()
+        try:
+            channel.fileno()  # Register event pipe
+            channel.exec_command(cmd)
+            channel.shutdown_write()
+            poll = select.poll()
+            poll.register(channel, select.POLLIN)
+            start_time = time.time()
+
+            while True:
+                ready = poll.poll(self.channel_timeout)
+                if not any(ready):
+                    if not self._is_timed_out(start_time):
+                        continue
+                    raise exceptions.TimeoutException(
+                        "Command: '{0}' executed on host '{1}'.".format(
+                            cmd, self.host))
+                if not ready[0]:        # If there is nothing to read.
                     continue
-                raise exceptions.TimeoutException(
-                    "Command: '{0}' executed on host '{1}'.".format(
-                        cmd, self.host))
-            if not ready[0]:        # If there is nothing to read.
-                continue
-            out_chunk = err_chunk = None
-            if channel.recv_ready():
-                out_chunk = channel.recv(self.buf_size)
-                out_data += out_chunk,
-            if channel.recv_stderr_ready():
-                err_chunk = channel.recv_stderr(self.buf_size)
-                err_data += err_chunk,
-            if channel.closed and not err_chunk and not out_chunk:
-                break
-        exit_status = channel.recv_exit_status()
+                out_chunk = err_chunk = None
+                if channel.recv_ready():
+                    out_chunk = channel.recv(self.buf_size)
+                    stdout_callback(out_chunk)
+                if channel.recv_stderr_ready():
+                    err_chunk = channel.recv_stderr(self.buf_size)
+                    stderr_callback(err_chunk)
+                if channel.closed and not err_chunk and not out_chunk:
+                    break
+            exit_status = channel.recv_exit_status()
+        finally:
+            channel.close()
+            self._release(ssh)
         if 0 != exit_status:
             raise exceptions.SSHExecCommandFailed(
                 command=cmd, exit_status=exit_status,
@@ -146,9 +237,31 @@ class Client(object):
     def test_connection_auth(self):
         """Returns true if ssh can connect to server."""
         try:
-            connection = self._get_ssh_connection()
-            connection.close()
+            connection = self._connect()
+            self._release(connection)
         except paramiko.AuthenticationException:
             return False
 
         return True
+
+
+def run_commands(commands, max_workers=4):
+    """Runs commands on many hosts concurrently.
+
+    commands maps a name to a (client, command) pair, at most max_workers
+    commands run at the same time. Give the clients a ConnectionCache to
+    run several rounds of commands over the same connections. Returns a
+    dict mapping the names to the outputs of the commands which succeeded
+    and one mapping the names to the exceptions of the failed ones.
+    """
+    graph = concurrency.TaskGraph(max_workers)
+    for name, (client, command) in commands.items():
+        graph.add(name, client.exec_command, (command,))
+    try:
+        graph.run(fail_fast=False)
+    except Exception:
+        # Every error is returned below.
+        pass
+    errors = dict((name, exc_info[1])
+                  for name, exc_info in graph.errors.items())
+    return graph.results, errors
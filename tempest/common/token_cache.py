@@ -0,0 +1,99 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import threading
+
+from tempest.common.utils.misc import singleton
+from tempest.openstack.common import log as logging
+from tempest.openstack.common import timeutils
+
+LOG = logging.getLogger(__name__)
+
+# token: the token id
+# expires_at: naive UTC datetime of the token expiry, or None if unknown
+# catalog: the parsed service catalog returned along with the token
+AuthData = collections.namedtuple('AuthData',
+                                  ['token', 'expires_at', 'catalog'])
+
+
+def parse_expiry(expires):
+    """Converts a keystone expiry timestamp into a naive UTC datetime."""
+    if not expires:
+        return None
+    try:
+        return timeutils.normalize_time(timeutils.parse_isotime(expires))
+    except ValueError:
+        LOG.warning("Unable to parse token expiry '%s'" % expires)
+        return None
+
+
+@singleton
+class TokenCache(object):
+    """Process wide cache of keystone tokens and service catalogs.
+
+    Entries are keyed by the credentials used to obtain them, so every
+    client authenticating with the same credentials against the same
+    identity endpoint shares a single token. A token is fetched again
+    when it is about to expire or after it was explicitly invalidated.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._locks = collections.defaultdict(threading.Lock)
+        self._locks_lock = threading.Lock()
+
+    def _lock_for(self, key):
+        with self._locks_lock:
+            return self._locks[key]
+
+    @staticmethod
+    def _expiring(auth_data, refresh_margin):
+        if auth_data.expires_at is None:
+            return False
+        return timeutils.is_soon(auth_data.expires_at, refresh_margin)
+
+    def get(self, key, fetch_func, refresh_margin=0):
+        """Returns the AuthData cached for key.
+
+        fetch_func is called to authenticate (and must return an AuthData)
+        if nothing is cached yet or if the cached token expires within
+        refresh_margin seconds.
+        """
+        auth_data = self._entries.get(key)
+        if auth_data and not self._expiring(auth_data, refresh_margin):
+            return auth_data
+        with self._lock_for(key):
+            # Another thread may have refreshed it in the meantime.
+            auth_data = self._entries.get(key)
+            if auth_data and not self._expiring(auth_data, refresh_margin):
+                return auth_data
+            auth_data = fetch_func()
+            self._entries[key] = auth_data
+            return auth_data
+
+    def is_fresh(self, key, token, refresh_margin=0):
+        """Checks that token is still the cached, non expiring one."""
+        auth_data = self._entries.get(key)
+        return (auth_data is not None and auth_data.token == token and
+                not self._expiring(auth_data, refresh_margin))
+
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
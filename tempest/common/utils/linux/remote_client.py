@@ -25,7 +25,8 @@ from tempest.exceptions import SSHTimeout
 class RemoteClient():
 
     # NOTE(afazekas): It should always get an address instead of server
-    def __init__(self, server, username, password=None, pkey=None):
+    def __init__(self, server, username, password=None, pkey=None,
+                 connection_cache=None):
         ssh_timeout = TempestConfig().compute.ssh_timeout
         network = TempestConfig().compute.network_for_ssh
         ip_version = TempestConfig().compute.ip_version_for_ssh
@@ -43,7 +44,8 @@ class RemoteClient():
 
         self.ssh_client = Client(ip_address, username, password, ssh_timeout,
                                  pkey=pkey,
-                                 channel_timeout=ssh_channel_timeout)
+                                 channel_timeout=ssh_channel_timeout,
+                                 connection_cache=connection_cache)
         if not self.ssh_client.test_connection_auth():
             raise SSHTimeout()
 
@@ -15,6 +15,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+
 
 def singleton(cls):
     """Simple wrapper for classes that should only have a single instance."""
@@ -25,3 +27,22 @@ def singleton(cls):
             instances[cls] = cls()
         return instances[cls]
     return getinstance
+
+
+class FrozenDict(collections.Mapping):
+    """Read-only dict, safe to share between many objects."""
+
+    def __init__(self, *args, **kwargs):
+        self._data = dict(*args, **kwargs)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self._data)
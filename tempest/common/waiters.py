@@ -37,8 +37,8 @@ def wait_for_server_status(client, server_id, status, ready_wait=True,
     resp, body = client.get_server(server_id)
     old_status = server_status = body['status']
     old_task_state = task_state = _get_task_state(body)
-    start_time = int(time.time())
     timeout = client.build_timeout + extra_timeout
+    poller = client.poll_policy.poller(timeout)
     while True:
         # NOTE(afazekas): Now the BUILD status only reached
         # between the UNKOWN->ACTIVE transition.
@@ -60,7 +60,7 @@ def wait_for_server_status(client, server_id, status, ready_wait=True,
             else:
                 return
 
-        time.sleep(client.build_interval)
+        poller.sleep()
         resp, body = client.get_server(server_id)
         server_status = body['status']
         task_state = _get_task_state(body)
@@ -68,11 +68,11 @@ def wait_for_server_status(client, server_id, status, ready_wait=True,
             LOG.info('State transition "%s" ==> "%s" after %d second wait',
                      '/'.join((old_status, str(old_task_state))),
                      '/'.join((server_status, str(task_state))),
-                     time.time() - start_time)
+                     poller.elapsed())
         if server_status == 'ERROR':
             raise exceptions.BuildErrorException(server_id=server_id)
 
-        timed_out = int(time.time()) - start_time >= timeout
+        timed_out = poller.expired()
 
         if timed_out:
             message = ('Server %s failed to reach %s status within the '
@@ -82,3 +82,78 @@ def wait_for_server_status(client, server_id, status, ready_wait=True,
             raise exceptions.TimeoutException(message)
         old_status = server_status
         old_task_state = task_state
+
+
+def wait_for_resources_status(list_resources, resource_ids, status,
+                              poll_policy, build_timeout,
+                              get_id=lambda r: r['id'],
+                              get_status=lambda r: r['status'],
+                              error_status='ERROR', allow_notfound=False):
+    """Waits for many resources to reach a given status.
+
+    Instead of fetching every resource on its own, list_resources is called
+    once per poll and must return (at least) all the watched resources. A
+    resource is done when get_status returns status, or when it is missing
+    from the listing and allow_notfound is set (deletion, status may then be
+    None to only wait for the missing resources). The time between the
+    polls is given by poll_policy (a backoff.PollPolicy). Returns as soon as
+    all the resources are done, with a dict mapping each resource id to its
+    list of (seconds since start, status) transitions.
+    """
+    pending = set(resource_ids)
+    transitions = dict((resource_id, []) for resource_id in pending)
+    poller = poll_policy.poller(build_timeout)
+    while True:
+        elapsed = poller.elapsed()
+        resources = dict((get_id(r), r) for r in list_resources())
+        for resource_id in list(pending):
+            resource = resources.get(resource_id)
+            if resource is None:
+                current = None if allow_notfound else 'UNKNOWN'
+            else:
+                current = get_status(resource)
+            history = transitions[resource_id]
+            if not history or history[-1][1] != current:
+                if history:
+                    LOG.info('State transition of %s "%s" ==> "%s" after %d '
+                             'second wait', resource_id, history[-1][1],
+                             current, elapsed)
+                history.append((elapsed, current))
+            if resource is None and allow_notfound:
+                pending.remove(resource_id)
+            elif error_status is not None and current == error_status:
+                raise exceptions.ResourceErrorException(
+                    resource_id=resource_id, status=current)
+            elif status is not None and current == status:
+                pending.remove(resource_id)
+        if not pending:
+            return transitions
+
+        if not poller.sleep():
+            message = ('Resources %s failed to reach %s status within the '
+                       'required time (%s s).' %
+                       (', '.join(sorted(pending)), status, build_timeout))
+            raise exceptions.TimeoutException(message)
+
+
+def wait_for_servers_status(client, server_ids, status, extra_timeout=0):
+    """Waits for many servers to reach a given status.
+
+    Polls the servers detail listing once per interval for all the servers,
+    a server is only considered done when no task is in progress on it.
+    """
+
+    def _get_status(server):
+        task_state = server.get('OS-EXT-STS:task_state', None)
+        # NOTE(afazekas): Converted to string bacuse of the XML responses
+        if server['status'] == 'ERROR' or str(task_state) == "None":
+            return server['status']
+        return '/'.join((server['status'], str(task_state)))
+
+    def _list_servers():
+        resp, body = client.list_servers_with_detail()
+        return body['servers']
+
+    return wait_for_resources_status(
+        _list_servers, server_ids, status, client.poll_policy,
+        client.build_timeout + extra_timeout, get_status=_get_status)
@@ -23,6 +23,7 @@ import sys
 
 from oslo.config import cfg
 
+from tempest.common.utils.misc import FrozenDict
 from tempest.common.utils.misc import singleton
 from tempest.openstack.common import log as logging
 
@@ -91,6 +92,22 @@ IdentityGroup = [
                default='pass',
                help="API key to use when authenticating as admin.",
                secret=True),
+    cfg.BoolOpt('token_cache',
+                default=True,
+                help="Share the tokens and service catalogs obtained from "
+                     "keystone between all the clients using the same "
+                     "credentials."),
+    cfg.IntOpt('token_refresh_margin',
+               default=300,
+               help="Time in seconds before the expiry of a cached token "
+                    "at which a new one is requested."),
+    cfg.IntOpt('isolated_creds_workers',
+               default=4,
+               help="Maximum number of concurrent API calls used to create "
+                    "and delete isolated credentials and their network "
+                    "resources. 1 makes them sequential. The scenario "
+                    "tests, which use the official clients, always make "
+                    "them sequentially."),
 ]
 
 compute_group = cfg.OptGroup(name='compute',
@@ -135,6 +152,19 @@ ComputeGroup = [
     cfg.IntOpt('build_timeout',
                default=300,
                help="Timeout in seconds to wait for an instance to build."),
+    cfg.FloatOpt('poll_initial_interval',
+                 default=1.0,
+                 help="Time in seconds between the first instance status "
+                      "checks, it then grows up to build_interval."),
+    cfg.FloatOpt('poll_backoff_factor',
+                 default=2.0,
+                 help="Factor by which the time between instance status "
+                      "checks grows after every check."),
+    cfg.IntOpt('teardown_workers',
+               default=4,
+               help="Maximum number of concurrent API calls used to delete "
+                    "the resources of a test class in its tear down, for "
+                    "all the services. 1 makes the deletions sequential."),
     cfg.BoolOpt('run_ssh',
                 default=False,
                 help="Does the test environment support snapshots?"),
@@ -328,6 +358,14 @@ VolumeGroup = [
                default=300,
                help='Timeout in seconds to wait for a volume to become'
                     'available.'),
+    cfg.FloatOpt('poll_initial_interval',
+                 default=1.0,
+                 help="Time in seconds between the first volume status "
+                      "checks, it then grows up to build_interval."),
+    cfg.FloatOpt('poll_backoff_factor',
+                 default=2.0,
+                 help="Factor by which the time between volume status "
+                      "checks grows after every check."),
     cfg.StrOpt('catalog_type',
                default='volume',
                help="Catalog type of the Volume Service"),
@@ -389,6 +427,14 @@ ObjectStoreGroup = [
                default='Member',
                help="Role to add to users created for swift tests to "
                     "enable creating containers"),
+    cfg.IntOpt('segment_size',
+               default=64 * 1024 * 1024,
+               help="Size in bytes of the segments of the large objects "
+                    "uploaded by the object client."),
+    cfg.IntOpt('transfer_workers',
+               default=4,
+               help="Number of segments or ranges of a large object "
+                    "transferred concurrently by the object client."),
 ]
 
 object_storage_feature_group = cfg.OptGroup(
@@ -409,6 +455,10 @@ ObjectStoreFeaturesGroup = [
     cfg.BoolOpt('tempurl',
                 default=True,
                 help="Set to True if the TempURL middleware is enabled"),
+    cfg.BoolOpt('bulk_delete',
+                default=True,
+                help="Set to True if the Bulk middleware is enabled, the "
+                     "test containers are then emptied with bulk deletes"),
 ]
 
 
@@ -437,6 +487,14 @@ OrchestrationGroup = [
     cfg.IntOpt('build_timeout',
                default=300,
                help="Timeout in seconds to wait for a stack to build."),
+    cfg.FloatOpt('poll_initial_interval',
+                 default=1.0,
+                 help="Time in seconds between the first stack status "
+                      "checks, it then grows up to build_interval."),
+    cfg.FloatOpt('poll_backoff_factor',
+                 default=2.0,
+                 help="Factor by which the time between stack status "
+                      "checks grows after every check."),
     cfg.StrOpt('instance_type',
                default='m1.micro',
                help="Instance type for tests. Needs to be big enough for a "
@@ -487,6 +545,15 @@ BotoGroup = [
                default="/opt/stack/devstack/files/images/"
                        "s3-materials/cirros-0.3.0",
                help="S3 Materials Path"),
+    cfg.IntOpt('s3_upload_workers',
+               default=4,
+               help="Maximum number of files, or parts of files, uploaded "
+                    "at the same time from the S3 materials path."),
+    cfg.IntOpt('s3_multipart_threshold',
+               default=0,
+               help="Size in bytes from which the S3 materials are sent "
+                    "with multipart uploads, 0 to never use them (the "
+                    "nova-objectstore S3 server does not support them)."),
     cfg.StrOpt('ari_manifest',
                default="cirros-0.3.0-x86_64-initrd.manifest.xml",
                help="ARI Ramdisk Image manifest"),
@@ -511,6 +578,14 @@ BotoGroup = [
     cfg.IntOpt('build_interval',
                default=1,
                help="Status Change Test Interval"),
+    cfg.FloatOpt('poll_initial_interval',
+                 default=1.0,
+                 help="Time in seconds between the first EC2/S3 resource "
+                      "status checks, it then grows up to build_interval."),
+    cfg.FloatOpt('poll_backoff_factor',
+                 default=2.0,
+                 help="Factor by which the time between EC2/S3 resource "
+                      "status checks grows after every check."),
 ]
 
 stress_group = cfg.OptGroup(name='stress', title='Stress Test Options')
@@ -543,7 +618,16 @@ StressGroup = [
                help='time (in seconds) between log file error checks.'),
     cfg.IntOpt('default_thread_number_per_action',
                default=4,
-               help='The number of threads created while stress test.')
+               help='The number of threads created while stress test.'),
+    cfg.IntOpt('report_interval',
+               default=10,
+               help='Time (in seconds) between the reports of the '
+                    'throughput and latencies of the actions during a '
+                    'stress test, 0 to disable them.'),
+    cfg.StrOpt('metrics_file',
+               default=None,
+               help='File the periodic stress reports are appended to, '
+                    'as lines of JSON.')
 ]
 
 
@@ -613,6 +697,63 @@ DebugGroup = [
                 help="Enable diagnostic commands"),
 ]
 
+http_group = cfg.OptGroup(name="http",
+                          title="HTTP Client Options")
+
+HttpGroup = [
+    cfg.BoolOpt('keep_alive',
+                default=False,
+                help="Reuse HTTP connections across the REST clients "
+                     "instead of closing them after every request."),
+    cfg.IntOpt('pool_maxsize',
+               default=10,
+               help="Maximum number of idle keep-alive connections kept "
+                    "per endpoint."),
+    cfg.IntOpt('pool_idle_timeout',
+               default=30,
+               help="Time in seconds after which an idle keep-alive "
+                    "connection is closed instead of being reused."),
+    cfg.IntOpt('timeout',
+               default=300,
+               help="Time in seconds the HTTP connections wait for the "
+                    "server to accept, answer or send more data before "
+                    "failing. 0 waits forever."),
+    cfg.BoolOpt('record_timings',
+                default=False,
+                help="Record the timings of the REST calls per endpoint, "
+                     "log the endpoints taking the longest at exit and "
+                     "attach the report of its calls to every test."),
+    cfg.StrOpt('timing_report_file',
+               default=None,
+               help="File the statistics of every endpoint are appended "
+                    "to at exit, as JSON lines, when record_timings is "
+                    "set."),
+]
+
+credential_pool_group = cfg.OptGroup(name="credential-pool",
+                                     title="Isolated Credential Pool Options")
+
+CredentialPoolGroup = [
+    cfg.BoolOpt('enabled',
+                default=False,
+                help="Lease pre-provisioned isolated credentials to the "
+                     "test classes instead of creating new ones for each "
+                     "class. The pool is created and deleted with "
+                     "tools/credential_pool.py."),
+    cfg.IntOpt('size',
+               default=8,
+               help="Number of isolated credential sets in the pool. It "
+                    "should be at least the number of test workers, test "
+                    "classes create their own credentials when the pool "
+                    "is exhausted."),
+    cfg.StrOpt('lock_path',
+               default=None,
+               help="Directory holding the pool description and the lease "
+                    "lock files, shared by all the test workers. Defaults "
+                    "to a tempest-credential-pool directory in the system "
+                    "temporary directory."),
+]
+
 
 @singleton
 class TempestConfig:
@@ -674,6 +815,9 @@ class TempestConfig:
         register_opt_group(cfg.CONF, service_available_group,
                            ServiceAvailableGroup)
         register_opt_group(cfg.CONF, debug_group, DebugGroup)
+        register_opt_group(cfg.CONF, http_group, HttpGroup)
+        register_opt_group(cfg.CONF, credential_pool_group,
+                           CredentialPoolGroup)
         self.compute = cfg.CONF.compute
         self.compute_feature_enabled = cfg.CONF['compute-feature-enabled']
         self.identity = cfg.CONF.identity
@@ -693,7 +837,33 @@ class TempestConfig:
         self.scenario = cfg.CONF.scenario
         self.service_available = cfg.CONF.service_available
         self.debug = cfg.CONF.debug
+        self.http = cfg.CONF.http
+        self.credential_pool = cfg.CONF['credential-pool']
         if not self.compute_admin.username:
             self.compute_admin.username = self.identity.admin_username
             self.compute_admin.password = self.identity.admin_password
             self.compute_admin.tenant_name = self.identity.admin_tenant_name
+        self.service_regions = self._get_service_regions()
+
+    def _get_service_regions(self):
+        """Maps the catalog type of every service to its region.
+
+        Computed once here instead of in every client, the services are the
+        option groups having a catalog_type and the region of a service
+        defaults to identity.region. This is the only per-service setting
+        the clients derived by scanning the whole configuration; the others
+        (build_interval, build_timeout, the poll policy) are read from the
+        option group of the service, which is cheap, so they are not
+        precomputed.
+        """
+        regions = {}
+        for cfgname in dir(self):
+            cfg_group = getattr(self, cfgname)
+            catalog_type = getattr(cfg_group, 'catalog_type', None)
+            if not catalog_type:
+                continue
+            service_region = getattr(cfg_group, 'region', None)
+            if not service_region:
+                service_region = self.identity.region
+            regions[catalog_type] = service_region
+        return FrozenDict(regions)
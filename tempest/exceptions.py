@@ -81,6 +81,10 @@ class BuildErrorException(TempestException):
     message = "Server %(server_id)s failed to build and is in ERROR status"
 
 
+class ResourceErrorException(BuildErrorException):
+    message = "Resource %(resource_id)s is in %(status)s status"
+
+
 class ImageKilledException(TempestException):
     message = "Image %(image_id)s 'killed' while waiting for '%(status)s'"
 
@@ -89,6 +93,16 @@ class AddImageException(TempestException):
     message = "Image %(image_id)s failed to become ACTIVE in the allotted time"
 
 
+class ImageChecksumMismatch(TempestException):
+    message = ("Data of image %(image_id)s has checksum %(actual)s instead "
+               "of %(expected)s")
+
+
+class ObjectChecksumMismatch(TempestException):
+    message = ("Data of object %(name)s has checksum %(actual)s instead of "
+               "%(expected)s")
+
+
 class EC2RegisterImageException(TempestException):
     message = ("Image %(image_id)s failed to become 'available' "
                "in the allotted time")
@@ -18,7 +18,6 @@
 
 import logging
 import os
-import subprocess
 
 # Default client libs
 import cinderclient.client
@@ -32,10 +31,13 @@ import novaclient.client
 from novaclient import exceptions as nova_exceptions
 
 from tempest.api.network import common as net_common
+from tempest.common import backoff
 from tempest.common import isolated_creds
+from tempest.common import prober
 from tempest.common import ssh
 from tempest.common.utils import data_utils
 from tempest.common.utils.linux.remote_client import RemoteClient
+from tempest.common import waiters
 from tempest import exceptions
 import tempest.manager
 from tempest.openstack.common import log
@@ -219,6 +221,9 @@ class OfficialClientTest(tempest.test.BaseTestCase):
         cls.orchestration_client = cls.manager.orchestration_client
         cls.resource_keys = {}
         cls.os_resources = []
+        # The ssh connections to the servers are reused by all the checks
+        # of the class.
+        cls.ssh_connections = ssh.ConnectionCache()
 
     @classmethod
     def credentials(cls):
@@ -232,6 +237,7 @@ class OfficialClientTest(tempest.test.BaseTestCase):
 
     @classmethod
     def tearDownClass(cls):
+        cls.ssh_connections.close()
         # NOTE(jaypipes): Because scenario tests are typically run in a
         # specific order, and because test methods in scenario tests
         # generally create resources in a particular order, we destroy
@@ -318,6 +324,26 @@ class OfficialClientTest(tempest.test.BaseTestCase):
                              error_status=error_status,
                              not_found_exception=not_found_exception)
 
+    def status_timeout_batch(self, things, thing_ids, expected_status,
+                             error_status='ERROR'):
+        """
+        Given many things of the same kind, wait for all of them to reach
+        the expected status, listing all the things once per poll instead
+        of getting every thing on its own. At any time, if the returned
+        status of a thing is ERROR, fail out.
+        """
+        transitions = waiters.wait_for_resources_status(
+            things.list, thing_ids, expected_status,
+            backoff.PollPolicy.from_config(self.config.compute),
+            self.config.compute.build_timeout,
+            get_id=lambda thing: thing.id,
+            get_status=lambda thing: thing.status,
+            error_status=error_status)
+        for thing_id, history in transitions.items():
+            LOG.debug("%s reached %s status after %d seconds",
+                      thing_id, expected_status, history[-1][0])
+        return transitions
+
     def _status_timeout(self,
                         things,
                         thing_id,
@@ -476,7 +502,8 @@ class OfficialClientTest(tempest.test.BaseTestCase):
             username = self.config.scenario.ssh_user
         if private_key is None:
             private_key = self.keypair.private_key
-        return RemoteClient(ip, username, pkey=private_key)
+        return RemoteClient(ip, username, pkey=private_key,
+                            connection_cache=self.ssh_connections)
 
 
 class NetworkScenarioTest(OfficialClientTest):
@@ -603,22 +630,20 @@ class NetworkScenarioTest(OfficialClientTest):
         self.set_resource(data_utils.rand_name('floatingip-'), floating_ip)
         return floating_ip
 
-    def _ping_ip_address(self, ip_address):
-        cmd = ['ping', '-c1', '-w1', ip_address]
-
-        def ping():
-            proc = subprocess.Popen(cmd,
-                                    stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE)
-            proc.wait()
-            if proc.returncode == 0:
-                return True
+    def _ping_ip_addresses(self, ip_addresses):
+        """Pings all the addresses at once, returns a prober.ProbeResult."""
+        result = prober.Prober(self.config.compute.ping_timeout).probe(
+            ip_addresses)
+        LOG.info("Pinged %d addresses, first replies after (s, count): %s",
+                 len(ip_addresses), result.histogram())
+        return result
 
-        return tempest.test.call_until_true(
-            ping, self.config.compute.ping_timeout, 1)
+    def _ping_ip_address(self, ip_address):
+        return not self._ping_ip_addresses([ip_address]).unreachable
 
     def _is_reachable_via_ssh(self, ip_address, username, private_key,
                               timeout):
+        # NOTE: not from the connection cache, the check has to connect.
         ssh_client = ssh.Client(ip_address, username,
                                 pkey=private_key,
                                 timeout=timeout)
@@ -636,6 +661,21 @@ class NetworkScenarioTest(OfficialClientTest):
             'Auth failure in connecting to %s@%s via ssh' %
             (username, ip_address))
 
+    def _check_vms_connectivity(self, ip_addresses, username, private_key):
+        """Checks many VMs, all the addresses are pinged together."""
+        unreachable = self._ping_ip_addresses(ip_addresses).unreachable
+        self.assertEqual([], unreachable,
+                         "Timed out waiting for %s to become reachable" %
+                         ', '.join(unreachable))
+        for ip_address in ip_addresses:
+            self.assertTrue(self._is_reachable_via_ssh(
+                ip_address,
+                username,
+                private_key,
+                timeout=self.config.compute.ssh_timeout),
+                'Auth failure in connecting to %s@%s via ssh' %
+                (username, ip_address))
+
     def _create_security_group_nova(self, client=None,
                                     namestart='secgroup-smoke-',
                                     tenant_id=None):
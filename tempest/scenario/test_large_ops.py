@@ -37,9 +37,9 @@ class TestLargeOpsScenario(manager.NetworkScenarioTest):
     """
 
     def _wait_for_server_status(self, status):
-        for server in self.servers:
-            self.status_timeout(
-                self.compute_client.servers, server.id, status)
+        self.status_timeout_batch(self.compute_client.servers,
+                                  [server.id for server in self.servers],
+                                  status)
 
     def _wait_for_volume_status(self, status):
         volume_id = self.volume.id
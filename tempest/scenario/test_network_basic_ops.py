@@ -228,11 +228,11 @@ class TestNetworkBasicOps(manager.NetworkScenarioTest):
         # key-based authentication by cloud-init.
         ssh_login = self.config.compute.image_ssh_user
         private_key = self.keypairs[self.tenant_id].private_key
-        for server in self.servers:
-            for net_name, ip_addresses in server.networks.iteritems():
-                for ip_address in ip_addresses:
-                    self._check_vm_connectivity(ip_address, ssh_login,
-                                                private_key)
+        ip_addresses = [ip_address
+                        for server in self.servers
+                        for addresses in server.networks.itervalues()
+                        for ip_address in addresses]
+        self._check_vms_connectivity(ip_addresses, ssh_login, private_key)
 
     def _assign_floating_ips(self):
         public_network_id = self.config.network.public_network_id
@@ -246,13 +246,12 @@ class TestNetworkBasicOps(manager.NetworkScenarioTest):
         # key-based authentication by cloud-init.
         ssh_login = self.config.compute.image_ssh_user
         private_key = self.keypairs[self.tenant_id].private_key
+        ip_addresses = [floating_ip.floating_ip_address
+                        for floating_ips in self.floating_ips.itervalues()
+                        for floating_ip in floating_ips]
         try:
-            for server, floating_ips in self.floating_ips.iteritems():
-                for floating_ip in floating_ips:
-                    ip_address = floating_ip.floating_ip_address
-                    self._check_vm_connectivity(ip_address,
-                                                ssh_login,
-                                                private_key)
+            self._check_vms_connectivity(ip_addresses, ssh_login,
+                                         private_key)
         except Exception as exc:
             LOG.exception(exc)
             debug.log_ip_ns()
@@ -15,8 +15,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import ConfigParser
-import contextlib
+import threading
+import time
 import types
 import urlparse
 
@@ -24,8 +26,14 @@ from tempest import exceptions
 
 import boto
 import boto.ec2
+import boto.exception
 import boto.s3.connection
 
+# NOTE: the EC2 credentials of a user in a tenant, shared by the clients
+# of the process so they are looked up (or created) only once.
+_ec2_credentials = {}
+_ec2_credentials_lock = threading.Lock()
+
 
 class BotoClientBase(object):
 
@@ -43,8 +51,20 @@ class BotoClientBase(object):
                         "password": password,
                         "auth_url": auth_url,
                         "tenant_name": tenant_name}
+        self.pool_maxsize = config.http.pool_maxsize
+        self.idle_timeout = config.http.pool_idle_timeout
+        self._connections = collections.deque()
+        self._connections_lock = threading.Lock()
 
     def _keystone_aws_get(self):
+        key = (self.ks_cred["auth_url"], self.ks_cred["username"],
+               self.ks_cred["tenant_name"])
+        with _ec2_credentials_lock:
+            if key not in _ec2_credentials:
+                _ec2_credentials[key] = self._keystone_aws_lookup()
+            return _ec2_credentials[key]
+
+    def _keystone_aws_lookup(self):
         import keystoneclient.v2_0.client
 
         keystone = keystoneclient.v2_0.client.Client(**self.ks_cred)
@@ -73,8 +93,19 @@ class BotoClientBase(object):
         """Automatically creates methods for the allowed methods set."""
         if name in self.ALLOWED_METHODS:
             def func(self, *args, **kwargs):
-                with contextlib.closing(self.get_connection()) as conn:
-                    return getattr(conn, name)(*args, **kwargs)
+                conn = self._acquire_connection()
+                try:
+                    result = getattr(conn, name)(*args, **kwargs)
+                except boto.exception.BotoServerError:
+                    # An error answer, the connection is fine.
+                    self._release_connection(conn)
+                    raise
+                except Exception:
+                    # The connection state is unknown, never reuse it.
+                    conn.close()
+                    raise
+                self._release_connection(conn)
+                return result
 
             func.__name__ = name
             setattr(self, name, types.MethodType(func, self, self.__class__))
@@ -99,6 +130,29 @@ class BotoClientBase(object):
                     "Unable to get access and secret keys")
         return self.connect_method(**self.connection_data)
 
+    def _acquire_connection(self):
+        """Returns an idle connection of the client, or a new one.
+
+        A connection is used by one call at a time, so the clients can be
+        shared by concurrent threads. Connections idle for longer than
+        [http] pool_idle_timeout are closed instead of being reused.
+        """
+        now = time.time()
+        with self._connections_lock:
+            while self._connections:
+                last_used, conn = self._connections.pop()
+                if now - last_used <= self.idle_timeout:
+                    return conn
+                conn.close()
+        return self.get_connection()
+
+    def _release_connection(self, conn):
+        with self._connections_lock:
+            if len(self._connections) < self.pool_maxsize:
+                self._connections.append((time.time(), conn))
+                return
+        conn.close()
+
 
 class APIClientEC2(BotoClientBase):
 
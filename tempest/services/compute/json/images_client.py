@@ -16,7 +16,6 @@
 #    under the License.
 
 import json
-import time
 import urllib
 
 from tempest.common.rest_client import RestClient
@@ -83,16 +82,16 @@ class ImagesClientJSON(RestClient):
     def wait_for_image_status(self, image_id, status):
         """Waits for an image to reach a given status."""
         resp, image = self.get_image(image_id)
-        start = int(time.time())
+        poller = self.poll_policy.poller(self.build_timeout)
 
         while image['status'] != status:
-            time.sleep(self.build_interval)
+            poller.sleep()
             resp, image = self.get_image(image_id)
 
             if image['status'] == 'ERROR':
                 raise exceptions.AddImageException(image_id=image_id)
 
-            if int(time.time()) - start >= self.build_timeout:
+            if poller.expired():
                 raise exceptions.TimeoutException
 
     def list_image_metadata(self, image_id):
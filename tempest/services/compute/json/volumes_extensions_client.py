@@ -16,9 +16,9 @@
 #    under the License.
 
 import json
-import time
 import urllib
 
+from tempest.common import backoff
 from tempest.common.rest_client import RestClient
 from tempest import exceptions
 
@@ -32,6 +32,8 @@ class VolumesExtensionsClientJSON(RestClient):
         self.service = self.config.compute.catalog_type
         self.build_interval = self.config.volume.build_interval
         self.build_timeout = self.config.volume.build_timeout
+        self.poll_policy = backoff.PollPolicy.from_config(
+            self.config.volume)
 
     def list_volumes(self, params=None):
         """List all the volumes created."""
@@ -88,16 +90,16 @@ class VolumesExtensionsClientJSON(RestClient):
         resp, body = self.get_volume(volume_id)
         volume_name = body['displayName']
         volume_status = body['status']
-        start = int(time.time())
+        poller = self.poll_policy.poller(self.build_timeout)
 
         while volume_status != status:
-            time.sleep(self.build_interval)
+            poller.sleep()
             resp, body = self.get_volume(volume_id)
             volume_status = body['status']
             if volume_status == 'error':
                 raise exceptions.VolumeBuildErrorException(volume_id=volume_id)
 
-            if int(time.time()) - start >= self.build_timeout:
+            if poller.expired():
                 message = ('Volume %s failed to reach %s status within '
                            'the required time (%s s).' %
                            (volume_name, status, self.build_timeout))
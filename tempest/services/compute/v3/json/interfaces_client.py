@@ -14,7 +14,6 @@
 #    under the License.
 
 import json
-import time
 
 from tempest.common.rest_client import RestClient
 from tempest import exceptions
@@ -65,14 +64,14 @@ class InterfacesV3ClientJSON(RestClient):
         """Waits for a interface to reach a given status."""
         resp, body = self.show_interface(server, port_id)
         interface_status = body['port_state']
-        start = int(time.time())
+        poller = self.poll_policy.poller(self.build_timeout)
 
         while(interface_status != status):
-            time.sleep(self.build_interval)
+            poller.sleep()
             resp, body = self.show_interface(server, port_id)
             interface_status = body['port_state']
 
-            timed_out = int(time.time()) - start >= self.build_timeout
+            timed_out = poller.expired()
 
             if interface_status != status and timed_out:
                 message = ('Interface %s failed to reach %s status within '
@@ -18,7 +18,6 @@
 #    under the License.
 
 import json
-import time
 import urllib
 
 from tempest.common.rest_client import RestClient
@@ -168,7 +167,7 @@ class ServersV3ClientJSON(RestClient):
 
     def wait_for_server_termination(self, server_id, ignore_error=False):
         """Waits for server to reach termination."""
-        start_time = int(time.time())
+        poller = self.poll_policy.poller(self.build_timeout)
         while True:
             try:
                 resp, body = self.get_server(server_id)
@@ -179,10 +178,10 @@ class ServersV3ClientJSON(RestClient):
             if server_status == 'ERROR' and not ignore_error:
                 raise exceptions.BuildErrorException(server_id=server_id)
 
-            if int(time.time()) - start_time >= self.build_timeout:
+            if poller.expired():
                 raise exceptions.TimeoutException
 
-            time.sleep(self.build_interval)
+            poller.sleep()
 
     def list_addresses(self, server_id):
         """Lists all addresses for a server."""
@@ -16,7 +16,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import time
 import urllib
 
 from lxml import etree
@@ -28,6 +27,8 @@ from tempest.openstack.common import log as logging
 from tempest.services.compute.xml.common import Document
 from tempest.services.compute.xml.common import Element
 from tempest.services.compute.xml.common import Text
+from tempest.services.compute.xml.common import xml_string_to_json
+from tempest.services.compute.xml.common import xml_string_to_json_list
 from tempest.services.compute.xml.common import xml_to_json
 from tempest.services.compute.xml.common import XMLNS_V3
 
@@ -218,19 +219,13 @@ class ServersV3ClientXML(RestClientXML):
         """Deletes the given server."""
         return self.delete("servers/%s" % str(server_id))
 
-    def _parse_array(self, node):
-        array = []
-        for child in node.getchildren():
-            array.append(xml_to_json(child))
-        return array
-
     def list_servers(self, params=None):
         url = 'servers'
         if params:
             url += '?%s' % urllib.urlencode(params)
 
         resp, body = self.get(url, self.headers)
-        servers = self._parse_array(etree.fromstring(body))
+        servers = xml_string_to_json_list(body)
         return resp, {"servers": servers}
 
     def list_servers_with_detail(self, params=None):
@@ -239,7 +234,7 @@ class ServersV3ClientXML(RestClientXML):
             url += '?%s' % urllib.urlencode(params)
 
         resp, body = self.get(url, self.headers)
-        servers = self._parse_array(etree.fromstring(body))
+        servers = xml_string_to_json_list(body)
         return resp, {"servers": servers}
 
     def update_server(self, server_id, name=None, meta=None, access_ip_v4=None,
@@ -264,7 +259,7 @@ class ServersV3ClientXML(RestClientXML):
 
         resp, body = self.put('servers/%s' % str(server_id),
                               str(doc), self.headers)
-        return resp, xml_to_json(etree.fromstring(body))
+        return resp, xml_string_to_json(body)
 
     def create_server(self, name, image_ref, flavor_ref, **kwargs):
         """
@@ -383,7 +378,7 @@ class ServersV3ClientXML(RestClientXML):
 
     def wait_for_server_termination(self, server_id, ignore_error=False):
         """Waits for server to reach termination."""
-        start_time = int(time.time())
+        poller = self.poll_policy.poller(self.build_timeout)
         while True:
             try:
                 resp, body = self.get_server(server_id)
@@ -394,10 +389,10 @@ class ServersV3ClientXML(RestClientXML):
             if server_status == 'ERROR' and not ignore_error:
                 raise exceptions.BuildErrorException
 
-            if int(time.time()) - start_time >= self.build_timeout:
+            if poller.expired():
                 raise exceptions.TimeoutException
 
-            time.sleep(self.build_interval)
+            poller.sleep()
 
     def _parse_network(self, node):
         addrs = []
@@ -434,7 +429,7 @@ class ServersV3ClientXML(RestClientXML):
         resp, body = self.post("servers/%s/action" % server_id,
                                str(doc), self.headers)
         if response_key is not None:
-            body = xml_to_json(etree.fromstring(body))
+            body = xml_string_to_json(body)
         return resp, body
 
     def change_password(self, server_id, password):
@@ -547,7 +542,7 @@ class ServersV3ClientXML(RestClientXML):
                 metadata.append(meta_element)
         resp, body = self.put('servers/%s/metadata' % str(server_id),
                               str(doc), self.headers)
-        return resp, xml_to_json(etree.fromstring(body))
+        return resp, xml_string_to_json(body)
 
     def update_server_metadata(self, server_id, meta):
         doc = Document()
@@ -559,14 +554,14 @@ class ServersV3ClientXML(RestClientXML):
             metadata.append(meta_element)
         resp, body = self.post("/servers/%s/metadata" % str(server_id),
                                str(doc), headers=self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body
 
     def get_server_metadata_item(self, server_id, key):
         resp, body = self.get("servers/%s/metadata/%s" % (str(server_id), key),
                               headers=self.headers)
         return resp, dict([(etree.fromstring(body).attrib['key'],
-                            xml_to_json(etree.fromstring(body)))])
+                            xml_string_to_json(body))])
 
     def set_server_metadata_item(self, server_id, key, meta):
         doc = Document()
@@ -576,7 +571,7 @@ class ServersV3ClientXML(RestClientXML):
             doc.append(meta_element)
         resp, body = self.put('servers/%s/metadata/%s' % (str(server_id), key),
                               str(doc), self.headers)
-        return resp, xml_to_json(etree.fromstring(body))
+        return resp, xml_string_to_json(body)
 
     def delete_server_metadata_item(self, server_id, key):
         resp, body = self.delete("servers/%s/metadata/%s" %
@@ -607,19 +602,19 @@ class ServersV3ClientXML(RestClientXML):
         """Get the usage data for a server."""
         resp, body = self.get("servers/%s/os-server-diagnostics" % server_id,
                               self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body
 
     def list_instance_actions(self, server_id):
         """List the provided server action."""
         resp, body = self.get("servers/%s/os-instance-actions" % server_id,
                               self.headers)
-        body = self._parse_array(etree.fromstring(body))
+        body = xml_string_to_json_list(body)
         return resp, body
 
     def get_instance_action(self, server_id, request_id):
         """Returns the action details of the provided server."""
         resp, body = self.get("servers/%s/os-instance-actions/%s" %
                               (server_id, request_id), self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body
@@ -17,6 +17,8 @@
 
 import collections
 
+from lxml import etree
+
 XMLNS_11 = "http://docs.openstack.org/compute/api/v1.1"
 XMLNS_V3 = "http://docs.openstack.org/compute/api/v1.1"
 
@@ -119,6 +121,84 @@ def xml_to_json(node):
     return json
 
 
+# Namespace stripped names of the tags seen so far, a response only uses a
+# handful of distinct tags.
+_local_names = {}
+
+
+def _local_name(tag):
+    try:
+        return _local_names[tag]
+    except KeyError:
+        name = tag
+        if tag.startswith("{"):
+            ns, name = tag.split("}", 1)
+        _local_names[tag] = name
+        return name
+
+
+class _JsonTarget(object):
+    """lxml parser target doing the xml_to_json conversion while parsing.
+
+    The parser calls start/data/end as it reads the document, so no
+    element tree is ever built: every element is converted when it is
+    closed and only its json is kept, in the dict of its parent (or in
+    the list of entries if as_list is set and the parent is the root).
+    """
+
+    def __init__(self, as_list=False):
+        self.as_list = as_list
+        # [json, has_children, text, tag] frames of the open elements
+        self.stack = []
+        self.items = []
+        self.result = None
+
+    def start(self, tag, attrib):
+        json = dict(attrib)
+        for attr in [attr for attr in json if attr.startswith("xmlns")]:
+            del json[attr]
+        if self.stack:
+            self.stack[-1][1] = True
+        self.stack.append([json, False, None, tag])
+
+    def data(self, data):
+        frame = self.stack[-1]
+        if not frame[1]:
+            # Only the text before the first child is the element text.
+            frame[2] = data if frame[2] is None else frame[2] + data
+
+    def end(self, tag):
+        json, has_children, text, tag = self.stack.pop()
+        if not has_children:
+            json = text or json
+        if not self.stack:
+            self.result = json
+        elif self.as_list and len(self.stack) == 1:
+            self.items.append(json)
+        else:
+            self.stack[-1][0][_local_name(tag)] = json
+
+    def close(self):
+        return self.items if self.as_list else self.result
+
+
+def xml_string_to_json(body):
+    """Streaming equivalent of xml_to_json(etree.fromstring(body)).
+
+    The document tree is never built, so large list responses are
+    converted in a fraction of the memory.
+    """
+    return etree.fromstring(body, etree.XMLParser(target=_JsonTarget()))
+
+
+def xml_string_to_json_list(body):
+    """Streaming equivalent of converting each child of the root of body
+    with xml_to_json, e.g. for the entries of a list response.
+    """
+    return etree.fromstring(body,
+                            etree.XMLParser(target=_JsonTarget(as_list=True)))
+
+
 def deep_dict_to_xml(dest, source):
     """Populates the ``dest`` xml element with the ``source`` ``Mapping``
        elements, if the source Mapping's value is also a ``Mapping``
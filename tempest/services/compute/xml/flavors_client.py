@@ -23,6 +23,7 @@ from tempest.common.rest_client import RestClientXML
 from tempest.services.compute.xml.common import Document
 from tempest.services.compute.xml.common import Element
 from tempest.services.compute.xml.common import Text
+from tempest.services.compute.xml.common import xml_string_to_json
 from tempest.services.compute.xml.common import xml_to_json
 from tempest.services.compute.xml.common import XMLNS_11
 
@@ -96,7 +97,7 @@ class FlavorsClientXML(RestClientXML):
 
     def get_flavor_details(self, flavor_id):
         resp, body = self.get("flavors/%s" % str(flavor_id), self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         flavor = self._format_flavor(body)
         return resp, flavor
 
@@ -122,7 +123,7 @@ class FlavorsClientXML(RestClientXML):
         flavor.add_attr('xmlns:OS-FLV-EXT-DATA', XMLNS_OS_FLV_EXT_DATA)
         flavor.add_attr('xmlns:os-flavor-access', XMLNS_OS_FLV_ACCESS)
         resp, body = self.post('flavors', str(Document(flavor)), self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         flavor = self._format_flavor(body)
         return resp, flavor
 
@@ -147,14 +148,14 @@ class FlavorsClientXML(RestClientXML):
             extra_specs.add_attr(key, specs[key])
         resp, body = self.post('flavors/%s/os-extra_specs' % flavor_id,
                                str(Document(extra_specs)), self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body
 
     def get_flavor_extra_spec(self, flavor_id):
         """Gets extra Specs of the mentioned flavor."""
         resp, body = self.get('flavors/%s/os-extra_specs' % flavor_id,
                               self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body
 
     def get_flavor_extra_spec_with_key(self, flavor_id, key):
@@ -179,7 +180,7 @@ class FlavorsClientXML(RestClientXML):
         resp, body = self.put('flavors/%s/os-extra_specs/%s' %
                               (flavor_id, key),
                               str(doc), self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, {key: body}
 
     def unset_flavor_extra_spec(self, flavor_id, key):
@@ -23,6 +23,7 @@ from tempest import exceptions
 from tempest.services.compute.xml.common import Document
 from tempest.services.compute.xml.common import Element
 from tempest.services.compute.xml.common import Text
+from tempest.services.compute.xml.common import xml_string_to_json_list
 from tempest.services.compute.xml.common import xml_to_json
 
 
@@ -32,12 +33,6 @@ class FloatingIPsClientXML(RestClientXML):
                                                    auth_url, tenant_name)
         self.service = self.config.compute.catalog_type
 
-    def _parse_array(self, node):
-        array = []
-        for child in node.getchildren():
-            array.append(xml_to_json(child))
-        return array
-
     def _parse_floating_ip(self, body):
         json = xml_to_json(body)
         return json
@@ -49,7 +44,7 @@ class FloatingIPsClientXML(RestClientXML):
             url += '?%s' % urllib.urlencode(params)
 
         resp, body = self.get(url, self.headers)
-        body = self._parse_array(etree.fromstring(body))
+        body = xml_string_to_json_list(body)
         return resp, body
 
     def get_floating_ip_details(self, floating_ip_id):
@@ -115,5 +110,5 @@ class FloatingIPsClientXML(RestClientXML):
             url += '?%s' % urllib.urlencode(params)
 
         resp, body = self.get(url, self.headers)
-        body = self._parse_array(etree.fromstring(body))
+        body = xml_string_to_json_list(body)
         return resp, body
@@ -18,6 +18,7 @@
 from lxml import etree
 
 from tempest.common.rest_client import RestClientXML
+from tempest.services.compute.xml.common import xml_string_to_json
 from tempest.services.compute.xml.common import xml_to_json
 
 
@@ -48,7 +49,7 @@ class HypervisorClientXML(RestClientXML):
         """Display the details of the specified hypervisor."""
         resp, body = self.get('os-hypervisors/%s' % hyper_id,
                               self.headers)
-        hypervisor = xml_to_json(etree.fromstring(body))
+        hypervisor = xml_string_to_json(body)
         return resp, hypervisor
 
     def get_hypervisor_servers(self, hyper_name):
@@ -61,14 +62,14 @@ class HypervisorClientXML(RestClientXML):
     def get_hypervisor_stats(self):
         """Get hypervisor statistics over all compute nodes."""
         resp, body = self.get('os-hypervisors/statistics', self.headers)
-        stats = xml_to_json(etree.fromstring(body))
+        stats = xml_string_to_json(body)
         return resp, stats
 
     def get_hypervisor_uptime(self, hyper_id):
         """Display the uptime of the specified hypervisor."""
         resp, body = self.get('os-hypervisors/%s/uptime' % hyper_id,
                               self.headers)
-        uptime = xml_to_json(etree.fromstring(body))
+        uptime = xml_string_to_json(body)
         return resp, uptime
 
     def search_hypervisor(self, hyper_name):
@@ -15,7 +15,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import time
 import urllib
 
 from lxml import etree
@@ -25,6 +24,7 @@ from tempest import exceptions
 from tempest.services.compute.xml.common import Document
 from tempest.services.compute.xml.common import Element
 from tempest.services.compute.xml.common import Text
+from tempest.services.compute.xml.common import xml_string_to_json
 from tempest.services.compute.xml.common import xml_to_json
 from tempest.services.compute.xml.common import XMLNS_11
 
@@ -141,15 +141,15 @@ class ImagesClientXML(RestClientXML):
     def wait_for_image_status(self, image_id, status):
         """Waits for an image to reach a given status."""
         resp, image = self.get_image(image_id)
-        start = int(time.time())
+        poller = self.poll_policy.poller(self.build_timeout)
 
         while image['status'] != status:
-            time.sleep(self.build_interval)
+            poller.sleep()
             resp, image = self.get_image(image_id)
             if image['status'] == 'ERROR':
                 raise exceptions.AddImageException(image_id=image_id)
 
-            if int(time.time()) - start >= self.build_timeout:
+            if poller.expired():
                 raise exceptions.TimeoutException
 
     def _metadata_body(self, meta):
@@ -197,7 +197,7 @@ class ImagesClientXML(RestClientXML):
             post_body.append(Text(v))
         resp, body = self.put('images/%s/metadata/%s' % (str(image_id), key),
                               str(Document(post_body)), self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body
 
     def update_image_metadata_item(self, image_id, key, meta):
@@ -205,7 +205,7 @@ class ImagesClientXML(RestClientXML):
         post_body = Document('meta', Text(meta), key=key)
         resp, body = self.put('images/%s/metadata/%s' % (str(image_id), key),
                               post_body, self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body['meta']
 
     def delete_image_metadata_item(self, image_id, key):
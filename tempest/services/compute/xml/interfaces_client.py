@@ -13,8 +13,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import time
-
 from lxml import etree
 
 from tempest.common.rest_client import RestClientXML
@@ -88,14 +86,14 @@ class InterfacesClientXML(RestClientXML):
         """Waits for a interface to reach a given status."""
         resp, body = self.show_interface(server, port_id)
         interface_status = body['port_state']
-        start = int(time.time())
+        poller = self.poll_policy.poller(self.build_timeout)
 
         while(interface_status != status):
-            time.sleep(self.build_interval)
+            poller.sleep()
             resp, body = self.show_interface(server, port_id)
             interface_status = body['port_state']
 
-            timed_out = int(time.time()) - start >= self.build_timeout
+            timed_out = poller.expired()
 
             if interface_status != status and timed_out:
                 message = ('Interface %s failed to reach %s status within '
@@ -21,6 +21,7 @@ from tempest.common.rest_client import RestClientXML
 from tempest.services.compute.xml.common import Document
 from tempest.services.compute.xml.common import Element
 from tempest.services.compute.xml.common import Text
+from tempest.services.compute.xml.common import xml_string_to_json
 from tempest.services.compute.xml.common import xml_to_json
 
 
@@ -39,7 +40,7 @@ class KeyPairsClientXML(RestClientXML):
 
     def get_keypair(self, key_name):
         resp, body = self.get("os-keypairs/%s" % str(key_name), self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body
 
     def create_keypair(self, name, pub_key=None):
@@ -62,7 +63,7 @@ class KeyPairsClientXML(RestClientXML):
 
         resp, body = self.post("os-keypairs",
                                headers=self.headers, body=str(doc))
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body
 
     def delete_keypair(self, key_name):
@@ -15,11 +15,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-from lxml import etree
-
 from tempest.common.rest_client import RestClientXML
 from tempest.services.compute.xml.common import Document
 from tempest.services.compute.xml.common import Element
+from tempest.services.compute.xml.common import xml_string_to_json
 from tempest.services.compute.xml.common import xml_to_json
 from tempest.services.compute.xml.common import XMLNS_11
 
@@ -51,7 +50,7 @@ class QuotasClientXML(RestClientXML):
 
         url = 'os-quota-sets/%s' % str(tenant_id)
         resp, body = self.get(url, self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         body = self._format_quota(body)
         return resp, body
 
@@ -60,7 +59,7 @@ class QuotasClientXML(RestClientXML):
 
         url = 'os-quota-sets/%s/defaults' % str(tenant_id)
         resp, body = self.get(url, self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         body = self._format_quota(body)
         return resp, body
 
@@ -121,6 +120,6 @@ class QuotasClientXML(RestClientXML):
         resp, body = self.put('os-quota-sets/%s' % str(tenant_id),
                               str(Document(post_body)),
                               self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         body = self._format_quota(body)
         return resp, body
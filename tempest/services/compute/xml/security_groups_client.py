@@ -23,6 +23,7 @@ from tempest import exceptions
 from tempest.services.compute.xml.common import Document
 from tempest.services.compute.xml.common import Element
 from tempest.services.compute.xml.common import Text
+from tempest.services.compute.xml.common import xml_string_to_json_list
 from tempest.services.compute.xml.common import xml_to_json
 from tempest.services.compute.xml.common import XMLNS_11
 
@@ -35,12 +36,6 @@ class SecurityGroupsClientXML(RestClientXML):
             auth_url, tenant_name)
         self.service = self.config.compute.catalog_type
 
-    def _parse_array(self, node):
-        array = []
-        for child in node.getchildren():
-            array.append(xml_to_json(child))
-        return array
-
     def _parse_body(self, body):
         json = xml_to_json(body)
         return json
@@ -53,7 +48,7 @@ class SecurityGroupsClientXML(RestClientXML):
             url += '?%s' % urllib.urlencode(params)
 
         resp, body = self.get(url, self.headers)
-        body = self._parse_array(etree.fromstring(body))
+        body = xml_string_to_json_list(body)
         return resp, body
 
     def get_security_group(self, security_group_id):
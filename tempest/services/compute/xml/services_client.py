@@ -22,6 +22,7 @@ from lxml import etree
 from tempest.common.rest_client import RestClientXML
 from tempest.services.compute.xml.common import Document
 from tempest.services.compute.xml.common import Element
+from tempest.services.compute.xml.common import xml_string_to_json
 from tempest.services.compute.xml.common import xml_to_json
 
 
@@ -54,7 +55,7 @@ class ServicesClientXML(RestClientXML):
 
         resp, body = self.put('os-services/enable', str(Document(post_body)),
                               self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body
 
     def disable_service(self, host_name, binary):
@@ -69,5 +70,5 @@ class ServicesClientXML(RestClientXML):
 
         resp, body = self.put('os-services/disable', str(Document(post_body)),
                               self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body
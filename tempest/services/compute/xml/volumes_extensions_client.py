@@ -15,7 +15,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import time
 import urllib
 
 from lxml import etree
@@ -25,6 +24,7 @@ from tempest import exceptions
 from tempest.services.compute.xml.common import Document
 from tempest.services.compute.xml.common import Element
 from tempest.services.compute.xml.common import Text
+from tempest.services.compute.xml.common import xml_string_to_json
 from tempest.services.compute.xml.common import xml_to_json
 from tempest.services.compute.xml.common import XMLNS_11
 
@@ -112,7 +112,7 @@ class VolumesExtensionsClientXML(RestClientXML):
 
         resp, body = self.post('os-volumes', str(Document(volume)),
                                self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body
 
     def delete_volume(self, volume_id):
@@ -124,16 +124,16 @@ class VolumesExtensionsClientXML(RestClientXML):
         resp, body = self.get_volume(volume_id)
         volume_name = body['displayName']
         volume_status = body['status']
-        start = int(time.time())
+        poller = self.poll_policy.poller(self.build_timeout)
 
         while volume_status != status:
-            time.sleep(self.build_interval)
+            poller.sleep()
             resp, body = self.get_volume(volume_id)
             volume_status = body['status']
             if volume_status == 'error':
                 raise exceptions.VolumeBuildErrorException(volume_id=volume_id)
 
-            if int(time.time()) - start >= self.build_timeout:
+            if poller.expired():
                 message = 'Volume %s failed to reach %s status within '\
                           'the required time (%s s).' % (volume_name, status,
                                                          self.build_timeout)
@@ -269,9 +269,7 @@ class TokenClientJSON(RestClient):
 
     def request(self, method, url, headers=None, body=None):
         """A simple HTTP request interface."""
-        dscv = self.config.identity.disable_ssl_certificate_validation
-        self.http_obj = http.ClosingHttp(
-            disable_ssl_certificate_validation=dscv)
+        self.http_obj = http.get_http_obj(self.config)
         if headers is None:
             headers = {}
 
@@ -49,9 +49,7 @@ class EndPointClientXML(RestClientXML):
 
     def request(self, method, url, headers=None, body=None, wait=None):
         """Overriding the existing HTTP request in super class RestClient."""
-        dscv = self.config.identity.disable_ssl_certificate_validation
-        self.http_obj = http.ClosingHttp(
-            disable_ssl_certificate_validation=dscv)
+        self.http_obj = http.get_http_obj(self.config)
         self._set_auth()
         self.base_url = self.base_url.replace(
             urlparse.urlparse(self.base_url).path, "/v3")
@@ -23,6 +23,7 @@ from tempest.common.rest_client import RestClientXML
 from tempest.services.compute.xml.common import Document
 from tempest.services.compute.xml.common import Element
 from tempest.services.compute.xml.common import Text
+from tempest.services.compute.xml.common import xml_string_to_json_list
 from tempest.services.compute.xml.common import xml_to_json
 
 XMLNS = "http://docs.openstack.org/identity/api/v3"
@@ -60,12 +61,6 @@ class IdentityV3ClientXML(RestClientXML):
                 array.append(xml_to_json(child))
         return array
 
-    def _parse_array(self, node):
-        array = []
-        for child in node.getchildren():
-            array.append(xml_to_json(child))
-        return array
-
     def _parse_body(self, body):
         json = xml_to_json(body)
         return json
@@ -132,7 +127,7 @@ class IdentityV3ClientXML(RestClientXML):
     def get_users(self):
         """Get the list of users."""
         resp, body = self.get("users", self.headers)
-        body = self._parse_array(etree.fromstring(body))
+        body = xml_string_to_json_list(body)
         return resp, body
 
     def get_user(self, user_id):
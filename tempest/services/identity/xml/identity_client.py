@@ -24,6 +24,7 @@ from tempest.common.rest_client import RestClientXML
 from tempest import exceptions
 from tempest.services.compute.xml.common import Document
 from tempest.services.compute.xml.common import Element
+from tempest.services.compute.xml.common import xml_string_to_json_list
 from tempest.services.compute.xml.common import xml_to_json
 
 
@@ -38,12 +39,6 @@ class IdentityClientXML(RestClientXML):
         self.service = self.config.identity.catalog_type
         self.endpoint_url = 'adminURL'
 
-    def _parse_array(self, node):
-        array = []
-        for child in node.getchildren():
-            array.append(xml_to_json(child))
-        return array
-
     def _parse_body(self, body):
         data = xml_to_json(body)
         return data
@@ -95,7 +90,7 @@ class IdentityClientXML(RestClientXML):
         """Returns a list of roles assigned to a user for a tenant."""
         url = '/tenants/%s/users/%s/roles' % (tenant_id, user_id)
         resp, body = self.get(url, self.headers)
-        body = self._parse_array(etree.fromstring(body))
+        body = xml_string_to_json_list(body)
         return resp, body
 
     def assign_user_role(self, tenant_id, user_id, role_id):
@@ -124,13 +119,13 @@ class IdentityClientXML(RestClientXML):
     def list_roles(self):
         """Returns roles."""
         resp, body = self.get('OS-KSADM/roles', self.headers)
-        body = self._parse_array(etree.fromstring(body))
+        body = xml_string_to_json_list(body)
         return resp, body
 
     def list_tenants(self):
         """Returns tenants."""
         resp, body = self.get('tenants', self.headers)
-        body = self._parse_array(etree.fromstring(body))
+        body = xml_string_to_json_list(body)
         return resp, body
 
     def get_tenant_by_name(self, tenant_name):
@@ -201,7 +196,7 @@ class IdentityClientXML(RestClientXML):
     def get_users(self):
         """Get the list of users."""
         resp, body = self.get("users", self.headers)
-        body = self._parse_array(etree.fromstring(body))
+        body = xml_string_to_json_list(body)
         return resp, body
 
     def enable_disable_user(self, user_id, enabled):
@@ -209,7 +204,7 @@ class IdentityClientXML(RestClientXML):
         enable_user = Element("user", enabled=str(enabled).lower())
         resp, body = self.put('users/%s/enabled' % user_id,
                               str(Document(enable_user)), self.headers)
-        body = self._parse_array(etree.fromstring(body))
+        body = xml_string_to_json_list(body)
         return resp, body
 
     def delete_token(self, token_id):
@@ -220,7 +215,7 @@ class IdentityClientXML(RestClientXML):
     def list_users_for_tenant(self, tenant_id):
         """List users for a Tenant."""
         resp, body = self.get('/tenants/%s/users' % tenant_id, self.headers)
-        body = self._parse_array(etree.fromstring(body))
+        body = xml_string_to_json_list(body)
         return resp, body
 
     def get_user_by_username(self, tenant_id, username):
@@ -247,7 +242,7 @@ class IdentityClientXML(RestClientXML):
     def list_services(self):
         """Returns services."""
         resp, body = self.get('OS-KSADM/services', self.headers)
-        body = self._parse_array(etree.fromstring(body))
+        body = xml_string_to_json_list(body)
         return resp, body
 
     def get_service(self, service_id):
@@ -289,9 +284,7 @@ class TokenClientXML(RestClientXML):
 
     def request(self, method, url, headers=None, body=None):
         """A simple HTTP request interface."""
-        dscv = self.config.identity.disable_ssl_certificate_validation
-        self.http_obj = http.ClosingHttp(
-            disable_ssl_certificate_validation=dscv)
+        self.http_obj = http.get_http_obj(self.config)
         if headers is None:
             headers = {}
         self._log_request(method, url, headers, body)
@@ -19,7 +19,6 @@ import copy
 import errno
 import json
 import os
-import time
 import urllib
 
 from tempest.common import glance_http
@@ -113,21 +112,30 @@ class ImageClientJSON(RestClient):
         return glance_http.HTTPClient(endpoint=endpoint, token=token,
                                       insecure=dscv)
 
+    def _add_size_header(self, headers, data):
+        # The data is streamed with chunked encoding, tell glance the size
+        # up front when it is known so it can reject oversized images early.
+        size = self._get_file_size(data)
+        if size is not None:
+            headers['x-image-meta-size'] = str(size)
+
     def _create_with_data(self, headers, data):
+        self._add_size_header(headers, data)
         resp, body_iter = self.http.raw_request('POST', '/v1/images',
                                                 headers=headers, body=data)
         self._error_checker('POST', '/v1/images', headers, data, resp,
                             body_iter)
-        body = json.loads(''.join([c for c in body_iter]))
+        body = json.load(body_iter)
         return resp, body['image']
 
     def _update_with_data(self, image_id, headers, data):
         url = '/v1/images/%s' % image_id
+        self._add_size_header(headers, data)
         resp, body_iter = self.http.raw_request('PUT', url, headers=headers,
                                                 body=data)
         self._error_checker('PUT', url, headers, data,
                             resp, body_iter)
-        body = json.loads(''.join([c for c in body_iter]))
+        body = json.load(body_iter)
         return resp, body['image']
 
     def create_image(self, name, container_format, disk_format, **kwargs):
@@ -214,6 +222,25 @@ class ImageClientJSON(RestClient):
         resp, body = self.get(url)
         return resp, body
 
+    def download_image(self, image_id, sink=None, verify=True):
+        """Streams the data of an image into sink, a file-like object.
+
+        The data is read in chunks and never held in memory as a whole. Its
+        md5 checksum is computed along the way and, if verify is set,
+        checked against the checksum glance has for the image. Returns the
+        response and the size of the data.
+        """
+        url = '/v1/images/%s' % image_id
+        resp, body_iter = self.http.raw_request('GET', url)
+        self._error_checker('GET', url, {}, None, resp, body_iter)
+        size, checksum = glance_http.save_body(body_iter, sink)
+        expected = resp.getheader('x-image-meta-checksum')
+        if verify and expected and expected != checksum:
+            raise exceptions.ImageChecksumMismatch(image_id=image_id,
+                                                   actual=checksum,
+                                                   expected=expected)
+        return resp, size
+
     def is_resource_deleted(self, id):
         try:
             self.get_image(id)
@@ -262,11 +289,10 @@ class ImageClientJSON(RestClient):
     # NOTE(afazkas): Wait reinvented again. It is not in the correct layer
     def wait_for_image_status(self, image_id, status):
         """Waits for a Image to reach a given status."""
-        start_time = time.time()
+        poller = self.poll_policy.poller(self.build_timeout)
         old_value = value = self._get_image_status(image_id)
         while True:
-            dtime = time.time() - start_time
-            time.sleep(self.build_interval)
+            dtime = poller.elapsed()
             if value != old_value:
                 LOG.info('Value transition from "%s" to "%s"'
                          'in %d second(s).', old_value,
@@ -277,12 +303,12 @@ class ImageClientJSON(RestClient):
             if value == 'killed':
                 raise exceptions.ImageKilledException(image_id=image_id,
                                                       status=status)
-            if dtime > self.build_timeout:
+            if poller.expired():
                 message = ('Time Limit Exceeded! (%ds)'
                            'while waiting for %s, '
                            'but we got %s.' %
                            (self.build_timeout, status, value))
                 raise exceptions.TimeoutException(message)
-            time.sleep(self.build_interval)
+            poller.sleep()
             old_value = value
             value = self._get_image_status(image_id)
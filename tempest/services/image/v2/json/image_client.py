@@ -125,6 +125,25 @@ class ImageClientV2JSON(rest_client.RestClient):
         resp, body = self.get(url)
         return resp, body
 
+    def download_image_file(self, image_id, sink=None, checksum=None):
+        """Streams the data of an image into sink, a file-like object.
+
+        The data is read in chunks and never held in memory as a whole. Its
+        md5 checksum is computed along the way and checked against checksum
+        or, by default, the Content-MD5 header of the response. Returns the
+        response and the size of the data.
+        """
+        url = 'v2/images/%s/file' % image_id
+        resp, body_iter = self.http.raw_request('GET', url)
+        self._error_checker('GET', url, {}, None, resp, body_iter)
+        size, actual = glance_http.save_body(body_iter, sink)
+        expected = checksum or resp.getheader('content-md5')
+        if expected and expected != actual:
+            raise exceptions.ImageChecksumMismatch(image_id=image_id,
+                                                   actual=actual,
+                                                   expected=expected)
+        return resp, size
+
     def add_image_tag(self, image_id, tag):
         url = 'v2/images/%s/tags/%s' % (image_id, tag)
         resp, body = self.put(url, body=None, headers=self.headers)
@@ -19,6 +19,7 @@ from tempest.common.rest_client import RestClientXML
 from tempest.services.compute.xml.common import deep_dict_to_xml
 from tempest.services.compute.xml.common import Document
 from tempest.services.compute.xml.common import Element
+from tempest.services.compute.xml.common import xml_string_to_json_list
 from tempest.services.compute.xml.common import xml_to_json
 
 
@@ -34,7 +35,7 @@ class NetworkClientXML(RestClientXML):
     def list_networks(self):
         uri = '%s/networks' % (self.uri_prefix)
         resp, body = self.get(uri, self.headers)
-        networks = self._parse_array(etree.fromstring(body))
+        networks = xml_string_to_json_list(body)
         networks = {"networks": networks}
         return resp, networks
 
@@ -56,7 +57,7 @@ class NetworkClientXML(RestClientXML):
                 p1.append(p2)
                 post_body.append(p1)
         resp, body = self.post(uri, str(Document(post_body)), self.headers)
-        networks = self._parse_array(etree.fromstring(body))
+        networks = xml_string_to_json_list(body)
         networks = {"networks": networks}
         return resp, networks
 
@@ -90,7 +91,7 @@ class NetworkClientXML(RestClientXML):
     def list_subnets(self):
         uri = '%s/subnets' % (self.uri_prefix)
         resp, body = self.get(uri, self.headers)
-        subnets = self._parse_array(etree.fromstring(body))
+        subnets = xml_string_to_json_list(body)
         subnets = {"subnets": subnets}
         return resp, subnets
 
@@ -116,16 +117,10 @@ class NetworkClientXML(RestClientXML):
         uri = '%s/ports/%s' % (self.uri_prefix, str(port_id))
         return self.delete(uri, self.headers)
 
-    def _parse_array(self, node):
-        array = []
-        for child in node.getchildren():
-            array.append(xml_to_json(child))
-        return array
-
     def list_ports(self):
         url = '%s/ports' % (self.uri_prefix)
         resp, body = self.get(url, self.headers)
-        ports = self._parse_array(etree.fromstring(body))
+        ports = xml_string_to_json_list(body)
         ports = {"ports": ports}
         return resp, ports
 
@@ -174,7 +169,7 @@ class NetworkClientXML(RestClientXML):
     def list_security_groups(self):
         url = '%s/security-groups' % (self.uri_prefix)
         resp, body = self.get(url, self.headers)
-        secgroups = self._parse_array(etree.fromstring(body))
+        secgroups = xml_string_to_json_list(body)
         secgroups = {"security_groups": secgroups}
         return resp, secgroups
 
@@ -191,7 +186,7 @@ class NetworkClientXML(RestClientXML):
     def list_security_group_rules(self):
         url = '%s/security-group-rules' % (self.uri_prefix)
         resp, body = self.get(url, self.headers)
-        rules = self._parse_array(etree.fromstring(body))
+        rules = xml_string_to_json_list(body)
         rules = {"security_group_rules": rules}
         return resp, rules
 
@@ -231,7 +226,7 @@ class NetworkClientXML(RestClientXML):
                 p1.append(p2)
             post_body.append(p1)
         resp, body = self.post(uri, str(Document(post_body)), self.headers)
-        subnets = self._parse_array(etree.fromstring(body))
+        subnets = xml_string_to_json_list(body)
         subnets = {"subnets": subnets}
         return resp, subnets
 
@@ -246,14 +241,14 @@ class NetworkClientXML(RestClientXML):
                 p1.append(p2)
             post_body.append(p1)
         resp, body = self.post(uri, str(Document(post_body)), self.headers)
-        ports = self._parse_array(etree.fromstring(body))
+        ports = xml_string_to_json_list(body)
         ports = {"ports": ports}
         return resp, ports
 
     def list_vips(self):
         url = '%s/lb/vips' % (self.uri_prefix)
         resp, body = self.get(url, self.headers)
-        vips = self._parse_array(etree.fromstring(body))
+        vips = xml_string_to_json_list(body)
         vips = {"vips": vips}
         return resp, vips
 
@@ -296,7 +291,7 @@ class NetworkClientXML(RestClientXML):
     def list_pools(self):
         url = '%s/lb/pools' % (self.uri_prefix)
         resp, body = self.get(url, self.headers)
-        pools = self._parse_array(etree.fromstring(body))
+        pools = xml_string_to_json_list(body)
         pools = {"pools": pools}
         return resp, pools
 
@@ -335,7 +330,7 @@ class NetworkClientXML(RestClientXML):
     def list_members(self):
         url = '%s/lb/members' % (self.uri_prefix)
         resp, body = self.get(url, self.headers)
-        members = self._parse_array(etree.fromstring(body))
+        members = xml_string_to_json_list(body)
         members = {"members": members}
         return resp, members
 
@@ -374,7 +369,7 @@ class NetworkClientXML(RestClientXML):
     def list_health_monitors(self):
         uri = '%s/lb/health_monitors' % (self.uri_prefix)
         resp, body = self.get(uri, self.headers)
-        body = self._parse_array(etree.fromstring(body))
+        body = xml_string_to_json_list(body)
         body = {"health_monitors": body}
         return resp, body
 
@@ -432,7 +427,7 @@ class NetworkClientXML(RestClientXML):
     def list_extensions(self):
         url = '%s/extensions' % (self.uri_prefix)
         resp, body = self.get(url, self.headers)
-        extensions = self._parse_array(etree.fromstring(body))
+        extensions = xml_string_to_json_list(body)
         extensions = {"extensions": extensions}
         return resp, extensions
 
@@ -522,7 +517,7 @@ class NetworkClientXML(RestClientXML):
     def list_floating_ips(self):
         uri = '%s/floatingips' % (self.uri_prefix)
         resp, body = self.get(uri, self.headers)
-        floatingips = self._parse_array(etree.fromstring(body))
+        floatingips = xml_string_to_json_list(body)
         floatingips = {"floatingips": floatingips}
         return resp, floatingips
 
@@ -550,14 +545,14 @@ class NetworkClientXML(RestClientXML):
     def list_router_interfaces(self, uuid):
         uri = '%s/ports?device_id=%s' % (self.uri_prefix, uuid)
         resp, body = self.get(uri, self.headers)
-        ports = self._parse_array(etree.fromstring(body))
+        ports = xml_string_to_json_list(body)
         ports = {"ports": ports}
         return resp, ports
 
     def list_agents(self):
         uri = '%s/agents' % self.uri_prefix
         resp, body = self.get(uri, self.headers)
-        agents = self._parse_array(etree.fromstring(body))
+        agents = xml_string_to_json_list(body)
         agents = {'agents': agents}
         return resp, agents
 
@@ -576,21 +571,21 @@ class NetworkClientXML(RestClientXML):
     def list_service_providers(self):
         uri = '%s/service-providers' % self.uri_prefix
         resp, body = self.get(uri, self.headers)
-        providers = self._parse_array(etree.fromstring(body))
+        providers = xml_string_to_json_list(body)
         body = {'service_providers': providers}
         return resp, body
 
     def list_dhcp_agent_hosting_network(self, network_id):
         uri = '%s/networks/%s/dhcp-agents' % (self.uri_prefix, network_id)
         resp, body = self.get(uri, self.headers)
-        agents = self._parse_array(etree.fromstring(body))
+        agents = xml_string_to_json_list(body)
         body = {'agents': agents}
         return resp, body
 
     def list_networks_hosted_by_one_dhcp_agent(self, agent_id):
         uri = '%s/agents/%s/dhcp-networks' % (self.uri_prefix, agent_id)
         resp, body = self.get(uri, self.headers)
-        networks = self._parse_array(etree.fromstring(body))
+        networks = xml_string_to_json_list(body)
         body = {'networks': networks}
         return resp, body
 
@@ -108,7 +108,7 @@ class AccountClientCustomizedHeader(RestClient):
 
     def request(self, method, url, headers=None, body=None):
         """A simple HTTP request interface."""
-        self.http_obj = http.ClosingHttp()
+        self.http_obj = http.get_http_obj(self.config)
         if headers is None:
             headers = {}
         if self.base_url is None:
@@ -117,8 +117,8 @@ class AccountClientCustomizedHeader(RestClient):
         req_url = "%s/%s" % (self.base_url, url)
 
         self._log_request(method, req_url, headers, body)
-        resp, resp_body = self.http_obj.request(req_url, method,
-                                                headers=headers, body=body)
+        resp, resp_body = self._http_request(method, url, req_url,
+                                             headers=headers, body=body)
         self._log_response(resp, resp_body)
 
         if resp.status == 401 or resp.status == 403:
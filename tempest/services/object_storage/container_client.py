@@ -88,43 +88,65 @@ class ContainerClient(RestClient):
         resp, body = self.head(url, headers=headers)
         return resp, body
 
+    def iter_container_objects(self, container, params=None):
+        """
+            Yields all the objects of the container, even if the item count
+            is beyond the 10,000 item listing limit.
+
+            The listing is fetched one page of params['limit'] (by default
+            9999) objects at a time, each page starting after the last
+            object of the previous one, so only one page is held in memory.
+            The other params (prefix, delimiter...) are passed along.
+        """
+        params = dict(params or {})
+        params.setdefault('limit', 9999)
+        while True:
+            resp, objlist = self.list_container_contents(container,
+                                                         params=params)
+            for obj in objlist:
+                yield obj
+            if len(objlist) < int(params['limit']):
+                return
+            last = objlist[-1]
+            # NOTE: with a delimiter the pseudo-directories only have a
+            # subdir key.
+            marker = last.get('name', last.get('subdir'))
+            # NOTE: urlencode only takes byte strings beyond ASCII.
+            params['marker'] = marker.encode('utf-8')
+
     def list_all_container_objects(self, container, params=None):
         """
             Returns complete list of all objects in the container, even if
             item count is beyond 10,000 item listing limit.
             Does not require any parameters aside from container name.
         """
-        # TODO(dwalleck): Rewrite using json format to avoid newlines at end of
-        # obj names. Set limit to API limit - 1 (max returned items = 9999)
-        limit = 9999
-        if params is not None:
-            if 'limit' in params:
-                limit = params['limit']
-
-            if 'marker' in params:
-                limit = params['marker']
-
-        resp, objlist = self.list_container_contents(container,
-                                                     params={'limit': limit})
-        return objlist
-        """tmp = []
-        for obj in objlist:
-            tmp.append(obj['name'])
-        objlist = tmp
-
-        if len(objlist) >= limit:
-
-            # Increment marker
-            marker = objlist[len(objlist) - 1]
-
-            # Get the next chunk of the list
-            objlist.extend(_list_all_container_objects(container,
-                                                      params={'marker': marker,
-                                                              'limit': limit}))
-            return objlist
-        else:
-            # Return final, complete list
-            return objlist"""
+        return list(self.iter_container_objects(container, params=params))
+
+    def bulk_delete_objects(self, container, object_names):
+        """
+            Deletes objects of the container in a single request with the
+            bulk middleware (at most 10,000 objects by default).
+
+            Returns the response and the result of the bulk delete, a dict
+            with 'Number Deleted', 'Number Not Found' and 'Errors' keys, or
+            None if the bulk middleware is not enabled.
+        """
+        paths = ['/%s/%s' % (urllib.quote(str(container)),
+                             urllib.quote(name.encode('utf-8')))
+                 for name in object_names]
+        headers = {'Content-Type': 'text/plain',
+                   'Accept': 'application/json'}
+        resp, body = self.post('?bulk-delete', body='\n'.join(paths),
+                               headers=headers)
+        # NOTE: without the middleware the request is an account metadata
+        # update, answered with an empty body.
+        try:
+            result = json.loads(body)
+        except ValueError:
+            return resp, None
+        if not isinstance(result, dict) or 'Number Deleted' not in result:
+            return resp, None
+        return resp, result
 
     def list_container_contents(self, container, params=None):
         """
@@ -15,10 +15,150 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import contextlib
+import hashlib
+import json
+import mmap
+import os
+import threading
+import urlparse
+
+import httplib2
+
+from tempest.common import concurrency
 from tempest.common import http
 from tempest.common.rest_client import RestClient
 from tempest import exceptions
 
+CHUNKSIZE = 1024 * 64  # 64kB
+RANGE_SIZE = 1024 * 1024 * 8  # 8MB
+
+
+class _Segment(object):
+    """length bytes of data, starting at offset, sent as a buffer.
+
+    data is a string or a mmap.mmap shared by all the segments of an
+    object, the buffer does not copy it. Unlike a file-like object, a
+    buffer is sent whole again when the request is: httplib2 retries it
+    on a kept-alive connection the server closed, the RestClient after a
+    413.
+    """
+
+    def __init__(self, name, data, offset, length):
+        self.name = name
+        self.body = buffer(data, offset, length)
+        self.length = length
+
+    def hexdigest(self):
+        """Returns the md5 checksum of the segment, the ETag swift sets."""
+        return hashlib.md5(self.body).hexdigest()
+
+    def __repr__(self):
+        return '<segment %s: %d bytes>' % (self.name, self.length)
+
+
+class _OrderedMD5(object):
+    """md5 checksum of data received out of order, chunk by chunk.
+
+    The chunks right at the end of the hashed data are hashed at once, the
+    ones further on are kept until the gap before them is filled. While
+    more than max_buffered bytes are waiting, update() blocks the callers
+    ahead; the chunks at the hashed position never wait, so the first
+    missing range always makes progress. abort() releases the waiters
+    once the checksum is not needed anymore.
+    """
+
+    def __init__(self, max_buffered):
+        self.max_buffered = max_buffered
+        self.offset = 0
+        self._md5 = hashlib.md5()
+        self._pending = {}
+        self._buffered = 0
+        self._aborted = False
+        self._changed = threading.Condition()
+
+    def update(self, offset, chunk):
+        with self._changed:
+            while (offset != self.offset and not self._aborted and
+                   self._buffered + len(chunk) > self.max_buffered):
+                self._changed.wait()
+            if self._aborted:
+                return
+            if offset != self.offset:
+                self._pending[offset] = chunk
+                self._buffered += len(chunk)
+                return
+            self._md5.update(chunk)
+            self.offset += len(chunk)
+            while self.offset in self._pending:
+                chunk = self._pending.pop(self.offset)
+                self._buffered -= len(chunk)
+                self._md5.update(chunk)
+                self.offset += len(chunk)
+            self._changed.notify_all()
+
+    def abort(self):
+        with self._changed:
+            self._aborted = True
+            self._pending.clear()
+            self._changed.notify_all()
+
+    def hexdigest(self):
+        return self._md5.hexdigest()
+
+
+@contextlib.contextmanager
+def _open_segments(data, object_name, segment_size):
+    """Opens data and yields a generator of its _Segments.
+
+    data is either a file path, memory-mapped, or a file-like object. An
+    object always has at least one (maybe empty) segment.
+    """
+    if isinstance(data, basestring):
+        with open(data, 'rb') as data_file:
+            size = os.fstat(data_file.fileno()).st_size
+            if size == 0:
+                yield iter([_Segment(object_name + '/00000000', '', 0, 0)])
+                return
+            mapping = mmap.mmap(data_file.fileno(), 0,
+                                access=mmap.ACCESS_READ)
+            try:
+                yield _mapped_segments(mapping, size, object_name,
+                                       segment_size)
+            finally:
+                mapping.close()
+    else:
+        yield _read_segments(data, object_name, segment_size)
+
+
+def _mapped_segments(mapping, size, object_name, segment_size):
+    for index, offset in enumerate(xrange(0, size, segment_size)):
+        yield _Segment('%s/%08d' % (object_name, index), mapping, offset,
+                       min(segment_size, size - offset))
+
+
+def _read_segments(stream, object_name, segment_size):
+    # A stream can only be read in order, so the segments are read into
+    # memory: a couple of segments per worker at most are waiting to be
+    # uploaded.
+    index = 0
+    while True:
+        chunks = []
+        left = segment_size
+        while left > 0:
+            chunk = stream.read(min(left, CHUNKSIZE))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            left -= len(chunk)
+        segment = ''.join(chunks)
+        if segment or index == 0:
+            yield _Segment('%s/%08d' % (object_name, index), segment, 0,
+                           len(segment))
+        if left > 0:
+            return
+        index += 1
+
 
 class ObjectClient(RestClient):
     def __init__(self, config, username, password, auth_url, tenant_name=None):
@@ -73,6 +213,127 @@ class ObjectClient(RestClient):
         resp, body = self.get(url)
         return resp, body
 
+    def _open_stream(self, url, headers=None):
+        # Sends a GET request with httplib and returns the connection, the
+        # response with the body still to be read and its headers as a
+        # httplib2 response.
+        if ((self.token is None) or (self.base_url is None) or
+                not self._is_token_fresh()):
+            self._set_auth()
+        headers = dict(headers or {})
+        headers['X-Auth-Token'] = self.token
+        req_url = "%s/%s" % (self.base_url, url)
+        parts = urlparse.urlsplit(req_url)
+        conn = http.get_connection(self.config, req_url)
+        path = parts.path
+        if parts.query:
+            path += '?' + parts.query
+        self._log_request('GET', req_url, headers, None)
+        conn.request('GET', path, headers=headers)
+        stream = conn.getresponse()
+        resp = httplib2.Response(stream)
+        self._log_response(resp, None)
+        if resp.status >= 400:
+            body = stream.read()
+            conn.close()
+            self._error_checker('GET', url, headers, None, resp, body)
+        return conn, stream, resp
+
+    def _read_stream(self, url, headers, write, byte_range=None):
+        # Passes the body of a GET response to write chunk by chunk,
+        # returns the response and the number of bytes read. With the
+        # (start, end) byte_range asked for, nothing is written unless the
+        # response holds exactly that range.
+        conn, stream, resp = self._open_stream(url, headers)
+        size = 0
+        try:
+            if byte_range is not None:
+                start, end = byte_range
+                content_range = resp.get('content-range', '')
+                if (resp.status != 206 or not content_range.startswith(
+                        'bytes %d-%d/' % (start, end - 1))):
+                    raise exceptions.RFCViolation(
+                        "Range %d-%d of %s answered with status %d and "
+                        "Content-Range '%s'" % (start, end - 1, url,
+                                                resp.status, content_range))
+            chunk = stream.read(CHUNKSIZE)
+            while chunk:
+                write(size, chunk)
+                size += len(chunk)
+                chunk = stream.read(CHUNKSIZE)
+        finally:
+            conn.close()
+        return resp, size
+
+    def download_object(self, container, object_name, sink, workers=None,
+                        range_size=RANGE_SIZE, checksum=None):
+        """Streams object's data into sink, a file-like object.
+
+        The data goes through in chunks and is never held in memory as a
+        whole. With more than one worker ([object-storage] transfer_workers
+        by default) an object larger than range_size is fetched as
+        concurrent Range requests, written at their offsets in sink, which
+        must then be seekable. The md5 of the data is computed along the
+        way and checked against checksum or, for objects which are not
+        large object manifests, the ETag. Returns the response (of the
+        HEAD request with several workers) and the size of the data.
+        """
+        url = "%s/%s" % (str(container), str(object_name))
+        workers = workers or self.config.object_storage.transfer_workers
+        resp = None
+        if workers > 1:
+            resp, body = self.list_object_metadata(container, object_name)
+            size = int(resp['content-length'])
+            ranges = [(offset, min(offset + range_size, size))
+                      for offset in xrange(0, size, range_size)]
+        if resp is None or len(ranges) < 2:
+            md5 = hashlib.md5()
+
+            def _write(offset, chunk):
+                md5.update(chunk)
+                sink.write(chunk)
+
+            resp, size = self._read_stream(url, {}, _write)
+        else:
+            md5 = _OrderedMD5(max_buffered=workers * range_size)
+            lock = threading.Lock()
+
+            def _write(offset, chunk):
+                with lock:
+                    sink.seek(offset)
+                    sink.write(chunk)
+                md5.update(offset, chunk)
+
+            def _fetch(byte_range):
+                start, end = byte_range
+                # If-Match makes sure all the ranges come from the object
+                # the HEAD request described.
+                headers = {'Range': 'bytes=%d-%d' % (start, end - 1),
+                           'If-Match': resp['etag']}
+                try:
+                    range_resp, length = self._read_stream(
+                        url, headers,
+                        lambda offset, chunk: _write(start + offset, chunk),
+                        byte_range)
+                    if length != end - start:
+                        raise exceptions.RFCViolation(
+                            "Range %d-%d of %s answered with %d bytes" %
+                            (start, end - 1, url, length))
+                except Exception:
+                    md5.abort()
+                    raise
+
+            concurrency.run_for_each(_fetch, ranges, workers)
+
+        is_manifest = ('x-object-manifest' in resp or
+                       resp.get('x-static-large-object', '').lower() == 'true')
+        if checksum is None and not is_manifest:
+            checksum = resp.get('etag', '').strip('"')
+        if checksum and checksum != md5.hexdigest():
+            raise exceptions.ObjectChecksumMismatch(
+                name=url, actual=md5.hexdigest(), expected=checksum)
+        return resp, size
+
     def copy_object_in_same_container(self, container, src_object_name,
                                       dest_object_name, metadata=None):
         """Copy storage object's data to the new object using PUT."""
@@ -127,6 +388,66 @@ class ObjectClient(RestClient):
         resp, body = self.put(url, data, self.headers)
         return resp, body
 
+    def _upload_segment(self, container, segment):
+        url = "%s/%s" % (str(container), segment.name)
+        headers = dict(self.headers)
+        headers['content-length'] = str(segment.length)
+        etag = segment.hexdigest()
+        resp, body = self.put(url, segment.body, headers)
+        if resp.get('etag', '').strip('"') != etag:
+            raise exceptions.ObjectChecksumMismatch(
+                name=url, actual=resp.get('etag'), expected=etag)
+        return {'path': '/%s/%s' % (container, segment.name),
+                'etag': etag,
+                'size_bytes': segment.length}
+
+    def create_large_object(self, container, object_name, data,
+                            manifest='dlo', segment_size=None, workers=None,
+                            segment_container=None):
+        """Uploads data as a segmented large object.
+
+        data is either the path of a file, which is memory-mapped, or a
+        file-like object read in chunks. It is split in segments of
+        segment_size bytes ([object-storage] segment_size by default) named
+        <object_name>/<index> in segment_container (container by default),
+        uploaded concurrently by workers ([object-storage] transfer_workers
+        by default) requests. The ETag of every segment is computed before
+        it is sent and checked against the one swift returns.
+
+        Once all the segments are stored, the manifest object is written:
+        a dynamic large object manifest for manifest='dlo', a static one
+        listing the segments for manifest='slo'. Returns the response of
+        the manifest PUT and the list of the segments, as dicts with path,
+        etag and size_bytes keys.
+        """
+        if manifest not in ('dlo', 'slo'):
+            raise ValueError("Unknown large object manifest type %s" %
+                             manifest)
+        storage = self.config.object_storage
+        segment_size = segment_size or storage.segment_size
+        workers = workers or storage.transfer_workers
+        segment_container = segment_container or container
+        segments = {}
+
+        def _upload(segment):
+            segments[segment.name] = self._upload_segment(segment_container,
+                                                          segment)
+
+        with _open_segments(data, object_name, segment_size) as to_upload:
+            concurrency.run_for_each(_upload, to_upload, workers)
+        segments = [segments[name] for name in sorted(segments)]
+
+        url = "%s/%s" % (str(container), str(object_name))
+        if manifest == 'dlo':
+            headers = {'X-Object-Manifest': '%s/%s/' % (segment_container,
+                                                        object_name),
+                       'content-length': '0'}
+            resp, body = self.put(url, None, headers)
+        else:
+            url += '?multipart-manifest=put'
+            resp, body = self.put(url, json.dumps(segments), {})
+        return resp, segments
+
     def get_object_using_temp_url(self, url):
         """Retrieve object's data using temp URL."""
         return self.get(url)
@@ -148,9 +469,7 @@ class ObjectClientCustomizedHeader(RestClient):
 
     def request(self, method, url, headers=None, body=None):
         """A simple HTTP request interface."""
-        dscv = self.config.identity.disable_ssl_certificate_validation
-        self.http_obj = http.ClosingHttp(
-            disable_ssl_certificate_validation=dscv)
+        self.http_obj = http.get_http_obj(self.config)
         if headers is None:
             headers = {}
         if self.base_url is None:
@@ -158,8 +477,8 @@ class ObjectClientCustomizedHeader(RestClient):
 
         req_url = "%s/%s" % (self.base_url, url)
         self._log_request(method, req_url, headers, body)
-        resp, resp_body = self.http_obj.request(req_url, method,
-                                                headers=headers, body=body)
+        resp, resp_body = self._http_request(method, url, req_url,
+                                             headers=headers, body=body)
         self._log_response(resp, resp_body)
         if resp.status == 401 or resp.status == 403:
             raise exceptions.Unauthorized()
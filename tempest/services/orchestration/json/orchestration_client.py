@@ -17,9 +17,9 @@
 
 import json
 import re
-import time
 import urllib
 
+from tempest.common import backoff
 from tempest.common import rest_client
 from tempest import exceptions
 
@@ -32,6 +32,8 @@ class OrchestrationClient(rest_client.RestClient):
         self.service = self.config.orchestration.catalog_type
         self.build_interval = self.config.orchestration.build_interval
         self.build_timeout = self.config.orchestration.build_timeout
+        self.poll_policy = backoff.PollPolicy.from_config(
+            self.config.orchestration)
 
     def list_stacks(self, params=None):
         """Lists all stacks for a user."""
@@ -123,7 +125,7 @@ class OrchestrationClient(rest_client.RestClient):
     def wait_for_resource_status(self, stack_identifier, resource_name,
                                  status, failure_pattern='^.*_FAILED$'):
         """Waits for a Resource to reach a given status."""
-        start = int(time.time())
+        poller = self.poll_policy.poller(self.build_timeout)
         fail_regexp = re.compile(failure_pattern)
 
         while True:
@@ -145,17 +147,17 @@ class OrchestrationClient(rest_client.RestClient):
                         resource_status=resource_status,
                         resource_status_reason=body['resource_status_reason'])
 
-            if int(time.time()) - start >= self.build_timeout:
+            if poller.expired():
                 message = ('Resource %s failed to reach %s status within '
                            'the required time (%s s).' %
                            (resource_name, status, self.build_timeout))
                 raise exceptions.TimeoutException(message)
-            time.sleep(self.build_interval)
+            poller.sleep()
 
     def wait_for_stack_status(self, stack_identifier, status,
                               failure_pattern='^.*_FAILED$'):
         """Waits for a Stack to reach a given status."""
-        start = int(time.time())
+        poller = self.poll_policy.poller(self.build_timeout)
         fail_regexp = re.compile(failure_pattern)
 
         while True:
@@ -170,12 +172,12 @@ class OrchestrationClient(rest_client.RestClient):
                     stack_status=stack_status,
                     stack_status_reason=body['stack_status_reason'])
 
-            if int(time.time()) - start >= self.build_timeout:
+            if poller.expired():
                 message = ('Stack %s failed to reach %s status within '
                            'the required time (%s s).' %
                            (stack_name, status, self.build_timeout))
                 raise exceptions.TimeoutException(message)
-            time.sleep(self.build_interval)
+            poller.sleep()
 
     def show_resource_metadata(self, stack_identifier, resource_name):
         """Returns the resource's metadata."""
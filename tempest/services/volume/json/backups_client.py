@@ -13,9 +13,9 @@
 #    under the License.
 
 import json
-import time
 import urllib
 
+from tempest.common import backoff
 from tempest.common.rest_client import RestClient
 from tempest import exceptions
 from tempest.openstack.common import log as logging
@@ -33,6 +33,8 @@ class BackupsClientJSON(RestClient):
         self.service = self.config.volume.catalog_type
         self.build_interval = self.config.volume.build_interval
         self.build_timeout = self.config.volume.build_timeout
+        self.poll_policy = backoff.PollPolicy.from_config(
+            self.config.volume)
 
     def create_backup(self, volume_id, **kwargs):
         """
@@ -102,11 +104,10 @@ class BackupsClientJSON(RestClient):
 
     def wait_for_backup_status(self, backup_id, status):
         """Waits for a Backup to reach a given status."""
-        start_time = time.time()
+        poller = self.poll_policy.poller(self.build_timeout)
         old_value = value = self._get_backup_status(backup_id)
         while True:
-            dtime = time.time() - start_time
-            time.sleep(self.build_interval)
+            dtime = poller.elapsed()
             if value != old_value:
                 LOG.info('Value transition from "%s" to "%s"'
                          'in %d second(s).', old_value,
@@ -114,13 +115,13 @@ class BackupsClientJSON(RestClient):
             if (value == status):
                 return value
 
-            if dtime > self.build_timeout:
+            if poller.expired():
                 message = ('Time Limit Exceeded! (%ds)'
                            'while waiting for %s, '
                            'but we got %s.' %
                            (self.build_timeout, status, value))
                 raise exceptions.TimeoutException(message)
-            time.sleep(self.build_interval)
+            poller.sleep()
             old_value = value
             value = self._get_backup_status(backup_id)
 
@@ -13,9 +13,9 @@
 #    under the License.
 
 import json
-import time
 import urllib
 
+from tempest.common import backoff
 from tempest.common.rest_client import RestClient
 from tempest import exceptions
 from tempest.openstack.common import log as logging
@@ -33,6 +33,8 @@ class SnapshotsClientJSON(RestClient):
         self.service = self.config.volume.catalog_type
         self.build_interval = self.config.volume.build_interval
         self.build_timeout = self.config.volume.build_timeout
+        self.poll_policy = backoff.PollPolicy.from_config(
+            self.config.volume)
 
     def list_snapshots(self, params=None):
         """List all the snapshot."""
@@ -99,11 +101,10 @@ class SnapshotsClientJSON(RestClient):
     # NOTE(afazkas): Wait reinvented again. It is not in the correct layer
     def wait_for_snapshot_status(self, snapshot_id, status):
         """Waits for a Snapshot to reach a given status."""
-        start_time = time.time()
+        poller = self.poll_policy.poller(self.build_timeout)
         old_value = value = self._get_snapshot_status(snapshot_id)
         while True:
-            dtime = time.time() - start_time
-            time.sleep(self.build_interval)
+            dtime = poller.elapsed()
             if value != old_value:
                 LOG.info('Value transition from "%s" to "%s"'
                          'in %d second(s).', old_value,
@@ -111,13 +112,13 @@ class SnapshotsClientJSON(RestClient):
             if (value == status):
                 return value
 
-            if dtime > self.build_timeout:
+            if poller.expired():
                 message = ('Time Limit Exceeded! (%ds)'
                            'while waiting for %s, '
                            'but we got %s.' %
                            (self.build_timeout, status, value))
                 raise exceptions.TimeoutException(message)
-            time.sleep(self.build_interval)
+            poller.sleep()
             old_value = value
             value = self._get_snapshot_status(snapshot_id)
 
@@ -16,9 +16,9 @@
 #    under the License.
 
 import json
-import time
 import urllib
 
+from tempest.common import backoff
 from tempest.common.rest_client import RestClient
 from tempest import exceptions
 
@@ -35,6 +35,8 @@ class VolumesClientJSON(RestClient):
         self.service = self.config.volume.catalog_type
         self.build_interval = self.config.volume.build_interval
         self.build_timeout = self.config.volume.build_timeout
+        self.poll_policy = backoff.PollPolicy.from_config(
+            self.config.volume)
 
     def get_attachment_from_volume(self, volume):
         """Return the element 'attachment' from input volumes."""
@@ -149,16 +151,16 @@ class VolumesClientJSON(RestClient):
         resp, body = self.get_volume(volume_id)
         volume_name = body['display_name']
         volume_status = body['status']
-        start = int(time.time())
+        poller = self.poll_policy.poller(self.build_timeout)
 
         while volume_status != status:
-            time.sleep(self.build_interval)
+            poller.sleep()
             resp, body = self.get_volume(volume_id)
             volume_status = body['status']
             if volume_status == 'error':
                 raise exceptions.VolumeBuildErrorException(volume_id=volume_id)
 
-            if int(time.time()) - start >= self.build_timeout:
+            if poller.expired():
                 message = ('Volume %s failed to reach %s status within '
                            'the required time (%s s).' %
                            (volume_name, status, self.build_timeout))
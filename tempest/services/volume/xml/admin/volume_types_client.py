@@ -24,6 +24,7 @@ from tempest import exceptions
 from tempest.services.compute.xml.common import Document
 from tempest.services.compute.xml.common import Element
 from tempest.services.compute.xml.common import Text
+from tempest.services.compute.xml.common import xml_string_to_json
 from tempest.services.compute.xml.common import xml_to_json
 from tempest.services.compute.xml.common import XMLNS_11
 
@@ -110,7 +111,7 @@ class VolumeTypesClientXML(RestClientXML):
 
         resp, body = self.post('types', str(Document(vol_type)),
                                self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body
 
     def delete_volume_type(self, type_id):
@@ -162,7 +163,7 @@ class VolumeTypesClientXML(RestClientXML):
 
         resp, body = self.post(url, str(Document(extra_specs)),
                                self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body
 
     def delete_volume_type_extra_specs(self, vol_id, extra_spec_name):
@@ -192,7 +193,7 @@ class VolumeTypesClientXML(RestClientXML):
 
         resp, body = self.put(url, str(Document(extra_specs)),
                               self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body
 
     def is_resource_deleted(self, id):
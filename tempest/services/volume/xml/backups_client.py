@@ -12,16 +12,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import time
 import urllib
 
 from lxml import etree
 
+from tempest.common import backoff
 from tempest.common.rest_client import RestClientXML
 from tempest import exceptions
 from tempest.openstack.common import log as logging
 from tempest.services.compute.xml.common import Document
 from tempest.services.compute.xml.common import Element
+from tempest.services.compute.xml.common import xml_string_to_json
 from tempest.services.compute.xml.common import xml_to_json
 from tempest.services.compute.xml.common import XMLNS_11
 
@@ -38,6 +39,8 @@ class BackupsClientXML(RestClientXML):
         self.service = self.config.volume.catalog_type
         self.build_interval = self.config.volume.build_interval
         self.build_timeout = self.config.volume.build_timeout
+        self.poll_policy = backoff.PollPolicy.from_config(
+            self.config.volume)
 
     def create_backup(self, volume_id, **kwargs):
         """Creates a new backup.
@@ -51,7 +54,7 @@ class BackupsClientXML(RestClientXML):
             backup.add_attr(key, value)
         resp, body = self.post('backups', str(Document(backup)),
                                self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body
 
     def list_backups(self):
@@ -94,7 +97,7 @@ class BackupsClientXML(RestClientXML):
         resp, body = self.post('backups/%s/restore' % str(backup_id),
                                str(Document(restore)),
                                self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body
 
     def delete_backup(self, backup_id):
@@ -112,11 +115,10 @@ class BackupsClientXML(RestClientXML):
 
     def wait_for_backup_status(self, backup_id, status):
         """Waits for a Backup to reach a given status."""
-        start_time = time.time()
+        poller = self.poll_policy.poller(self.build_timeout)
         old_value = value = self._get_backup_status(backup_id)
         while True:
-            dtime = time.time() - start_time
-            time.sleep(self.build_interval)
+            dtime = poller.elapsed()
             if value != old_value:
                 LOG.info('Value transition from "%s" to "%s"'
                          'in %d second(s).', old_value,
@@ -124,13 +126,13 @@ class BackupsClientXML(RestClientXML):
             if (value == status):
                 return value
 
-            if dtime > self.build_timeout:
+            if poller.expired():
                 message = ('Time Limit Exceeded! (%ds)'
                            'while waiting for %s, '
                            'but we got %s.' %
                            (self.build_timeout, status, value))
                 raise exceptions.TimeoutException(message)
-            time.sleep(self.build_interval)
+            poller.sleep()
             old_value = value
             value = self._get_backup_status(backup_id)
 
@@ -12,16 +12,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import time
 import urllib
 
 from lxml import etree
 
+from tempest.common import backoff
 from tempest.common.rest_client import RestClientXML
 from tempest import exceptions
 from tempest.openstack.common import log as logging
 from tempest.services.compute.xml.common import Document
 from tempest.services.compute.xml.common import Element
+from tempest.services.compute.xml.common import xml_string_to_json
 from tempest.services.compute.xml.common import xml_to_json
 from tempest.services.compute.xml.common import XMLNS_11
 
@@ -38,6 +39,8 @@ class SnapshotsClientXML(RestClientXML):
         self.service = self.config.volume.catalog_type
         self.build_interval = self.config.volume.build_interval
         self.build_timeout = self.config.volume.build_timeout
+        self.poll_policy = backoff.PollPolicy.from_config(
+            self.config.volume)
 
     def list_snapshots(self, params=None):
         """List all snapshot."""
@@ -87,7 +90,7 @@ class SnapshotsClientXML(RestClientXML):
             snapshot.add_attr(key, value)
         resp, body = self.post('snapshots', str(Document(snapshot)),
                                self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body
 
     def update_snapshot(self, snapshot_id, **kwargs):
@@ -97,7 +100,7 @@ class SnapshotsClientXML(RestClientXML):
         resp, body = self.put('snapshots/%s' % snapshot_id,
                               str(Document(put_body)),
                               self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body
 
     # NOTE(afazekas): just for the wait function
@@ -115,11 +118,10 @@ class SnapshotsClientXML(RestClientXML):
     # NOTE(afazkas): Wait reinvented again. It is not in the correct layer
     def wait_for_snapshot_status(self, snapshot_id, status):
         """Waits for a Snapshot to reach a given status."""
-        start_time = time.time()
+        poller = self.poll_policy.poller(self.build_timeout)
         old_value = value = self._get_snapshot_status(snapshot_id)
         while True:
-            dtime = time.time() - start_time
-            time.sleep(self.build_interval)
+            dtime = poller.elapsed()
             if value != old_value:
                 LOG.info('Value transition from "%s" to "%s"'
                          'in %d second(s).', old_value,
@@ -127,13 +129,13 @@ class SnapshotsClientXML(RestClientXML):
             if (value == status):
                 return value
 
-            if dtime > self.build_timeout:
+            if poller.expired():
                 message = ('Time Limit Exceeded! (%ds)'
                            'while waiting for %s, '
                            'but we got %s.' %
                            (self.build_timeout, status, value))
                 raise exceptions.TimeoutException(message)
-            time.sleep(self.build_interval)
+            poller.sleep()
             old_value = value
             value = self._get_snapshot_status(snapshot_id)
 
@@ -156,7 +158,7 @@ class SnapshotsClientXML(RestClientXML):
         url = 'snapshots/%s/action' % str(snapshot_id)
         resp, body = self.post(url, str(Document(post_body)), self.headers)
         if body:
-            body = xml_to_json(etree.fromstring(body))
+            body = xml_string_to_json(body)
         return resp, body
 
     def update_snapshot_status(self, snapshot_id, status, progress):
@@ -168,5 +170,5 @@ class SnapshotsClientXML(RestClientXML):
         url = 'snapshots/%s/action' % str(snapshot_id)
         resp, body = self.post(url, str(Document(post_body)), self.headers)
         if body:
-            body = xml_to_json(etree.fromstring(body))
+            body = xml_string_to_json(body)
         return resp, body
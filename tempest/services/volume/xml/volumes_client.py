@@ -15,7 +15,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import time
 import urllib
 
 from lxml import etree
@@ -25,6 +24,7 @@ from tempest import exceptions
 from tempest.services.compute.xml.common import Document
 from tempest.services.compute.xml.common import Element
 from tempest.services.compute.xml.common import Text
+from tempest.services.compute.xml.common import xml_string_to_json
 from tempest.services.compute.xml.common import xml_to_json
 from tempest.services.compute.xml.common import XMLNS_11
 
@@ -153,7 +153,7 @@ class VolumesClientXML(RestClientXML):
 
         resp, body = self.post('volumes', str(Document(volume)),
                                self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body
 
     def update_volume(self, volume_id, **kwargs):
@@ -163,7 +163,7 @@ class VolumesClientXML(RestClientXML):
         resp, body = self.put('volumes/%s' % volume_id,
                               str(Document(put_body)),
                               self.headers)
-        body = xml_to_json(etree.fromstring(body))
+        body = xml_string_to_json(body)
         return resp, body
 
     def delete_volume(self, volume_id):
@@ -174,16 +174,16 @@ class VolumesClientXML(RestClientXML):
         """Waits for a Volume to reach a given status."""
         resp, body = self.get_volume(volume_id)
         volume_status = body['status']
-        start = int(time.time())
+        poller = self.poll_policy.poller(self.build_timeout)
 
         while volume_status != status:
-            time.sleep(self.build_interval)
+            poller.sleep()
             resp, body = self.get_volume(volume_id)
             volume_status = body['status']
             if volume_status == 'error':
                 raise exceptions.VolumeBuildErrorException(volume_id=volume_id)
 
-            if int(time.time()) - start >= self.build_timeout:
+            if poller.expired():
                 message = 'Volume %s failed to reach %s status within '\
                           'the required time (%s s).' % (volume_id,
                                                          status,
@@ -206,7 +206,7 @@ class VolumesClientXML(RestClientXML):
         url = 'volumes/%s/action' % str(volume_id)
         resp, body = self.post(url, str(Document(post_body)), self.headers)
         if body:
-            body = xml_to_json(etree.fromstring(body))
+            body = xml_string_to_json(body)
         return resp, body
 
     def detach_volume(self, volume_id):
@@ -215,7 +215,7 @@ class VolumesClientXML(RestClientXML):
         url = 'volumes/%s/action' % str(volume_id)
         resp, body = self.post(url, str(Document(post_body)), self.headers)
         if body:
-            body = xml_to_json(etree.fromstring(body))
+            body = xml_string_to_json(body)
         return resp, body
 
     def upload_volume(self, volume_id, image_name, disk_format):
@@ -225,7 +225,7 @@ class VolumesClientXML(RestClientXML):
                             disk_format=disk_format)
         url = 'volumes/%s/action' % str(volume_id)
         resp, body = self.post(url, str(Document(post_body)), self.headers)
-        volume = xml_to_json(etree.fromstring(body))
+        volume = xml_string_to_json(body)
         return resp, volume
 
     def extend_volume(self, volume_id, extend_size):
@@ -235,7 +235,7 @@ class VolumesClientXML(RestClientXML):
         url = 'volumes/%s/action' % str(volume_id)
         resp, body = self.post(url, str(Document(post_body)), self.headers)
         if body:
-            body = xml_to_json(etree.fromstring(body))
+            body = xml_string_to_json(body)
         return resp, body
 
     def reset_volume_status(self, volume_id, status):
@@ -246,7 +246,7 @@ class VolumesClientXML(RestClientXML):
         url = 'volumes/%s/action' % str(volume_id)
         resp, body = self.post(url, str(Document(post_body)), self.headers)
         if body:
-            body = xml_to_json(etree.fromstring(body))
+            body = xml_string_to_json(body)
         return resp, body
 
     def volume_begin_detaching(self, volume_id):
@@ -255,7 +255,7 @@ class VolumesClientXML(RestClientXML):
         url = 'volumes/%s/action' % str(volume_id)
         resp, body = self.post(url, str(Document(post_body)), self.headers)
         if body:
-            body = xml_to_json(etree.fromstring(body))
+            body = xml_string_to_json(body)
         return resp, body
 
     def volume_roll_detaching(self, volume_id):
@@ -264,7 +264,7 @@ class VolumesClientXML(RestClientXML):
         url = 'volumes/%s/action' % str(volume_id)
         resp, body = self.post(url, str(Document(post_body)), self.headers)
         if body:
-            body = xml_to_json(etree.fromstring(body))
+            body = xml_string_to_json(body)
         return resp, body
 
     def reserve_volume(self, volume_id):
@@ -273,7 +273,7 @@ class VolumesClientXML(RestClientXML):
         url = 'volumes/%s/action' % str(volume_id)
         resp, body = self.post(url, str(Document(post_body)), self.headers)
         if body:
-            body = xml_to_json(etree.fromstring(body))
+            body = xml_string_to_json(body)
         return resp, body
 
     def unreserve_volume(self, volume_id):
@@ -282,7 +282,7 @@ class VolumesClientXML(RestClientXML):
         url = 'volumes/%s/action' % str(volume_id)
         resp, body = self.post(url, str(Document(post_body)), self.headers)
         if body:
-            body = xml_to_json(etree.fromstring(body))
+            body = xml_string_to_json(body)
         return resp, body
 
     def create_volume_transfer(self, vol_id, display_name=None):
@@ -294,14 +294,14 @@ class VolumesClientXML(RestClientXML):
         resp, body = self.post('os-volume-transfer',
                                str(Document(post_body)),
                                self.headers)
-        volume = xml_to_json(etree.fromstring(body))
+        volume = xml_string_to_json(body)
         return resp, volume
 
     def get_volume_transfer(self, transfer_id):
         """Returns the details of a volume transfer."""
         url = "os-volume-transfer/%s" % str(transfer_id)
         resp, body = self.get(url, self.headers)
-        volume = xml_to_json(etree.fromstring(body))
+        volume = xml_string_to_json(body)
         return resp, volume
 
     def list_volume_transfers(self, params=None):
@@ -335,7 +335,7 @@ class VolumesClientXML(RestClientXML):
         post_body = Element("accept", auth_key=transfer_auth_key)
         url = 'os-volume-transfer/%s/accept' % transfer_id
         resp, body = self.post(url, str(Document(post_body)), self.headers)
-        volume = xml_to_json(etree.fromstring(body))
+        volume = xml_string_to_json(body)
         return resp, volume
 
     def update_volume_readonly(self, volume_id, readonly):
@@ -345,7 +345,7 @@ class VolumesClientXML(RestClientXML):
         url = 'volumes/%s/action' % str(volume_id)
         resp, body = self.post(url, str(Document(post_body)), self.headers)
         if body:
-            body = xml_to_json(etree.fromstring(body))
+            body = xml_string_to_json(body)
         return resp, body
 
     def force_delete_volume(self, volume_id):
@@ -354,5 +354,5 @@ class VolumesClientXML(RestClientXML):
         url = 'volumes/%s/action' % str(volume_id)
         resp, body = self.post(url, str(Document(post_body)), self.headers)
         if body:
-            body = xml_to_json(etree.fromstring(body))
+            body = xml_string_to_json(body)
         return resp, body
@@ -12,9 +12,7 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
-import socket
-import subprocess
-
+from tempest.common import prober
 from tempest.common.utils import data_utils
 import tempest.stress.stressaction as stressaction
 import tempest.test
@@ -22,45 +20,22 @@ import tempest.test
 
 class FloatingStress(stressaction.StressAction):
 
-    # from the scenario manager
-    def ping_ip_address(self, ip_address):
-        cmd = ['ping', '-c1', '-w1', ip_address]
-
-        proc = subprocess.Popen(cmd,
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE)
-        proc.wait()
-        success = proc.returncode == 0
-        self.logger.info("%s(%s): %s", self.server_id, self.floating['ip'],
-                         "pong!" if success else "no pong :(")
-        return success
-
-    def tcp_connect_scan(self, addr, port):
-        # like tcp
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        try:
-            s.connect((addr, port))
-        except socket.error as exc:
-            self.logger.info("%s(%s): %s", self.server_id, self.floating['ip'],
-                             str(exc))
-            return False
-        self.logger.info("%s(%s): Connected :)", self.server_id,
-                         self.floating['ip'])
-        s.close()
-        return True
+    def _probe(self, port=None):
+        ip = self.floating['ip']
+        result = prober.Prober(self.check_timeout,
+                               self.check_interval).probe([ip], port=port)
+        latency = result.latencies[ip]
+        self.logger.info("%s(%s): %s", self.server_id, ip,
+                         "unreachable" if latency is None else
+                         "reachable after %.1f s" % latency)
+        return latency is not None
 
     def check_port_ssh(self):
-        def func():
-            return self.tcp_connect_scan(self.floating['ip'], 22)
-        if not tempest.test.call_until_true(func, self.check_timeout,
-                                            self.check_interval):
+        if not self._probe(port=22):
             raise RuntimeError("Cannot connect to the ssh port.")
 
     def check_icmp_echo(self):
-        def func():
-            return self.ping_ip_address(self.floating['ip'])
-        if not tempest.test.call_until_true(func, self.check_timeout,
-                                            self.check_interval):
+        if not self._probe():
             raise RuntimeError("Cannot ping the machine.")
 
     def _create_vm(self):
@@ -14,6 +14,7 @@
 
 import multiprocessing
 import os
+import pipes
 import signal
 import time
 
@@ -24,6 +25,8 @@ from tempest import exceptions
 from tempest.openstack.common import importutils
 from tempest.openstack.common import log as logging
 from tempest.stress import cleanup
+from tempest.stress import openloop
+from tempest.stress import statistics
 
 LOG = logging.getLogger(__name__)
 processes = []
@@ -58,21 +61,80 @@ def _get_compute_nodes(controller, ssh_user, ssh_key=None):
     return nodes
 
 
-def _has_error_in_logs(logfiles, nodes, ssh_user, ssh_key=None,
-                       stop_on_error=False):
+class LogTailer(object):
     """
-    Detect errors in the nova log files on the controller and compute nodes.
+    Greps the lines appended to the log files of nodes since the last check.
+
+    Every check runs one command on all the nodes at the same time, over
+    cached ssh connections. The command greps each log file from the offset
+    the previous check stopped at instead of scanning it again, and from
+    its start if the file shrank since then.
     """
-    grep = 'egrep "ERROR|TRACE" %s' % logfiles
-    ret = False
-    for node in nodes:
-        errors = do_ssh(grep, node, ssh_user, ssh_key)
-        if len(errors) > 0:
-            LOG.error('%s: %s' % (node, errors))
-            ret = True
-            if stop_on_error:
-                break
-    return ret
+
+    _marker = '==> tempest-log-size'
+
+    def __init__(self, logfiles, nodes, ssh_user, ssh_key=None,
+                 pattern='ERROR|TRACE'):
+        self.logfiles = logfiles
+        self.pattern = pattern
+        self.connections = ssh.ConnectionCache()
+        self.clients = {}
+        for node in nodes:
+            self.clients[node] = ssh.Client(node, ssh_user,
+                                            key_filename=ssh_key,
+                                            connection_cache=self.connections)
+        self.offsets = dict((node, {}) for node in nodes)
+
+    def _command(self, node):
+        cases = ''.join('%s) offset=%d ;; ' % (pipes.quote(path), offset)
+                        for path, offset in self.offsets[node].iteritems())
+        return ('for f in %(logfiles)s; do '
+                '[ -f "$f" ] || continue; '
+                'size=$(stat -c %%s "$f"); '
+                'case "$f" in %(cases)s*) offset=0 ;; esac; '
+                '[ "$size" -lt "$offset" ] && offset=0; '
+                'echo "%(marker)s $size $f"; '
+                'tail -c +$((offset + 1)) "$f" | head -c $((size - offset)) '
+                '| egrep "%(pattern)s" | sed "s|^|$f: |"; '
+                'done; true' % {'logfiles': self.logfiles, 'cases': cases,
+                                'marker': self._marker,
+                                'pattern': self.pattern})
+
+    def check(self):
+        """Returns the new matching lines of the nodes which have some."""
+        commands = dict((node, (client, self._command(node)))
+                        for node, client in self.clients.iteritems())
+        outputs, failures = ssh.run_commands(commands,
+                                             max_workers=len(commands))
+        for node, exc in failures.iteritems():
+            LOG.error('Failed to check the logs of %s: %s' % (node, exc))
+        errors = {}
+        for node, output in outputs.iteritems():
+            offsets = {}
+            lines = []
+            for line in output.splitlines():
+                if line.startswith(self._marker + ' '):
+                    size, path = line[len(self._marker) + 1:].split(' ', 1)
+                    offsets[path] = int(size)
+                elif line:
+                    lines.append(line)
+            self.offsets[node] = offsets
+            if lines:
+                errors[node] = lines
+        return errors
+
+    def close(self):
+        self.connections.close()
+
+
+def _has_error_in_logs(tailer):
+    """
+    Detect new errors in the nova log files on the compute nodes.
+    """
+    errors = tailer.check()
+    for node in sorted(errors):
+        LOG.error('%s: %s' % (node, '\n'.join(errors[node])))
+    return bool(errors)
 
 
 def sigchld_handler(signal, frame):
@@ -104,9 +166,17 @@ def terminate_all_processes(check_interval=20):
         process['process'].join()
 
 
-def stress_openstack(tests, duration, max_runs=None, stop_on_error=False):
+def stress_openstack(tests, duration, max_runs=None, stop_on_error=False,
+                     rate=None, ramp_up=0, ramp_down=0, max_backlog=100):
     """
     Workload driver. Executes an action function against a nova-cluster.
+
+    By default every process runs its action back to back. Given a rate
+    of runs per second (or a 'rate' in the description of a test), the
+    test runs in the open loop instead: its runs arrive at that rate as a
+    Poisson process, ramping up and down during ramp_up and ramp_down
+    seconds, and wait for a free process in a queue of at most
+    max_backlog arrivals.
     """
     admin_manager = clients.AdminManager()
 
@@ -116,12 +186,27 @@ def stress_openstack(tests, duration, max_runs=None, stop_on_error=False):
     log_check_interval = int(admin_manager.config.stress.log_check_interval)
     default_thread_num = int(admin_manager.config.stress.
                              default_thread_number_per_action)
+    report_interval = admin_manager.config.stress.report_interval
+    metrics_file = admin_manager.config.stress.metrics_file
     if logfiles:
         controller = admin_manager.config.stress.target_controller
         computes = _get_compute_nodes(controller, ssh_user, ssh_key)
         for node in computes:
             do_ssh("rm -f %s" % logfiles, node, ssh_user, ssh_key)
+        tailer = LogTailer(logfiles, computes, ssh_user, ssh_key)
+    # NOTE: the statistics of all the workers share one memory array,
+    # which has to exist before they are forked.
+    stats = statistics.StressStatistics(
+        sum(test.get('threads', default_thread_num) for test in tests))
+    workers = iter(stats.workers)
+    dispatchers = {}
     for test in tests:
+        test_rate = test.get('rate', rate)
+        arrivals = None
+        if test_rate:
+            profile = openloop.RateProfile(test_rate, duration, ramp_up,
+                                           ramp_down)
+            arrivals = multiprocessing.Queue(max_backlog)
         if test.get('use_admin', False):
             manager = admin_manager
         else:
@@ -150,13 +235,15 @@ def stress_openstack(tests, duration, max_runs=None, stop_on_error=False):
             LOG.debug("calling Target Object %s" %
                       test_run.__class__.__name__)
 
-            mp_manager = multiprocessing.Manager()
-            shared_statistic = mp_manager.dict()
-            shared_statistic['runs'] = 0
-            shared_statistic['fails'] = 0
+            shared_statistic = next(workers)
 
-            p = multiprocessing.Process(target=test_run.execute,
-                                        args=(shared_statistic,))
+            if arrivals is None:
+                p = multiprocessing.Process(target=test_run.execute,
+                                            args=(shared_statistic,))
+            else:
+                p = multiprocessing.Process(target=test_run.execute_arrivals,
+                                            args=(shared_statistic,
+                                                  arrivals))
 
             process = {'process': p,
                        'p_number': p_number,
@@ -165,9 +252,20 @@ def stress_openstack(tests, duration, max_runs=None, stop_on_error=False):
 
             processes.append(process)
             p.start()
+        if arrivals is not None:
+            dispatchers[test_run.action] = openloop.Dispatcher(
+                test_run.action, profile, arrivals,
+                test.get('threads', default_thread_num))
     if stop_on_error:
         # NOTE(mkoderer): only the parent should register the handler
         signal.signal(signal.SIGCHLD, sigchld_handler)
+    reporter = None
+    if report_interval > 0:
+        reporter = statistics.Reporter(processes, report_interval,
+                                       metrics_file, dispatchers)
+        reporter.start()
+    for dispatcher in dispatchers.values():
+        dispatcher.start()
     end_time = time.time() + duration
     had_errors = False
     while True:
@@ -193,12 +291,18 @@ def stress_openstack(tests, duration, max_runs=None, stop_on_error=False):
 
         if not logfiles:
             continue
-        if _has_error_in_logs(logfiles, computes, ssh_user, ssh_key,
-                              stop_on_error):
+        if _has_error_in_logs(tailer):
             had_errors = True
             break
 
+    for dispatcher in dispatchers.values():
+        dispatcher.stop()
     terminate_all_processes()
+    if logfiles:
+        tailer.close()
+    if reporter:
+        reporter.stop()
+        reporter.report()
 
     sum_fails = 0
     sum_runs = 0
@@ -217,6 +321,8 @@ def stress_openstack(tests, duration, max_runs=None, stop_on_error=False):
     LOG.info("Summary:")
     LOG.info("Run %d actions (%d failed)" %
              (sum_runs, sum_fails))
+    LOG.info("Latencies (per action):")
+    statistics.log_summary(processes, dispatchers)
 
     if not had_errors:
         LOG.info("cleaning up")
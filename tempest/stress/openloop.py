@@ -0,0 +1,129 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Open-loop load generation for the stress driver.
+
+In the default closed loop, every worker process runs its action back to
+back, so the load offered to the cloud depends on the number of workers
+and on the latency of the cloud. In the open loop, a Dispatcher of the
+driver offers the load instead: it draws Poisson arrivals at a target
+rate that follows a RateProfile, and queues them for the workers of the
+action, which run once per arrival. The workers bound the concurrency,
+and a bounded queue the backlog: arrivals finding it full are dropped.
+"""
+
+import random
+import threading
+import time
+
+from six.moves import queue
+
+from tempest.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+
+class RateProfile(object):
+    """Target rate of arrivals per second over the duration of a test.
+
+    The rate grows linearly from 0 to rate during the first ramp_up
+    seconds, holds for the plateau, then decreases linearly back to 0
+    during the last ramp_down seconds.
+    """
+
+    def __init__(self, rate, duration, ramp_up=0, ramp_down=0):
+        if rate <= 0:
+            raise ValueError("The target rate must be positive")
+        if ramp_up < 0 or ramp_down < 0 or ramp_up + ramp_down > duration:
+            raise ValueError("The ramps must fit in the duration")
+        self.rate = rate
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.ramp_down = ramp_down
+
+    def rate_at(self, elapsed):
+        if elapsed < 0 or elapsed >= self.duration:
+            return 0.0
+        if elapsed < self.ramp_up:
+            return self.rate * elapsed / self.ramp_up
+        remaining = self.duration - elapsed
+        if remaining < self.ramp_down:
+            return self.rate * remaining / self.ramp_down
+        return float(self.rate)
+
+    def arrivals(self, rand=random):
+        """Yields the times of Poisson arrivals following the profile.
+
+        The times are in seconds since the start of the test. Arrivals are
+        drawn at the peak rate and thinned to the rate of their time.
+        """
+        elapsed = 0.0
+        while True:
+            elapsed += rand.expovariate(self.rate)
+            if elapsed >= self.duration:
+                return
+            if rand.random() * self.rate < self.rate_at(elapsed):
+                yield elapsed
+
+
+class Dispatcher(threading.Thread):
+    """Queues the arrivals of a profile for the workers of an action.
+
+    Each arrival is put in the queue as the time it is due at, for the
+    workers to measure how long it waited. When the queue is full the
+    arrival is dropped. At the end of the profile, or when stopped, one
+    None per worker tells them to exit.
+    """
+
+    def __init__(self, action, profile, arrivals_queue, workers):
+        super(Dispatcher, self).__init__(name='stress-dispatcher-%s' %
+                                         action)
+        self.daemon = True
+        self.action = action
+        self.profile = profile
+        self.queue = arrivals_queue
+        self.workers = workers
+        self.arrivals = 0
+        self.dropped = 0
+        self.started = None
+        self._stopped = threading.Event()
+
+    def target_rate(self, now=None):
+        if self.started is None:
+            return 0.0
+        return self.profile.rate_at((now or time.time()) - self.started)
+
+    def run(self):
+        self.started = time.time()
+        for elapsed in self.profile.arrivals():
+            due = self.started + elapsed
+            self._stopped.wait(max(due - time.time(), 0))
+            if self._stopped.is_set():
+                break
+            self.arrivals += 1
+            try:
+                self.queue.put_nowait(due)
+            except queue.Full:
+                self.dropped += 1
+        LOG.info("%s: dispatched %d arrivals (%d dropped)" %
+                 (self.action, self.arrivals, self.dropped))
+        for _ in xrange(self.workers):
+            # NOTE: blocks while the workers drain the backlog
+            self.queue.put(None)
+
+    def stop(self):
+        self._stopped.set()
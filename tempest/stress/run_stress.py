@@ -76,18 +76,22 @@ def main(ns):
     else:
         tests = discover_stress_tests(filter_attr=ns.type,
                                       call_inherited=ns.call_inherited)
+    open_loop = {'rate': ns.rate, 'ramp_up': ns.ramp_up,
+                 'ramp_down': ns.ramp_down, 'max_backlog': ns.max_backlog}
 
     if ns.serial:
         for test in tests:
             step_result = driver.stress_openstack([test],
                                                   ns.duration,
                                                   ns.number,
-                                                  ns.stop)
+                                                  ns.stop,
+                                                  **open_loop)
             # NOTE(mkoderer): we just save the last result code
             if (step_result != 0):
                 result = step_result
     else:
-        driver.stress_openstack(tests, ns.duration, ns.number, ns.stop)
+        driver.stress_openstack(tests, ns.duration, ns.number, ns.stop,
+                                **open_loop)
     return result
 
 
@@ -100,6 +104,18 @@ parser.add_argument('-S', '--stop', action='store_true',
                     default=False, help="Stop on first error")
 parser.add_argument('-n', '--number', type=int,
                     help="How often an action is executed for each process")
+parser.add_argument('-r', '--rate', type=float,
+                    help="Run in the open loop: rate of the runs per second "
+                         "of each test, which arrive as a Poisson process "
+                         "and wait for a free process")
+parser.add_argument('--ramp-up', default=0, type=int,
+                    help="Secs the open-loop rate takes to reach its target")
+parser.add_argument('--ramp-down', default=0, type=int,
+                    help="Secs the open-loop rate takes to go back to 0 at "
+                         "the end of the test")
+parser.add_argument('--max-backlog', default=100, type=int,
+                    help="Maximum number of open-loop runs waiting for a "
+                         "process, further ones are dropped")
 group = parser.add_mutually_exclusive_group(required=True)
 group.add_argument('-a', '--all', action='store_true',
                    help="Execute all stress tests")
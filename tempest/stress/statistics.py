@@ -0,0 +1,197 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import multiprocessing
+import threading
+import time
+
+from tempest.common import histograms
+from tempest.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+_RUNS = 0
+_FAILS = 1
+_HISTOGRAM = 2
+_QUEUE_DELAYS = _HISTOGRAM + histograms.HISTOGRAM_SIZE
+_SLOT_SIZE = _QUEUE_DELAYS + histograms.HISTOGRAM_SIZE
+
+
+class WorkerStatistic(object):
+    """The counters of one stress worker, in its slot of a shared array.
+
+    A worker process is the only writer of its slot, so the counters are
+    updated in place without any lock or round trip to a manager process;
+    the driver only reads them. The counts of runs and failures are read
+    and written like the items of a dict: ``statistic['runs'] += 1``.
+    Histograms count the latencies of the runs, and in the open-loop mode
+    the delays the arrivals waited for a worker.
+    """
+
+    _counters = {'runs': _RUNS, 'fails': _FAILS}
+
+    def __init__(self, array, index):
+        self._array = array
+        self._offset = index * _SLOT_SIZE
+
+    def __getitem__(self, key):
+        return self._array[self._offset + self._counters[key]]
+
+    def __setitem__(self, key, value):
+        self._array[self._offset + self._counters[key]] = value
+
+    def _add(self, histogram, seconds):
+        bucket = histograms.bucket(seconds)
+        self._array[self._offset + histogram + bucket] += 1
+
+    def add_latency(self, seconds):
+        self._add(_HISTOGRAM, seconds)
+
+    def add_queue_delay(self, seconds):
+        self._add(_QUEUE_DELAYS, seconds)
+
+    def histogram(self):
+        return self._array[self._offset + _HISTOGRAM:
+                           self._offset + _QUEUE_DELAYS]
+
+    def queue_delay_histogram(self):
+        return self._array[self._offset + _QUEUE_DELAYS:
+                           self._offset + _SLOT_SIZE]
+
+
+class StressStatistics(object):
+    """Statistics of the stress workers, in a single shared memory array.
+
+    The array must be created before the worker processes are forked, to
+    be shared with them.
+    """
+
+    def __init__(self, workers):
+        self._array = multiprocessing.RawArray('l', workers * _SLOT_SIZE)
+        self.workers = [WorkerStatistic(self._array, index)
+                        for index in xrange(workers)]
+
+
+class Reporter(threading.Thread):
+    """Reports the throughput and latencies of the actions periodically.
+
+    Every interval seconds, logs for each action the number of runs and
+    failures since the last report, the rate of runs and the percentiles
+    of their latencies. processes are the process dicts of the driver,
+    with the 'action' and 'statistic' of each worker. dispatchers maps
+    the actions run in the open-loop mode to their openloop.Dispatcher,
+    whose target rate, dropped arrivals and queueing delays are reported
+    too. If path is given, the reports are also appended to it, one line
+    of JSON per action.
+    """
+
+    def __init__(self, processes, interval, path=None, dispatchers=None):
+        super(Reporter, self).__init__(name='stress-reporter')
+        self.daemon = True
+        self.processes = processes
+        self.interval = interval
+        self.path = path
+        self.dispatchers = dispatchers or {}
+        self._stopped = threading.Event()
+        self._last = (time.time(), self._snapshot())
+
+    def _snapshot(self):
+        snapshot = {}
+        for process in self.processes:
+            statistic = process['statistic']
+            counts = [statistic['runs'], statistic['fails'],
+                      statistic.histogram(),
+                      statistic.queue_delay_histogram()]
+            if process['action'] in snapshot:
+                total = snapshot[process['action']]
+                counts = [total[0] + counts[0], total[1] + counts[1],
+                          histograms.merge([total[2], counts[2]]),
+                          histograms.merge([total[3], counts[3]])]
+            snapshot[process['action']] = counts
+        return snapshot
+
+    def report(self):
+        now, snapshot = time.time(), self._snapshot()
+        last_time, last = self._last
+        self._last = now, snapshot
+        elapsed = max(now - last_time, 1e-6)
+        lines = []
+        for action in sorted(snapshot):
+            runs, fails, histogram, delays = snapshot[action]
+            last_runs, last_fails, last_histogram, last_delays = last[action]
+            runs -= last_runs
+            fails -= last_fails
+            histogram = [count - last_count for count, last_count
+                         in zip(histogram, last_histogram)]
+            record = {'time': now, 'action': action, 'runs': runs,
+                      'fails': fails, 'rate': runs / elapsed}
+            for point, latency in zip(histograms.PERCENTILES,
+                                      histograms.percentiles(histogram)):
+                record['p%d' % point] = latency
+            message = "%s: %d runs (%.2f/s), %d failed, %s" % (
+                action, runs, runs / elapsed, fails,
+                histograms.format_percentiles(histogram))
+            dispatcher = self.dispatchers.get(action)
+            if dispatcher:
+                delays = [count - last_count for count, last_count
+                          in zip(delays, last_delays)]
+                record['target_rate'] = dispatcher.target_rate(now)
+                record['dropped'] = dispatcher.dropped
+                for point, delay in zip(histograms.PERCENTILES,
+                                        histograms.percentiles(delays)):
+                    record['queue_p%d' % point] = delay
+                message += ("; target %.2f/s, %d dropped, queueing %s" %
+                            (record['target_rate'], dispatcher.dropped,
+                             histograms.format_percentiles(delays)))
+            LOG.info(message)
+            lines.append(json.dumps(record))
+        if self.path and lines:
+            with open(self.path, 'a') as metrics:
+                metrics.write('\n'.join(lines) + '\n')
+
+    def run(self):
+        self._stopped.wait(self.interval)
+        while not self._stopped.is_set():
+            try:
+                self.report()
+            except Exception:
+                LOG.exception("Failure in the stress reporter")
+            self._stopped.wait(self.interval)
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+def log_summary(processes, dispatchers=None):
+    """Logs the latencies of every action (and its queueing delays)."""
+    dispatchers = dispatchers or {}
+    actions = {}
+    for process in processes:
+        actions.setdefault(process['action'], []).append(
+            process['statistic'])
+    for action in sorted(actions):
+        stats = actions[action]
+        message = " %s: %s" % (action, histograms.format_percentiles(
+            histograms.merge([stat.histogram() for stat in stats])))
+        if action in dispatchers:
+            message += "; %d arrivals, %d dropped, queueing %s" % (
+                dispatchers[action].arrivals, dispatchers[action].dropped,
+                histograms.format_percentiles(histograms.merge(
+                    [stat.queue_delay_histogram() for stat in stats])))
+        LOG.info(message)
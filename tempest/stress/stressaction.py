@@ -16,6 +16,7 @@
 
 import signal
 import sys
+import time
 
 from tempest.openstack.common import log as logging
 
@@ -63,27 +64,50 @@ class StressAction(object):
         """This is the main execution entry point called
         by the driver.   We register a signal handler to
         allow us to tearDown gracefully, and then exit.
-        We also keep track of how many runs we do.
+        We also keep track of how many runs we do, and of
+        how long they take.
         """
         signal.signal(signal.SIGHUP, self._shutdown_handler)
         signal.signal(signal.SIGTERM, self._shutdown_handler)
 
         while self.max_runs is None or (shared_statistic['runs'] <
                                         self.max_runs):
-            self.logger.debug("Trigger new run (run %d)" %
-                              shared_statistic['runs'])
-            try:
-                self.run()
-            except Exception:
-                shared_statistic['fails'] += 1
-                self.logger.exception("Failure in run")
-            finally:
-                shared_statistic['runs'] += 1
-                if self.stop_on_error and (shared_statistic['fails'] > 1):
-                    self.logger.warn("Stop process due to"
-                                     "\"stop-on-error\" argument")
-                    self.tearDown()
-                    sys.exit(1)
+            self._run_once(shared_statistic)
+
+    def execute_arrivals(self, shared_statistic, arrivals):
+        """This is the execution entry point of the open-loop mode
+        of the driver. Instead of running back to back, we run
+        once for each arrival time read from the arrivals queue,
+        until we read None. The time an arrival waited in the
+        queue is kept track of as its queueing delay.
+        """
+        signal.signal(signal.SIGHUP, self._shutdown_handler)
+        signal.signal(signal.SIGTERM, self._shutdown_handler)
+
+        while True:
+            arrival = arrivals.get()
+            if arrival is None:
+                break
+            shared_statistic.add_queue_delay(time.time() - arrival)
+            self._run_once(shared_statistic)
+
+    def _run_once(self, shared_statistic):
+        self.logger.debug("Trigger new run (run %d)" %
+                          shared_statistic['runs'])
+        started = time.time()
+        try:
+            self.run()
+        except Exception:
+            shared_statistic['fails'] += 1
+            self.logger.exception("Failure in run")
+        finally:
+            shared_statistic.add_latency(time.time() - started)
+            shared_statistic['runs'] += 1
+            if self.stop_on_error and (shared_statistic['fails'] > 1):
+                self.logger.warn("Stop process due to"
+                                 "\"stop-on-error\" argument")
+                self.tearDown()
+                sys.exit(1)
 
     def run(self):
         """This method is where the stress test code runs."""
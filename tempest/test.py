@@ -18,7 +18,6 @@
 import atexit
 import functools
 import os
-import time
 
 import fixtures
 import nose.plugins.attrib
@@ -26,7 +25,9 @@ import testresources
 import testtools
 
 from tempest import clients
-from tempest.common import isolated_creds
+from tempest.common import backoff
+from tempest.common import credential_pool
+from tempest.common import http_timing
 from tempest import config
 from tempest import exceptions
 from tempest.openstack.common import log as logging
@@ -223,15 +224,27 @@ class BaseTestCase(testtools.TestCase,
             self.useFixture(fixtures.LoggerFixture(nuke_handlers=False,
                                                    format=log_format,
                                                    level=None))
+        if self.config.http.record_timings:
+            scope = http_timing.recorder.start_scope()
+            self.addCleanup(self._attach_http_timings, scope)
+
+    def _attach_http_timings(self, scope):
+        http_timing.recorder.stop_scope(scope)
+        if scope:
+            self.addDetail('http-timings', testtools.content.text_content(
+                http_timing.report(scope)))
 
     @classmethod
     def get_client_manager(cls):
         """
         Returns an Openstack client manager
         """
-        cls.isolated_creds = isolated_creds.IsolatedCreds(cls.__name__)
-
         force_tenant_isolation = getattr(cls, 'force_tenant_isolation', None)
+        # NOTE: the classes forcing tenant isolation change their tenant,
+        # so they never lease a reused one from the credential pool.
+        cls.isolated_creds = credential_pool.get_isolated_creds(
+            cls.__name__, pooled=not force_tenant_isolation)
+
         if (cls.config.compute.allow_tenant_isolation or
             force_tenant_isolation):
             creds = cls.isolated_creds.get_primary_creds()
@@ -272,7 +285,7 @@ class BaseTestCase(testtools.TestCase,
         )
 
 
-def call_until_true(func, duration, sleep_for):
+def call_until_true(func, duration, sleep_for, poll_policy=None):
     """
     Call the given function until it returns True (and return True) or
     until the specified duration (in seconds) elapses (and return
@@ -281,15 +294,20 @@ def call_until_true(func, duration, sleep_for):
     :param func: A zero argument callable that returns True on success.
     :param duration: The number of seconds for which to attempt a
         successful call of the function.
-    :param sleep_for: The number of seconds to sleep after an unsuccessful
-                      invocation of the function.
+    :param sleep_for: The maximum number of seconds to sleep after an
+                      unsuccessful invocation of the function.
+    :param poll_policy: The backoff.PollPolicy giving the sleep times, by
+                        default the compute polling options capped at
+                        sleep_for.
     """
-    now = time.time()
-    timeout = now + duration
-    while now < timeout:
+    if poll_policy is None:
+        conf = config.TempestConfig().compute
+        poll_policy = backoff.PollPolicy(sleep_for,
+                                         conf.poll_initial_interval,
+                                         conf.poll_backoff_factor)
+    poller = poll_policy.poller(duration)
+    while True:
         if func():
             return True
-        LOG.debug("Sleeping for %d seconds", sleep_for)
-        time.sleep(sleep_for)
-        now = time.time()
-    return False
+        if not poller.sleep():
+            return False
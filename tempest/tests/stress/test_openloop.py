@@ -0,0 +1,57 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import Queue
+import random
+
+from tempest.stress import openloop
+import tempest.test
+
+
+class TestOpenLoop(tempest.test.BaseTestCase):
+
+    def test_rate_profile(self):
+        profile = openloop.RateProfile(10, 100, ramp_up=20, ramp_down=10)
+        self.assertEqual(0, profile.rate_at(0))
+        self.assertEqual(5, profile.rate_at(10))
+        self.assertEqual(10, profile.rate_at(50))
+        self.assertEqual(5, profile.rate_at(95))
+        self.assertEqual(0, profile.rate_at(100))
+
+    def test_invalid_profiles(self):
+        self.assertRaises(ValueError, openloop.RateProfile, 0, 100)
+        self.assertRaises(ValueError, openloop.RateProfile, 1, 100,
+                          ramp_up=60, ramp_down=60)
+
+    def test_arrivals_follow_the_profile(self):
+        profile = openloop.RateProfile(20, 100, ramp_up=50)
+        arrivals = list(profile.arrivals(random.Random(42)))
+        self.assertEqual(sorted(arrivals), arrivals)
+        ramp = len([t for t in arrivals if t < 50])
+        plateau = len(arrivals) - ramp
+        # 500 arrivals expected during the ramp, 1000 on the plateau
+        self.assertTrue(400 < ramp < 600)
+        self.assertTrue(900 < plateau < 1100)
+
+    def test_dispatcher_drops_the_arrivals_of_a_full_queue(self):
+        arrivals = Queue.Queue(5)
+        profile = openloop.RateProfile(1000, 0.1)
+        dispatcher = openloop.Dispatcher('action', profile, arrivals, 0)
+        dispatcher.run()
+        self.assertEqual(5, arrivals.qsize())
+        self.assertEqual(dispatcher.arrivals - 5, dispatcher.dropped)
+        self.assertTrue(dispatcher.dropped > 0)
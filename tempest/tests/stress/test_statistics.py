@@ -0,0 +1,40 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import multiprocessing
+
+from tempest.stress import statistics
+import tempest.test
+
+
+def _count_runs(statistic):
+    for _ in xrange(100):
+        statistic['runs'] += 1
+        statistic.add_latency(0.5)
+
+
+class TestStatistics(tempest.test.BaseTestCase):
+
+    def test_workers_share_the_statistics(self):
+        stats = statistics.StressStatistics(2)
+        process = multiprocessing.Process(target=_count_runs,
+                                          args=(stats.workers[1],))
+        process.start()
+        process.join()
+        self.assertEqual(0, stats.workers[0]['runs'])
+        self.assertEqual(100, stats.workers[1]['runs'])
+        self.assertEqual(100, sum(stats.workers[1].histogram()))
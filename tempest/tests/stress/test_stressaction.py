@@ -15,6 +15,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import Queue
+import time
+
+from tempest.common import histograms
+from tempest.stress import statistics
 import tempest.stress.stressaction as stressaction
 import tempest.test
 
@@ -39,7 +44,10 @@ class FakeStressActionFailing(stressaction.StressAction):
 
 class TestStressAction(tempest.test.BaseTestCase):
     def _bulid_stats_dict(self, runs=0, fails=0):
-        return {'runs': runs, 'fails': fails}
+        stats = statistics.StressStatistics(1).workers[0]
+        stats['runs'] = runs
+        stats['fails'] = fails
+        return stats
 
     def testStressTestRun(self):
         stressAction = FakeStressAction(manager=None, max_runs=1)
@@ -48,6 +56,7 @@ class TestStressAction(tempest.test.BaseTestCase):
         self.assertTrue(stressAction.run_called)
         self.assertEqual(stats['runs'], 1)
         self.assertEqual(stats['fails'], 0)
+        self.assertEqual(sum(stats.histogram()), 1)
 
     def testStressMaxTestRuns(self):
         stressAction = FakeStressAction(manager=None, max_runs=500)
@@ -63,3 +72,16 @@ class TestStressAction(tempest.test.BaseTestCase):
         stressAction.execute(stats)
         self.assertEqual(stats['runs'], 1)
         self.assertEqual(stats['fails'], 1)
+
+    def testStressRunArrivals(self):
+        stressAction = FakeStressAction(manager=None)
+        stats = self._bulid_stats_dict()
+        arrivals = Queue.Queue()
+        arrivals.put(time.time() - 1)
+        arrivals.put(time.time())
+        arrivals.put(None)
+        stressAction.execute_arrivals(stats, arrivals)
+        self.assertTrue(stressAction.run_called)
+        self.assertEqual(stats['runs'], 2)
+        self.assertTrue(histograms.percentiles(
+            stats.queue_delay_histogram(), (100,))[0] >= 1)
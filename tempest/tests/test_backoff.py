@@ -0,0 +1,63 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import itertools
+import time
+
+from tempest.common import backoff
+from tempest.tests import base
+
+
+class TestPollPolicy(base.TestCase):
+
+    def _first(self, policy, count):
+        return list(itertools.islice(policy.intervals(), count))
+
+    def test_exponential_growth_is_capped(self):
+        policy = backoff.PollPolicy(10, 1, factor=3, jitter=False)
+        self.assertEqual([1, 3, 9, 10, 10], self._first(policy, 5))
+
+    def test_fixed_interval_by_default(self):
+        policy = backoff.PollPolicy(5)
+        self.assertEqual([5, 5, 5], self._first(policy, 3))
+
+    def test_jitter_bounds(self):
+        policy = backoff.PollPolicy(10, 1)
+        for n, interval in enumerate(self._first(policy, 20)):
+            self.assertTrue(1 <= interval <= min(2 ** n, 10))
+
+
+class TestPoller(base.TestCase):
+
+    def setUp(self):
+        super(TestPoller, self).setUp()
+        self.now = 1000.0
+        self.sleeps = []
+        self.stubs.Set(time, 'time', lambda: self.now)
+        self.stubs.Set(time, 'sleep', self._sleep)
+
+    def _sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def test_never_sleeps_past_the_deadline(self):
+        policy = backoff.PollPolicy(10, 4, jitter=False)
+        poller = policy.poller(10)
+        while poller.sleep():
+            pass
+        self.assertEqual([4, 6], self.sleeps)
+        self.assertTrue(poller.expired())
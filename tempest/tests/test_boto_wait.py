@@ -0,0 +1,103 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+from tempest import exceptions
+from tempest.tests import base
+from tempest.thirdparty.boto import test as boto_test
+from tempest.thirdparty.boto.utils import wait
+
+
+class FakeObject(object):
+    connection = 'connection'
+
+    def __init__(self, obj_id):
+        self.id = obj_id
+
+
+class TestBatchedDescribe(base.TestCase):
+
+    def setUp(self):
+        super(TestBatchedDescribe, self).setUp()
+        self.calls = []
+        self.batch = wait.BatchedDescribe(self._describe, interval=60)
+
+    def _describe(self, connection, ids):
+        self.calls.append(sorted(ids))
+        return dict((obj_id, 'fresh %s' % obj_id) for obj_id in ids
+                    if obj_id != 'gone')
+
+    def test_lookups_share_one_describe(self):
+        objs = [FakeObject('i-1'), FakeObject('i-2'), FakeObject('gone')]
+        with self.batch.watch(*objs) as lookup:
+            self.assertEqual('fresh i-1', lookup(objs[0]))
+            self.assertEqual('fresh i-2', lookup(objs[1]))
+            self.assertIsNone(lookup(objs[2]))
+        self.assertEqual([['gone', 'i-1', 'i-2']], self.calls)
+
+    def test_watch_needs_a_newer_describe(self):
+        first, second = FakeObject('i-1'), FakeObject('i-2')
+        with self.batch.watch(first) as lookup:
+            lookup(first)
+            with self.batch.watch(second) as second_lookup:
+                second_lookup(second)
+                lookup(first)
+        with self.batch.watch(first) as lookup:
+            lookup(first)
+        self.assertEqual([['i-1'], ['i-1', 'i-2'], ['i-1']], self.calls)
+
+
+class FakeBotoTestCase(boto_test.BotoTestCase):
+    events = []
+
+    @classmethod
+    def record(cls, name):
+        cls.events.append(name)
+
+    @classmethod
+    @boto_test.concurrent_cleanup
+    def destroy(cls, name, started, release):
+        cls.events.append(name)
+        started.set()
+        # Only returns once the other concurrent cleanup started.
+        if not release.wait(10):
+            raise RuntimeError("%s ran alone" % name)
+
+    @classmethod
+    def fail(cls):
+        raise RuntimeError("Cleanup failure")
+
+
+class TestConcurrentTearDown(base.TestCase):
+
+    def test_concurrent_cleanups_keep_the_order(self):
+        cls = FakeBotoTestCase
+        cls._resource_trash_bin = {}
+        cls._sequence = -1
+        first, second = threading.Event(), threading.Event()
+        cls.addResourceCleanUp(cls.record, 'group')
+        cls.addResourceCleanUp(cls.destroy, 'volume', first, second)
+        cls.addResourceCleanUp(cls.destroy, 'reservation', second, first)
+        cls.addResourceCleanUp(cls.fail)
+        cls.addResourceCleanUp(cls.record, 'image')
+        del cls.events[:]
+        self.assertRaises(exceptions.TearDownException, cls.tearDownClass)
+        self.assertEqual('image', cls.events[0])
+        self.assertEqual(set(['volume', 'reservation']), set(cls.events[1:3]))
+        self.assertEqual('group', cls.events[3])
+        self.assertEqual({}, cls._resource_trash_bin)
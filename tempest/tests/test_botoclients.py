@@ -0,0 +1,123 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import socket
+
+import boto.exception
+
+from tempest.services import botoclients
+from tempest.tests import base
+
+
+class FakeSection(object):
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class FakeConfig(object):
+    boto = FakeSection(http_socket_timeout=10, num_retries=1,
+                       build_timeout=60)
+    http = FakeSection(pool_maxsize=2, pool_idle_timeout=30)
+
+
+class FakeConnection(object):
+
+    def __init__(self):
+        self.closed = False
+
+    def get_all_zones(self):
+        return ['nova']
+
+    def get_all_images(self):
+        raise boto.exception.EC2ResponseError(400, 'Bad Request')
+
+    def get_all_volumes(self):
+        raise socket.error('Connection reset by peer')
+
+    def close(self):
+        self.closed = True
+
+
+class FakeClient(botoclients.BotoClientBase):
+
+    ALLOWED_METHODS = set(('get_all_zones', 'get_all_images',
+                           'get_all_volumes'))
+
+    def __init__(self, username='demo', tenant_name='demo'):
+        super(FakeClient, self).__init__(FakeConfig(), username=username,
+                                         password='secret',
+                                         auth_url='http://keystone/v2.0',
+                                         tenant_name=tenant_name)
+        self.connection_data = {"aws_access_key_id": None,
+                                "aws_secret_access_key": None}
+        self.connections = []
+        self.lookups = []
+
+    def connect_method(self, **kwargs):
+        self.connections.append(FakeConnection())
+        return self.connections[-1]
+
+    def _keystone_aws_lookup(self):
+        self.lookups.append(self.ks_cred['username'])
+        return FakeSection(access='access', secret='secret')
+
+
+class TestBotoClient(base.TestCase):
+
+    def setUp(self):
+        super(TestBotoClient, self).setUp()
+        self.addCleanup(botoclients._ec2_credentials.clear)
+
+    def test_connection_is_reused(self):
+        client = FakeClient()
+        self.assertEqual(['nova'], client.get_all_zones())
+        self.assertEqual(['nova'], client.get_all_zones())
+        self.assertEqual(1, len(client.connections))
+
+    def test_connection_is_reused_after_an_error_answer(self):
+        client = FakeClient()
+        self.assertRaises(boto.exception.EC2ResponseError,
+                          client.get_all_images)
+        client.get_all_zones()
+        self.assertEqual(1, len(client.connections))
+
+    def test_connection_is_dropped_after_a_transport_error(self):
+        client = FakeClient()
+        self.assertRaises(socket.error, client.get_all_volumes)
+        client.get_all_zones()
+        self.assertEqual(2, len(client.connections))
+        self.assertTrue(client.connections[0].closed)
+
+    def test_idle_connection_is_dropped(self):
+        client = FakeClient()
+        client.get_all_zones()
+        client.idle_timeout = -1
+        client.get_all_zones()
+        self.assertEqual(2, len(client.connections))
+        self.assertTrue(client.connections[0].closed)
+
+    def test_credentials_are_shared(self):
+        first = FakeClient()
+        first.get_all_zones()
+        second = FakeClient()
+        second.get_all_zones()
+        FakeClient(username='alt').get_all_zones()
+        self.assertEqual(['demo'], first.lookups)
+        self.assertEqual([], second.lookups)
+        self.assertEqual('access',
+                         second.connection_data['aws_access_key_id'])
@@ -0,0 +1,143 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import time
+
+from tempest.common import backoff
+from tempest.common import cleanup
+from tempest import exceptions
+from tempest.tests import base
+
+
+class TestResourceCleaner(base.TestCase):
+
+    def setUp(self):
+        super(TestResourceCleaner, self).setUp()
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def _deleter(self, kind):
+        def delete(resource_id):
+            with self.lock:
+                self.calls.append((kind, resource_id))
+        return delete
+
+    def _cleaner(self, max_workers=4):
+        cleaner = cleanup.ResourceCleaner(max_workers)
+        cleaner.register('router', self._deleter('router'))
+        cleaner.register('port', self._deleter('port'))
+        cleaner.register('subnet', self._deleter('subnet'),
+                         after=('router', 'port'))
+        cleaner.register('network', self._deleter('network'),
+                         after=('subnet',))
+        return cleaner
+
+    def test_levels(self):
+        levels = self._cleaner().levels()
+        self.assertEqual([['network'], ['port', 'router'], ['subnet']],
+                         sorted(sorted(level) for level in levels))
+        self.assertEqual(['network'], levels[2])
+
+    def test_unknown_kind(self):
+        cleaner = self._cleaner()
+        self.assertRaises(ValueError, cleaner.register, 'vip',
+                          self._deleter('vip'), after=('pool',))
+        self.assertRaises(ValueError, cleaner.add, 'vip', 'vip1')
+
+    def test_dependency_order(self):
+        for max_workers in (1, 4):
+            self.calls = []
+            cleaner = self._cleaner(max_workers)
+            cleaner.add('network', 'net1')
+            cleaner.add('subnet', 'sub1')
+            cleaner.add('subnet', 'sub2')
+            for port in range(5):
+                cleaner.add('port', port)
+            cleaner.add('router', 'r1')
+            cleaner.run()
+            kinds = [kind for kind, _ in self.calls]
+            self.assertEqual(9, len(kinds))
+            self.assertEqual(['subnet', 'subnet', 'network'], kinds[-3:])
+            self.assertEqual(3, len(cleaner.timings))
+
+    def test_waits_once_per_kind(self):
+        waits = []
+        cleaner = cleanup.ResourceCleaner()
+        cleaner.register('volume', self._deleter('volume'),
+                         wait=lambda ids: waits.append(sorted(ids)))
+        cleaner.add('volume', 'v2')
+        cleaner.add('volume', 'v1')
+        cleaner.run()
+        self.assertEqual([['v1', 'v2']], waits)
+
+    def test_errors_are_raised_at_the_end(self):
+        def fail(resource_id):
+            raise exceptions.TimeoutException()
+
+        def not_found(resource_id):
+            raise exceptions.NotFound()
+
+        cleaner = cleanup.ResourceCleaner()
+        cleaner.register('router', fail)
+        cleaner.register('port', not_found)
+        cleaner.register('network', self._deleter('network'),
+                         after=('router', 'port'))
+        cleaner.add('router', 'r1')
+        cleaner.add('port', 'p1')
+        cleaner.add('network', 'net1')
+        self.assertRaises(exceptions.TimeoutException, cleaner.run)
+        self.assertEqual([('network', 'net1')], self.calls)
+        # Everything was forgotten
+        cleaner.run()
+
+
+class FakeClient(object):
+    poll_policy = backoff.PollPolicy(10, 1, jitter=False)
+    build_timeout = 300
+
+
+class TestDeletionWaiter(base.TestCase):
+
+    def setUp(self):
+        super(TestDeletionWaiter, self).setUp()
+        self.sleeps = []
+        self.stubs.Set(time, 'sleep', self.sleeps.append)
+
+    def _waiter(self, polls, **kwargs):
+        polls = iter(polls)
+        return cleanup.deletion_waiter(FakeClient(), lambda: next(polls),
+                                       **kwargs)
+
+    def test_disappears(self):
+        wait = self._waiter([[{'id': 'a', 'status': 'deleting'},
+                              {'id': 'b', 'status': 'available'}],
+                             [{'id': 'b', 'status': 'available'}]])
+        wait(['a'])
+        self.assertEqual(1, len(self.sleeps))
+
+    def test_without_status(self):
+        # e.g. the servers listing without details.
+        wait = self._waiter([[{'id': 'a'}], [{'id': 'a'}], []])
+        wait(['a'])
+        self.assertEqual(2, len(self.sleeps))
+
+    def test_error_status(self):
+        wait = self._waiter([[{'id': 'a', 'status': 'deleting'}],
+                             [{'id': 'a', 'status': 'error_deleting'}]],
+                            error_status='error_deleting')
+        self.assertRaises(exceptions.BuildErrorException, wait, ['a'])
@@ -0,0 +1,121 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+from tempest.common import concurrency
+from tempest.tests import base
+
+
+class TestTaskGraph(base.TestCase):
+
+    def _graph(self, max_workers):
+        self.calls = []
+        self.lock = threading.Lock()
+        return concurrency.TaskGraph(max_workers)
+
+    def _task(self, name):
+        def func():
+            with self.lock:
+                self.calls.append(name)
+            return name.upper()
+        return func
+
+    def _fail(self):
+        raise ValueError('boom')
+
+    def test_dependencies_are_honoured(self):
+        for max_workers in (1, 4):
+            graph = self._graph(max_workers)
+            graph.add('tenant', self._task('tenant'))
+            graph.add('user', self._task('user'), deps=('tenant',))
+            graph.add('network', self._task('network'), deps=('tenant',))
+            graph.add('router', self._task('router'), deps=('tenant',))
+            graph.add('interface', self._task('interface'),
+                      deps=('network', 'router'))
+            results = graph.run()
+            self.assertEqual('INTERFACE', results['interface'])
+            self.assertEqual(5, len(results))
+            self.assertEqual('tenant', self.calls[0])
+            self.assertEqual('interface', self.calls[-1])
+
+    def test_unknown_dependency(self):
+        graph = self._graph(4)
+        self.assertRaises(ValueError, graph.add, 'user', self._task('user'),
+                          deps=('tenant',))
+
+    def test_fail_fast(self):
+        graph = self._graph(1)
+        graph.add('tenant', self._fail)
+        graph.add('roles', self._task('roles'))
+        self.assertRaises(ValueError, graph.run)
+        self.assertEqual([], self.calls)
+        self.assertEqual({}, graph.results)
+
+    def test_dependents_of_failures_are_skipped(self):
+        for max_workers in (1, 4):
+            graph = self._graph(max_workers)
+            graph.add('interface', self._fail)
+            graph.add('router', self._task('router'), deps=('interface',))
+            graph.add('user', self._task('user'))
+            self.assertRaises(ValueError, graph.run, fail_fast=False)
+            self.assertEqual(['user'], self.calls)
+            self.assertIn('interface', graph.errors)
+
+
+class TestRunForEach(base.TestCase):
+
+    def test_all_items_are_processed(self):
+        for max_workers in (1, 4):
+            seen = []
+            lock = threading.Lock()
+
+            def func(item):
+                with lock:
+                    seen.append(item)
+
+            count = concurrency.run_for_each(func, iter(range(100)),
+                                             max_workers)
+            self.assertEqual(100, count)
+            self.assertEqual(list(range(100)), sorted(seen))
+
+    def test_items_are_consumed_lazily(self):
+        produced = []
+
+        def items():
+            for item in range(100):
+                produced.append(item)
+                yield item
+
+        def func(item):
+            # No more than the workers and the queue are ahead.
+            self.assertTrue(len(produced) <= item + 1 + 2 * 2 + 2)
+
+        concurrency.run_for_each(func, items(), 2)
+
+    def test_errors_do_not_stop_the_run(self):
+        for max_workers in (1, 4):
+            seen = []
+
+            def func(item):
+                if item % 10 == 0:
+                    raise ValueError(item)
+                seen.append(item)
+
+            self.assertRaises(ValueError, concurrency.run_for_each, func,
+                              range(50), max_workers)
+            self.assertEqual(45, len(seen))
@@ -0,0 +1,120 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import urlparse
+
+from tempest.services.object_storage import container_client
+from tempest.tests import base
+
+
+class FakeContainerClient(container_client.ContainerClient):
+    """ContainerClient answering the requests from a fake container."""
+
+    def __init__(self, names=(), bulk_body=''):
+        # No authentication nor HTTP transport is needed.
+        self.format = 'json'
+        self.names = sorted(names)
+        self.bulk_body = bulk_body
+        self.requests = []
+
+    def get(self, url):
+        self.requests.append(url)
+        query = dict(urlparse.parse_qsl(urlparse.urlsplit(url).query))
+        marker = query.get('marker', '').decode('utf-8')
+        delimiter = query.get('delimiter')
+        listing = []
+        for name in self.names:
+            if name <= marker:
+                continue
+            if delimiter and delimiter in name:
+                subdir = name[:name.index(delimiter) + 1]
+                if subdir <= marker:
+                    continue
+                if not listing or listing[-1].get('subdir') != subdir:
+                    listing.append({'subdir': subdir})
+            else:
+                listing.append({'name': name})
+        return {'status': '200'}, json.dumps(listing[:int(query['limit'])])
+
+    def post(self, url, body, headers):
+        self.requests.append((url, body, headers))
+        return {'status': '200'}, self.bulk_body
+
+
+class TestIterContainerObjects(base.TestCase):
+
+    def _listing(self, client, **params):
+        return [obj.get('name', obj.get('subdir')) for obj in
+                client.iter_container_objects('container', params)]
+
+    def test_pages(self):
+        names = ['object-%02d' % index for index in range(7)]
+        client = FakeContainerClient(names)
+        self.assertEqual(names, self._listing(client, limit=3))
+        self.assertEqual(3, len(client.requests))
+        self.assertIn('marker=object-05', client.requests[2])
+
+    def test_full_last_page(self):
+        names = ['object-%02d' % index for index in range(6)]
+        client = FakeContainerClient(names)
+        self.assertEqual(names, self._listing(client, limit=3))
+        # An empty page tells the listing is over.
+        self.assertEqual(3, len(client.requests))
+
+    def test_delimiter(self):
+        client = FakeContainerClient(['a', 'dir1/a', 'dir1/b', 'dir2/a', 'z'])
+        self.assertEqual(['a', 'dir1/', 'dir2/', 'z'],
+                         self._listing(client, limit=2, delimiter='/'))
+        self.assertIn('marker=dir1%2F', client.requests[1])
+
+    def test_non_ascii_marker(self):
+        names = [u'caf\xe9-%d' % index for index in range(3)]
+        client = FakeContainerClient(names)
+        self.assertEqual(names, self._listing(client, limit=2))
+        self.assertIn('marker=caf%C3%A9-1', client.requests[1])
+
+    def test_list_all_container_objects(self):
+        client = FakeContainerClient(['a', 'b', 'c'])
+        self.assertEqual(
+            [{'name': 'a'}, {'name': 'b'}, {'name': 'c'}],
+            client.list_all_container_objects('container', {'limit': 2}))
+
+
+class TestBulkDeleteObjects(base.TestCase):
+
+    def test_result(self):
+        result = {'Number Deleted': 1, 'Number Not Found': 0,
+                  'Errors': [['/container/b%C3%A9', '409 Conflict']],
+                  'Response Status': '400 Bad Request'}
+        client = FakeContainerClient(bulk_body=json.dumps(result))
+        resp, body = client.bulk_delete_objects('container', ['a', u'b\xe9'])
+        self.assertEqual(result, body)
+        url, request_body, headers = client.requests[0]
+        self.assertEqual('?bulk-delete', url)
+        self.assertEqual('/container/a\n/container/b%C3%A9', request_body)
+        self.assertEqual('application/json', headers['Accept'])
+
+    def test_missing_middleware(self):
+        client = FakeContainerClient()
+        resp, body = client.bulk_delete_objects('container', ['a'])
+        self.assertIsNone(body)
+
+    def test_unexpected_body(self):
+        client = FakeContainerClient(bulk_body='{"Other": 1}')
+        resp, body = client.bulk_delete_objects('container', ['a'])
+        self.assertIsNone(body)
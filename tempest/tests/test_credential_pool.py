@@ -0,0 +1,197 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+
+from oslo.config import cfg
+
+from tempest.common import credential_pool
+from tempest.tests import base
+
+
+class FakeIsolatedCreds(object):
+    """Stands for IsolatedCreds, without any API call."""
+
+    created = 0
+    deleted = []
+
+    def __init__(self):
+        self.password = 'pass'
+        self.isolated_creds = {}
+        self.isolated_net_resources = {}
+
+    def create_isolated_creds(self, *cred_types):
+        for cred_type in cred_types:
+            FakeIsolatedCreds.created += 1
+            name = 'tenant-%d' % FakeIsolatedCreds.created
+            self.isolated_creds[cred_type] = ({'name': 'user-' + name},
+                                              {'name': name})
+            self.isolated_net_resources[cred_type] = (
+                {'name': 'network-' + name}, {'name': 'subnet-' + name},
+                {'name': 'router-' + name})
+
+    def clear_isolated_creds(self):
+        FakeIsolatedCreds.deleted.extend(
+            tenant['name'] for user, tenant in self.isolated_creds.values())
+
+
+class FakeScrubber(object):
+    scrubbed = []
+    fail = False
+
+    def __init__(self, config, cred_set):
+        self.cred_set = cred_set
+
+    def scrub(self):
+        if FakeScrubber.fail:
+            raise RuntimeError("Unable to delete the servers")
+        FakeScrubber.scrubbed.append(self.cred_set['tenant']['name'])
+
+
+class FakeConfig(object):
+
+    class credential_pool(object):
+        size = 2
+
+
+class TestCredentialPool(base.TestCase):
+
+    def setUp(self):
+        super(TestCredentialPool, self).setUp()
+        FakeIsolatedCreds.created = 0
+        FakeIsolatedCreds.deleted = []
+        FakeScrubber.scrubbed = []
+        FakeScrubber.fail = False
+        self.stubs.Set(credential_pool, 'Scrubber', FakeScrubber)
+        self.stubs.Set(credential_pool.CredentialPool, '_new_isolated_creds',
+                       lambda pool: FakeIsolatedCreds())
+        directory = tempfile.mkdtemp(prefix='tempest-unit')
+        self.addCleanup(shutil.rmtree, directory)
+        self.pool = self._pool(os.path.join(directory, 'pool'))
+
+    def _pool(self, path):
+        pool = credential_pool.CredentialPool()
+        pool.config = FakeConfig
+        pool.path = path
+        pool.pool_file = os.path.join(path, 'credentials.json')
+        pool.lock_file = os.path.join(path, 'pool.lock')
+        return pool
+
+    def _tenants(self):
+        return [cred_set['tenant']['name'] for cred_set in self.pool._load()]
+
+    def test_create(self):
+        self.pool.create()
+        self.assertEqual(['tenant-1', 'tenant-2'], self._tenants())
+        cred_set = self.pool._load()[0]
+        self.assertEqual('pass', cred_set['password'])
+        self.assertEqual('router-tenant-1', cred_set['router']['name'])
+        # The passwords are only readable by the owner.
+        self.assertEqual(0o600, os.stat(self.pool.pool_file).st_mode & 0o777)
+        # An existing pool is kept.
+        self.pool.create()
+        self.assertEqual(['tenant-1', 'tenant-2'], self._tenants())
+
+    def test_lease_without_pool(self):
+        self.assertIsNone(self.pool.lease())
+
+    def test_lease(self):
+        self.pool.create()
+        first = self.pool.lease()
+        second = self.pool.lease()
+        self.addCleanup(first.release)
+        self.addCleanup(second.release)
+        self.assertEqual(set([0, 1]), set([first.index, second.index]))
+        self.assertEqual(['tenant-1', 'tenant-2'],
+                         sorted([first.tenant['name'],
+                                 second.tenant['name']]))
+        self.assertEqual('user-' + first.tenant['name'], first.user['name'])
+        network, subnet, router = first.net_resources
+        self.assertEqual('network-' + first.tenant['name'], network['name'])
+        # All the sets are leased.
+        self.assertIsNone(self.pool.lease())
+
+    def test_release(self):
+        self.pool.create()
+        leases = [self.pool.lease(), self.pool.lease()]
+        leases[0].release()
+        self.assertEqual([leases[0].tenant['name']], FakeScrubber.scrubbed)
+        lease = self.pool.lease()
+        self.addCleanup(lease.release)
+        self.addCleanup(leases[1].release)
+        self.assertEqual(leases[0].index, lease.index)
+        # Releasing twice does nothing.
+        leases[0].release()
+        self.assertEqual(1, len(FakeScrubber.scrubbed))
+
+    def test_replace(self):
+        self.pool.create()
+        lease = self.pool.lease()
+        FakeScrubber.fail = True
+        lease.release()
+        self.assertEqual([lease.tenant['name']], FakeIsolatedCreds.deleted)
+        tenants = self._tenants()
+        self.assertEqual('tenant-3', tenants[lease.index])
+        self.assertIn(lease.tenant['name'], ['tenant-1', 'tenant-2'])
+        self.assertNotIn(lease.tenant['name'], tenants)
+        # The new set is leased.
+        FakeScrubber.fail = False
+        lease = self.pool.lease()
+        self.addCleanup(lease.release)
+        self.assertEqual('tenant-3', lease.tenant['name'])
+
+    def test_delete(self):
+        self.pool.create()
+        self.pool.lease().release()
+        self.pool.delete()
+        self.assertEqual(['tenant-1', 'tenant-2'],
+                         sorted(FakeIsolatedCreds.deleted))
+        self.assertIsNone(self.pool._load())
+        self.assertEqual(['pool.lock'], os.listdir(self.pool.path))
+        # Deleting a missing pool does nothing.
+        self.pool.delete()
+        self._pool(self.pool.path + '-missing').delete()
+
+
+class TestGetIsolatedCreds(base.TestCase):
+
+    def setUp(self):
+        super(TestGetIsolatedCreds, self).setUp()
+        self.stubs.Set(credential_pool, 'PooledIsolatedCreds',
+                       lambda name, **kwargs: 'pooled')
+        self.stubs.Set(credential_pool.isolated_creds, 'IsolatedCreds',
+                       lambda name, **kwargs: 'isolated')
+        # Registers the options before overriding them.
+        credential_pool.config.TempestConfig()
+        cfg.CONF.set_override('enabled', True, 'credential-pool')
+        self.addCleanup(cfg.CONF.clear_override, 'enabled',
+                        'credential-pool')
+
+    def test_pooled(self):
+        self.assertEqual('pooled',
+                         credential_pool.get_isolated_creds('TestCase'))
+
+    def test_not_pooled(self):
+        self.assertEqual('isolated', credential_pool.get_isolated_creds(
+            'TestCase', pooled=False))
+        self.assertEqual('isolated', credential_pool.get_isolated_creds(
+            'TestCase', tempest_client=False))
+        cfg.CONF.set_override('enabled', False, 'credential-pool')
+        self.assertEqual('isolated',
+                         credential_pool.get_isolated_creds('TestCase'))
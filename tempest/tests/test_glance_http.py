@@ -0,0 +1,65 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import hashlib
+import os
+import StringIO
+import tempfile
+
+from tempest.common import glance_http
+from tempest.tests import base
+
+
+class TestStreaming(base.TestCase):
+
+    data = ''.join(chr(i % 256) for i in range(10000))
+
+    def _temp_file(self, data):
+        fd, path = tempfile.mkstemp()
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'wb') as data_file:
+            data_file.write(data)
+        return path
+
+    def test_chunks_of_file_like_object(self):
+        chunks = list(glance_http.iter_body_chunks(
+            StringIO.StringIO(self.data), chunk_size=4096))
+        self.assertEqual([4096, 4096, 1808], [len(c) for c in chunks])
+        self.assertEqual(self.data, ''.join(chunks))
+
+    def test_chunks_of_iterable(self):
+        chunks = list(glance_http.iter_body_chunks(['ab', '', 'cd']))
+        self.assertEqual(['ab', 'cd'], chunks)
+
+    def test_chunks_of_mapped_file(self):
+        with glance_http.mapped_file(self._temp_file(self.data)) as mapping:
+            chunks = list(glance_http.iter_body_chunks(mapping,
+                                                       chunk_size=4096))
+        self.assertEqual(self.data, ''.join(chunks))
+
+    def test_mapped_empty_file(self):
+        with glance_http.mapped_file(self._temp_file('')) as mapping:
+            self.assertEqual([], list(glance_http.iter_body_chunks(mapping)))
+
+    def test_save_body(self):
+        sink = StringIO.StringIO()
+        chunks = glance_http.iter_body_chunks(StringIO.StringIO(self.data),
+                                              chunk_size=1000)
+        size, checksum = glance_http.save_body(chunks, sink)
+        self.assertEqual(len(self.data), size)
+        self.assertEqual(hashlib.md5(self.data).hexdigest(), checksum)
+        self.assertEqual(self.data, sink.getvalue())
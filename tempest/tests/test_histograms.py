@@ -0,0 +1,57 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from tempest.common import histograms
+from tempest.tests import base
+
+
+def _histogram(latencies):
+    histogram = [0] * histograms.HISTOGRAM_SIZE
+    for latency in latencies:
+        histogram[histograms.bucket(latency)] += 1
+    return histogram
+
+
+class TestHistograms(base.TestCase):
+
+    def test_percentiles(self):
+        histogram = _histogram([0.01] * 90 + [1] * 9 + [100])
+        p50, p95, p99, p100 = histograms.percentiles(histogram,
+                                                     (50, 95, 99, 100))
+        self.assertTrue(0.01 <= p50 < 0.012)
+        self.assertTrue(1 <= p95 < 1.2)
+        self.assertEqual(p95, p99)
+        self.assertTrue(100 <= p100 < 120)
+
+    def test_percentiles_of_no_runs(self):
+        self.assertEqual([None, None, None],
+                         histograms.percentiles([0, 0, 0]))
+
+    def test_longest_runs_fall_in_the_last_bucket(self):
+        histogram = _histogram([10 ** 6])
+        self.assertEqual(1, histogram[-1])
+        self.assertEqual([float('inf')],
+                         histograms.percentiles(histogram, (50,)))
+
+    def test_merge(self):
+        self.assertEqual([1, 3, 0], histograms.merge([[1, 1, 0], [0, 2, 0]]))
+
+    def test_format_percentiles(self):
+        self.assertEqual('p50 -, p95 -, p99 -',
+                         histograms.format_percentiles([0, 0]))
+        self.assertEqual('p50 0.001s, p95 0.001s, p99 0.001s',
+                         histograms.format_percentiles(_histogram([0.001])))
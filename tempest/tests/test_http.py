@@ -0,0 +1,171 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import socket
+
+from tempest.common import http
+from tempest.tests import base
+
+
+class FakeConnection(object):
+
+    def __init__(self, sock=None):
+        self.sock = sock
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeHttp(object):
+    """Stands for httplib2.Http, with one connection per request URI."""
+
+    created = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.connections = {}
+        self.response = {'status': '200'}
+        FakeHttp.created.append(self)
+
+    def request(self, uri, method='GET', body=None, headers=None):
+        if uri not in self.connections:
+            self.connections[uri] = FakeConnection()
+        return dict(self.response), ''
+
+
+class TestPooledHttp(base.TestCase):
+
+    def setUp(self):
+        super(TestPooledHttp, self).setUp()
+        FakeHttp.created = []
+        self.stubs.Set(http.httplib2, 'Http', FakeHttp)
+        self.now = 1000.0
+        self.stubs.Set(http.time, 'time', lambda: self.now)
+        self.pool = http.PooledHttp(maxsize=2, idle_timeout=30)
+
+    def test_reuse_per_endpoint(self):
+        self.pool.request('http://compute:8774/v2/servers')
+        self.pool.request('HTTP://Compute:8774/v2/flavors')
+        self.pool.request('https://compute:8774/v2/servers')
+        self.pool.request('http://compute:8775/v2/servers')
+        self.assertEqual(3, len(FakeHttp.created))
+        self.assertEqual(2, len(FakeHttp.created[0].connections))
+
+    def test_http_kwargs(self):
+        pool = http.PooledHttp(disable_ssl_certificate_validation=True)
+        pool.request('https://identity:5000/v2.0/tokens')
+        self.assertEqual({'disable_ssl_certificate_validation': True},
+                         FakeHttp.created[0].kwargs)
+
+    def test_maxsize(self):
+        key = self.pool._pool_key('http://compute:8774')
+        http_objs = [self.pool._get(key) for _ in range(3)]
+        conns = []
+        for http_obj in http_objs:
+            http_obj.request('http://compute:8774/v2/servers')
+            conns.append(http_obj.connections.values()[0])
+            self.pool._put(key, http_obj)
+        self.assertEqual(2, len(self.pool._pools[key]))
+        self.assertEqual([False, False, True],
+                         [conn.closed for conn in conns])
+
+    def test_idle_eviction(self):
+        self.pool.request('http://compute:8774/v2/servers')
+        first = FakeHttp.created[0]
+        self.now += 31
+        self.pool.request('http://compute:8774/v2/servers')
+        self.assertEqual(2, len(FakeHttp.created))
+        self.assertEqual({}, first.connections)
+
+    def test_dropped_connection(self):
+        local, remote = socket.socketpair()
+        self.addCleanup(local.close)
+        self.pool.request('http://compute:8774/v2/servers')
+        first = FakeHttp.created[0]
+        conn = first.connections.values()[0]
+        conn.sock = local
+        self.pool.request('http://compute:8774/v2/servers')
+        self.assertEqual(1, len(FakeHttp.created))
+        # The peer closes the idle connection, it is not handed out again.
+        remote.close()
+        self.pool.request('http://compute:8774/v2/servers')
+        self.assertEqual(2, len(FakeHttp.created))
+        self.assertTrue(conn.closed)
+
+    def test_connection_close(self):
+        key = self.pool._pool_key('http://compute:8774')
+        self.stubs.Set(FakeHttp, 'request', self._closing_request)
+        self.pool.request('http://compute:8774/v2/servers')
+        self.assertEqual(0, len(self.pool._pools[key]))
+        self.assertEqual({}, FakeHttp.created[0].connections)
+
+    @staticmethod
+    def _closing_request(http_obj, uri, method='GET', body=None,
+                         headers=None):
+        http_obj.connections[uri] = FakeConnection()
+        return {'status': '200', 'connection': 'Close'}, ''
+
+    def test_error_closes(self):
+        key = self.pool._pool_key('http://compute:8774')
+        self.stubs.Set(FakeHttp, 'request', self._failing_request)
+        self.assertRaises(socket.error, self.pool.request,
+                          'http://compute:8774/v2/servers')
+        self.assertEqual(0, len(self.pool._pools[key]))
+
+    @staticmethod
+    def _failing_request(http_obj, uri, method='GET', body=None,
+                         headers=None):
+        raise socket.error("Connection reset by peer")
+
+    def test_clear(self):
+        self.pool.request('http://compute:8774/v2/servers')
+        self.pool.request('http://volume:8776/v1/volumes')
+        self.pool.clear()
+        self.assertEqual({}, dict(self.pool._pools))
+        for http_obj in FakeHttp.created:
+            self.assertEqual({}, http_obj.connections)
+
+
+class FakeConfig(object):
+
+    class identity(object):
+        disable_ssl_certificate_validation = True
+
+    class http(object):
+        keep_alive = False
+        timeout = 10
+
+
+class TestGetConnection(base.TestCase):
+
+    def test_https(self):
+        conn = http.get_connection(FakeConfig, 'https://swift:8080/v1/a/c/o')
+        self.assertIsInstance(conn, http.httplib2.HTTPSConnectionWithTimeout)
+        self.assertEqual(('swift', 8080), (conn.host, conn.port))
+        self.assertEqual(10, conn.timeout)
+        self.assertTrue(conn.disable_ssl_certificate_validation)
+
+    def test_http(self):
+        conn = http.get_connection(FakeConfig, 'http://swift:8080/v1/a/c/o')
+        self.assertIsInstance(conn, http.httplib2.HTTPConnectionWithTimeout)
+        self.assertEqual(10, conn.timeout)
+
+    def test_same_settings_as_http_obj(self):
+        http_obj = http.get_http_obj(FakeConfig)
+        self.assertEqual(10, http_obj.timeout)
+        self.assertTrue(http_obj.disable_ssl_certificate_validation)
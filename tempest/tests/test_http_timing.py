@@ -0,0 +1,102 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import BaseHTTPServer
+import threading
+
+from tempest.common import http
+from tempest.common import http_timing
+from tempest.tests import base
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_PUT(self):
+        self.rfile.read(int(self.headers['content-length']))
+        body = '{"server": {}}'
+        self.send_response(404 if 'missing' in self.path else 200)
+        self.send_header('content-length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHttpTiming(base.TestCase):
+
+    def setUp(self):
+        super(TestHttpTiming, self).setUp()
+        server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), _Handler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.base_url = 'http://localhost:%d' % server.server_address[1]
+        self.scope = http_timing.recorder.start_scope()
+        self.addCleanup(http_timing.recorder.stop_scope, self.scope)
+
+    def test_url_template(self):
+        self.assertEqual(
+            'servers/{id}/action',
+            http_timing.url_template(
+                'servers/0f4b2e4c-3b43-4d36-a0ce-8e0b8d6c3c1a/action'))
+        self.assertEqual('v1/{id}/{name}/{id}',
+                         http_timing.url_template(
+                             'v1/4c1a35ad1fa64bb0a19bb5b4a0c6c5ef/'
+                             'TestContainer-123456/42?format=json'))
+        self.assertEqual('flavors/detail',
+                         http_timing.url_template('flavors/detail'))
+
+    def _request(self, http_obj, url):
+        return http_timing.request(http_obj, 'compute', url,
+                                   '%s/%s' % (self.base_url, url), 'PUT',
+                                   headers={}, body='x' * 10)
+
+    def test_request_phases(self):
+        http_obj = http.PooledHttp()
+        self.addCleanup(http_obj.clear)
+        for server_id in (1, 2):
+            resp, body = self._request(http_obj, 'servers/%d' % server_id)
+            self.assertEqual(200, resp.status)
+        self._request(http_obj, 'servers/missing-1')
+
+        statistic = self.scope[('compute', 'PUT', 'servers/{id}')]
+        self.assertEqual(2, statistic.calls)
+        self.assertEqual(0, statistic.errors)
+        self.assertEqual(20, statistic.sent)
+        self.assertEqual(28, statistic.received)
+        self.assertTrue(0 < statistic.ttfb <= statistic.total)
+        # The connection opened by the first call was timed
+        self.assertTrue(0 < statistic.dns + statistic.connect)
+        self.assertEqual(2, sum(statistic.histogram))
+        self.assertEqual(
+            1, self.scope[('compute', 'PUT', 'servers/{name}')].errors)
+        report = http_timing.report(self.scope).splitlines()
+        self.assertEqual(3, len(report))
+        self.assertIn('servers/{id}', report[1] + report[2])
+
+    def test_scopes(self):
+        scope = http_timing.recorder.start_scope()
+        self._request(http.ClosingHttp(), 'servers/1')
+        http_timing.recorder.stop_scope(scope)
+        self._request(http.ClosingHttp(), 'servers/2')
+        self.assertEqual(1, scope[('compute', 'PUT', 'servers/{id}')].calls)
+        self.assertEqual(
+            2, self.scope[('compute', 'PUT', 'servers/{id}')].calls)
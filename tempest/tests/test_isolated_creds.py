@@ -0,0 +1,111 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from tempest.common import isolated_creds
+from tempest import exceptions
+from tempest.tests import base
+
+
+class FakeIdentityClient(object):
+    """Identity admin client failing the fail_user-th user creation."""
+
+    def __init__(self, fail_user=None, fail_role=False):
+        self.fail_user = fail_user
+        self.fail_role = fail_role
+        self.tenants = []
+        self.users = []
+        self.deleted_tenants = []
+        self.deleted_users = []
+
+    def create_tenant(self, name, description):
+        tenant = {'id': 'tenant-%d' % (len(self.tenants) + 1), 'name': name}
+        self.tenants.append(tenant)
+        return {'status': '200'}, tenant
+
+    def create_user(self, username, password, tenant_id, email):
+        if len(self.users) + 1 == self.fail_user:
+            raise exceptions.IdentityError()
+        user = {'id': 'user-%d' % (len(self.users) + 1), 'name': username,
+                'tenantId': tenant_id}
+        self.users.append(user)
+        return {'status': '200'}, user
+
+    def list_roles(self):
+        return {'status': '200'}, [{'id': 'role-1', 'name': 'admin'}]
+
+    def assign_user_role(self, tenant, user, role):
+        if self.fail_role:
+            raise exceptions.IdentityError()
+
+    def delete_user(self, user_id):
+        self.deleted_users.append(user_id)
+
+    def delete_tenant(self, tenant_id):
+        self.deleted_tenants.append(tenant_id)
+
+
+class FakeConfig(object):
+
+    class identity(object):
+        admin_role = 'admin'
+        isolated_creds_workers = 1
+
+    class service_available(object):
+        neutron = False
+
+
+class TestIsolatedCredsRollback(base.TestCase):
+
+    def _creds(self, identity_client):
+        self.stubs.Set(isolated_creds.IsolatedCreds, '_get_admin_clients',
+                       lambda creds: (identity_client, None))
+        creds = isolated_creds.IsolatedCreds('TestRollback')
+        creds.config = FakeConfig
+        return creds
+
+    def test_user_creation_fails(self):
+        # The tasks run in order: primary tenant and user, alt tenant and
+        # the failing alt user.
+        client = FakeIdentityClient(fail_user=2)
+        creds = self._creds(client)
+        self.assertRaises(exceptions.IdentityError,
+                          creds.create_isolated_creds, 'primary', 'alt')
+        self.assertEqual(['primary'], creds.isolated_creds.keys())
+        self.assertEqual('user-1', creds.get_primary_user()['id'])
+        self.assertEqual(['tenant-2'], client.deleted_tenants)
+        self.assertEqual([], client.deleted_users)
+
+    def test_role_assignment_fails(self):
+        client = FakeIdentityClient(fail_role=True)
+        creds = self._creds(client)
+        self.assertRaises(exceptions.IdentityError,
+                          creds.create_isolated_creds, 'primary', 'admin')
+        self.assertEqual(['primary'], creds.isolated_creds.keys())
+        self.assertEqual(['tenant-2'], client.deleted_tenants)
+        self.assertEqual(['user-2'], client.deleted_users)
+
+    def test_rollback_failure_keeps_the_error(self):
+        client = FakeIdentityClient(fail_user=1)
+
+        def delete_tenant(tenant_id):
+            raise exceptions.ServerFault()
+
+        client.delete_tenant = delete_tenant
+        creds = self._creds(client)
+        self.assertRaises(exceptions.IdentityError,
+                          creds.create_isolated_creds, 'primary')
+        self.assertEqual({}, creds.isolated_creds)
@@ -0,0 +1,117 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import gzip
+import os
+import StringIO
+import tempfile
+
+from tempest.common import log_scanner
+from tempest.tests import base
+
+LOG = """2013-10-01 10:00:00.000 INFO nova.compute.manager [-] Started
+2013-10-01 10:00:01.000 ERROR nova.compute.manager [req-1 x y] Boom
+Stderr: 'ERROR nova [req-2 x y] in a command output'
+2013-10-01 10:00:02.000 ERROR nova.network.api [req-3 x y] Failed storing \
+info cache
+"""
+
+WHITELISTS = {'n-cpu': [{'module': 'nova.network.api',
+                         'message': 'Failed storing info cache'},
+                        {'module': 'nova.virt.libvirt.driver',
+                         'message': 'Error from libvirt'}]}
+
+
+def _chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def _gzip(data):
+    buf = StringIO.StringIO()
+    with gzip.GzipFile(fileobj=buf, mode='wb') as compressed:
+        compressed.write(data)
+    return buf.getvalue()
+
+
+class TestLogScanner(base.TestCase):
+
+    def test_lines_span_chunks(self):
+        self.assertEqual(LOG.splitlines(),
+                         list(log_scanner.iter_lines(_chunks(LOG, 7))))
+
+    def test_gunzip_chunks(self):
+        chunks = _chunks(_gzip(LOG), 16)
+        self.assertEqual(LOG, ''.join(log_scanner.gunzip_chunks(chunks)))
+        # Logs which are not compressed are passed through
+        self.assertEqual(LOG, ''.join(log_scanner.gunzip_chunks([LOG])))
+
+    def test_whitelist(self):
+        whitelist = log_scanner.compile_whitelist(WHITELISTS['n-cpu'])
+        self.assertTrue(whitelist.search('nova.network.api [-] Failed '
+                                         'storing info cache'))
+        self.assertTrue(whitelist.search('nova.virt.libvirt.driver [-] '
+                                         'Error from libvirt during destroy'))
+        self.assertFalse(whitelist.search('nova.network.api [-] Error from '
+                                          'libvirt'))
+        self.assertIsNone(log_scanner.compile_whitelist([]))
+
+    def test_scan(self):
+        scanner = log_scanner.LogScanner(WHITELISTS)
+        lines = LOG.splitlines()
+        self.assertEqual([(lines[1], False), (lines[3], True)],
+                         scanner.scan('n-cpu', lines))
+        self.assertEqual([(lines[1], False), (lines[3], False)],
+                         scanner.scan('n-api', lines))
+
+    def test_scan_all_files(self):
+        logs = []
+        for data in (LOG, _gzip(LOG), ''):
+            fd, path = tempfile.mkstemp()
+            self.addCleanup(os.remove, path)
+            with os.fdopen(fd, 'wb') as log:
+                log.write(data)
+            logs.append(('n-cpu', log_scanner.open_file(path, 16)))
+        results = log_scanner.LogScanner(WHITELISTS).scan_all(logs, 2)
+        self.assertEqual(['n-cpu'] * 3, [name for name, _ in results])
+        self.assertEqual([2, 2, 0], [len(errors) for _, errors in results])
+
+
+TRACES = """2013-10-01 10:00:00.000 1234 INFO nova.api [-] Started
+2013-10-01 10:00:01.000 1234 ERROR nova.api [req-1 a b] Instance 12 failed
+2013-10-01 10:00:01.000 1234 TRACE nova.api Traceback:
+2013-10-01 10:00:01.000 1234 TRACE nova.api   File "api.py", line 10
+2013-10-01 10:00:01.000 1234 TRACE nova.api ValueError: 0x1f
+2013-10-01 10:00:05.000 1234 ERROR nova.api [req-2 c d] Instance 34 failed
+2013-10-01 10:00:06.000 1234 INFO nova.api [-] Done
+"""
+
+
+class TestStackTraces(base.TestCase):
+
+    def test_extract_traces(self):
+        traces = list(log_scanner.extract_traces(TRACES.splitlines()))
+        self.assertEqual(['ERROR', 'TRACE', 'ERROR'],
+                         [trace.level for trace in traces])
+        self.assertEqual('Traceback:\n  File "api.py", line 10\n'
+                         'ValueError: 0x1f', traces[1].msg)
+        self.assertEqual('nova.api', traces[2].module)
+
+    def test_fingerprints(self):
+        first, trace, second = log_scanner.extract_traces(
+            TRACES.splitlines())
+        self.assertEqual(first.fingerprint(), second.fingerprint())
+        self.assertNotEqual(first.fingerprint(), trace.fingerprint())
@@ -0,0 +1,54 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from tempest.common.utils import misc
+from tempest.tests import base
+
+
+class TestFrozenDict(base.TestCase):
+
+    def test_mapping(self):
+        regions = misc.FrozenDict({'compute': 'RegionOne'}, volume='RegionTwo')
+        self.assertEqual('RegionOne', regions['compute'])
+        self.assertEqual('RegionTwo', regions.get('volume'))
+        self.assertIsNone(regions.get('network'))
+        self.assertRaises(KeyError, lambda: regions['network'])
+        self.assertEqual(2, len(regions))
+        self.assertEqual(['compute', 'volume'], sorted(regions))
+        self.assertIn('volume', regions)
+        self.assertEqual({'compute': 'RegionOne', 'volume': 'RegionTwo'},
+                         dict(regions))
+        self.assertEqual(
+            "FrozenDict({'compute': 'RegionOne'})",
+            repr(misc.FrozenDict(compute='RegionOne')))
+
+    def test_read_only(self):
+        source = {'compute': 'RegionOne'}
+        regions = misc.FrozenDict(source)
+
+        def set_region():
+            regions['compute'] = 'RegionTwo'
+
+        def del_region():
+            del regions['compute']
+
+        self.assertRaises(TypeError, set_region)
+        self.assertRaises(TypeError, del_region)
+        self.assertFalse(hasattr(regions, 'update'))
+        # Changing the source afterwards does not change it either.
+        source['compute'] = 'RegionTwo'
+        self.assertEqual('RegionOne', regions['compute'])
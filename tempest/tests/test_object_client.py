@@ -0,0 +1,185 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import hashlib
+import os
+import StringIO
+import tempfile
+import threading
+
+import httplib2
+
+from tempest import exceptions
+from tempest.services.object_storage import object_client
+from tempest.tests import base
+
+
+class TestSegments(base.TestCase):
+
+    data = os.urandom(100003)
+
+    def _check(self, data, sizes):
+        with object_client._open_segments(data, 'obj', 30000) as segments:
+            segments = [(segment.name, str(segment.body), segment.hexdigest())
+                        for segment in segments]
+        self.assertEqual(['obj/%08d' % i for i in range(len(sizes))],
+                         [name for name, _, _ in segments])
+        self.assertEqual(sizes, [len(body) for _, body, _ in segments])
+        for name, body, etag in segments:
+            self.assertEqual(hashlib.md5(body).hexdigest(), etag)
+        return ''.join(body for _, body, _ in segments)
+
+    def _temp_file(self, data):
+        fd, path = tempfile.mkstemp()
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'wb') as data_file:
+            data_file.write(data)
+        return path
+
+    def test_mapped_file_segments(self):
+        path = self._temp_file(self.data)
+        self.assertEqual(self.data,
+                         self._check(path, [30000, 30000, 30000, 10003]))
+
+    def test_stream_segments(self):
+        stream = StringIO.StringIO(self.data)
+        self.assertEqual(self.data,
+                         self._check(stream, [30000, 30000, 30000, 10003]))
+
+    def test_stream_of_whole_segments(self):
+        stream = StringIO.StringIO(self.data[:60000])
+        self._check(stream, [30000, 30000])
+
+    def test_resend(self):
+        # httplib2 or the RestClient may send the same body again.
+        stream = StringIO.StringIO(self.data)
+        with object_client._open_segments(stream, 'obj', 30000) as segments:
+            segment = next(segments)
+            self.assertEqual(str(segment.body), str(segment.body))
+            self.assertEqual(30000, len(segment.body))
+
+    def test_empty_object_has_one_segment(self):
+        self._check(self._temp_file(''), [0])
+        self._check(StringIO.StringIO(''), [0])
+
+
+class TestOrderedMD5(base.TestCase):
+
+    data = os.urandom(10000)
+
+    def test_out_of_order_chunks(self):
+        md5 = object_client._OrderedMD5(max_buffered=len(self.data))
+        offsets = range(0, len(self.data), 1000)
+        for offset in reversed(offsets):
+            md5.update(offset, self.data[offset:offset + 1000])
+        self.assertEqual(len(self.data), md5.offset)
+        self.assertEqual(hashlib.md5(self.data).hexdigest(), md5.hexdigest())
+
+    def test_buffer_is_bounded(self):
+        md5 = object_client._OrderedMD5(max_buffered=1000)
+        md5.update(1000, self.data[1000:2000])
+        ahead = threading.Thread(target=md5.update,
+                                 args=(2000, self.data[2000:3000]))
+        ahead.start()
+        ahead.join(0.1)
+        # Waiting for the first chunk to make room
+        self.assertTrue(ahead.is_alive())
+        md5.update(0, self.data[:1000])
+        ahead.join()
+        self.assertEqual(3000, md5.offset)
+
+    def test_abort_releases_waiters(self):
+        md5 = object_client._OrderedMD5(max_buffered=0)
+        ahead = threading.Thread(target=md5.update,
+                                 args=(1000, self.data[1000:2000]))
+        ahead.start()
+        md5.abort()
+        ahead.join()
+        self.assertEqual(0, md5.offset)
+
+
+class FakeStream(object):
+
+    def __init__(self, data):
+        self.stream = StringIO.StringIO(data)
+
+    def read(self, size):
+        return self.stream.read(size)
+
+
+class FakeConnection(object):
+
+    def close(self):
+        pass
+
+
+class FakeObjectClient(object_client.ObjectClient):
+    """ObjectClient serving one object, honouring Range or not."""
+
+    class config(object):
+        class object_storage(object):
+            transfer_workers = 2
+
+    def __init__(self, data, ranges=True):
+        # No authentication nor HTTP transport is needed.
+        self.data = data
+        self.ranges = ranges
+        self.etag = hashlib.md5(data).hexdigest()
+
+    def list_object_metadata(self, container, object_name):
+        return httplib2.Response({'status': '200',
+                                  'content-length': str(len(self.data)),
+                                  'etag': self.etag}), ''
+
+    def _open_stream(self, url, headers=None):
+        resp = {'status': '200', 'etag': self.etag}
+        data = self.data
+        byte_range = (headers or {}).get('Range')
+        if byte_range and self.ranges:
+            start, end = map(int, byte_range[len('bytes='):].split('-'))
+            data = data[start:end + 1]
+            resp.update(status='206', **{
+                'content-range': 'bytes %d-%d/%d' % (start, end,
+                                                     len(self.data))})
+        return FakeConnection(), FakeStream(data), httplib2.Response(resp)
+
+
+class TestDownloadObject(base.TestCase):
+
+    data = os.urandom(100003)
+
+    def test_ranges(self):
+        sink = StringIO.StringIO()
+        resp, size = FakeObjectClient(self.data).download_object(
+            'container', 'obj', sink, range_size=30000)
+        self.assertEqual(len(self.data), size)
+        self.assertEqual(self.data, sink.getvalue())
+
+    def test_range_ignored(self):
+        # The whole object must not be written at the offset of every
+        # range.
+        client = FakeObjectClient(self.data, ranges=False)
+        sink = StringIO.StringIO()
+        self.assertRaises(exceptions.RFCViolation, client.download_object,
+                          'container', 'obj', sink, range_size=30000)
+        self.assertEqual('', sink.getvalue())
+
+    def test_single_request(self):
+        client = FakeObjectClient(self.data, ranges=False)
+        sink = StringIO.StringIO()
+        client.download_object('container', 'obj', sink, workers=1)
+        self.assertEqual(self.data, sink.getvalue())
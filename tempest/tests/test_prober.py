@@ -0,0 +1,56 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import socket
+import struct
+
+from tempest.common import prober
+from tempest.tests import base
+
+
+class TestProber(base.TestCase):
+
+    def test_echo_request_checksum(self):
+        packet = prober._echo_request(0x1234, 1)
+        self.assertEqual(0, prober._checksum(packet))
+        self.assertEqual((prober.ICMP_ECHO_REQUEST, 0),
+                         struct.unpack('!BB', packet[:2]))
+
+    def test_histogram(self):
+        result = prober.ProbeResult(['a', 'b', 'c', 'd'])
+        result.latencies.update(a=0.2, b=0.7, c=2.5)
+        self.assertEqual([(0.0, 2), (2.0, 1)], result.histogram())
+        self.assertEqual(['d'], result.unreachable)
+
+    def test_tcp_probe(self):
+        listener = socket.socket()
+        self.addCleanup(listener.close)
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(5)
+        port = listener.getsockname()[1]
+        # Nothing listens on the port of the closed socket.
+        closed = socket.socket()
+        closed.bind(('127.0.0.1', 0))
+        closed_port = closed.getsockname()[1]
+        closed.close()
+
+        result = prober.Prober(timeout=1, interval=0.2).probe(['127.0.0.1'],
+                                                              port=port)
+        self.assertEqual([], result.unreachable)
+        result = prober.Prober(timeout=0.5, interval=0.2).probe(
+            ['127.0.0.1'], port=closed_port)
+        self.assertEqual(['127.0.0.1'], result.unreachable)
@@ -0,0 +1,102 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+import threading
+
+from tempest.tests import base
+from tempest.thirdparty.boto.utils import s3
+
+
+class FakeMultiPartUpload(object):
+
+    def __init__(self, key_name, fail_part=None):
+        self.key_name = key_name
+        self.fail_part = fail_part
+        self.parts = {}
+        self.completed = False
+        self.cancelled = False
+        self._lock = threading.Lock()
+
+    def upload_part_from_file(self, fp, part_num, size):
+        if part_num == self.fail_part:
+            raise IOError("Upload failed")
+        with self._lock:
+            self.parts[part_num] = fp.read(size)
+
+    def complete_upload(self):
+        self.completed = True
+
+    def cancel_upload(self):
+        self.cancelled = True
+
+
+class FakeBucket(object):
+    name = 'bucket'
+
+    def __init__(self, fail_part=None):
+        self.fail_part = fail_part
+        self.uploads = {}
+
+    def initiate_multipart_upload(self, key_name):
+        upload = FakeMultiPartUpload(key_name, self.fail_part)
+        self.uploads[key_name] = upload
+        return upload
+
+
+class TestS3UploadDir(base.TestCase):
+
+    def setUp(self):
+        super(TestS3UploadDir, self).setUp()
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        os.mkdir(os.path.join(self.path, 'images'))
+        self.files = {'manifest.xml': 'manifest',
+                      'images/part.0': os.urandom(2500)}
+        for name, data in self.files.items():
+            with open(os.path.join(self.path, name), 'wb') as fp:
+                fp.write(data)
+
+    def test_upload_targets(self):
+        targets = s3._upload_targets(self.path, 'prefix/')
+        self.assertEqual([('prefix/images/part.0', 2500),
+                          ('prefix/manifest.xml', 8)],
+                         sorted((target, size)
+                                for _, target, size in targets))
+
+    def test_multipart_upload(self):
+        bucket = FakeBucket()
+        s3.s3_upload_dir(bucket, self.path, workers=3,
+                         multipart_threshold=1, part_size=1000)
+        self.assertEqual(['images/part.0', 'manifest.xml'],
+                         sorted(bucket.uploads))
+        upload = bucket.uploads['images/part.0']
+        self.assertTrue(upload.completed)
+        self.assertEqual([1, 2, 3], sorted(upload.parts))
+        self.assertEqual(self.files['images/part.0'],
+                         ''.join(upload.parts[part] for part in (1, 2, 3)))
+
+    def test_failed_multipart_upload_is_cancelled(self):
+        bucket = FakeBucket(fail_part=2)
+        self.stubs.Set(s3, '_upload_file', lambda *args: None)
+        self.assertRaises(IOError, s3.s3_upload_dir, bucket, self.path,
+                          multipart_threshold=1000, part_size=1000)
+        upload = bucket.uploads['images/part.0']
+        self.assertFalse(upload.completed)
+        self.assertTrue(upload.cancelled)
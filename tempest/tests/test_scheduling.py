@@ -0,0 +1,144 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import os
+import shutil
+import tempfile
+
+from tempest.common import scheduling
+from tempest.tests import base
+
+EPOCH = datetime.datetime(2013, 12, 1)
+REGEXP = scheduling.group_regex('tempest/tests/files/testr-conf')
+
+
+def _test(test_id, start, stop, worker=0):
+    return {'id': test_id, 'tags': set(['worker-%d' % worker]),
+            'timestamps': [EPOCH + datetime.timedelta(seconds=start),
+                           EPOCH + datetime.timedelta(seconds=stop)]}
+
+
+class TestScheduling(base.TestCase):
+
+    def test_class_of(self):
+        self.assertEqual('tempest.api.test_a.TestA',
+                         scheduling.class_of(
+                             'tempest.api.test_a.TestA.test_x[gate]', REGEXP))
+        self.assertEqual('tempest.api.test_a.TestA',
+                         scheduling.class_of(
+                             'setUpClass (tempest.api.test_a.TestA)', REGEXP))
+
+    def test_class_durations_include_the_fixtures(self):
+        tests = [_test('a.TestA.test_1', 10, 12),
+                 _test('a.TestA.test_2', 12, 13),
+                 # 5 seconds of setUpClass before the first test
+                 _test('a.TestB.test_1', 18, 20),
+                 _test('tearDownClass (a.TestB)', 21, 22),
+                 _test('a.TestC.test_1', 10, 40, worker=1)]
+        durations, counts, makespan = scheduling.class_durations(tests,
+                                                                 REGEXP)
+        self.assertEqual({'a.TestA': 3.0, 'a.TestB': 9.0, 'a.TestC': 30.0},
+                         durations)
+        self.assertEqual({'a.TestA': 2, 'a.TestB': 1, 'a.TestC': 1}, counts)
+        self.assertEqual(30.0, makespan)
+
+    def test_partition_longest_first(self):
+        durations = {'a': 8.0, 'b': 5.0, 'c': 4.0, 'd': 3.0}
+        loads = scheduling.partition(durations, 2)
+        self.assertEqual([(9.0, ['b', 'c']), (11.0, ['a', 'd'])], loads)
+        self.assertEqual(11.0, scheduling.makespan(
+            [names for _, names in loads], durations))
+
+    def test_testr_partition_deals_unknown_classes(self):
+        classes = {'a': ['a.1', 'a.2'], 'b': ['b.1'], 'c': ['c.1'],
+                   'd': ['d.1']}
+        assigned = scheduling.testr_partition(
+            classes, {'a.1': 1.0, 'a.2': 1.0, 'b.1': 1.0}, 2)
+        self.assertEqual([['a'], ['b']],
+                         sorted([name for name in names if name in 'ab']
+                                for names in assigned))
+        self.assertEqual([['c'], ['d']],
+                         sorted([name for name in names if name in 'cd']
+                                for names in assigned))
+
+
+class TestTestrArgs(base.TestCase):
+
+    def test_split_testr_args(self):
+        self.assertEqual((None, []), scheduling.split_testr_args(''))
+        self.assertEqual(
+            (4, ['(^tempest\\.api)', 'smoke']),
+            scheduling.split_testr_args(
+                '--parallel (^tempest\\.api) --concurrency 4 smoke'))
+        self.assertEqual((2, ['tempest']), scheduling.split_testr_args(
+            '--subunit --concurrency=2 tempest'))
+
+    def test_split_testr_args_unsupported(self):
+        self.assertRaises(ValueError, scheduling.split_testr_args,
+                          'tempest --failing')
+        self.assertRaises(ValueError, scheduling.split_testr_args,
+                          '--concurrency')
+        self.assertRaises(ValueError, scheduling.split_testr_args,
+                          '--concurrency=all')
+
+    def test_worker_command(self):
+        self.assertEqual(
+            '${PYTHON:-python} -m subunit.run discover -t ./ ./tests  '
+            '--load-list worker-0.list',
+            scheduling.worker_command('worker-0.list',
+                                      'tempest/tests/files/testr-conf'))
+
+
+class TestTimingDB(base.TestCase):
+
+    def setUp(self):
+        super(TestTimingDB, self).setUp()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'class_times.json')
+
+    def test_record_and_estimate(self):
+        db = scheduling.TimingDB(self.path)
+        db.record({'tempest.scenario.test_a.TestA': 100.0,
+                   'tempest.scenario.test_b.TestB': 30.0,
+                   'tempest.api.test_c.TestC': 4.0,
+                   'tempest.api.test_d.TestD': 2.0},
+                  {'tempest.scenario.test_a.TestA': 1,
+                   'tempest.scenario.test_b.TestB': 1,
+                   'tempest.api.test_c.TestC': 2,
+                   'tempest.api.test_d.TestD': 1}, 100.0)
+        db.save()
+        db = scheduling.TimingDB(self.path)
+        self.assertEqual([100.0], db.makespans)
+        # A part of a known class
+        self.assertEqual(2.0, db.estimate('tempest.api.test_c.TestC', 1))
+        # Unknown classes, from the tests of their package
+        self.assertEqual(200.0,
+                         db.estimate('tempest.scenario.test_e.TestE', 2))
+        self.assertEqual(2.0, db.estimate('tempest.api.test_e.TestE', 1))
+        # From all the tests when the package is unknown
+        self.assertEqual(90.0, db.estimate('other.TestF', 3))
+        self.assertEqual(scheduling.DEFAULT_TEST_TIME * 3,
+                         scheduling.TimingDB(self.path + '.new').estimate(
+                             'other.TestF', 3))
+
+    def test_record_smooths_the_durations(self):
+        db = scheduling.TimingDB(self.path)
+        db.record({'a.TestA': 10.0}, {'a.TestA': 1}, 10.0)
+        db.record({'a.TestA': 20.0}, {'a.TestA': 1}, 20.0)
+        self.assertEqual(15.0, db.estimate('a.TestA', 1))
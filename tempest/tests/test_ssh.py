@@ -0,0 +1,109 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import time
+
+from tempest.common import ssh
+from tempest.tests import base
+
+
+class FakeTransport(object):
+
+    def __init__(self):
+        self.active = True
+
+    def is_active(self):
+        return self.active
+
+
+class FakeConnection(object):
+
+    def __init__(self):
+        self.transport = FakeTransport()
+        self.closed = False
+
+    def get_transport(self):
+        return self.transport
+
+    def close(self):
+        self.closed = True
+
+
+class FakeClient(object):
+
+    def __init__(self, host):
+        self.host = host
+        self.connections = []
+
+    def connection_key(self):
+        return (self.host, 'cirros')
+
+    def _get_ssh_connection(self):
+        self.connections.append(FakeConnection())
+        return self.connections[-1]
+
+
+class SlowClient(FakeClient):
+
+    def _get_ssh_connection(self):
+        # Leaves the other threads the time to miss the cache too.
+        time.sleep(0.05)
+        return super(SlowClient, self)._get_ssh_connection()
+
+
+class TestConnectionCache(base.TestCase):
+
+    def test_connections_are_reused(self):
+        cache = ssh.ConnectionCache()
+        client = FakeClient('10.0.0.1')
+        first = cache.get(client)
+        self.assertIs(first, cache.get(client))
+        self.assertIs(first, cache.get(FakeClient('10.0.0.1')))
+        self.assertIsNot(first, cache.get(FakeClient('10.0.0.2')))
+        self.assertEqual(1, len(client.connections))
+
+    def test_dead_connections_are_replaced(self):
+        cache = ssh.ConnectionCache()
+        client = FakeClient('10.0.0.1')
+        first = cache.get(client)
+        first.transport.active = False
+        second = cache.get(client)
+        self.assertIsNot(first, second)
+        self.assertTrue(first.closed)
+
+    def test_concurrent_misses_connect_once(self):
+        cache = ssh.ConnectionCache()
+        client = SlowClient('10.0.0.1')
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            cache.get(client))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(1, len(client.connections))
+        self.assertEqual([client.connections[0]] * 4, results)
+        self.assertFalse(client.connections[0].closed)
+
+    def test_close(self):
+        cache = ssh.ConnectionCache()
+        client = FakeClient('10.0.0.1')
+        connection = cache.get(client)
+        cache.close()
+        self.assertTrue(connection.closed)
+        self.assertIsNot(connection, cache.get(client))
@@ -0,0 +1,99 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+
+from tempest.common import token_cache
+from tempest.openstack.common import timeutils
+from tempest.tests import base
+
+NOW = datetime.datetime(2013, 11, 5, 12, 0, 0)
+KEY = ('http://identity:5000/v2.0', 'demo', 'demo', 'secret')
+
+
+class TestTokenCache(base.TestCase):
+
+    def setUp(self):
+        super(TestTokenCache, self).setUp()
+        timeutils.set_time_override(NOW)
+        self.addCleanup(timeutils.clear_time_override)
+        self.cache = token_cache.TokenCache()
+        self.cache.clear()
+        self.addCleanup(self.cache.clear)
+        self.fetched = []
+
+    def _fetch(self, lifetime=3600):
+        token = 'token-%d' % (len(self.fetched) + 1)
+        expires_at = None
+        if lifetime is not None:
+            expires_at = timeutils.utcnow() + datetime.timedelta(
+                seconds=lifetime)
+        auth_data = token_cache.AuthData(token, expires_at, {})
+        self.fetched.append(auth_data)
+        return auth_data
+
+    def test_parse_expiry(self):
+        self.assertEqual(datetime.datetime(2013, 11, 5, 13, 0, 0),
+                         token_cache.parse_expiry('2013-11-05T14:00:00+01:00'))
+        self.assertIsNone(token_cache.parse_expiry(None))
+        self.assertIsNone(token_cache.parse_expiry('tomorrow'))
+
+    def test_singleton(self):
+        self.assertIs(self.cache, token_cache.TokenCache())
+
+    def test_get_caches(self):
+        first = self.cache.get(KEY, self._fetch)
+        self.assertEqual('token-1', first.token)
+        self.assertIs(first, self.cache.get(KEY, self._fetch))
+        other = self.cache.get(KEY[:3] + ('other',), self._fetch)
+        self.assertEqual('token-2', other.token)
+        self.assertEqual(2, len(self.fetched))
+
+    def test_refresh_before_expiry(self):
+        self.cache.get(KEY, self._fetch, refresh_margin=300)
+        timeutils.advance_time_seconds(3200)
+        self.assertEqual(
+            'token-1', self.cache.get(KEY, self._fetch, 300).token)
+        # Within refresh_margin of the expiry the token is fetched again.
+        timeutils.advance_time_seconds(200)
+        self.assertEqual(
+            'token-2', self.cache.get(KEY, self._fetch, 300).token)
+        self.assertEqual(
+            'token-2', self.cache.get(KEY, self._fetch, 300).token)
+
+    def test_unknown_expiry(self):
+        self.cache.get(KEY, lambda: self._fetch(lifetime=None))
+        timeutils.advance_time_seconds(86400)
+        self.assertEqual('token-1', self.cache.get(KEY, self._fetch).token)
+        self.assertTrue(self.cache.is_fresh(KEY, 'token-1', 300))
+
+    def test_is_fresh(self):
+        self.assertFalse(self.cache.is_fresh(KEY, 'token-1'))
+        self.cache.get(KEY, self._fetch)
+        self.assertTrue(self.cache.is_fresh(KEY, 'token-1', 300))
+        self.assertFalse(self.cache.is_fresh(KEY, 'token-0', 300))
+        timeutils.advance_time_seconds(3400)
+        self.assertTrue(self.cache.is_fresh(KEY, 'token-1'))
+        self.assertFalse(self.cache.is_fresh(KEY, 'token-1', 300))
+
+    def test_invalidate(self):
+        self.cache.get(KEY, self._fetch)
+        self.cache.invalidate(KEY)
+        self.assertFalse(self.cache.is_fresh(KEY, 'token-1'))
+        self.assertEqual('token-2', self.cache.get(KEY, self._fetch).token)
+        # Invalidating an unknown key is harmless.
+        self.cache.invalidate(('unknown',))
@@ -0,0 +1,130 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import time
+
+from tempest.common import backoff
+from tempest.common import waiters
+from tempest import exceptions
+from tempest.tests import base
+
+
+class TestWaitForResourcesStatus(base.TestCase):
+
+    def setUp(self):
+        super(TestWaitForResourcesStatus, self).setUp()
+        self.sleeps = []
+        self.stubs.Set(time, 'sleep', self.sleeps.append)
+        self.policy = backoff.PollPolicy(10, 1)
+
+    def _lister(self, polls):
+        polls = iter(polls)
+
+        def list_resources():
+            return next(polls)
+        return list_resources
+
+    def test_one_list_call_per_poll(self):
+        polls = [
+            [{'id': 'a', 'status': 'BUILD'}, {'id': 'b', 'status': 'BUILD'}],
+            [{'id': 'a', 'status': 'ACTIVE'}, {'id': 'b', 'status': 'BUILD'}],
+            [{'id': 'a', 'status': 'ACTIVE'}, {'id': 'b', 'status': 'ACTIVE'}],
+        ]
+        transitions = waiters.wait_for_resources_status(
+            self._lister(polls), ['a', 'b'], 'ACTIVE', self.policy, 300)
+        self.assertEqual(2, len(self.sleeps))
+        self.assertEqual(['BUILD', 'ACTIVE'],
+                         [status for _, status in transitions['a']])
+        self.assertEqual(['BUILD', 'ACTIVE'],
+                         [status for _, status in transitions['b']])
+
+    def test_backoff_is_capped(self):
+        polls = [[{'id': 'a', 'status': 'BUILD'}]] * 6
+        polls.append([{'id': 'a', 'status': 'ACTIVE'}])
+        waiters.wait_for_resources_status(
+            self._lister(polls), ['a'], 'ACTIVE',
+            backoff.PollPolicy(8, 1, jitter=False), 300)
+        self.assertEqual([1, 2, 4, 8, 8, 8], self.sleeps)
+
+    def test_deleted_resources(self):
+        polls = [[{'id': 'a', 'status': 'DELETING'}], []]
+        transitions = waiters.wait_for_resources_status(
+            self._lister(polls), ['a'], None, self.policy, 300,
+            allow_notfound=True)
+        self.assertEqual(['DELETING', None],
+                         [status for _, status in transitions['a']])
+
+    def test_error_status(self):
+        polls = [[{'id': 'a', 'status': 'ERROR'}]]
+        exc = self.assertRaises(exceptions.BuildErrorException,
+                                waiters.wait_for_resources_status,
+                                self._lister(polls), ['a'], 'ACTIVE',
+                                self.policy, 300)
+        self.assertEqual('Resource a is in ERROR status', str(exc))
+
+    def test_timeout(self):
+        polls = [[{'id': 'a', 'status': 'BUILD'}]] * 3
+        self.assertRaises(exceptions.TimeoutException,
+                          waiters.wait_for_resources_status,
+                          self._lister(polls), ['a'], 'ACTIVE', self.policy,
+                          0)
+
+
+class FakeServersClient(object):
+    build_timeout = 300
+
+    def __init__(self, polls):
+        self.polls = iter(polls)
+        self.poll_policy = backoff.PollPolicy(10, 1)
+
+    def list_servers_with_detail(self):
+        return {'status': '200'}, {'servers': next(self.polls)}
+
+
+class TestWaitForServersStatus(base.TestCase):
+
+    def setUp(self):
+        super(TestWaitForServersStatus, self).setUp()
+        self.sleeps = []
+        self.stubs.Set(time, 'sleep', self.sleeps.append)
+
+    def test_waits_for_the_tasks(self):
+        polls = [
+            [{'id': 'a', 'status': 'BUILD',
+              'OS-EXT-STS:task_state': 'spawning'},
+             {'id': 'b', 'status': 'ACTIVE',
+              'OS-EXT-STS:task_state': 'None'}],
+            [{'id': 'a', 'status': 'ACTIVE',
+              'OS-EXT-STS:task_state': 'powering-on'},
+             {'id': 'b', 'status': 'ACTIVE'}],
+            [{'id': 'a', 'status': 'ACTIVE',
+              'OS-EXT-STS:task_state': None}],
+        ]
+        transitions = waiters.wait_for_servers_status(
+            FakeServersClient(polls), ['a', 'b'], 'ACTIVE')
+        self.assertEqual(2, len(self.sleeps))
+        self.assertEqual(['BUILD/spawning', 'ACTIVE/powering-on', 'ACTIVE'],
+                         [status for _, status in transitions['a']])
+        self.assertEqual(['ACTIVE'],
+                         [status for _, status in transitions['b']])
+
+    def test_error(self):
+        polls = [[{'id': 'a', 'status': 'ERROR',
+                   'OS-EXT-STS:task_state': 'spawning'}]]
+        self.assertRaises(exceptions.BuildErrorException,
+                          waiters.wait_for_servers_status,
+                          FakeServersClient(polls), ['a'], 'ACTIVE')
@@ -0,0 +1,66 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from lxml import etree
+
+from tempest.services.compute.xml import common
+from tempest.tests import base
+
+DOCUMENTS = [
+    '<a/>',
+    '<a>text</a>',
+    '<a x="1"/>',
+    '<a x="1">text</a>',
+    '<a x="1"><b/></a>',
+    '<a b="attribute"><b>child</b></a>',
+    '<a>  <b>  </b>\n</a>',
+    '<a>x&amp;y<![CDATA[<z>]]></a>',
+    '<a xmlns:q="http://q" q:x="1"><q:b q:c="d"/></a>',
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<servers xmlns="http://docs.openstack.org/compute/api/v1.1" '
+    'xmlns:atom="http://www.w3.org/2005/Atom">'
+    '<server id="1" name="s1"><image id="i"/><metadata/>'
+    '<atom:link href="http://1" rel="self"/>'
+    '<atom:link href="http://2" rel="bookmark"/></server>'
+    '<server id="2"><addresses><network id="private">'
+    '<ip version="4" addr="10.0.0.2"/></network></addresses></server>'
+    '</servers>',
+]
+
+
+class TestXmlStringToJson(base.TestCase):
+
+    def test_same_as_xml_to_json(self):
+        for document in DOCUMENTS:
+            self.assertEqual(
+                common.xml_to_json(etree.fromstring(document)),
+                common.xml_string_to_json(document))
+
+    def test_list_same_as_xml_to_json(self):
+        for document in DOCUMENTS:
+            expected = [common.xml_to_json(child)
+                        for child in etree.fromstring(document)]
+            self.assertEqual(expected,
+                             common.xml_string_to_json_list(document))
+
+    def test_list_keeps_duplicates(self):
+        servers = common.xml_string_to_json_list(DOCUMENTS[-1])
+        self.assertEqual(['1', '2'], [server['id'] for server in servers])
+
+    def test_invalid_document(self):
+        self.assertRaises(etree.XMLSyntaxError,
+                          common.xml_string_to_json, '<a>')
@@ -19,6 +19,7 @@ import contextlib
 import logging as orig_logging
 import os
 import re
+import threading
 import urlparse
 
 import boto
@@ -28,17 +29,24 @@ from boto import s3
 import keystoneclient.exceptions
 
 import tempest.clients
+from tempest.common import concurrency
 from tempest.common.utils.file_utils import have_effective_read_access
 import tempest.config
 from tempest import exceptions
 from tempest.openstack.common import log as logging
 import tempest.test
+from tempest.thirdparty.boto.utils.wait import BatchedDescribe
 from tempest.thirdparty.boto.utils.wait import re_search_wait
 from tempest.thirdparty.boto.utils.wait import state_wait
 from tempest.thirdparty.boto.utils.wait import wait_exception
 
 LOG = logging.getLogger(__name__)
 
+# NOTE: the waits for the instances (or volumes) of an account share a
+# single DescribeInstances (or DescribeVolumes) call per poll interval.
+_batches = {}
+_batches_lock = threading.Lock()
+
 
 def decision_maker():
     A_I_IMAGES_READY = True  # ari,ami,aki
@@ -171,6 +179,50 @@ def _add_matcher_class(error_cls, error_data, base=BotoExceptionMatcher):
 
 
 # TODO(afazekas): classmethod handling
+def _describe_instances(connection, ids):
+    reservations = connection.get_all_instances(filters={'instance-id': ids})
+    return dict((instance.id, instance)
+                for reservation in reservations
+                for instance in reservation.instances)
+
+
+def _describe_volumes(connection, ids):
+    volumes = connection.get_all_volumes(filters={'volume-id': ids})
+    return dict((volume.id, volume) for volume in volumes)
+
+
+# The kinds of objects whose waits are batched, with their status attribute
+_BATCHED_KINDS = ((ec2.instance.Instance, "state", _describe_instances),
+                  (ec2.volume.Volume, "status", _describe_volumes))
+
+
+def batched_describe(obj):
+    """Returns the BatchedDescribe of the kind and the account of obj.
+
+    Returns None if the waits of the kind of obj are not batched.
+    """
+    for kind, _, describe in _BATCHED_KINDS:
+        if isinstance(obj, kind):
+            break
+    else:
+        return None
+    key = (kind, obj.connection.host, obj.connection.aws_access_key_id)
+    with _batches_lock:
+        if key not in _batches:
+            _batches[key] = BatchedDescribe(describe)
+        return _batches[key]
+
+
+def concurrent_cleanup(function):
+    """Marks a cleanup function as safe to run with its neighbours.
+
+    tearDownClass runs the consecutive concurrent cleanups of the trash
+    bin at the same time; the others still run alone, in reverse order.
+    """
+    function.concurrent_cleanup = True
+    return function
+
+
 def friendly_function_name_simple(call_able):
     name = ""
     if hasattr(call_able, "im_class"):
@@ -246,21 +298,22 @@ class BotoTestCase(tempest.test.BaseTestCase):
     def tearDownClass(cls):
         """Calls the callables added by addResourceCleanUp,
         when you overwire this function dont't forget to call this too.
+        The consecutive cleanups marked with concurrent_cleanup are called
+        together, by at most [compute] teardown_workers threads.
         """
         fail_count = 0
         trash_keys = sorted(cls._resource_trash_bin, reverse=True)
-        for key in trash_keys:
-            (function, pos_args, kw_args) = cls._resource_trash_bin[key]
-            try:
-                LOG.debug("Cleaning up: %s" %
-                          friendly_function_call_str(function, *pos_args,
-                                                     **kw_args))
-                function(*pos_args, **kw_args)
-            except BaseException as exc:
-                fail_count += 1
-                LOG.exception(exc)
-            finally:
-                del cls._resource_trash_bin[key]
+        while trash_keys:
+            keys = [trash_keys.pop(0)]
+            while (trash_keys and
+                   cls._is_concurrent_cleanup(keys[0]) and
+                   cls._is_concurrent_cleanup(trash_keys[0])):
+                keys.append(trash_keys.pop(0))
+            graph = concurrency.TaskGraph(cls.config.compute.teardown_workers)
+            for key in keys:
+                graph.add(key, cls._clean_up, (key,))
+            results = graph.run(fail_fast=False)
+            fail_count += results.values().count(False)
         super(BotoTestCase, cls).tearDownClass()
         # NOTE(afazekas): let the super called even on exceptions
         # The real exceptions already logged, if the super throws another,
@@ -268,6 +321,27 @@ class BotoTestCase(tempest.test.BaseTestCase):
         if fail_count:
             raise exceptions.TearDownException(num=fail_count)
 
+    @classmethod
+    def _is_concurrent_cleanup(cls, key):
+        function = cls._resource_trash_bin[key][0]
+        return getattr(function, 'concurrent_cleanup', False)
+
+    @classmethod
+    def _clean_up(cls, key):
+        """Calls a cleanup of the trash bin, returns whether it succeeded."""
+        (function, pos_args, kw_args) = cls._resource_trash_bin[key]
+        try:
+            LOG.debug("Cleaning up: %s" %
+                      friendly_function_call_str(function, *pos_args,
+                                                 **kw_args))
+            function(*pos_args, **kw_args)
+            return True
+        except BaseException as exc:
+            LOG.exception(exc)
+            return False
+        finally:
+            del cls._resource_trash_bin[key]
+
     ec2_error_code = BotoExceptionMatcher()
     # InsufficientInstanceCapacity can be both server and client error
     ec2_error_code.server = ServerError()
@@ -322,12 +396,37 @@ class BotoTestCase(tempest.test.BaseTestCase):
 
         return _status
 
+    @classmethod
+    @contextlib.contextmanager
+    def watch_status(cls, obj):
+        """Yields the function returned by get_lfunction_gone for obj.
+
+        The status of the instances and volumes is polled by their
+        BatchedDescribe instead, together with the other ones waited for.
+        """
+        batch = batched_describe(obj)
+        if batch is None:
+            yield cls.get_lfunction_gone(obj)
+            return
+        status_attr = [attr for kind, attr, _ in _BATCHED_KINDS
+                       if isinstance(obj, kind)][0]
+
+        with batch.watch(obj) as lookup:
+            def _status():
+                fresh = lookup(obj)
+                if fresh is None:
+                    return "_GONE"
+                obj._update(fresh)
+                return getattr(obj, status_attr)
+
+            yield _status
+
     def state_wait_gone(self, lfunction, final_set, valid_set):
         if not isinstance(final_set, set):
             final_set = set((final_set,))
         final_set |= self.gone_set
-        lfunction = self.get_lfunction_gone(lfunction)
-        state = state_wait(lfunction, final_set, valid_set)
+        with self.watch_status(lfunction) as lfunction:
+            state = state_wait(lfunction, final_set, valid_set)
         self.assertIn(state, valid_set | self.gone_set)
         return state
 
@@ -439,33 +538,36 @@ class BotoTestCase(tempest.test.BaseTestCase):
             raise exceptions.TearDownException(num=exc_num)
 
     @classmethod
+    @concurrent_cleanup
     def destroy_reservation(cls, reservation):
-        """Terminate instances in a reservation, just for teardown."""
+        """Terminate instances in a reservation, just for teardown.
+        The instances are terminated first, then waited for together.
+        """
         exc_num = 0
-
-        def _instance_state():
-            try:
-                instance.update(validate=True)
-            except ValueError:
-                return "_GONE"
-            except exception.EC2ResponseError as exc:
-                if cls.ec2_error_code.\
-                        client.InvalidInstanceID.NotFound.match(exc):
-                    return "_GONE"
-                # NOTE(afazekas): incorrect code,
-                # but the resource must be destoreyd
-                if exc.error_code == "InstanceNotFound":
-                    return "_GONE"
-
-            return instance.state
-
+        terminated = []
         for instance in reservation.instances:
             try:
                 instance.terminate()
-                re_search_wait(_instance_state, "_GONE")
+                terminated.append(instance)
             except BaseException as exc:
                 LOG.exception(exc)
                 exc_num += 1
+
+        def _instance_state():
+            fresh = lookup(instance)
+            if fresh is None:
+                return "_GONE"
+            return fresh.state
+
+        if terminated:
+            batch = batched_describe(terminated[0])
+            with batch.watch(*terminated) as lookup:
+                for instance in terminated:
+                    try:
+                        re_search_wait(_instance_state, "_GONE")
+                    except BaseException as exc:
+                        LOG.exception(exc)
+                        exc_num += 1
         if exc_num:
             raise exceptions.TearDownException(num=exc_num)
 
@@ -481,6 +583,7 @@ class BotoTestCase(tempest.test.BaseTestCase):
         group.delete()
 
     @classmethod
+    @concurrent_cleanup
     def destroy_volume_wait(cls, volume):
         """Delete volume, tryies to detach first.
            Use just for teardown!
@@ -493,7 +596,10 @@ class BotoTestCase(tempest.test.BaseTestCase):
 
         # NOTE(afazekas): detaching/attching not valid EC2 status
         def _volume_state():
-            volume.update(validate=True)
+            fresh = lookup(volume)
+            if fresh is None:
+                raise ValueError('%s is not a valid Volume ID' % volume.id)
+            volume._update(fresh)
             try:
                 if volume.status != "available":
                     volume.detach(force=True)
@@ -503,8 +609,10 @@ class BotoTestCase(tempest.test.BaseTestCase):
             return volume.status
 
         try:
-            re_search_wait(_volume_state, "available")  # not validates status
-            LOG.info(_volume_state())
+            with batched_describe(volume).watch(volume) as lookup:
+                # not validates status
+                re_search_wait(_volume_state, "available")
+                LOG.info(_volume_state())
             volume.delete()
         except BaseException as exc:
             LOG.exception(exc)
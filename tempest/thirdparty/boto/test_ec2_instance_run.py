@@ -59,7 +59,10 @@ class InstanceRunTest(BotoTestCase):
         cls.addResourceCleanUp(cls.destroy_bucket,
                                cls.s3_client.connection_data,
                                cls.bucket_name)
-        s3_upload_dir(bucket, cls.materials_path)
+        s3_upload_dir(bucket, cls.materials_path,
+                      workers=config.boto.s3_upload_workers,
+                      multipart_threshold=(
+                          config.boto.s3_multipart_threshold or None))
         cls.images = {"ami":
                       {"name": data_utils.rand_name("ami-name-"),
                        "location": cls.bucket_name + "/" + ami_manifest},
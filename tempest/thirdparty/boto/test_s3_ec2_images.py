@@ -48,7 +48,10 @@ class S3ImagesTest(BotoTestCase):
         cls.addResourceCleanUp(cls.destroy_bucket,
                                cls.s3_client.connection_data,
                                cls.bucket_name)
-        s3_upload_dir(bucket, cls.materials_path)
+        s3_upload_dir(bucket, cls.materials_path,
+                      workers=config.boto.s3_upload_workers,
+                      multipart_threshold=(
+                          config.boto.s3_multipart_threshold or None))
 
     @attr(type='smoke')
     def test_register_get_deregister_ami_image(self):
@@ -18,26 +18,116 @@
 import contextlib
 import os
 import re
+import time
 
 import boto
 import boto.s3.key
 
+from tempest.common import concurrency
 from tempest.openstack.common import log as logging
 
 LOG = logging.getLogger(__name__)
 
+PART_SIZE = 8 * 1024 * 1024
 
-def s3_upload_dir(bucket, path, prefix="", connection_data=None):
+
+def _throughput(size, elapsed):
+    return "%d bytes in %.2fs (%.2f MB/s)" % (
+        size, elapsed, size / max(elapsed, 1e-6) / (1024 * 1024))
+
+
+def _upload_targets(path, prefix):
+    """Returns the (source, target, size) of the files under path."""
+    strip = re.compile("^" + re.escape(path) + "?/")
+    targets = []
+    for root, dirs, files in os.walk(path):
+        for fil in files:
+            source = root + os.sep + fil
+            target = strip.sub(prefix, source)
+            if os.sep != '/':
+                target = target.replace(os.sep, '/')
+            targets.append((source, target, os.path.getsize(source)))
+    return targets
+
+
+def _upload_file(bucket, source, target, size):
+    start = time.time()
+    with contextlib.closing(boto.s3.key.Key(bucket)) as key:
+        key.key = target
+        key.set_contents_from_filename(source)
+    LOG.info("Uploaded %s to %s/%s: %s", source, bucket.name, target,
+             _throughput(size, time.time() - start))
+
+
+def _upload_part(upload, source, part_num, offset, size):
+    with open(source, 'rb') as fp:
+        fp.seek(offset)
+        upload.upload_part_from_file(fp, part_num, size=size)
+
+
+def _add_multipart_upload(graph, bucket, source, target, size, part_size):
+    """Adds the tasks of the multipart upload of a file to graph."""
+    name = 'multipart:%s' % target
+    started = {}
+
+    def initiate():
+        started['time'] = time.time()
+        return bucket.initiate_multipart_upload(target)
+
+    def complete():
+        graph.results[name].complete_upload()
+        elapsed = time.time() - started['time']
+        LOG.info("Uploaded %s to %s/%s in %d parts: %s", source, bucket.name,
+                 target, len(parts), _throughput(size, elapsed))
+
+    graph.add(name, initiate)
+    parts = []
+    for part_num, offset in enumerate(xrange(0, size, part_size), 1):
+        part = '%s:%d' % (name, part_num)
+        graph.add(part,
+                  lambda *args: _upload_part(graph.results[name], *args),
+                  (source, part_num, offset, min(part_size, size - offset)),
+                  deps=(name,))
+        parts.append(part)
+    graph.add('%s:complete' % name, complete, deps=parts)
+    return name
+
+
+def s3_upload_dir(bucket, path, prefix="", connection_data=None,
+                  workers=4, multipart_threshold=None, part_size=PART_SIZE):
+    """Uploads the files under path to an S3 bucket, concurrently.
+
+    At most workers files, or parts of files, are uploaded at the same time.
+    The files of at least multipart_threshold bytes are sent with multipart
+    uploads of part_size bytes parts, the others (or all of them if it is
+    None) in one request. The throughput of every file and the aggregated
+    one are logged.
+    """
     if isinstance(bucket, basestring):
         with contextlib.closing(boto.connect_s3(**connection_data)) as conn:
             bucket = conn.lookup(bucket)
-    for root, dirs, files in os.walk(path):
-        for fil in files:
-            with contextlib.closing(boto.s3.key.Key(bucket)) as key:
-                source = root + os.sep + fil
-                target = re.sub("^" + re.escape(path) + "?/", prefix, source)
-                if os.sep != '/':
-                    target = re.sub(re.escape(os.sep), '/', target)
-                key.key = target
-                LOG.info("Uploading %s to %s/%s", source, bucket.name, target)
-                key.set_contents_from_filename(source)
+    targets = _upload_targets(path, prefix)
+    graph = concurrency.TaskGraph(workers)
+    multiparts = []
+    for source, target, size in targets:
+        if multipart_threshold is not None and size >= multipart_threshold:
+            multiparts.append(_add_multipart_upload(graph, bucket, source,
+                                                    target, size, part_size))
+        else:
+            graph.add(target, _upload_file, (bucket, source, target, size))
+    start = time.time()
+    try:
+        graph.run()
+    except Exception:
+        for name in multiparts:
+            if (name in graph.results and
+                    '%s:complete' % name not in graph.results):
+                try:
+                    graph.results[name].cancel_upload()
+                except Exception:
+                    LOG.exception("Failed to cancel the upload of %s",
+                                  graph.results[name].key_name)
+        raise
+    LOG.info("Uploaded %d files from %s to %s: %s", len(targets), path,
+             bucket.name, _throughput(sum(size for _, _, size in targets),
+                                      time.time() - start))
@@ -15,12 +15,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import contextlib
 import re
+import threading
 import time
 
 import boto.exception
 from testtools import TestCase
 
+from tempest.common import backoff
 import tempest.config
 from tempest.openstack.common import log as logging
 
@@ -32,6 +35,8 @@ default_timeout = _boto_config.build_timeout
 
 default_check_interval = _boto_config.build_interval
 
+_poll_policy = backoff.PollPolicy.from_config(_boto_config)
+
 
 def state_wait(lfunction, final_set=set(), valid_set=None):
     # TODO(afazekas): evaluate using ABC here
@@ -39,51 +44,48 @@ def state_wait(lfunction, final_set=set(), valid_set=None):
         final_set = set((final_set,))
     if not isinstance(valid_set, set) and valid_set is not None:
         valid_set = set((valid_set,))
-    start_time = time.time()
+    poller = _poll_policy.poller(default_timeout)
     old_status = status = lfunction()
     while True:
         if status != old_status:
             LOG.info('State transition "%s" ==> "%s" %d second', old_status,
-                     status, time.time() - start_time)
+                     status, poller.elapsed())
         if status in final_set:
             return status
         if valid_set is not None and status not in valid_set:
             return status
-        dtime = time.time() - start_time
-        if dtime > default_timeout:
+        if not poller.sleep():
             raise TestCase.failureException("State change timeout exceeded!"
                                             '(%ds) While waiting'
                                             'for %s at "%s"' %
-                                            (dtime, final_set, status))
-        time.sleep(default_check_interval)
+                                            (poller.elapsed(), final_set,
+                                             status))
         old_status = status
         status = lfunction()
 
 
 def re_search_wait(lfunction, regexp):
     """Stops waiting on success."""
-    start_time = time.time()
+    poller = _poll_policy.poller(default_timeout)
     while True:
         text = lfunction()
         result = re.search(regexp, text)
         if result is not None:
             LOG.info('Pattern "%s" found in %d second in "%s"',
                      regexp,
-                     time.time() - start_time,
+                     poller.elapsed(),
                      text)
             return result
-        dtime = time.time() - start_time
-        if dtime > default_timeout:
+        if not poller.sleep():
             raise TestCase.failureException('Pattern find timeout exceeded!'
                                             '(%ds) While waiting for'
                                             '"%s" pattern in "%s"' %
-                                            (dtime, regexp, text))
-        time.sleep(default_check_interval)
+                                            (poller.elapsed(), regexp, text))
 
 
 def wait_no_exception(lfunction, exc_class=None, exc_matcher=None):
     """Stops waiting on success."""
-    start_time = time.time()
+    poller = _poll_policy.poller(default_timeout)
     if exc_matcher is not None:
         exc_class = boto.exception.BotoServerError
 
@@ -94,7 +96,7 @@ def wait_no_exception(lfunction, exc_class=None, exc_matcher=None):
         try:
             result = lfunction()
             LOG.info('No Exception in %d second',
-                     time.time() - start_time)
+                     poller.elapsed())
             return result
         except exc_class as exc:
             if exc_matcher is not None:
@@ -103,28 +105,80 @@ def wait_no_exception(lfunction, exc_class=None, exc_matcher=None):
                     LOG.info(res)
                     raise exc
         # Let the other exceptions propagate
-        dtime = time.time() - start_time
-        if dtime > default_timeout:
+        if not poller.sleep():
             raise TestCase.failureException("Wait timeout exceeded! (%ds)" %
-                                            dtime)
-        time.sleep(default_check_interval)
+                                            poller.elapsed())
 
 
 # NOTE(afazekas): EC2/boto normally raise exception instead of empty list
 def wait_exception(lfunction):
     """Returns with the exception or raises one."""
-    start_time = time.time()
+    poller = _poll_policy.poller(default_timeout)
     while True:
         try:
             lfunction()
         except BaseException as exc:
             LOG.info('Exception in %d second',
-                     time.time() - start_time)
+                     poller.elapsed())
             return exc
-        dtime = time.time() - start_time
-        if dtime > default_timeout:
+        if not poller.sleep():
             raise TestCase.failureException("Wait timeout exceeded! (%ds)" %
-                                            dtime)
-        time.sleep(default_check_interval)
+                                            poller.elapsed())
+
+
+class BatchedDescribe(object):
+    """Shares one Describe call per interval among the waits of many objects.
+
+    describe is called with a boto connection and a list of ids, and
+    returns a dict mapping the ids it found to fresh objects. The objects
+    watched at the same time, from any thread, are described together by
+    a single call, issued at most once per interval; the waits use its
+    result in between. A lookup is always answered by a call issued after
+    its watch started, so a wait never sees a state older than itself.
+
+    Usage::
+
+        with batch.watch(*reservation.instances) as lookup:
+            fresh = lookup(instance)  # None if the instance is not found
+    """
+
+    def __init__(self, describe, interval=default_check_interval):
+        self._describe = describe
+        self.interval = interval
+        self._watched = {}
+        self._found = {}
+        self._described = None
+        self._lock = threading.Lock()
+
+    def _lookup(self, obj, since):
+        with self._lock:
+            if (self._described is None or self._described <= since or
+                    time.time() - self._described >= self.interval):
+                described = time.time()
+                ids = list(self._watched)
+                self._found = self._describe(obj.connection, ids)
+                self._described = described
+                LOG.debug("Described %d objects at once", len(ids))
+            return self._found.get(obj.id)
+
+    @contextlib.contextmanager
+    def watch(self, *objs):
+        """Adds objs to the described objects, yields their lookup function.
+
+        The lookup function takes one of objs and returns its fresh version,
+        or None if it was not found.
+        """
+        since = time.time()
+        with self._lock:
+            for obj in objs:
+                self._watched[obj.id] = self._watched.get(obj.id, 0) + 1
+        try:
+            yield lambda obj: self._lookup(obj, since)
+        finally:
+            with self._lock:
+                for obj in objs:
+                    self._watched[obj.id] -= 1
+                    if not self._watched[obj.id]:
+                        del self._watched[obj.id]
 
 # TODO(afazekas): consider strategy design pattern..
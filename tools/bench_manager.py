@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Micro-benchmark of the construction cost of clients.Manager.
+
+The lazy mode measures what a test class pays today: building the Manager
+and the few clients it actually uses. The eager mode also builds every
+registered client, which is what Manager.__init__ used to do.
+
+No request is sent to the cloud, the glance clients (which authenticate
+when built) are disabled for the run.
+"""
+
+from __future__ import print_function
+
+import argparse
+import gc
+import resource
+import time
+
+from oslo.config import cfg
+
+from tempest import clients
+from tempest import config
+
+
+def _max_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def build_managers(count, interface, used_clients, eager):
+    managers = []
+    start = time.time()
+    for _ in range(count):
+        manager = clients.Manager(interface=interface)
+        names = sorted(manager._client_factories) if eager else used_clients
+        for name in names:
+            getattr(manager, name)
+        managers.append(manager)
+    return time.time() - start, managers
+
+
+def run(count, interface, used_clients):
+    # NOTE: max RSS never decreases, so measure the lighter mode first.
+    for eager in (False, True):
+        gc.collect()
+        rss_before = _max_rss_kb()
+        elapsed, managers = build_managers(count, interface, used_clients,
+                                           eager)
+        print("%-6s %5d managers: %8.2f ms per manager, max RSS +%d kB" %
+              ('eager' if eager else 'lazy', count,
+               elapsed * 1000.0 / count, _max_rss_kb() - rss_before))
+        del managers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--count', type=int, default=100,
+                        help="Number of managers to build per mode")
+    parser.add_argument('-i', '--interface', default='json',
+                        choices=['json', 'xml'])
+    parser.add_argument('-c', '--clients', nargs='*',
+                        default=['servers_client', 'images_client'],
+                        help="Clients used by the simulated test class")
+    args = parser.parse_args()
+
+    config.TempestConfig()
+    cfg.CONF.set_override('glance', False, 'service_available')
+    # Warm up imports and the config before measuring anything.
+    build_managers(1, args.interface, args.clients, True)
+    run(args.count, args.interface, args.clients)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Benchmark of the segmented large object upload of the object client.
+
+Writes a file of the given size, then uploads it to swift as a large
+object with every given number of workers, from the memory-mapped file
+and from a stream, and reports the throughput. Uses the credentials of
+tempest.conf. The container and its objects are deleted at the end.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import tempfile
+import time
+
+from tempest.api.object_storage import base
+from tempest import clients
+from tempest.common.utils import data_utils
+
+MB = 1024 * 1024
+
+
+def write_file(path, size_mb):
+    block = os.urandom(MB)
+    with open(path, 'wb') as data_file:
+        for _ in range(size_mb):
+            data_file.write(block)
+
+
+def upload(object_client, container, path, source, workers, segment_size,
+           manifest):
+    name = data_utils.rand_name('bench-object-')
+    start = time.time()
+    if source == 'mmap':
+        object_client.create_large_object(container, name, path,
+                                          manifest=manifest,
+                                          segment_size=segment_size,
+                                          workers=workers)
+    else:
+        with open(path, 'rb') as stream:
+            object_client.create_large_object(container, name, stream,
+                                              manifest=manifest,
+                                              segment_size=segment_size,
+                                              workers=workers)
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-s', '--size', type=int, default=2048,
+                        help="Size of the object in MB")
+    parser.add_argument('-g', '--segment-size', type=int, default=64,
+                        help="Size of the segments in MB")
+    parser.add_argument('-w', '--workers', type=int, nargs='*',
+                        default=[1, 4, 8],
+                        help="Numbers of concurrent segment uploads")
+    parser.add_argument('-m', '--manifest', default='dlo',
+                        choices=['dlo', 'slo'])
+    parser.add_argument('--source', nargs='*', default=['mmap', 'stream'],
+                        choices=['mmap', 'stream'])
+    args = parser.parse_args()
+
+    manager = clients.Manager()
+    container_client = manager.container_client
+    object_client = manager.object_client
+    container = data_utils.rand_name('bench-container-')
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        write_file(path, args.size)
+        container_client.create_container(container)
+        for source in args.source:
+            for workers in args.workers:
+                elapsed = upload(object_client, container, path, source,
+                                 workers, args.segment_size * MB,
+                                 args.manifest)
+                print("%-6s %2d workers: %5d MB in %7.2f s, %7.2f MB/s" %
+                      (source, workers, args.size, elapsed,
+                       args.size / elapsed))
+    finally:
+        os.remove(path)
+        base.BaseObjectTest.delete_containers([container], container_client,
+                                              object_client)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Micro-benchmark of the XML response parsers of the REST clients.
+
+Compares xml_to_json(etree.fromstring(body)), which builds the whole tree
+before converting it, with the streaming xml_string_to_json (and the list
+variants of both) on synthetic servers detail responses of increasing
+size. The results of both parsers are checked to be equal.
+"""
+
+from __future__ import print_function
+
+import argparse
+import gc
+import resource
+import time
+
+from lxml import etree
+
+from tempest.services.compute.xml import common
+
+SERVER = """
+<server id="%(id)s" name="server-%(id)s" status="ACTIVE" hostId="%(id)x"
+        tenant_id="tenant" user_id="user" accessIPv4="" accessIPv6=""
+        created="2013-10-01T10:00:00Z" updated="2013-10-01T10:01:00Z"
+        progress="100" key_name="key">
+  <image id="image-%(id)s">
+    <atom:link href="http://compute/images/image-%(id)s" rel="bookmark"/>
+  </image>
+  <flavor id="1">
+    <atom:link href="http://compute/flavors/1" rel="bookmark"/>
+  </flavor>
+  <metadata>
+    <meta key="role">worker</meta>
+    <meta key="index">%(id)s</meta>
+  </metadata>
+  <addresses>
+    <network id="private">
+      <ip version="4" addr="10.0.%(a)s.%(b)s"/>
+    </network>
+  </addresses>
+  <security_groups>
+    <security_group name="default"/>
+  </security_groups>
+  <atom:link href="http://compute/v2/servers/%(id)s" rel="self"/>
+  <atom:link href="http://compute/servers/%(id)s" rel="bookmark"/>
+</server>"""
+
+
+def make_servers_detail(count):
+    servers = ''.join(SERVER % {'id': i, 'a': i // 256, 'b': i % 256}
+                      for i in range(count))
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<servers xmlns="http://docs.openstack.org/compute/api/v1.1" '
+            'xmlns:atom="http://www.w3.org/2005/Atom">%s</servers>' %
+            servers).encode('utf-8')
+
+
+def tree_parse(body):
+    return common.xml_to_json(etree.fromstring(body))
+
+
+def stream_parse(body):
+    return common.xml_string_to_json(body)
+
+
+def tree_parse_list(body):
+    return [common.xml_to_json(child) for child in etree.fromstring(body)]
+
+
+def stream_parse_list(body):
+    return common.xml_string_to_json_list(body)
+
+
+def _max_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(func, body, repeat):
+    gc.collect()
+    rss_before = _max_rss_kb()
+    start = time.time()
+    for _ in range(repeat):
+        result = func(body)
+    elapsed = (time.time() - start) * 1000.0 / repeat
+    return result, elapsed, _max_rss_kb() - rss_before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-s', '--sizes', type=int, nargs='*',
+                        default=[10, 100, 1000, 10000],
+                        help="Numbers of servers in the responses")
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help="Number of parses per measure")
+    args = parser.parse_args()
+
+    # NOTE: max RSS never decreases, so measure the streaming parsers first
+    # and the largest responses last.
+    for size in sorted(args.sizes):
+        body = make_servers_detail(size)
+        results = {}
+        for name, func in (('stream', stream_parse),
+                           ('stream list', stream_parse_list),
+                           ('tree', tree_parse),
+                           ('tree list', tree_parse_list)):
+            result, elapsed, rss = measure(func, body, args.repeat)
+            results[name] = result
+            print("%6d servers (%7d kB) %-12s %9.2f ms, max RSS +%d kB" %
+                  (size, len(body) // 1024, name, elapsed, rss))
+        assert results['stream'] == results['tree']
+        assert results['stream list'] == results['tree list']
+
+
+if __name__ == "__main__":
+    main()
@@ -17,58 +17,46 @@
 #    under the License.
 
 import argparse
-import gzip
 import os
 import re
-import StringIO
 import sys
 import urllib2
 import yaml
 
+# NOTE: the tools are run from a checkout, where tempest is not installed.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                os.pardir)))
+
+from tempest.common import log_scanner
+
 
 is_neutron = os.environ.get('DEVSTACK_GATE_NEUTRON', "0") == "1"
 dump_all_errors = is_neutron
 
 
-def process_files(file_specs, url_specs, whitelists):
-    regexp = re.compile(r"^.*(ERROR|CRITICAL).*\[.*\-.*\]")
+def process_files(file_specs, url_specs, whitelists, workers=8):
+    scanner = log_scanner.LogScanner(whitelists)
+    logs = [(name, log_scanner.open_file(filename))
+            for (name, filename) in file_specs]
+    logs += [(name, log_scanner.open_url(url)) for (name, url) in url_specs]
     had_errors = False
-    for (name, filename) in file_specs:
-        whitelist = whitelists.get(name, [])
-        with open(filename) as content:
-            if scan_content(name, content, regexp, whitelist):
-                had_errors = True
-    for (name, url) in url_specs:
-        whitelist = whitelists.get(name, [])
-        req = urllib2.Request(url)
-        req.add_header('Accept-Encoding', 'gzip')
-        page = urllib2.urlopen(req)
-        buf = StringIO.StringIO(page.read())
-        f = gzip.GzipFile(fileobj=buf)
-        if scan_content(name, f.read().splitlines(), regexp, whitelist):
+    for name, errors in scanner.scan_all(logs, max_workers=workers):
+        if print_errors(name, errors):
             had_errors = True
     return had_errors
 
 
-def scan_content(name, content, regexp, whitelist):
+def print_errors(name, errors):
     had_errors = False
     print_log_name = True
-    for line in content:
-        if not line.startswith("Stderr:") and regexp.match(line):
-            whitelisted = False
-            for w in whitelist:
-                pat = ".*%s.*%s.*" % (w['module'].replace('.', '\\.'),
-                                      w['message'])
-                if re.match(pat, line):
-                    whitelisted = True
-                    break
-            if not whitelisted or dump_all_errors:
-                if print_log_name:
-                    print("Log File: %s" % name)
-                    print_log_name = False
-                if not whitelisted:
-                    had_errors = True
-                print(line)
+    for line, whitelisted in errors:
+        if not whitelisted or dump_all_errors:
+            if print_log_name:
+                print("Log File: %s" % name)
+                print_log_name = False
+            if not whitelisted:
+                had_errors = True
+            print(line)
     return had_errors
 
 
@@ -120,7 +108,8 @@ def main(opts):
                     assert 'module' in w, 'no module in %s' % name
                     assert 'message' in w, 'no message in %s' % name
             whitelists = loaded
-    if process_files(files_to_process, urls_to_process, whitelists):
+    if process_files(files_to_process, urls_to_process, whitelists,
+                     opts.workers):
         print("Logs have errors")
         if is_neutron:
             print("Currently not failing neutron builds with errors")
@@ -133,7 +122,8 @@ def main(opts):
 
 usage = """
 Find non-white-listed log errors in log files from a devstack-gate run.
-Log files will be searched for ERROR or CRITICAL messages. If any
+Log files will be searched for ERROR or CRITICAL messages, several at
+the same time, while they are downloaded and decompressed. If any
 error messages do not match any of the whitelist entries contained in
 etc/whitelist.yaml, those messages will be printed to the console and
 failure will be returned. A file directory containing logs or a url to the
@@ -155,6 +145,9 @@ parser.add_argument('-d', '--directory',
                     help="Directory containing log files")
 parser.add_argument('-u', '--url',
                     help="url containing logs from an OpenStack gate job")
+parser.add_argument('-w', '--workers', type=int, default=8,
+                    help="Number of log files downloaded and scanned at the "
+                         "same time")
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Creates or deletes the pool of isolated credentials leased to the tests.
+
+Run 'create' before and 'delete' after a test run. Nothing is done unless
+both [credential-pool] enabled and [compute] allow_tenant_isolation are
+set in tempest.conf.
+"""
+
+import argparse
+import os
+import sys
+
+# NOTE: the tools are run from a checkout, where tempest is not installed.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                os.pardir)))
+
+from tempest.common import credential_pool
+from tempest import config
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('action', choices=['create', 'delete'])
+    args = parser.parse_args()
+
+    conf = config.TempestConfig()
+    if not (conf.credential_pool.enabled and
+            conf.compute.allow_tenant_isolation):
+        return 0
+    pool = credential_pool.CredentialPool()
+    if args.action == 'create':
+        pool.create()
+    else:
+        pool.delete()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
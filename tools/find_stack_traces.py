@@ -16,88 +16,33 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import gzip
+"""
+Hunts for stack traces in a devstack run.
+
+Downloads and parses the logs of a tempest devstack run, several at the same
+time, and reports the stack traces found in each of them. Ends with the
+fingerprints of the errors, identifying the occurrences of the same error in
+the logs, and their numbers of occurrences.
+"""
+
+import argparse
+import collections
+import os
 import re
-import StringIO
 import sys
 import urllib2
 
-import pprint
-pp = pprint.PrettyPrinter()
+# NOTE: the tools are run from a checkout, where tempest is not installed.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                os.pardir)))
 
-NOVA_TIMESTAMP = r"\d\d\d\d-\d\d-\d\d \d\d:\d\d:\d\d\.\d\d\d"
-
-NOVA_REGEX = r"(?P<timestamp>%s) (?P<pid>\d+ )?(?P<level>(ERROR|TRACE)) " \
-    "(?P<module>[\w\.]+) (?P<msg>.*)" % (NOVA_TIMESTAMP)
-
-
-class StackTrace(object):
-    timestamp = None
-    pid = None
-    level = ""
-    module = ""
-    msg = ""
-
-    def __init__(self, timestamp=None, pid=None, level="", module="",
-                 msg=""):
-        self.timestamp = timestamp
-        self.pid = pid
-        self.level = level
-        self.module = module
-        self.msg = msg
-
-    def append(self, msg):
-        self.msg = self.msg + msg
-
-    def is_same(self, data):
-        return (data['timestamp'] == self.timestamp and
-                data['level'] == self.level)
-
-    def not_none(self):
-        return self.timestamp is not None
-
-    def __str__(self):
-        buff = "<%s %s %s>\n" % (self.timestamp, self.level, self.module)
-        for line in self.msg.splitlines():
-            buff = buff + line + "\n"
-        return buff
+from tempest.common import concurrency
+from tempest.common import log_scanner
 
 
 def hunt_for_stacktrace(url):
     """Return TRACE or ERROR lines out of logs."""
-    req = urllib2.Request(url)
-    req.add_header('Accept-Encoding', 'gzip')
-    page = urllib2.urlopen(req)
-    buf = StringIO.StringIO(page.read())
-    f = gzip.GzipFile(fileobj=buf)
-    content = f.read()
-
-    traces = []
-    trace = StackTrace()
-    for line in content.splitlines():
-        m = re.match(NOVA_REGEX, line)
-        if m:
-            data = m.groupdict()
-            if trace.not_none() and trace.is_same(data):
-                trace.append(data['msg'] + "\n")
-            else:
-                trace = StackTrace(
-                    timestamp=data.get('timestamp'),
-                    pid=data.get('pid'),
-                    level=data.get('level'),
-                    module=data.get('module'),
-                    msg=data.get('msg'))
-
-        else:
-            if trace.not_none():
-                traces.append(trace)
-                trace = StackTrace()
-
-    # once more at the end to pick up any stragglers
-    if trace.not_none():
-        traces.append(trace)
-
-    return traces
+    return list(log_scanner.extract_traces(log_scanner.open_url(url)))
 
 
 def log_url(url, log):
@@ -111,17 +56,13 @@ def collect_logs(url):
     return logs
 
 
-def usage():
-    print("""
-Usage: find_stack_traces.py <logurl>
-
-Hunts for stack traces in a devstack run. Must provide it a base log url
-from a tempest devstack run. Should start with http and end with /logs/.
-
-Returns a report listing stack traces out of the various files where
-they are found.
-""")
-    sys.exit(0)
+def hunt_all(url, logs, workers):
+    """Returns the traces of every log, downloading several at once."""
+    graph = concurrency.TaskGraph(workers)
+    for log in logs:
+        graph.add(log, hunt_for_stacktrace, (log_url(url, log),))
+    graph.run()
+    return [(log, graph.results[log]) for log in logs]
 
 
 def print_stats(items, fname, verbose=False):
@@ -136,24 +77,47 @@ def print_stats(items, fname, verbose=False):
         print("\n\n")
 
 
-def main():
-    if len(sys.argv) == 2:
-        url = sys.argv[1]
-        loglist = collect_logs(url)
+def print_fingerprints(results):
+    """Prints how often each error occurred, the most frequent first."""
+    counts = collections.Counter()
+    first = {}
+    for log, traces in results:
+        for trace in traces:
+            fingerprint = trace.fingerprint()
+            counts[fingerprint] += 1
+            first.setdefault(fingerprint, (log, trace))
+    print("%d distinct errors found" % len(counts))
+    for fingerprint, count in counts.most_common():
+        log, trace = first[fingerprint]
+        # The message of a trace may be empty.
+        lines = trace.msg.splitlines() or ['']
+        print("%6d %s %s %s %s: %s" % (count, fingerprint, log, trace.level,
+                                       trace.module, lines[0][:80]))
 
-        # probably wrong base url
-        if not loglist:
-            usage()
-
-        for log in loglist:
-            logurl = log_url(url, log)
-            traces = hunt_for_stacktrace(logurl)
 
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('url', help="Base log url of a tempest devstack "
+                                    "run, should start with http and end "
+                                    "with /logs/")
+    parser.add_argument('-w', '--workers', type=int, default=8,
+                        help="Number of logs downloaded at the same time")
+    parser.add_argument('-s', '--summary', action='store_true',
+                        help="Only print the fingerprints of the errors "
+                             "with their number of occurrences")
+    args = parser.parse_args()
+
+    loglist = collect_logs(args.url)
+    # probably wrong base url
+    if not loglist:
+        parser.error("no log found at %s" % args.url)
+
+    results = hunt_all(args.url, loglist, args.workers)
+    if not args.summary:
+        for log, traces in results:
             if traces:
                 print_stats(traces, log, verbose=True)
-
-    else:
-        usage()
+    print_fingerprints(results)
 
 if __name__ == '__main__':
     main()
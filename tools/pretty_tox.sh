@@ -1,4 +1,25 @@
 #!/bin/sh
 
 TESTRARGS=$1
-python setup.py testr --slowest --testr-args="--subunit $TESTRARGS" | subunit2pyunit
+POOL=tools/credential_pool.py
+SCHEDULER=tools/schedule_tests.py
+if [ -f $POOL ]; then
+    python $POOL create || exit $?
+else
+    echo "$POOL not found, running without a credential pool" >&2
+fi
+if [ -f $SCHEDULER ] && python $SCHEDULER prepare "$TESTRARGS"; then
+    python $SCHEDULER run | subunit2pyunit
+    retval=$?
+    testr slowest
+else
+    python setup.py testr --slowest --testr-args="--subunit $TESTRARGS" | subunit2pyunit
+    retval=$?
+fi
+if [ -f $SCHEDULER ]; then
+    testr last --subunit | python $SCHEDULER record
+fi
+if [ -f $POOL ]; then
+    python $POOL delete
+fi
+exit $retval
@@ -1,11 +1,20 @@
 #!/bin/sh
 
 TESTRARGS=$@
+POOL=tools/credential_pool.py
 
 if [ ! -d .testrepository ]; then
     testr init
 fi
+if [ -f $POOL ]; then
+    python $POOL create || exit $?
+else
+    echo "$POOL not found, running without a credential pool" >&2
+fi
 testr run --subunit $TESTRARGS | subunit2pyunit
 retval=$?
+if [ -f $POOL ]; then
+    python $POOL delete
+fi
 testr slowest
 exit $retval
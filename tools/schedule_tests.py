@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+# Copyright 2013 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Schedules the test classes of a parallel testr run by their durations.
+
+'record' reads the subunit stream of a run on stdin, such as the output of
+'testr last --subunit', and records the durations of its classes, class
+fixtures included, in its own timing DB. 'prepare' lists the tests the
+given testr arguments select and packs their classes on the workers
+longest first, writing the tests of every worker in a list file. It exits
+with 1 when the run can not be scheduled, e.g. for a testr option it does
+not handle, and testr should then run the tests itself. 'run' runs the
+workers on these lists with the test command of .testr.conf and loads
+their streams into testr, which prints the subunit stream of the run.
+"""
+
+import anydbm
+import argparse
+import glob
+import multiprocessing
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import subunit
+import testtools
+
+# NOTE: the tools are run from a checkout, where tempest is not installed.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                os.pardir)))
+
+from tempest.common import scheduling
+
+TEST_ID = re.compile(r'^[\w\.]+(\[.*\])?$')
+
+
+def read_tests(stream):
+    tests = []
+    case = subunit.ByteStreamToStreamResult(stream, non_subunit_name='stdout')
+    result = testtools.StreamToDict(tests.append)
+    result.startTestRun()
+    try:
+        case.run(result)
+    finally:
+        result.stopTestRun()
+    return tests
+
+
+def record(args, regexp):
+    db = scheduling.TimingDB(args.db)
+    previous = db.makespans[-1] if db.makespans else None
+    durations, counts, makespan = scheduling.class_durations(
+        read_tests(sys.stdin), regexp)
+    if not counts:
+        print("No test run to record")
+        return 0
+    db.record(durations, counts, makespan)
+    db.save()
+    message = "Recorded %d test classes, makespan %.0fs" % (len(counts),
+                                                            makespan)
+    if previous:
+        message += " (previous run: %.0fs)" % previous
+    print(message)
+    return 0
+
+
+def _testr_times(args, test_ids):
+    """Returns the last durations testr recorded for the tests."""
+    path = os.path.join(args.repository, 'times.dbm')
+    try:
+        times = anydbm.open(path, 'r')
+    except anydbm.error:
+        return {}
+    try:
+        test_times = {}
+        for test_id in test_ids:
+            try:
+                test_times[test_id] = float(times[test_id])
+            except KeyError:
+                pass
+        return test_times
+    finally:
+        times.close()
+
+
+def _worker_lists(args):
+    return sorted(glob.glob(os.path.join(args.schedule, 'worker-*.list')),
+                  key=lambda path: int(re.findall(r'\d+', path)[-1]))
+
+
+def prepare(args, regexp):
+    try:
+        concurrency, filters = scheduling.split_testr_args(args.testr_args)
+    except ValueError as e:
+        print("Not scheduling the tests: %s" % e)
+        return 1
+    concurrency = concurrency or args.concurrency
+    listing = subprocess.Popen(['testr', 'list-tests'] + filters,
+                               stdout=subprocess.PIPE)
+    test_ids = [line.strip() for line in listing.stdout
+                if TEST_ID.match(line.strip())]
+    if listing.wait() != 0:
+        print("Not scheduling the tests: unable to list them")
+        return 1
+    classes = scheduling.group_tests(test_ids, regexp)
+    if not classes:
+        print("Not scheduling the tests: no test to run")
+        return 1
+    db = scheduling.TimingDB(args.db)
+    durations = dict((name, db.estimate(name, len(tests)))
+                     for name, tests in classes.iteritems())
+    unknown = len([name for name in classes if name not in db.classes])
+    before = scheduling.makespan(
+        scheduling.testr_partition(classes, _testr_times(args, test_ids),
+                                   concurrency), durations)
+    loads = scheduling.partition(durations, concurrency)
+
+    for path in _worker_lists(args):
+        os.remove(path)
+    if not os.path.isdir(args.schedule):
+        os.makedirs(args.schedule)
+    for index, (load, names) in enumerate(loads):
+        if not names:
+            continue
+        path = os.path.join(args.schedule, 'worker-%d.list' % index)
+        with open(path, 'w') as id_file:
+            for name in names:
+                id_file.writelines(test_id + '\n'
+                                   for test_id in classes[name])
+
+    after = loads[-1][0]
+    print("Scheduled %d test classes (%d unknown) on %d workers: estimated "
+          "makespan %.0fs instead of %.0fs (%.0f%% shorter), lower bound "
+          "%.0fs" % (len(classes), unknown, concurrency, after, before,
+                     100.0 * (before - after) / before if before else 0.0,
+                     sum(durations.values()) / concurrency))
+    return 0
+
+
+def run(args, regexp):
+    """Runs the workers prepared and loads their streams into testr.
+
+    The workers write their subunit streams in named pipes, which testr
+    reads all at once, tagging the tests of every stream with its worker.
+    """
+    id_files = _worker_lists(args)
+    if not id_files:
+        sys.stderr.write("No scheduled tests, run 'prepare' first\n")
+        return 1
+    fifo_dir = tempfile.mkdtemp(prefix='tempest-schedule')
+    try:
+        fifos = [os.path.join(fifo_dir, 'worker-%d' % index)
+                 for index in range(len(id_files))]
+        for fifo in fifos:
+            os.mkfifo(fifo)
+        load = subprocess.Popen(['testr', 'load', '--subunit'] + fifos)
+        workers = []
+        # testr opens the pipes in order, each open waits for the reader.
+        for id_file, fifo in zip(id_files, fifos):
+            with open(fifo, 'wb') as stream:
+                workers.append(subprocess.Popen(
+                    scheduling.worker_command(id_file), shell=True,
+                    stdout=stream))
+        for worker in workers:
+            worker.wait()
+        return load.wait()
+    finally:
+        shutil.rmtree(fifo_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('action', choices=['prepare', 'run', 'record'])
+    parser.add_argument('testr_args', nargs='?', default='',
+                        help="Arguments of the testr run to prepare, the "
+                             "filters and --concurrency")
+    parser.add_argument('--concurrency', type=int,
+                        default=multiprocessing.cpu_count(),
+                        help="Number of testr workers when the testr "
+                             "arguments do not give it (default: the number "
+                             "of CPUs, as testr)")
+    parser.add_argument('--repository', default='.testrepository',
+                        help="Path of the testr repository")
+    parser.add_argument('--db', default=None,
+                        help="Path of the timing DB (default: "
+                             "class_times.json in the testr repository)")
+    args = parser.parse_args()
+    if args.db is None:
+        args.db = os.path.join(args.repository, 'class_times.json')
+    args.schedule = os.path.join(args.repository, 'schedule')
+    if not os.path.isdir(args.repository):
+        print("No testr repository at %s" % args.repository)
+        return 1 if args.action == 'prepare' else 0
+    regexp = scheduling.group_regex()
+    actions = {'prepare': prepare, 'run': run, 'record': record}
+    return actions[args.action](args, regexp)
+
+
+if __name__ == "__main__":
+    sys.exit(main())